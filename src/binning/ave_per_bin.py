@@ -54,7 +54,9 @@ OUTPATH=lt.OUTPATH
 # Importing utility functions
 
 sys.path.append("utility")
-from utility import remove_bad_bins, get_centroid, integrate_hist_range, prune_hist
+from utility import remove_bad_bins, get_centroid, integrate_hist_range, prune_hist, get_simc_tree
+from columnar import simc_good_mask
+from binned_hist import BinnedHist
 
 ##################################################################################################################################################
 
@@ -88,6 +90,8 @@ def process_hist_data(tree_data, tree_dummy, t_bins, nWindows, phi_setting, inpD
     # Import function to define cut bools
     from apply_cuts import apply_data_cuts, apply_data_sub_cuts, set_val
     set_val(inpDict) # Set global variables for optimization
+    sys.path.append("cuts")
+    from event_scan import get_event_scan, fill_binned_arrays, binned_mm_offset, AVE_BIN_SPEC
 
     ################################################################################################################################################
     # Define HGCer hole cut for KaonLT 2018-19
@@ -162,41 +166,44 @@ def process_hist_data(tree_data, tree_dummy, t_bins, nWindows, phi_setting, inpD
     # Loop through bins in t_data and identify events in specified bins
     for j in range(len(t_bins)-1):
 
-        hist_bin_dict["H_Q2_DATA_{}".format(j)]       = TH1D("H_Q2_DATA_{}".format(j),"Q2", 200, inpDict["Q2min"], inpDict["Q2max"])
-        hist_bin_dict["H_W_DATA_{}".format(j)]  = TH1D("H_W_DATA_{}".format(j),"W ", 200, inpDict["Wmin"], inpDict["Wmax"])
-        hist_bin_dict["H_t_DATA_{}".format(j)]       = TH1D("H_t_DATA_{}".format(j),"-t", 200, inpDict["tmin"], inpDict["tmax"])
-        hist_bin_dict["H_epsilon_DATA_{}".format(j)]  = TH1D("H_epsilon_DATA_{}".format(j),"epsilon", 200, inpDict["Epsmin"], inpDict["Epsmax"])
-        hist_bin_dict["H_MM_DATA_{}".format(j)]       = TH1D("H_MM_DATA_{}".format(j),"MM", 200, inpDict["mm_min"], inpDict["mm_max"])
-        hist_bin_dict["H_MM_fit1sub_DATA_{}".format(j)]       = TH1D("H_MM_fit1sub_DATA_{}".format(j),"MM", 200, 0.7, 1.5)
-        hist_bin_dict["H_MM_pisub_DATA_{}".format(j)]       = TH1D("H_MM_pisub_DATA_{}".format(j),"MM", 200, 0.7, 1.5)
-        hist_bin_dict["H_MM_nosub_DATA_{}".format(j)]       = TH1D("H_MM_nosub_DATA_{}".format(j),"MM", 200, 0.7, 1.5)
-
-        hist_bin_dict["H_Q2_RAND_{}".format(j)]       = TH1D("H_Q2_RAND_{}".format(j),"Q2", 200, inpDict["Q2min"], inpDict["Q2max"])
-        hist_bin_dict["H_W_RAND_{}".format(j)]  = TH1D("H_W_RAND_{}".format(j),"W ", 200, inpDict["Wmin"], inpDict["Wmax"])
-        hist_bin_dict["H_t_RAND_{}".format(j)]       = TH1D("H_t_RAND_{}".format(j),"-t", 200, inpDict["tmin"], inpDict["tmax"])
-        hist_bin_dict["H_epsilon_RAND_{}".format(j)]  = TH1D("H_epsilon_RAND_{}".format(j),"epsilon", 200, inpDict["Epsmin"], inpDict["Epsmax"])
-        hist_bin_dict["H_MM_RAND_{}".format(j)]       = TH1D("H_MM_RAND_{}".format(j),"MM", 200, inpDict["mm_min"], inpDict["mm_max"])
-        hist_bin_dict["H_MM_fit1sub_RAND_{}".format(j)]       = TH1D("H_MM_fit1sub_RAND_{}".format(j),"MM", 200, 0.7, 1.5)
-        hist_bin_dict["H_MM_pisub_RAND_{}".format(j)]       = TH1D("H_MM_pisub_RAND_{}".format(j),"MM", 200, 0.7, 1.5)
-        hist_bin_dict["H_MM_nosub_RAND_{}".format(j)]       = TH1D("H_MM_nosub_RAND_{}".format(j),"MM", 200, 0.7, 1.5)
-
-        hist_bin_dict["H_Q2_DUMMY_{}".format(j)]       = TH1D("H_Q2_DUMMY_{}".format(j),"Q2", 200, inpDict["Q2min"], inpDict["Q2max"])
-        hist_bin_dict["H_W_DUMMY_{}".format(j)]  = TH1D("H_W_DUMMY_{}".format(j),"W ", 200, inpDict["Wmin"], inpDict["Wmax"])
-        hist_bin_dict["H_t_DUMMY_{}".format(j)]       = TH1D("H_t_DUMMY_{}".format(j),"-t", 200, inpDict["tmin"], inpDict["tmax"])
-        hist_bin_dict["H_epsilon_DUMMY_{}".format(j)]  = TH1D("H_epsilon_DUMMY_{}".format(j),"epsilon", 200, inpDict["Epsmin"], inpDict["Epsmax"])
-        hist_bin_dict["H_MM_DUMMY_{}".format(j)]       = TH1D("H_MM_DUMMY_{}".format(j),"MM", 200, inpDict["mm_min"], inpDict["mm_max"])
-        hist_bin_dict["H_MM_fit1sub_DUMMY_{}".format(j)]       = TH1D("H_MM_fit1sub_DUMMY_{}".format(j),"MM", 200, 0.7, 1.5)
-        hist_bin_dict["H_MM_pisub_DUMMY_{}".format(j)]       = TH1D("H_MM_pisub_DUMMY_{}".format(j),"MM", 200, 0.7, 1.5)
-        hist_bin_dict["H_MM_nosub_DUMMY_{}".format(j)]       = TH1D("H_MM_nosub_DUMMY_{}".format(j),"MM", 200, 0.7, 1.5)
-
-        hist_bin_dict["H_Q2_DUMMY_RAND_{}".format(j)]       = TH1D("H_Q2_DUMMY_RAND_{}".format(j),"Q2", 200, inpDict["Q2min"], inpDict["Q2max"])
-        hist_bin_dict["H_W_DUMMY_RAND_{}".format(j)]  = TH1D("H_W_DUMMY_RAND_{}".format(j),"W ", 200, inpDict["Wmin"], inpDict["Wmax"])
-        hist_bin_dict["H_t_DUMMY_RAND_{}".format(j)]       = TH1D("H_t_DUMMY_RAND_{}".format(j),"-t", 200, inpDict["tmin"], inpDict["tmax"])
-        hist_bin_dict["H_epsilon_DUMMY_RAND_{}".format(j)]  = TH1D("H_epsilon_DUMMY_RAND_{}".format(j),"epsilon", 200, inpDict["Epsmin"], inpDict["Epsmax"])
-        hist_bin_dict["H_MM_DUMMY_RAND_{}".format(j)]       = TH1D("H_MM_DUMMY_RAND_{}".format(j),"MM", 200, inpDict["mm_min"], inpDict["mm_max"])
-        hist_bin_dict["H_MM_fit1sub_DUMMY_RAND_{}".format(j)]       = TH1D("H_MM_fit1sub_DUMMY_RAND_{}".format(j),"MM", 200, 0.7, 1.5)
-        hist_bin_dict["H_MM_pisub_DUMMY_RAND_{}".format(j)]       = TH1D("H_MM_pisub_DUMMY_RAND_{}".format(j),"MM", 200, 0.7, 1.5)
-        hist_bin_dict["H_MM_nosub_DUMMY_RAND_{}".format(j)]       = TH1D("H_MM_nosub_DUMMY_RAND_{}".format(j),"MM", 200, 0.7, 1.5)
+        # Booked here only for the event loop, the columnar path fills BinnedHist arrays instead
+        if inpDict.get("EVENT_LOOP", False):
+
+            hist_bin_dict["H_Q2_DATA_{}".format(j)]       = TH1D("H_Q2_DATA_{}".format(j),"Q2", 200, inpDict["Q2min"], inpDict["Q2max"])
+            hist_bin_dict["H_W_DATA_{}".format(j)]  = TH1D("H_W_DATA_{}".format(j),"W ", 200, inpDict["Wmin"], inpDict["Wmax"])
+            hist_bin_dict["H_t_DATA_{}".format(j)]       = TH1D("H_t_DATA_{}".format(j),"-t", 200, inpDict["tmin"], inpDict["tmax"])
+            hist_bin_dict["H_epsilon_DATA_{}".format(j)]  = TH1D("H_epsilon_DATA_{}".format(j),"epsilon", 200, inpDict["Epsmin"], inpDict["Epsmax"])
+            hist_bin_dict["H_MM_DATA_{}".format(j)]       = TH1D("H_MM_DATA_{}".format(j),"MM", 200, inpDict["mm_min"], inpDict["mm_max"])
+            hist_bin_dict["H_MM_fit1sub_DATA_{}".format(j)]       = TH1D("H_MM_fit1sub_DATA_{}".format(j),"MM", 200, 0.7, 1.5)
+            hist_bin_dict["H_MM_pisub_DATA_{}".format(j)]       = TH1D("H_MM_pisub_DATA_{}".format(j),"MM", 200, 0.7, 1.5)
+            hist_bin_dict["H_MM_nosub_DATA_{}".format(j)]       = TH1D("H_MM_nosub_DATA_{}".format(j),"MM", 200, 0.7, 1.5)
+
+            hist_bin_dict["H_Q2_RAND_{}".format(j)]       = TH1D("H_Q2_RAND_{}".format(j),"Q2", 200, inpDict["Q2min"], inpDict["Q2max"])
+            hist_bin_dict["H_W_RAND_{}".format(j)]  = TH1D("H_W_RAND_{}".format(j),"W ", 200, inpDict["Wmin"], inpDict["Wmax"])
+            hist_bin_dict["H_t_RAND_{}".format(j)]       = TH1D("H_t_RAND_{}".format(j),"-t", 200, inpDict["tmin"], inpDict["tmax"])
+            hist_bin_dict["H_epsilon_RAND_{}".format(j)]  = TH1D("H_epsilon_RAND_{}".format(j),"epsilon", 200, inpDict["Epsmin"], inpDict["Epsmax"])
+            hist_bin_dict["H_MM_RAND_{}".format(j)]       = TH1D("H_MM_RAND_{}".format(j),"MM", 200, inpDict["mm_min"], inpDict["mm_max"])
+            hist_bin_dict["H_MM_fit1sub_RAND_{}".format(j)]       = TH1D("H_MM_fit1sub_RAND_{}".format(j),"MM", 200, 0.7, 1.5)
+            hist_bin_dict["H_MM_pisub_RAND_{}".format(j)]       = TH1D("H_MM_pisub_RAND_{}".format(j),"MM", 200, 0.7, 1.5)
+            hist_bin_dict["H_MM_nosub_RAND_{}".format(j)]       = TH1D("H_MM_nosub_RAND_{}".format(j),"MM", 200, 0.7, 1.5)
+
+            hist_bin_dict["H_Q2_DUMMY_{}".format(j)]       = TH1D("H_Q2_DUMMY_{}".format(j),"Q2", 200, inpDict["Q2min"], inpDict["Q2max"])
+            hist_bin_dict["H_W_DUMMY_{}".format(j)]  = TH1D("H_W_DUMMY_{}".format(j),"W ", 200, inpDict["Wmin"], inpDict["Wmax"])
+            hist_bin_dict["H_t_DUMMY_{}".format(j)]       = TH1D("H_t_DUMMY_{}".format(j),"-t", 200, inpDict["tmin"], inpDict["tmax"])
+            hist_bin_dict["H_epsilon_DUMMY_{}".format(j)]  = TH1D("H_epsilon_DUMMY_{}".format(j),"epsilon", 200, inpDict["Epsmin"], inpDict["Epsmax"])
+            hist_bin_dict["H_MM_DUMMY_{}".format(j)]       = TH1D("H_MM_DUMMY_{}".format(j),"MM", 200, inpDict["mm_min"], inpDict["mm_max"])
+            hist_bin_dict["H_MM_fit1sub_DUMMY_{}".format(j)]       = TH1D("H_MM_fit1sub_DUMMY_{}".format(j),"MM", 200, 0.7, 1.5)
+            hist_bin_dict["H_MM_pisub_DUMMY_{}".format(j)]       = TH1D("H_MM_pisub_DUMMY_{}".format(j),"MM", 200, 0.7, 1.5)
+            hist_bin_dict["H_MM_nosub_DUMMY_{}".format(j)]       = TH1D("H_MM_nosub_DUMMY_{}".format(j),"MM", 200, 0.7, 1.5)
+
+            hist_bin_dict["H_Q2_DUMMY_RAND_{}".format(j)]       = TH1D("H_Q2_DUMMY_RAND_{}".format(j),"Q2", 200, inpDict["Q2min"], inpDict["Q2max"])
+            hist_bin_dict["H_W_DUMMY_RAND_{}".format(j)]  = TH1D("H_W_DUMMY_RAND_{}".format(j),"W ", 200, inpDict["Wmin"], inpDict["Wmax"])
+            hist_bin_dict["H_t_DUMMY_RAND_{}".format(j)]       = TH1D("H_t_DUMMY_RAND_{}".format(j),"-t", 200, inpDict["tmin"], inpDict["tmax"])
+            hist_bin_dict["H_epsilon_DUMMY_RAND_{}".format(j)]  = TH1D("H_epsilon_DUMMY_RAND_{}".format(j),"epsilon", 200, inpDict["Epsmin"], inpDict["Epsmax"])
+            hist_bin_dict["H_MM_DUMMY_RAND_{}".format(j)]       = TH1D("H_MM_DUMMY_RAND_{}".format(j),"MM", 200, inpDict["mm_min"], inpDict["mm_max"])
+            hist_bin_dict["H_MM_fit1sub_DUMMY_RAND_{}".format(j)]       = TH1D("H_MM_fit1sub_DUMMY_RAND_{}".format(j),"MM", 200, 0.7, 1.5)
+            hist_bin_dict["H_MM_pisub_DUMMY_RAND_{}".format(j)]       = TH1D("H_MM_pisub_DUMMY_RAND_{}".format(j),"MM", 200, 0.7, 1.5)
+            hist_bin_dict["H_MM_nosub_DUMMY_RAND_{}".format(j)]       = TH1D("H_MM_nosub_DUMMY_RAND_{}".format(j),"MM", 200, 0.7, 1.5)
 
         # Pion subtraction by scaling simc to peak size
         if ParticleType == "kaon":
@@ -229,194 +236,251 @@ def process_hist_data(tree_data, tree_dummy, t_bins, nWindows, phi_setting, inpD
             subDict["H_MM_SUB_DUMMY_RAND_{}".format(j)]  = TH1D("H_MM_SUB_DUMMY_RAND_{}".format(j),"MM_{}".format(SubtractedParticle), 200, inpDict["mm_min"], inpDict["mm_max"])
             subDict["H_MM_nosub_SUB_DUMMY_RAND_{}".format(j)]  = TH1D("H_MM_nosub_SUB_DUMMY_RAND_{}".format(j),"MM_nosub_{}".format(SubtractedParticle), 200, 0.7, 1.5)
             
-    print("\nBinning data...")
-    for i,evt in enumerate(TBRANCH_DATA):
+    if inpDict.get("EVENT_LOOP", False):
 
-        # Progress bar
-        Misc.progressBar(i, TBRANCH_DATA.GetEntries(),bar_length=25)
+        print("\nBinning data...")
+        for i,evt in enumerate(TBRANCH_DATA):
 
-        ##############
-        # HARD CODED #
-        ##############
+            # Progress bar
+            Misc.progressBar(i, TBRANCH_DATA.GetEntries(),bar_length=25)
 
-        adj_hsdelta = evt.hsdelta + c0_dict["Q{}W{}_{}e".format(Q2,W,EPSSET)]*evt.hsxpfp
+            ##############
+            # HARD CODED #
+            ##############
 
-        # Check if variable shift branch exists
-        try:
-            adj_MM = evt.MM_shift
-        except AttributeError:
-            adj_MM = evt.MM
+            adj_hsdelta = evt.hsdelta + c0_dict["Q{}W{}_{}e".format(Q2,W,EPSSET)]*evt.hsxpfp
 
-        ##############
-        ##############        
-        ##############
+            # Check if variable shift branch exists
+            try:
+                adj_MM = evt.MM_shift
+            except AttributeError:
+                adj_MM = evt.MM
+
+            ##############
+            ##############        
+            ##############
         
-        if ParticleType == "kaon":
-            ALLCUTS = apply_data_cuts(evt, mm_min, mm_max) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
-            NOMMCUTS = apply_data_sub_cuts(evt) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
-        else:
-            ALLCUTS = apply_data_cuts(evt, mm_min, mm_max)
-            NOMMCUTS = apply_data_sub_cuts(evt)
-
-        if(NOMMCUTS):
-            for j in range(len(t_bins)-1):                
-                if t_bins[j] <= -evt.MandelT <= t_bins[j+1]:
-                    hist_bin_dict["H_MM_fit1sub_DATA_{}".format(j)].Fill(adj_MM)
-                    hist_bin_dict["H_MM_pisub_DATA_{}".format(j)].Fill(adj_MM) 
-                    hist_bin_dict["H_MM_nosub_DATA_{}".format(j)].Fill(adj_MM)          
-
-        if(ALLCUTS):            
-
-            # Loop through bins in t_data and identify events in specified bins
-            for j in range(len(t_bins)-1):                
-                if t_bins[j] <= -evt.MandelT <= t_bins[j+1]:
-                    hist_bin_dict["H_t_DATA_{}".format(j)].Fill(-evt.MandelT)
-                    hist_bin_dict["H_Q2_DATA_{}".format(j)].Fill(evt.Q2)
-                    hist_bin_dict["H_W_DATA_{}".format(j)].Fill(evt.W)                        
-                    hist_bin_dict["H_epsilon_DATA_{}".format(j)].Fill(evt.epsilon)
-                    hist_bin_dict["H_MM_DATA_{}".format(j)].Fill(adj_MM)
-                    MM_offset_DATA = evt.MM_shift-evt.MM
+            if ParticleType == "kaon":
+                ALLCUTS = apply_data_cuts(evt, mm_min, mm_max) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
+                NOMMCUTS = apply_data_sub_cuts(evt) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
+            else:
+                ALLCUTS = apply_data_cuts(evt, mm_min, mm_max)
+                NOMMCUTS = apply_data_sub_cuts(evt)
+
+            if(NOMMCUTS):
+                for j in range(len(t_bins)-1):                
+                    if t_bins[j] <= -evt.MandelT <= t_bins[j+1]:
+                        hist_bin_dict["H_MM_fit1sub_DATA_{}".format(j)].Fill(adj_MM)
+                        hist_bin_dict["H_MM_pisub_DATA_{}".format(j)].Fill(adj_MM) 
+                        hist_bin_dict["H_MM_nosub_DATA_{}".format(j)].Fill(adj_MM)          
+
+            if(ALLCUTS):            
+
+                # Loop through bins in t_data and identify events in specified bins
+                for j in range(len(t_bins)-1):                
+                    if t_bins[j] <= -evt.MandelT <= t_bins[j+1]:
+                        hist_bin_dict["H_t_DATA_{}".format(j)].Fill(-evt.MandelT)
+                        hist_bin_dict["H_Q2_DATA_{}".format(j)].Fill(evt.Q2)
+                        hist_bin_dict["H_W_DATA_{}".format(j)].Fill(evt.W)                        
+                        hist_bin_dict["H_epsilon_DATA_{}".format(j)].Fill(evt.epsilon)
+                        hist_bin_dict["H_MM_DATA_{}".format(j)].Fill(adj_MM)
+                        MM_offset_DATA = evt.MM_shift-evt.MM
                     
-    print("\nBinning dummy...")
-    for i,evt in enumerate(TBRANCH_DUMMY):
+        print("\nBinning dummy...")
+        for i,evt in enumerate(TBRANCH_DUMMY):
 
-        # Progress bar
-        Misc.progressBar(i, TBRANCH_DUMMY.GetEntries(),bar_length=25)
+            # Progress bar
+            Misc.progressBar(i, TBRANCH_DUMMY.GetEntries(),bar_length=25)
 
-        ##############
-        # HARD CODED #
-        ##############
+            ##############
+            # HARD CODED #
+            ##############
 
-        adj_hsdelta = evt.hsdelta + c0_dict["Q{}W{}_{}e".format(Q2,W,EPSSET)]*evt.hsxpfp
+            adj_hsdelta = evt.hsdelta + c0_dict["Q{}W{}_{}e".format(Q2,W,EPSSET)]*evt.hsxpfp
 
-        # Check if variable shift branch exists
-        try:
-            adj_MM = evt.MM_shift
-        except AttributeError:
-            adj_MM = evt.MM
+            # Check if variable shift branch exists
+            try:
+                adj_MM = evt.MM_shift
+            except AttributeError:
+                adj_MM = evt.MM
 
-        ##############
-        ##############        
-        ##############
+            ##############
+            ##############        
+            ##############
         
-        if ParticleType == "kaon":
-            ALLCUTS = apply_data_cuts(evt, mm_min, mm_max) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
-            NOMMCUTS = apply_data_sub_cuts(evt) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
-        else:
-            ALLCUTS = apply_data_cuts(evt, mm_min, mm_max)
-            NOMMCUTS = apply_data_sub_cuts(evt)
-
-        if(NOMMCUTS):
-            for j in range(len(t_bins)-1):                
-                if t_bins[j] <= -evt.MandelT <= t_bins[j+1]:   
-                    hist_bin_dict["H_MM_fit1sub_DUMMY_{}".format(j)].Fill(adj_MM)             
-                    hist_bin_dict["H_MM_pisub_DUMMY_{}".format(j)].Fill(adj_MM)
-                    hist_bin_dict["H_MM_nosub_DUMMY_{}".format(j)].Fill(adj_MM)            
-
-        if(ALLCUTS):
-
-            # Loop through bins in t_dummy and identify events in specified bins
-            for j in range(len(t_bins)-1):                
-                if t_bins[j] <= -evt.MandelT <= t_bins[j+1]:
-                    hist_bin_dict["H_t_DUMMY_{}".format(j)].Fill(-evt.MandelT)
-                    hist_bin_dict["H_Q2_DUMMY_{}".format(j)].Fill(evt.Q2)
-                    hist_bin_dict["H_W_DUMMY_{}".format(j)].Fill(evt.W)                        
-                    hist_bin_dict["H_epsilon_DUMMY_{}".format(j)].Fill(evt.epsilon)
-                    hist_bin_dict["H_MM_DUMMY_{}".format(j)].Fill(adj_MM)                    
+            if ParticleType == "kaon":
+                ALLCUTS = apply_data_cuts(evt, mm_min, mm_max) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
+                NOMMCUTS = apply_data_sub_cuts(evt) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
+            else:
+                ALLCUTS = apply_data_cuts(evt, mm_min, mm_max)
+                NOMMCUTS = apply_data_sub_cuts(evt)
+
+            if(NOMMCUTS):
+                for j in range(len(t_bins)-1):                
+                    if t_bins[j] <= -evt.MandelT <= t_bins[j+1]:   
+                        hist_bin_dict["H_MM_fit1sub_DUMMY_{}".format(j)].Fill(adj_MM)             
+                        hist_bin_dict["H_MM_pisub_DUMMY_{}".format(j)].Fill(adj_MM)
+                        hist_bin_dict["H_MM_nosub_DUMMY_{}".format(j)].Fill(adj_MM)            
+
+            if(ALLCUTS):
+
+                # Loop through bins in t_dummy and identify events in specified bins
+                for j in range(len(t_bins)-1):                
+                    if t_bins[j] <= -evt.MandelT <= t_bins[j+1]:
+                        hist_bin_dict["H_t_DUMMY_{}".format(j)].Fill(-evt.MandelT)
+                        hist_bin_dict["H_Q2_DUMMY_{}".format(j)].Fill(evt.Q2)
+                        hist_bin_dict["H_W_DUMMY_{}".format(j)].Fill(evt.W)                        
+                        hist_bin_dict["H_epsilon_DUMMY_{}".format(j)].Fill(evt.epsilon)
+                        hist_bin_dict["H_MM_DUMMY_{}".format(j)].Fill(adj_MM)                    
                     
-    print("\nBinning rand...")
-    for i,evt in enumerate(TBRANCH_RAND):
+        print("\nBinning rand...")
+        for i,evt in enumerate(TBRANCH_RAND):
 
-        # Progress bar
-        Misc.progressBar(i, TBRANCH_RAND.GetEntries(),bar_length=25)
+            # Progress bar
+            Misc.progressBar(i, TBRANCH_RAND.GetEntries(),bar_length=25)
 
-        ##############
-        # HARD CODED #
-        ##############
+            ##############
+            # HARD CODED #
+            ##############
 
-        adj_hsdelta = evt.hsdelta + c0_dict["Q{}W{}_{}e".format(Q2,W,EPSSET)]*evt.hsxpfp
+            adj_hsdelta = evt.hsdelta + c0_dict["Q{}W{}_{}e".format(Q2,W,EPSSET)]*evt.hsxpfp
 
-        # Check if variable shift branch exists
-        try:
-            adj_MM = evt.MM_shift
-        except AttributeError:
-            adj_MM = evt.MM
+            # Check if variable shift branch exists
+            try:
+                adj_MM = evt.MM_shift
+            except AttributeError:
+                adj_MM = evt.MM
 
-        ##############
-        ##############        
-        ##############
+            ##############
+            ##############        
+            ##############
         
-        if ParticleType == "kaon":
-            ALLCUTS = apply_data_cuts(evt, mm_min, mm_max) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
-            NOMMCUTS = apply_data_sub_cuts(evt) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
-        else:
-            ALLCUTS = apply_data_cuts(evt, mm_min, mm_max)
-            NOMMCUTS = apply_data_sub_cuts(evt)
-
-        if(NOMMCUTS):
-            for j in range(len(t_bins)-1):                
-                if t_bins[j] <= -evt.MandelT <= t_bins[j+1]:       
-                    hist_bin_dict["H_MM_fit1sub_RAND_{}".format(j)].Fill(adj_MM)         
-                    hist_bin_dict["H_MM_pisub_RAND_{}".format(j)].Fill(adj_MM) 
-                    hist_bin_dict["H_MM_nosub_RAND_{}".format(j)].Fill(adj_MM)           
-
-        if(ALLCUTS):
-
-            # Loop through bins in t_rand and identify events in specified bins
-            for j in range(len(t_bins)-1):                
-                if t_bins[j] <= -evt.MandelT <= t_bins[j+1]:
-                    hist_bin_dict["H_t_RAND_{}".format(j)].Fill(-evt.MandelT)
-                    hist_bin_dict["H_Q2_RAND_{}".format(j)].Fill(evt.Q2)
-                    hist_bin_dict["H_W_RAND_{}".format(j)].Fill(evt.W)                        
-                    hist_bin_dict["H_epsilon_RAND_{}".format(j)].Fill(evt.epsilon)
-                    hist_bin_dict["H_MM_RAND_{}".format(j)].Fill(adj_MM)
+            if ParticleType == "kaon":
+                ALLCUTS = apply_data_cuts(evt, mm_min, mm_max) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
+                NOMMCUTS = apply_data_sub_cuts(evt) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
+            else:
+                ALLCUTS = apply_data_cuts(evt, mm_min, mm_max)
+                NOMMCUTS = apply_data_sub_cuts(evt)
+
+            if(NOMMCUTS):
+                for j in range(len(t_bins)-1):                
+                    if t_bins[j] <= -evt.MandelT <= t_bins[j+1]:       
+                        hist_bin_dict["H_MM_fit1sub_RAND_{}".format(j)].Fill(adj_MM)         
+                        hist_bin_dict["H_MM_pisub_RAND_{}".format(j)].Fill(adj_MM) 
+                        hist_bin_dict["H_MM_nosub_RAND_{}".format(j)].Fill(adj_MM)           
+
+            if(ALLCUTS):
+
+                # Loop through bins in t_rand and identify events in specified bins
+                for j in range(len(t_bins)-1):                
+                    if t_bins[j] <= -evt.MandelT <= t_bins[j+1]:
+                        hist_bin_dict["H_t_RAND_{}".format(j)].Fill(-evt.MandelT)
+                        hist_bin_dict["H_Q2_RAND_{}".format(j)].Fill(evt.Q2)
+                        hist_bin_dict["H_W_RAND_{}".format(j)].Fill(evt.W)                        
+                        hist_bin_dict["H_epsilon_RAND_{}".format(j)].Fill(evt.epsilon)
+                        hist_bin_dict["H_MM_RAND_{}".format(j)].Fill(adj_MM)
                     
-    print("\nBinning dummy_rand...")
-    for i,evt in enumerate(TBRANCH_DUMMY_RAND):
+        print("\nBinning dummy_rand...")
+        for i,evt in enumerate(TBRANCH_DUMMY_RAND):
 
-        # Progress bar
-        Misc.progressBar(i, TBRANCH_DUMMY_RAND.GetEntries(),bar_length=25)
+            # Progress bar
+            Misc.progressBar(i, TBRANCH_DUMMY_RAND.GetEntries(),bar_length=25)
 
-        ##############
-        # HARD CODED #
-        ##############
+            ##############
+            # HARD CODED #
+            ##############
 
-        adj_hsdelta = evt.hsdelta + c0_dict["Q{}W{}_{}e".format(Q2,W,EPSSET)]*evt.hsxpfp
+            adj_hsdelta = evt.hsdelta + c0_dict["Q{}W{}_{}e".format(Q2,W,EPSSET)]*evt.hsxpfp
 
-        # Check if variable shift branch exists
-        try:
-            adj_MM = evt.MM_shift
-        except AttributeError:
-            adj_MM = evt.MM
+            # Check if variable shift branch exists
+            try:
+                adj_MM = evt.MM_shift
+            except AttributeError:
+                adj_MM = evt.MM
 
-        ##############
-        ##############        
-        ##############
+            ##############
+            ##############        
+            ##############
         
+            if ParticleType == "kaon":
+                ALLCUTS = apply_data_cuts(evt, mm_min, mm_max) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
+                NOMMCUTS = apply_data_sub_cuts(evt) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
+            else:
+                ALLCUTS = apply_data_cuts(evt, mm_min, mm_max)
+                NOMMCUTS = apply_data_sub_cuts(evt)
+
+            if(NOMMCUTS):
+                for j in range(len(t_bins)-1):                
+                    if t_bins[j] <= -evt.MandelT <= t_bins[j+1]:         
+                        hist_bin_dict["H_MM_fit1sub_DUMMY_RAND_{}".format(j)].Fill(adj_MM)       
+                        hist_bin_dict["H_MM_pisub_DUMMY_RAND_{}".format(j)].Fill(adj_MM)
+                        hist_bin_dict["H_MM_nosub_DUMMY_RAND_{}".format(j)].Fill(adj_MM)            
+
+            if(ALLCUTS):
+
+                # Loop through bins in t_dummy_rand and identify events in specified bins
+                for j in range(len(t_bins)-1):                
+                    if t_bins[j] <= -evt.MandelT <= t_bins[j+1]:
+                        hist_bin_dict["H_t_DUMMY_RAND_{}".format(j)].Fill(-evt.MandelT)
+                        hist_bin_dict["H_Q2_DUMMY_RAND_{}".format(j)].Fill(evt.Q2)
+                        hist_bin_dict["H_W_DUMMY_RAND_{}".format(j)].Fill(evt.W)                        
+                        hist_bin_dict["H_epsilon_DUMMY_RAND_{}".format(j)].Fill(evt.epsilon)
+                        hist_bin_dict["H_MM_DUMMY_RAND_{}".format(j)].Fill(adj_MM)
+    else:
+
+        offsetDict = {}
+
+        # One array per spectrum and category covering every t bin, instead of a TH1D per bin
+        binned_shape = (len(t_bins)-1, 1)
+        binned_dict = {}
+        for category in ["DATA", "RAND", "DUMMY", "DUMMY_RAND"]:
+            binned_dict["H_Q2_{}".format(category)] = BinnedHist("H_Q2_{}".format(category), "Q2", binned_shape, 200, inpDict["Q2min"], inpDict["Q2max"])
+            binned_dict["H_W_{}".format(category)] = BinnedHist("H_W_{}".format(category), "W ", binned_shape, 200, inpDict["Wmin"], inpDict["Wmax"])
+            binned_dict["H_t_{}".format(category)] = BinnedHist("H_t_{}".format(category), "-t", binned_shape, 200, inpDict["tmin"], inpDict["tmax"])
+            binned_dict["H_epsilon_{}".format(category)] = BinnedHist("H_epsilon_{}".format(category), "epsilon", binned_shape, 200, inpDict["Epsmin"], inpDict["Epsmax"])
+            binned_dict["H_MM_{}".format(category)] = BinnedHist("H_MM_{}".format(category), "MM", binned_shape, 200, inpDict["mm_min"], inpDict["mm_max"])
+            binned_dict["H_MM_fit1sub_{}".format(category)] = BinnedHist("H_MM_fit1sub_{}".format(category), "MM", binned_shape, 200, 0.7, 1.5)
+            binned_dict["H_MM_pisub_{}".format(category)] = BinnedHist("H_MM_pisub_{}".format(category), "MM", binned_shape, 200, 0.7, 1.5)
+            binned_dict["H_MM_nosub_{}".format(category)] = BinnedHist("H_MM_nosub_{}".format(category), "MM", binned_shape, 200, 0.7, 1.5)
+
+        def ave_consumer(category, arrays, cut_masks):
+            fill_binned_arrays(binned_dict, category, arrays, cut_masks, AVE_BIN_SPEC, t_bins)
+            if category == "DATA":
+                MM_offset = binned_mm_offset(arrays, cut_masks, t_bins)
+                if MM_offset is not None:
+                    offsetDict["MM_offset_DATA"] = MM_offset
+
+        # Reuses the trees already read by rand_sub for this setting
         if ParticleType == "kaon":
-            ALLCUTS = apply_data_cuts(evt, mm_min, mm_max) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
-            NOMMCUTS = apply_data_sub_cuts(evt) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
+            scan = get_event_scan(phi_setting, ParticleType, inpDict, hgcer_cutg)
         else:
-            ALLCUTS = apply_data_cuts(evt, mm_min, mm_max)
-            NOMMCUTS = apply_data_sub_cuts(evt)
-
-        if(NOMMCUTS):
-            for j in range(len(t_bins)-1):                
-                if t_bins[j] <= -evt.MandelT <= t_bins[j+1]:         
-                    hist_bin_dict["H_MM_fit1sub_DUMMY_RAND_{}".format(j)].Fill(adj_MM)       
-                    hist_bin_dict["H_MM_pisub_DUMMY_RAND_{}".format(j)].Fill(adj_MM)
-                    hist_bin_dict["H_MM_nosub_DUMMY_RAND_{}".format(j)].Fill(adj_MM)            
-
-        if(ALLCUTS):
-
-            # Loop through bins in t_dummy_rand and identify events in specified bins
-            for j in range(len(t_bins)-1):                
-                if t_bins[j] <= -evt.MandelT <= t_bins[j+1]:
-                    hist_bin_dict["H_t_DUMMY_RAND_{}".format(j)].Fill(-evt.MandelT)
-                    hist_bin_dict["H_Q2_DUMMY_RAND_{}".format(j)].Fill(evt.Q2)
-                    hist_bin_dict["H_W_DUMMY_RAND_{}".format(j)].Fill(evt.W)                        
-                    hist_bin_dict["H_epsilon_DUMMY_RAND_{}".format(j)].Fill(evt.epsilon)
-                    hist_bin_dict["H_MM_DUMMY_RAND_{}".format(j)].Fill(adj_MM)
+            scan = get_event_scan(phi_setting, ParticleType, inpDict)
+        scan.register(ave_consumer)
+
+        if "MM_offset_DATA" in offsetDict:
+            MM_offset_DATA = offsetDict["MM_offset_DATA"]
+
+        # Random, dummy subtraction and normalization of all bins at once, same steps
+        # (and order) as the per bin histograms of the event loop below
+        for prefix in ["H_Q2", "H_W", "H_t", "H_epsilon", "H_MM", "H_MM_fit1sub", "H_MM_pisub", "H_MM_nosub"]:
+            binned_dict["{}_RAND".format(prefix)].scale(1/nWindows)
+            binned_dict["{}_DATA".format(prefix)].add(binned_dict["{}_RAND".format(prefix)], -1)
+            binned_dict["{}_DUMMY_RAND".format(prefix)].scale(1/nWindows)
+            binned_dict["{}_DUMMY".format(prefix)].add(binned_dict["{}_DUMMY_RAND".format(prefix)], -1)
+            # Data and dummy normalization
+            binned_dict["{}_DATA".format(prefix)].scale(norm_factor_data)
+            binned_dict["{}_DUMMY".format(prefix)].scale(norm_factor_dummy)
+            # Dummy subtraction
+            binned_dict["{}_DATA".format(prefix)].add(binned_dict["{}_DUMMY".format(prefix)], -1)
+
+        # Only the subtracted data (and the dummy, for the plots) become TH1Ds
+        for j in range(len(t_bins)-1):
+            for prefix in ["H_Q2", "H_W", "H_t", "H_epsilon", "H_MM", "H_MM_fit1sub", "H_MM_pisub", "H_MM_nosub"]:
+                hist_bin_dict["{}_DATA_{}".format(prefix, j)] = binned_dict["{}_DATA".format(prefix)].to_hist(j)
+            for prefix in ["H_Q2", "H_W", "H_t", "H_epsilon", "H_MM"]:
+                hist_bin_dict["{}_DUMMY_{}".format(prefix, j)] = binned_dict["{}_DUMMY".format(prefix)].to_hist(j)
+        del binned_dict
+
 
     # Pion subtraction by scaling simc to peak size
     if ParticleType == "kaon":
@@ -428,71 +492,74 @@ def process_hist_data(tree_data, tree_dummy, t_bins, nWindows, phi_setting, inpD
     # Loop through bins in t_data and identify events in specified bins
     for j in range(len(t_bins)-1):
                     
-        hist_bin_dict["H_Q2_RAND_{}".format(j)].Scale(1/nWindows)
-        hist_bin_dict["H_W_RAND_{}".format(j)].Scale(1/nWindows)    
-        hist_bin_dict["H_t_RAND_{}".format(j)].Scale(1/nWindows)
-        hist_bin_dict["H_epsilon_RAND_{}".format(j)].Scale(1/nWindows)
-        hist_bin_dict["H_MM_RAND_{}".format(j)].Scale(1/nWindows)
-        hist_bin_dict["H_MM_fit1sub_RAND_{}".format(j)].Scale(1/nWindows)
-        hist_bin_dict["H_MM_pisub_RAND_{}".format(j)].Scale(1/nWindows)
-        hist_bin_dict["H_MM_nosub_RAND_{}".format(j)].Scale(1/nWindows)        
-
-        hist_bin_dict["H_Q2_DATA_{}".format(j)].Add(hist_bin_dict["H_Q2_RAND_{}".format(j)],-1)
-        hist_bin_dict["H_W_DATA_{}".format(j)].Add(hist_bin_dict["H_W_RAND_{}".format(j)],-1)
-        hist_bin_dict["H_t_DATA_{}".format(j)].Add(hist_bin_dict["H_t_RAND_{}".format(j)],-1)
-        hist_bin_dict["H_epsilon_DATA_{}".format(j)].Add(hist_bin_dict["H_epsilon_RAND_{}".format(j)],-1)
-        hist_bin_dict["H_MM_DATA_{}".format(j)].Add(hist_bin_dict["H_MM_RAND_{}".format(j)],-1)
-        hist_bin_dict["H_MM_fit1sub_DATA_{}".format(j)].Add(hist_bin_dict["H_MM_fit1sub_RAND_{}".format(j)],-1)
-        hist_bin_dict["H_MM_pisub_DATA_{}".format(j)].Add(hist_bin_dict["H_MM_pisub_RAND_{}".format(j)],-1)
-        hist_bin_dict["H_MM_nosub_DATA_{}".format(j)].Add(hist_bin_dict["H_MM_nosub_RAND_{}".format(j)],-1)        
-
-        hist_bin_dict["H_Q2_DUMMY_RAND_{}".format(j)].Scale(1/nWindows)
-        hist_bin_dict["H_W_DUMMY_RAND_{}".format(j)].Scale(1/nWindows)    
-        hist_bin_dict["H_t_DUMMY_RAND_{}".format(j)].Scale(1/nWindows)
-        hist_bin_dict["H_epsilon_DUMMY_RAND_{}".format(j)].Scale(1/nWindows)
-        hist_bin_dict["H_MM_DUMMY_RAND_{}".format(j)].Scale(1/nWindows)
-        hist_bin_dict["H_MM_fit1sub_DUMMY_RAND_{}".format(j)].Scale(1/nWindows)
-        hist_bin_dict["H_MM_pisub_DUMMY_RAND_{}".format(j)].Scale(1/nWindows) 
-        hist_bin_dict["H_MM_nosub_DUMMY_RAND_{}".format(j)].Scale(1/nWindows)        
-
-        hist_bin_dict["H_Q2_DUMMY_{}".format(j)].Add(hist_bin_dict["H_Q2_DUMMY_RAND_{}".format(j)],-1)
-        hist_bin_dict["H_W_DUMMY_{}".format(j)].Add(hist_bin_dict["H_W_DUMMY_RAND_{}".format(j)],-1)
-        hist_bin_dict["H_t_DUMMY_{}".format(j)].Add(hist_bin_dict["H_t_DUMMY_RAND_{}".format(j)],-1)
-        hist_bin_dict["H_epsilon_DUMMY_{}".format(j)].Add(hist_bin_dict["H_epsilon_DUMMY_RAND_{}".format(j)],-1)
-        hist_bin_dict["H_MM_DUMMY_{}".format(j)].Add(hist_bin_dict["H_MM_DUMMY_RAND_{}".format(j)],-1)
-        hist_bin_dict["H_MM_fit1sub_DUMMY_{}".format(j)].Add(hist_bin_dict["H_MM_fit1sub_DUMMY_RAND_{}".format(j)],-1)
-        hist_bin_dict["H_MM_pisub_DUMMY_{}".format(j)].Add(hist_bin_dict["H_MM_pisub_DUMMY_RAND_{}".format(j)],-1)
-        hist_bin_dict["H_MM_nosub_DUMMY_{}".format(j)].Add(hist_bin_dict["H_MM_nosub_DUMMY_RAND_{}".format(j)],-1)   
+        # The columnar path has already done this on the BinnedHist arrays
+        if inpDict.get("EVENT_LOOP", False):
+
+            hist_bin_dict["H_Q2_RAND_{}".format(j)].Scale(1/nWindows)
+            hist_bin_dict["H_W_RAND_{}".format(j)].Scale(1/nWindows)    
+            hist_bin_dict["H_t_RAND_{}".format(j)].Scale(1/nWindows)
+            hist_bin_dict["H_epsilon_RAND_{}".format(j)].Scale(1/nWindows)
+            hist_bin_dict["H_MM_RAND_{}".format(j)].Scale(1/nWindows)
+            hist_bin_dict["H_MM_fit1sub_RAND_{}".format(j)].Scale(1/nWindows)
+            hist_bin_dict["H_MM_pisub_RAND_{}".format(j)].Scale(1/nWindows)
+            hist_bin_dict["H_MM_nosub_RAND_{}".format(j)].Scale(1/nWindows)        
+
+            hist_bin_dict["H_Q2_DATA_{}".format(j)].Add(hist_bin_dict["H_Q2_RAND_{}".format(j)],-1)
+            hist_bin_dict["H_W_DATA_{}".format(j)].Add(hist_bin_dict["H_W_RAND_{}".format(j)],-1)
+            hist_bin_dict["H_t_DATA_{}".format(j)].Add(hist_bin_dict["H_t_RAND_{}".format(j)],-1)
+            hist_bin_dict["H_epsilon_DATA_{}".format(j)].Add(hist_bin_dict["H_epsilon_RAND_{}".format(j)],-1)
+            hist_bin_dict["H_MM_DATA_{}".format(j)].Add(hist_bin_dict["H_MM_RAND_{}".format(j)],-1)
+            hist_bin_dict["H_MM_fit1sub_DATA_{}".format(j)].Add(hist_bin_dict["H_MM_fit1sub_RAND_{}".format(j)],-1)
+            hist_bin_dict["H_MM_pisub_DATA_{}".format(j)].Add(hist_bin_dict["H_MM_pisub_RAND_{}".format(j)],-1)
+            hist_bin_dict["H_MM_nosub_DATA_{}".format(j)].Add(hist_bin_dict["H_MM_nosub_RAND_{}".format(j)],-1)        
+
+            hist_bin_dict["H_Q2_DUMMY_RAND_{}".format(j)].Scale(1/nWindows)
+            hist_bin_dict["H_W_DUMMY_RAND_{}".format(j)].Scale(1/nWindows)    
+            hist_bin_dict["H_t_DUMMY_RAND_{}".format(j)].Scale(1/nWindows)
+            hist_bin_dict["H_epsilon_DUMMY_RAND_{}".format(j)].Scale(1/nWindows)
+            hist_bin_dict["H_MM_DUMMY_RAND_{}".format(j)].Scale(1/nWindows)
+            hist_bin_dict["H_MM_fit1sub_DUMMY_RAND_{}".format(j)].Scale(1/nWindows)
+            hist_bin_dict["H_MM_pisub_DUMMY_RAND_{}".format(j)].Scale(1/nWindows) 
+            hist_bin_dict["H_MM_nosub_DUMMY_RAND_{}".format(j)].Scale(1/nWindows)        
+
+            hist_bin_dict["H_Q2_DUMMY_{}".format(j)].Add(hist_bin_dict["H_Q2_DUMMY_RAND_{}".format(j)],-1)
+            hist_bin_dict["H_W_DUMMY_{}".format(j)].Add(hist_bin_dict["H_W_DUMMY_RAND_{}".format(j)],-1)
+            hist_bin_dict["H_t_DUMMY_{}".format(j)].Add(hist_bin_dict["H_t_DUMMY_RAND_{}".format(j)],-1)
+            hist_bin_dict["H_epsilon_DUMMY_{}".format(j)].Add(hist_bin_dict["H_epsilon_DUMMY_RAND_{}".format(j)],-1)
+            hist_bin_dict["H_MM_DUMMY_{}".format(j)].Add(hist_bin_dict["H_MM_DUMMY_RAND_{}".format(j)],-1)
+            hist_bin_dict["H_MM_fit1sub_DUMMY_{}".format(j)].Add(hist_bin_dict["H_MM_fit1sub_DUMMY_RAND_{}".format(j)],-1)
+            hist_bin_dict["H_MM_pisub_DUMMY_{}".format(j)].Add(hist_bin_dict["H_MM_pisub_DUMMY_RAND_{}".format(j)],-1)
+            hist_bin_dict["H_MM_nosub_DUMMY_{}".format(j)].Add(hist_bin_dict["H_MM_nosub_DUMMY_RAND_{}".format(j)],-1)   
         
-        # Data Normalization
-        hist_bin_dict["H_Q2_DATA_{}".format(j)].Scale(norm_factor_data)
-        hist_bin_dict["H_W_DATA_{}".format(j)].Scale(norm_factor_data)
-        hist_bin_dict["H_t_DATA_{}".format(j)].Scale(norm_factor_data)
-        hist_bin_dict["H_epsilon_DATA_{}".format(j)].Scale(norm_factor_data)
-        hist_bin_dict["H_MM_DATA_{}".format(j)].Scale(norm_factor_data)
-        hist_bin_dict["H_MM_fit1sub_DATA_{}".format(j)].Scale(norm_factor_data)
-        hist_bin_dict["H_MM_pisub_DATA_{}".format(j)].Scale(norm_factor_data)
-        hist_bin_dict["H_MM_nosub_DATA_{}".format(j)].Scale(norm_factor_data)
-
-        # Dummy Normalization
-        hist_bin_dict["H_Q2_DUMMY_{}".format(j)].Scale(norm_factor_dummy)
-        hist_bin_dict["H_W_DUMMY_{}".format(j)].Scale(norm_factor_dummy)
-        hist_bin_dict["H_t_DUMMY_{}".format(j)].Scale(norm_factor_dummy)
-        hist_bin_dict["H_epsilon_DUMMY_{}".format(j)].Scale(norm_factor_dummy)
-        hist_bin_dict["H_MM_DUMMY_{}".format(j)].Scale(norm_factor_dummy)
-        hist_bin_dict["H_MM_fit1sub_DUMMY_{}".format(j)].Scale(norm_factor_dummy)
-        hist_bin_dict["H_MM_pisub_DUMMY_{}".format(j)].Scale(norm_factor_dummy)
-        hist_bin_dict["H_MM_nosub_DUMMY_{}".format(j)].Scale(norm_factor_dummy)   
-
-        # Dummy subtraction
-        hist_bin_dict["H_Q2_DATA_{}".format(j)].Add(hist_bin_dict["H_Q2_DUMMY_{}".format(j)], -1)
-        hist_bin_dict["H_W_DATA_{}".format(j)].Add(hist_bin_dict["H_W_DUMMY_{}".format(j)], -1)
-        hist_bin_dict["H_t_DATA_{}".format(j)].Add(hist_bin_dict["H_t_DUMMY_{}".format(j)], -1)
-        hist_bin_dict["H_epsilon_DATA_{}".format(j)].Add(hist_bin_dict["H_epsilon_DUMMY_{}".format(j)], -1)
-        hist_bin_dict["H_MM_DATA_{}".format(j)].Add(hist_bin_dict["H_MM_DUMMY_{}".format(j)], -1)
-        hist_bin_dict["H_MM_fit1sub_DATA_{}".format(j)].Add(hist_bin_dict["H_MM_fit1sub_DUMMY_{}".format(j)], -1)
-        hist_bin_dict["H_MM_pisub_DATA_{}".format(j)].Add(hist_bin_dict["H_MM_pisub_DUMMY_{}".format(j)], -1)
-        hist_bin_dict["H_MM_nosub_DATA_{}".format(j)].Add(hist_bin_dict["H_MM_nosub_DUMMY_{}".format(j)], -1)  
+            # Data Normalization
+            hist_bin_dict["H_Q2_DATA_{}".format(j)].Scale(norm_factor_data)
+            hist_bin_dict["H_W_DATA_{}".format(j)].Scale(norm_factor_data)
+            hist_bin_dict["H_t_DATA_{}".format(j)].Scale(norm_factor_data)
+            hist_bin_dict["H_epsilon_DATA_{}".format(j)].Scale(norm_factor_data)
+            hist_bin_dict["H_MM_DATA_{}".format(j)].Scale(norm_factor_data)
+            hist_bin_dict["H_MM_fit1sub_DATA_{}".format(j)].Scale(norm_factor_data)
+            hist_bin_dict["H_MM_pisub_DATA_{}".format(j)].Scale(norm_factor_data)
+            hist_bin_dict["H_MM_nosub_DATA_{}".format(j)].Scale(norm_factor_data)
+
+            # Dummy Normalization
+            hist_bin_dict["H_Q2_DUMMY_{}".format(j)].Scale(norm_factor_dummy)
+            hist_bin_dict["H_W_DUMMY_{}".format(j)].Scale(norm_factor_dummy)
+            hist_bin_dict["H_t_DUMMY_{}".format(j)].Scale(norm_factor_dummy)
+            hist_bin_dict["H_epsilon_DUMMY_{}".format(j)].Scale(norm_factor_dummy)
+            hist_bin_dict["H_MM_DUMMY_{}".format(j)].Scale(norm_factor_dummy)
+            hist_bin_dict["H_MM_fit1sub_DUMMY_{}".format(j)].Scale(norm_factor_dummy)
+            hist_bin_dict["H_MM_pisub_DUMMY_{}".format(j)].Scale(norm_factor_dummy)
+            hist_bin_dict["H_MM_nosub_DUMMY_{}".format(j)].Scale(norm_factor_dummy)   
+
+            # Dummy subtraction
+            hist_bin_dict["H_Q2_DATA_{}".format(j)].Add(hist_bin_dict["H_Q2_DUMMY_{}".format(j)], -1)
+            hist_bin_dict["H_W_DATA_{}".format(j)].Add(hist_bin_dict["H_W_DUMMY_{}".format(j)], -1)
+            hist_bin_dict["H_t_DATA_{}".format(j)].Add(hist_bin_dict["H_t_DUMMY_{}".format(j)], -1)
+            hist_bin_dict["H_epsilon_DATA_{}".format(j)].Add(hist_bin_dict["H_epsilon_DUMMY_{}".format(j)], -1)
+            hist_bin_dict["H_MM_DATA_{}".format(j)].Add(hist_bin_dict["H_MM_DUMMY_{}".format(j)], -1)
+            hist_bin_dict["H_MM_fit1sub_DATA_{}".format(j)].Add(hist_bin_dict["H_MM_fit1sub_DUMMY_{}".format(j)], -1)
+            hist_bin_dict["H_MM_pisub_DATA_{}".format(j)].Add(hist_bin_dict["H_MM_pisub_DUMMY_{}".format(j)], -1)
+            hist_bin_dict["H_MM_nosub_DATA_{}".format(j)].Add(hist_bin_dict["H_MM_nosub_DUMMY_{}".format(j)], -1)  
 
         # Remove histograms with less than event_threshold entries and negative integrals
         event_threshold = 10
@@ -929,6 +996,9 @@ def process_hist_simc(tree_simc, t_bins, inpDict, iteration):
     # Import function to define cut bools
     from apply_cuts import apply_simc_cuts, set_val
     set_val(inpDict) # Set global variables for optimization
+
+    sys.path.append("cuts")
+    from event_scan import scan_simc, fill_binned, AVE_BIN_SPEC_SIMC
     
     ################################################################################################################################################
     # Define HGCer hole cut for KaonLT 2018-19
@@ -938,7 +1008,8 @@ def process_hist_simc(tree_simc, t_bins, inpDict, iteration):
     
     ################################################################################################################################################
         
-    TBRANCH_SIMC  = tree_simc.Get("h10")
+    # Full h10 tree, also for a weight sidecar (see iter_weight)
+    TBRANCH_SIMC  = get_simc_tree(tree_simc)
     
     hist_bin_dict = {}
     
@@ -950,33 +1021,49 @@ def process_hist_simc(tree_simc, t_bins, inpDict, iteration):
         hist_bin_dict["H_t_SIMC_{}".format(j)]       = TH1D("H_t_SIMC_{}".format(j),"-t", 200, inpDict["tmin"], inpDict["tmax"])
         hist_bin_dict["H_epsilon_SIMC_{}".format(j)]  = TH1D("H_epsilon_SIMC_{}".format(j),"epsilon", 200, inpDict["Epsmin"], inpDict["Epsmax"])
 
-    print("\nBinning simc...")
-    for i,evt in enumerate(TBRANCH_SIMC):
+    if inpDict.get("EVENT_LOOP", False):
 
-        # Progress bar
-        Misc.progressBar(i, TBRANCH_SIMC.GetEntries(),bar_length=25)
+        iter_good = simc_good_mask(tree_simc.GetName())
 
-        if ParticleType == "kaon":
-            ALLCUTS =  apply_simc_cuts(evt, mm_min, mm_max) and not hgcer_cutg.IsInside(evt.phgcer_x_det, evt.phgcer_y_det)
-        else:
-            ALLCUTS = apply_simc_cuts(evt, mm_min, mm_max)
-
-        #Fill SIMC events
-        if(ALLCUTS):
-
-            # Loop through bins in t_simc and identify events in specified bins
-            for j in range(len(t_bins)-1):            
-                if t_bins[j] <= -evt.t <= t_bins[j+1]:
-                    if iteration:
-                        hist_bin_dict["H_t_SIMC_{}".format(j)].Fill(-evt.t, evt.iter_weight)
-                        hist_bin_dict["H_Q2_SIMC_{}".format(j)].Fill(evt.Q2, evt.iter_weight)
-                        hist_bin_dict["H_W_SIMC_{}".format(j)].Fill(evt.W, evt.iter_weight)
-                        hist_bin_dict["H_epsilon_SIMC_{}".format(j)].Fill(evt.epsilon, evt.iter_weight)
-                    else:
-                        hist_bin_dict["H_t_SIMC_{}".format(j)].Fill(-evt.t, evt.Weight)
-                        hist_bin_dict["H_Q2_SIMC_{}".format(j)].Fill(evt.Q2, evt.Weight)
-                        hist_bin_dict["H_W_SIMC_{}".format(j)].Fill(evt.W, evt.Weight)
-                        hist_bin_dict["H_epsilon_SIMC_{}".format(j)].Fill(evt.epsilon, evt.Weight)                    
+        print("\nBinning simc...")
+        for i,evt in enumerate(TBRANCH_SIMC):
+
+            # Progress bar
+            Misc.progressBar(i, TBRANCH_SIMC.GetEntries(),bar_length=25)
+
+            # Events dropped by the reweighting (weight sidecars only)
+            if iter_good is not None and not iter_good[i]:
+                continue
+
+            if ParticleType == "kaon":
+                ALLCUTS =  apply_simc_cuts(evt, mm_min, mm_max) and not hgcer_cutg.IsInside(evt.phgcer_x_det, evt.phgcer_y_det)
+            else:
+                ALLCUTS = apply_simc_cuts(evt, mm_min, mm_max)
+
+            #Fill SIMC events
+            if(ALLCUTS):
+
+                # Loop through bins in t_simc and identify events in specified bins
+                for j in range(len(t_bins)-1):            
+                    if t_bins[j] <= -evt.t <= t_bins[j+1]:
+                        if iteration:
+                            hist_bin_dict["H_t_SIMC_{}".format(j)].Fill(-evt.t, evt.iter_weight)
+                            hist_bin_dict["H_Q2_SIMC_{}".format(j)].Fill(evt.Q2, evt.iter_weight)
+                            hist_bin_dict["H_W_SIMC_{}".format(j)].Fill(evt.W, evt.iter_weight)
+                            hist_bin_dict["H_epsilon_SIMC_{}".format(j)].Fill(evt.epsilon, evt.iter_weight)
+                        else:
+                            hist_bin_dict["H_t_SIMC_{}".format(j)].Fill(-evt.t, evt.Weight)
+                            hist_bin_dict["H_Q2_SIMC_{}".format(j)].Fill(evt.Q2, evt.Weight)
+                            hist_bin_dict["H_W_SIMC_{}".format(j)].Fill(evt.W, evt.Weight)
+                            hist_bin_dict["H_epsilon_SIMC_{}".format(j)].Fill(evt.epsilon, evt.Weight)                    
+    else:
+
+        scanned = scan_simc(tree_simc.GetName(), inpDict, iteration, hgcer_cutg if ParticleType == "kaon" else None)
+
+        if scanned is not None:
+            arrays, cut_masks = scanned
+            print("\nBinning simc...")
+            fill_binned(hist_bin_dict, "SIMC", arrays, cut_masks, AVE_BIN_SPEC_SIMC, t_bins)
 
     # Loop through bins in t_simc and identify events in specified bins
     for j in range(len(t_bins)-1):
@@ -54,7 +54,10 @@ OUTPATH=lt.OUTPATH
 # Importing utility functions
 
 sys.path.append("utility")
-from utility import is_hist, remove_bad_bins, integrate_hist_range, prune_hist
+from utility import is_hist, remove_bad_bins, integrate_hist_range, prune_hist, get_simc_tree
+from columnar import simc_good_mask, prescale_tag
+from binned_hist import BinnedHist
+from response_matrix import build_simc_response, save_simc_response
 
 ##################################################################################################################################################
 
@@ -85,6 +88,8 @@ def process_hist_data(tree_data, tree_dummy, normfac_data, normfac_dummy, t_bins
     # Import function to define cut bools
     from apply_cuts import apply_data_cuts, apply_data_sub_cuts, set_val
     set_val(inpDict) # Set global variables for optimization
+    sys.path.append("cuts")
+    from event_scan import get_event_scan, fill_binned_arrays, binned_mm_offset, YIELD_BIN_SPEC
     
     ################################################################################################################################################
     # Define HGCer hole cut for KaonLT 2018-19
@@ -160,29 +165,32 @@ def process_hist_data(tree_data, tree_dummy, normfac_data, normfac_dummy, t_bins
     for j in range(len(t_bins)-1):
         for k in range(len(phi_bins)-1):
 
-            hist_bin_dict["H_MM_DATA_{}_{}".format(j, k)]       = TH1D("H_MM_DATA_{}_{}".format(j, k),"MM", 200, inpDict["mm_min"], inpDict["mm_max"])
-            hist_bin_dict["H_MM_fit1sub_DATA_{}_{}".format(j, k)]       = TH1D("H_MM_fit1sub_DATA_{}_{}".format(j, k),"MM", 200, 0.7, 1.5)
-            hist_bin_dict["H_MM_pisub_DATA_{}_{}".format(j, k)]       = TH1D("H_MM_pisub_DATA_{}_{}".format(j, k),"MM", 200, 0.7, 1.5)
-            hist_bin_dict["H_MM_nosub_DATA_{}_{}".format(j, k)]       = TH1D("H_MM_nosub_DATA_{}_{}".format(j, k),"MM", 200, 0.7, 1.5)
-            hist_bin_dict["H_t_DATA_{}_{}".format(j, k)]       = TH1D("H_t_DATA_{}_{}".format(j, k),"-t", 200, inpDict["tmin"], inpDict["tmax"])
-
-            hist_bin_dict["H_MM_RAND_{}_{}".format(j, k)]       = TH1D("H_MM_RAND_{}_{}".format(j, k),"MM", 200, inpDict["mm_min"], inpDict["mm_max"])
-            hist_bin_dict["H_MM_fit1sub_RAND_{}_{}".format(j, k)]       = TH1D("H_MM_fit1sub_RAND_{}_{}".format(j, k),"MM", 200, 0.7, 1.5)
-            hist_bin_dict["H_MM_pisub_RAND_{}_{}".format(j, k)]       = TH1D("H_MM_pisub_RAND_{}_{}".format(j, k),"MM", 200, 0.7, 1.5)
-            hist_bin_dict["H_MM_nosub_RAND_{}_{}".format(j, k)]       = TH1D("H_MM_nosub_RAND_{}_{}".format(j, k),"MM", 200, 0.7, 1.5)
-            hist_bin_dict["H_t_RAND_{}_{}".format(j, k)]       = TH1D("H_t_RAND_{}_{}".format(j, k),"-t", 200, inpDict["tmin"], inpDict["tmax"])
-
-            hist_bin_dict["H_MM_DUMMY_{}_{}".format(j, k)]       = TH1D("H_MM_DUMMY_{}_{}".format(j, k),"MM", 200, inpDict["mm_min"], inpDict["mm_max"])
-            hist_bin_dict["H_MM_fit1sub_DUMMY_{}_{}".format(j, k)]       = TH1D("H_MM_fit1sub_DUMMY_{}_{}".format(j, k),"MM", 200, 0.7, 1.5)
-            hist_bin_dict["H_MM_pisub_DUMMY_{}_{}".format(j, k)]       = TH1D("H_MM_pisub_DUMMY_{}_{}".format(j, k),"MM", 200, 0.7, 1.5)
-            hist_bin_dict["H_MM_nosub_DUMMY_{}_{}".format(j, k)]       = TH1D("H_MM_nosub_DUMMY_{}_{}".format(j, k),"MM", 200, 0.7, 1.5)
-            hist_bin_dict["H_t_DUMMY_{}_{}".format(j, k)]       = TH1D("H_t_DUMMY_{}_{}".format(j, k),"-t", 200, inpDict["tmin"], inpDict["tmax"])
-
-            hist_bin_dict["H_MM_DUMMY_RAND_{}_{}".format(j, k)]       = TH1D("H_MM_DUMMY_RAND_{}_{}".format(j, k),"MM", 200, inpDict["mm_min"], inpDict["mm_max"])
-            hist_bin_dict["H_MM_fit1sub_DUMMY_RAND_{}_{}".format(j, k)]       = TH1D("H_MM_fit1sub_DUMMY_RAND_{}_{}".format(j, k),"MM", 200, 0.7, 1.5)
-            hist_bin_dict["H_MM_pisub_DUMMY_RAND_{}_{}".format(j, k)]       = TH1D("H_MM_pisub_DUMMY_RAND_{}_{}".format(j, k),"MM", 200, 0.7, 1.5)
-            hist_bin_dict["H_MM_nosub_DUMMY_RAND_{}_{}".format(j, k)]       = TH1D("H_MM_nosub_DUMMY_RAND_{}_{}".format(j, k),"MM", 200, 0.7, 1.5)
-            hist_bin_dict["H_t_DUMMY_RAND_{}_{}".format(j, k)]       = TH1D("H_t_DUMMY_RAND_{}_{}".format(j, k),"-t", 200, inpDict["tmin"], inpDict["tmax"])
+            # Booked here only for the event loop, the columnar path fills BinnedHist arrays instead
+            if inpDict.get("EVENT_LOOP", False):
+
+                hist_bin_dict["H_MM_DATA_{}_{}".format(j, k)]       = TH1D("H_MM_DATA_{}_{}".format(j, k),"MM", 200, inpDict["mm_min"], inpDict["mm_max"])
+                hist_bin_dict["H_MM_fit1sub_DATA_{}_{}".format(j, k)]       = TH1D("H_MM_fit1sub_DATA_{}_{}".format(j, k),"MM", 200, 0.7, 1.5)
+                hist_bin_dict["H_MM_pisub_DATA_{}_{}".format(j, k)]       = TH1D("H_MM_pisub_DATA_{}_{}".format(j, k),"MM", 200, 0.7, 1.5)
+                hist_bin_dict["H_MM_nosub_DATA_{}_{}".format(j, k)]       = TH1D("H_MM_nosub_DATA_{}_{}".format(j, k),"MM", 200, 0.7, 1.5)
+                hist_bin_dict["H_t_DATA_{}_{}".format(j, k)]       = TH1D("H_t_DATA_{}_{}".format(j, k),"-t", 200, inpDict["tmin"], inpDict["tmax"])
+
+                hist_bin_dict["H_MM_RAND_{}_{}".format(j, k)]       = TH1D("H_MM_RAND_{}_{}".format(j, k),"MM", 200, inpDict["mm_min"], inpDict["mm_max"])
+                hist_bin_dict["H_MM_fit1sub_RAND_{}_{}".format(j, k)]       = TH1D("H_MM_fit1sub_RAND_{}_{}".format(j, k),"MM", 200, 0.7, 1.5)
+                hist_bin_dict["H_MM_pisub_RAND_{}_{}".format(j, k)]       = TH1D("H_MM_pisub_RAND_{}_{}".format(j, k),"MM", 200, 0.7, 1.5)
+                hist_bin_dict["H_MM_nosub_RAND_{}_{}".format(j, k)]       = TH1D("H_MM_nosub_RAND_{}_{}".format(j, k),"MM", 200, 0.7, 1.5)
+                hist_bin_dict["H_t_RAND_{}_{}".format(j, k)]       = TH1D("H_t_RAND_{}_{}".format(j, k),"-t", 200, inpDict["tmin"], inpDict["tmax"])
+
+                hist_bin_dict["H_MM_DUMMY_{}_{}".format(j, k)]       = TH1D("H_MM_DUMMY_{}_{}".format(j, k),"MM", 200, inpDict["mm_min"], inpDict["mm_max"])
+                hist_bin_dict["H_MM_fit1sub_DUMMY_{}_{}".format(j, k)]       = TH1D("H_MM_fit1sub_DUMMY_{}_{}".format(j, k),"MM", 200, 0.7, 1.5)
+                hist_bin_dict["H_MM_pisub_DUMMY_{}_{}".format(j, k)]       = TH1D("H_MM_pisub_DUMMY_{}_{}".format(j, k),"MM", 200, 0.7, 1.5)
+                hist_bin_dict["H_MM_nosub_DUMMY_{}_{}".format(j, k)]       = TH1D("H_MM_nosub_DUMMY_{}_{}".format(j, k),"MM", 200, 0.7, 1.5)
+                hist_bin_dict["H_t_DUMMY_{}_{}".format(j, k)]       = TH1D("H_t_DUMMY_{}_{}".format(j, k),"-t", 200, inpDict["tmin"], inpDict["tmax"])
+
+                hist_bin_dict["H_MM_DUMMY_RAND_{}_{}".format(j, k)]       = TH1D("H_MM_DUMMY_RAND_{}_{}".format(j, k),"MM", 200, inpDict["mm_min"], inpDict["mm_max"])
+                hist_bin_dict["H_MM_fit1sub_DUMMY_RAND_{}_{}".format(j, k)]       = TH1D("H_MM_fit1sub_DUMMY_RAND_{}_{}".format(j, k),"MM", 200, 0.7, 1.5)
+                hist_bin_dict["H_MM_pisub_DUMMY_RAND_{}_{}".format(j, k)]       = TH1D("H_MM_pisub_DUMMY_RAND_{}_{}".format(j, k),"MM", 200, 0.7, 1.5)
+                hist_bin_dict["H_MM_nosub_DUMMY_RAND_{}_{}".format(j, k)]       = TH1D("H_MM_nosub_DUMMY_RAND_{}_{}".format(j, k),"MM", 200, 0.7, 1.5)
+                hist_bin_dict["H_t_DUMMY_RAND_{}_{}".format(j, k)]       = TH1D("H_t_DUMMY_RAND_{}_{}".format(j, k),"-t", 200, inpDict["tmin"], inpDict["tmax"])
 
             # Pion subtraction by scaling simc to peak size
             if ParticleType == "kaon":
@@ -207,226 +215,280 @@ def process_hist_data(tree_data, tree_dummy, normfac_data, normfac_dummy, t_bins
                 subDict["H_MM_nosub_SUB_DUMMY_RAND_{}_{}".format(j, k)]  \
                     = TH1D("H_MM_nosub_SUB_DUMMY_RAND_{}_{}".format(j, k),"MM_{}".format(SubtractedParticle), 200, 0.7, 1.5)
                 
-    print("\nBinning data...")
-    for i,evt in enumerate(TBRANCH_DATA):
+    if inpDict.get("EVENT_LOOP", False):
 
-        # Progress bar
-        Misc.progressBar(i, TBRANCH_DATA.GetEntries(),bar_length=25)
+        print("\nBinning data...")
+        for i,evt in enumerate(TBRANCH_DATA):
 
-        ##############
-        # HARD CODED #
-        ##############
+            # Progress bar
+            Misc.progressBar(i, TBRANCH_DATA.GetEntries(),bar_length=25)
 
-        adj_hsdelta = evt.hsdelta + c0_dict["Q{}W{}_{}e".format(Q2,W,EPSSET)]*evt.hsxpfp
+            ##############
+            # HARD CODED #
+            ##############
 
-        # Check if variable shift branch exists
-        try:
-            adj_MM = evt.MM_shift
-        except AttributeError:
-            adj_MM = evt.MM
+            adj_hsdelta = evt.hsdelta + c0_dict["Q{}W{}_{}e".format(Q2,W,EPSSET)]*evt.hsxpfp
+
+            # Check if variable shift branch exists
+            try:
+                adj_MM = evt.MM_shift
+            except AttributeError:
+                adj_MM = evt.MM
 
-        ##############
-        ##############        
-        ##############
+            ##############
+            ##############        
+            ##############
         
-        # Phase shift to right setting
-        #phi_shift = (evt.ph_q+math.pi)
-        phi_shift = (evt.ph_q)        
+            # Phase shift to right setting
+            #phi_shift = (evt.ph_q+math.pi)
+            phi_shift = (evt.ph_q)        
 
-        if ParticleType == "kaon":
-            ALLCUTS = apply_data_cuts(evt, mm_min, mm_max) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
-            NOMMCUTS = apply_data_sub_cuts(evt) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
-        else:
-            ALLCUTS = apply_data_cuts(evt, mm_min, mm_max)
-            NOMMCUTS = apply_data_sub_cuts(evt)
+            if ParticleType == "kaon":
+                ALLCUTS = apply_data_cuts(evt, mm_min, mm_max) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
+                NOMMCUTS = apply_data_sub_cuts(evt) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
+            else:
+                ALLCUTS = apply_data_cuts(evt, mm_min, mm_max)
+                NOMMCUTS = apply_data_sub_cuts(evt)
             
-        if(NOMMCUTS):
-            # Loop through bins in t_data and identify events in specified bins
-            for j in range(len(t_bins)-1):
-                for k in range(len(phi_bins)-1):            
-                    if t_bins[j] <= -evt.MandelT <= t_bins[j+1]:
-                        if phi_bins[k] <= (phi_shift)*(180 / math.pi) <= phi_bins[k+1]:
-                            #print(phi_bins[k]," <= ",(phi_shift)*(180 / math.pi)," <= ",phi_bins[k+1])
-                            hist_bin_dict["H_MM_fit1sub_DATA_{}_{}".format(j, k)].Fill(adj_MM)
-                            hist_bin_dict["H_MM_pisub_DATA_{}_{}".format(j, k)].Fill(adj_MM)
-                            hist_bin_dict["H_MM_nosub_DATA_{}_{}".format(j, k)].Fill(adj_MM)
+            if(NOMMCUTS):
+                # Loop through bins in t_data and identify events in specified bins
+                for j in range(len(t_bins)-1):
+                    for k in range(len(phi_bins)-1):            
+                        if t_bins[j] <= -evt.MandelT <= t_bins[j+1]:
+                            if phi_bins[k] <= (phi_shift)*(180 / math.pi) <= phi_bins[k+1]:
+                                #print(phi_bins[k]," <= ",(phi_shift)*(180 / math.pi)," <= ",phi_bins[k+1])
+                                hist_bin_dict["H_MM_fit1sub_DATA_{}_{}".format(j, k)].Fill(adj_MM)
+                                hist_bin_dict["H_MM_pisub_DATA_{}_{}".format(j, k)].Fill(adj_MM)
+                                hist_bin_dict["H_MM_nosub_DATA_{}_{}".format(j, k)].Fill(adj_MM)
         
-        if(ALLCUTS):
-
-            # Loop through bins in t_data and identify events in specified bins
-            for j in range(len(t_bins)-1):
-                for k in range(len(phi_bins)-1):            
-                    if t_bins[j] <= -evt.MandelT <= t_bins[j+1]:
-                        if phi_bins[k] <= (phi_shift)*(180 / math.pi) <= phi_bins[k+1]:
-                            #print(phi_bins[k]," <= ",(phi_shift)*(180 / math.pi)," <= ",phi_bins[k+1])
-                            hist_bin_dict["H_t_DATA_{}_{}".format(j, k)].Fill(-evt.MandelT)
-                            hist_bin_dict["H_MM_DATA_{}_{}".format(j, k)].Fill(adj_MM)
-                            MM_offset_DATA = evt.MM_shift-evt.MM
-
-    print("\nBinning dummy...")
-    for i,evt in enumerate(TBRANCH_DUMMY):
-
-        # Progress bar
-        Misc.progressBar(i, TBRANCH_DUMMY.GetEntries(),bar_length=25)
-
-        ##############
-        # HARD CODED #
-        ##############
-
-        adj_hsdelta = evt.hsdelta + c0_dict["Q{}W{}_{}e".format(Q2,W,EPSSET)]*evt.hsxpfp
-
-        # Check if variable shift branch exists
-        try:
-            adj_MM = evt.MM_shift
-        except AttributeError:
-            adj_MM = evt.MM
-
-        ##############
-        ##############        
-        ##############        
+            if(ALLCUTS):
+
+                # Loop through bins in t_data and identify events in specified bins
+                for j in range(len(t_bins)-1):
+                    for k in range(len(phi_bins)-1):            
+                        if t_bins[j] <= -evt.MandelT <= t_bins[j+1]:
+                            if phi_bins[k] <= (phi_shift)*(180 / math.pi) <= phi_bins[k+1]:
+                                #print(phi_bins[k]," <= ",(phi_shift)*(180 / math.pi)," <= ",phi_bins[k+1])
+                                hist_bin_dict["H_t_DATA_{}_{}".format(j, k)].Fill(-evt.MandelT)
+                                hist_bin_dict["H_MM_DATA_{}_{}".format(j, k)].Fill(adj_MM)
+                                MM_offset_DATA = evt.MM_shift-evt.MM
+
+        print("\nBinning dummy...")
+        for i,evt in enumerate(TBRANCH_DUMMY):
+
+            # Progress bar
+            Misc.progressBar(i, TBRANCH_DUMMY.GetEntries(),bar_length=25)
+
+            ##############
+            # HARD CODED #
+            ##############
+
+            adj_hsdelta = evt.hsdelta + c0_dict["Q{}W{}_{}e".format(Q2,W,EPSSET)]*evt.hsxpfp
+
+            # Check if variable shift branch exists
+            try:
+                adj_MM = evt.MM_shift
+            except AttributeError:
+                adj_MM = evt.MM
+
+            ##############
+            ##############        
+            ##############        
         
-        # Phase shift to right setting
-        #phi_shift = (evt.ph_q+math.pi)
-        phi_shift = (evt.ph_q)        
+            # Phase shift to right setting
+            #phi_shift = (evt.ph_q+math.pi)
+            phi_shift = (evt.ph_q)        
 
-        if ParticleType == "kaon":
-            ALLCUTS = apply_data_cuts(evt, mm_min, mm_max) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
-            NOMMCUTS = apply_data_sub_cuts(evt) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
-        else:
-            ALLCUTS = apply_data_cuts(evt, mm_min, mm_max)
-            NOMMCUTS = apply_data_sub_cuts(evt)
-
-        if(NOMMCUTS):
-            # Loop through bins in t_data and identify events in specified bins
-            for j in range(len(t_bins)-1):
-                for k in range(len(phi_bins)-1):            
-                    if t_bins[j] <= -evt.MandelT <= t_bins[j+1]:
-                        if phi_bins[k] <= (phi_shift)*(180 / math.pi) <= phi_bins[k+1]:
-                            #print(phi_bins[k]," <= ",(phi_shift)*(180 / math.pi)," <= ",phi_bins[k+1])
-                            hist_bin_dict["H_MM_fit1sub_DUMMY_{}_{}".format(j, k)].Fill(adj_MM) 
-                            hist_bin_dict["H_MM_pisub_DUMMY_{}_{}".format(j, k)].Fill(adj_MM)             
-                            hist_bin_dict["H_MM_nosub_DUMMY_{}_{}".format(j, k)].Fill(adj_MM)
-
-        if(ALLCUTS):                
-
-            # Loop through bins in t_dummy and identify events in specified bins
-            for j in range(len(t_bins)-1):
-                for k in range(len(phi_bins)-1):            
-                    if t_bins[j] <= -evt.MandelT <= t_bins[j+1]:
-                        if phi_bins[k] <= (phi_shift)*(180 / math.pi) <= phi_bins[k+1]:
-                            #print(phi_bins[k]," <= ",(phi_shift)*(180 / math.pi)," <= ",phi_bins[k+1])
-                            hist_bin_dict["H_t_DUMMY_{}_{}".format(j, k)].Fill(-evt.MandelT)
-                            hist_bin_dict["H_MM_DUMMY_{}_{}".format(j, k)].Fill(adj_MM)
+            if ParticleType == "kaon":
+                ALLCUTS = apply_data_cuts(evt, mm_min, mm_max) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
+                NOMMCUTS = apply_data_sub_cuts(evt) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
+            else:
+                ALLCUTS = apply_data_cuts(evt, mm_min, mm_max)
+                NOMMCUTS = apply_data_sub_cuts(evt)
+
+            if(NOMMCUTS):
+                # Loop through bins in t_data and identify events in specified bins
+                for j in range(len(t_bins)-1):
+                    for k in range(len(phi_bins)-1):            
+                        if t_bins[j] <= -evt.MandelT <= t_bins[j+1]:
+                            if phi_bins[k] <= (phi_shift)*(180 / math.pi) <= phi_bins[k+1]:
+                                #print(phi_bins[k]," <= ",(phi_shift)*(180 / math.pi)," <= ",phi_bins[k+1])
+                                hist_bin_dict["H_MM_fit1sub_DUMMY_{}_{}".format(j, k)].Fill(adj_MM) 
+                                hist_bin_dict["H_MM_pisub_DUMMY_{}_{}".format(j, k)].Fill(adj_MM)             
+                                hist_bin_dict["H_MM_nosub_DUMMY_{}_{}".format(j, k)].Fill(adj_MM)
+
+            if(ALLCUTS):                
+
+                # Loop through bins in t_dummy and identify events in specified bins
+                for j in range(len(t_bins)-1):
+                    for k in range(len(phi_bins)-1):            
+                        if t_bins[j] <= -evt.MandelT <= t_bins[j+1]:
+                            if phi_bins[k] <= (phi_shift)*(180 / math.pi) <= phi_bins[k+1]:
+                                #print(phi_bins[k]," <= ",(phi_shift)*(180 / math.pi)," <= ",phi_bins[k+1])
+                                hist_bin_dict["H_t_DUMMY_{}_{}".format(j, k)].Fill(-evt.MandelT)
+                                hist_bin_dict["H_MM_DUMMY_{}_{}".format(j, k)].Fill(adj_MM)
                             
-    print("\nBinning rand...")
-    for i,evt in enumerate(TBRANCH_RAND):
+        print("\nBinning rand...")
+        for i,evt in enumerate(TBRANCH_RAND):
 
-        # Progress bar
-        Misc.progressBar(i, TBRANCH_RAND.GetEntries(),bar_length=25)
+            # Progress bar
+            Misc.progressBar(i, TBRANCH_RAND.GetEntries(),bar_length=25)
 
-        ##############
-        # HARD CODED #
-        ##############
+            ##############
+            # HARD CODED #
+            ##############
 
-        adj_hsdelta = evt.hsdelta + c0_dict["Q{}W{}_{}e".format(Q2,W,EPSSET)]*evt.hsxpfp
+            adj_hsdelta = evt.hsdelta + c0_dict["Q{}W{}_{}e".format(Q2,W,EPSSET)]*evt.hsxpfp
 
-        # Check if variable shift branch exists
-        try:
-            adj_MM = evt.MM_shift
-        except AttributeError:
-            adj_MM = evt.MM
+            # Check if variable shift branch exists
+            try:
+                adj_MM = evt.MM_shift
+            except AttributeError:
+                adj_MM = evt.MM
 
-        ##############
-        ##############        
-        ##############
+            ##############
+            ##############        
+            ##############
                 
-        # Phase shift to right setting
-        #phi_shift = (evt.ph_q+math.pi)
-        phi_shift = (evt.ph_q)        
+            # Phase shift to right setting
+            #phi_shift = (evt.ph_q+math.pi)
+            phi_shift = (evt.ph_q)        
 
-        if ParticleType == "kaon":
-            ALLCUTS = apply_data_cuts(evt, mm_min, mm_max) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
-            NOMMCUTS = apply_data_sub_cuts(evt) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
-        else:
-            ALLCUTS = apply_data_cuts(evt, mm_min, mm_max)
-            NOMMCUTS = apply_data_sub_cuts(evt)
-
-        if(NOMMCUTS):
-            # Loop through bins in t_data and identify events in specified bins
-            for j in range(len(t_bins)-1):
-                for k in range(len(phi_bins)-1):            
-                    if t_bins[j] <= -evt.MandelT <= t_bins[j+1]:
-                        if phi_bins[k] <= (phi_shift)*(180 / math.pi) <= phi_bins[k+1]:
-                            #print(phi_bins[k]," <= ",(phi_shift)*(180 / math.pi)," <= ",phi_bins[k+1])   
-                            hist_bin_dict["H_MM_fit1sub_RAND_{}_{}".format(j, k)].Fill(adj_MM)
-                            hist_bin_dict["H_MM_pisub_RAND_{}_{}".format(j, k)].Fill(adj_MM)             
-                            hist_bin_dict["H_MM_nosub_RAND_{}_{}".format(j, k)].Fill(adj_MM)
-
-        if(ALLCUTS):                
-
-            # Loop through bins in t_rand and identify events in specified bins
-            for j in range(len(t_bins)-1):
-                for k in range(len(phi_bins)-1):            
-                    if t_bins[j] <= -evt.MandelT <= t_bins[j+1]:
-                        if phi_bins[k] <= (phi_shift)*(180 / math.pi) <= phi_bins[k+1]:
-                            #print(phi_bins[k]," <= ",(phi_shift)*(180 / math.pi)," <= ",phi_bins[k+1])
-                            hist_bin_dict["H_t_RAND_{}_{}".format(j, k)].Fill(-evt.MandelT)
-                            hist_bin_dict["H_MM_RAND_{}_{}".format(j, k)].Fill(adj_MM)
+            if ParticleType == "kaon":
+                ALLCUTS = apply_data_cuts(evt, mm_min, mm_max) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
+                NOMMCUTS = apply_data_sub_cuts(evt) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
+            else:
+                ALLCUTS = apply_data_cuts(evt, mm_min, mm_max)
+                NOMMCUTS = apply_data_sub_cuts(evt)
+
+            if(NOMMCUTS):
+                # Loop through bins in t_data and identify events in specified bins
+                for j in range(len(t_bins)-1):
+                    for k in range(len(phi_bins)-1):            
+                        if t_bins[j] <= -evt.MandelT <= t_bins[j+1]:
+                            if phi_bins[k] <= (phi_shift)*(180 / math.pi) <= phi_bins[k+1]:
+                                #print(phi_bins[k]," <= ",(phi_shift)*(180 / math.pi)," <= ",phi_bins[k+1])   
+                                hist_bin_dict["H_MM_fit1sub_RAND_{}_{}".format(j, k)].Fill(adj_MM)
+                                hist_bin_dict["H_MM_pisub_RAND_{}_{}".format(j, k)].Fill(adj_MM)             
+                                hist_bin_dict["H_MM_nosub_RAND_{}_{}".format(j, k)].Fill(adj_MM)
+
+            if(ALLCUTS):                
+
+                # Loop through bins in t_rand and identify events in specified bins
+                for j in range(len(t_bins)-1):
+                    for k in range(len(phi_bins)-1):            
+                        if t_bins[j] <= -evt.MandelT <= t_bins[j+1]:
+                            if phi_bins[k] <= (phi_shift)*(180 / math.pi) <= phi_bins[k+1]:
+                                #print(phi_bins[k]," <= ",(phi_shift)*(180 / math.pi)," <= ",phi_bins[k+1])
+                                hist_bin_dict["H_t_RAND_{}_{}".format(j, k)].Fill(-evt.MandelT)
+                                hist_bin_dict["H_MM_RAND_{}_{}".format(j, k)].Fill(adj_MM)
                             
-    print("\nBinning dummy_rand...")
-    for i,evt in enumerate(TBRANCH_DUMMY_RAND):
+        print("\nBinning dummy_rand...")
+        for i,evt in enumerate(TBRANCH_DUMMY_RAND):
 
-        # Progress bar
-        Misc.progressBar(i, TBRANCH_DUMMY_RAND.GetEntries(),bar_length=25)
+            # Progress bar
+            Misc.progressBar(i, TBRANCH_DUMMY_RAND.GetEntries(),bar_length=25)
 
-        ##############
-        # HARD CODED #
-        ##############
+            ##############
+            # HARD CODED #
+            ##############
 
-        adj_hsdelta = evt.hsdelta + c0_dict["Q{}W{}_{}e".format(Q2,W,EPSSET)]*evt.hsxpfp
+            adj_hsdelta = evt.hsdelta + c0_dict["Q{}W{}_{}e".format(Q2,W,EPSSET)]*evt.hsxpfp
 
-        # Check if variable shift branch exists
-        try:
-            adj_MM = evt.MM_shift
-        except AttributeError:
-            adj_MM = evt.MM
+            # Check if variable shift branch exists
+            try:
+                adj_MM = evt.MM_shift
+            except AttributeError:
+                adj_MM = evt.MM
 
-        ##############
-        ##############        
-        ##############        
+            ##############
+            ##############        
+            ##############        
         
-       # Phase shift to right setting
-        #phi_shift = (evt.ph_q+math.pi)
-        phi_shift = (evt.ph_q)        
+           # Phase shift to right setting
+            #phi_shift = (evt.ph_q+math.pi)
+            phi_shift = (evt.ph_q)        
+
+            if ParticleType == "kaon":
+                ALLCUTS = apply_data_cuts(evt, mm_min, mm_max) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
+                NOMMCUTS = apply_data_sub_cuts(evt) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
+            else:
+                ALLCUTS = apply_data_cuts(evt, mm_min, mm_max)
+                NOMMCUTS = apply_data_sub_cuts(evt)
+
+            if(NOMMCUTS):
+                # Loop through bins in t_data and identify events in specified bins
+                for j in range(len(t_bins)-1):
+                    for k in range(len(phi_bins)-1):            
+                        if t_bins[j] <= -evt.MandelT <= t_bins[j+1]:
+                            if phi_bins[k] <= (phi_shift)*(180 / math.pi) <= phi_bins[k+1]:
+                                #print(phi_bins[k]," <= ",(phi_shift)*(180 / math.pi)," <= ",phi_bins[k+1]) 
+                                hist_bin_dict["H_MM_fit1sub_DUMMY_RAND_{}_{}".format(j, k)].Fill(adj_MM)               
+                                hist_bin_dict["H_MM_pisub_DUMMY_RAND_{}_{}".format(j, k)].Fill(adj_MM)
+                                hist_bin_dict["H_MM_nosub_DUMMY_RAND_{}_{}".format(j, k)].Fill(adj_MM)
+
+            if(ALLCUTS):                
+
+                # Loop through bins in t_dummy_rand and identify events in specified bins
+                for j in range(len(t_bins)-1):
+                    for k in range(len(phi_bins)-1):            
+                        if t_bins[j] <= -evt.MandelT <= t_bins[j+1]:
+                            if phi_bins[k] <= (phi_shift)*(180 / math.pi) <= phi_bins[k+1]:
+                                #print(phi_bins[k]," <= ",(phi_shift)*(180 / math.pi)," <= ",phi_bins[k+1])
+                                hist_bin_dict["H_t_DUMMY_RAND_{}_{}".format(j, k)].Fill(-evt.MandelT)
+                                hist_bin_dict["H_MM_DUMMY_RAND_{}_{}".format(j, k)].Fill(adj_MM)
+    else:
 
+        offsetDict = {}
+
+        # One array per spectrum and category covering every (t,phi) bin, instead of a TH1D per bin
+        binned_shape = (len(t_bins)-1, len(phi_bins)-1)
+        binned_dict = {}
+        for category in ["DATA", "RAND", "DUMMY", "DUMMY_RAND"]:
+            binned_dict["H_MM_{}".format(category)] = BinnedHist("H_MM_{}".format(category), "MM", binned_shape, 200, inpDict["mm_min"], inpDict["mm_max"])
+            binned_dict["H_MM_fit1sub_{}".format(category)] = BinnedHist("H_MM_fit1sub_{}".format(category), "MM", binned_shape, 200, 0.7, 1.5)
+            binned_dict["H_MM_pisub_{}".format(category)] = BinnedHist("H_MM_pisub_{}".format(category), "MM", binned_shape, 200, 0.7, 1.5)
+            binned_dict["H_MM_nosub_{}".format(category)] = BinnedHist("H_MM_nosub_{}".format(category), "MM", binned_shape, 200, 0.7, 1.5)
+            binned_dict["H_t_{}".format(category)] = BinnedHist("H_t_{}".format(category), "-t", binned_shape, 200, inpDict["tmin"], inpDict["tmax"])
+
+        def yield_consumer(category, arrays, cut_masks):
+            fill_binned_arrays(binned_dict, category, arrays, cut_masks, YIELD_BIN_SPEC, t_bins, phi_bins)
+            if category == "DATA":
+                MM_offset = binned_mm_offset(arrays, cut_masks, t_bins, phi_bins)
+                if MM_offset is not None:
+                    offsetDict["MM_offset_DATA"] = MM_offset
+
+        # Reuses the trees already read by rand_sub for this setting
         if ParticleType == "kaon":
-            ALLCUTS = apply_data_cuts(evt, mm_min, mm_max) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
-            NOMMCUTS = apply_data_sub_cuts(evt) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
+            scan = get_event_scan(phi_setting, ParticleType, inpDict, hgcer_cutg)
         else:
-            ALLCUTS = apply_data_cuts(evt, mm_min, mm_max)
-            NOMMCUTS = apply_data_sub_cuts(evt)
-
-        if(NOMMCUTS):
-            # Loop through bins in t_data and identify events in specified bins
-            for j in range(len(t_bins)-1):
-                for k in range(len(phi_bins)-1):            
-                    if t_bins[j] <= -evt.MandelT <= t_bins[j+1]:
-                        if phi_bins[k] <= (phi_shift)*(180 / math.pi) <= phi_bins[k+1]:
-                            #print(phi_bins[k]," <= ",(phi_shift)*(180 / math.pi)," <= ",phi_bins[k+1]) 
-                            hist_bin_dict["H_MM_fit1sub_DUMMY_RAND_{}_{}".format(j, k)].Fill(adj_MM)               
-                            hist_bin_dict["H_MM_pisub_DUMMY_RAND_{}_{}".format(j, k)].Fill(adj_MM)
-                            hist_bin_dict["H_MM_nosub_DUMMY_RAND_{}_{}".format(j, k)].Fill(adj_MM)
-
-        if(ALLCUTS):                
-
-            # Loop through bins in t_dummy_rand and identify events in specified bins
-            for j in range(len(t_bins)-1):
-                for k in range(len(phi_bins)-1):            
-                    if t_bins[j] <= -evt.MandelT <= t_bins[j+1]:
-                        if phi_bins[k] <= (phi_shift)*(180 / math.pi) <= phi_bins[k+1]:
-                            #print(phi_bins[k]," <= ",(phi_shift)*(180 / math.pi)," <= ",phi_bins[k+1])
-                            hist_bin_dict["H_t_DUMMY_RAND_{}_{}".format(j, k)].Fill(-evt.MandelT)
-                            hist_bin_dict["H_MM_DUMMY_RAND_{}_{}".format(j, k)].Fill(adj_MM)
+            scan = get_event_scan(phi_setting, ParticleType, inpDict)
+        scan.register(yield_consumer)
+
+        if "MM_offset_DATA" in offsetDict:
+            MM_offset_DATA = offsetDict["MM_offset_DATA"]
+
+        # Random, dummy subtraction and normalization of all bins at once, same steps
+        # (and order) as the per bin histograms of the event loop below
+        for prefix in ["H_MM", "H_MM_fit1sub", "H_MM_pisub", "H_MM_nosub", "H_t"]:
+            binned_dict["{}_RAND".format(prefix)].scale(1/nWindows)
+            binned_dict["{}_DATA".format(prefix)].add(binned_dict["{}_RAND".format(prefix)], -1)
+            binned_dict["{}_DUMMY_RAND".format(prefix)].scale(1/nWindows)
+            binned_dict["{}_DUMMY".format(prefix)].add(binned_dict["{}_DUMMY_RAND".format(prefix)], -1)
+            # Normalize for yields
+            binned_dict["{}_DATA".format(prefix)].scale(normfac_data)
+            if prefix in ["H_MM", "H_t"]:
+                binned_dict["{}_DUMMY".format(prefix)].scale(normfac_dummy)
+            # Dummy subtraction
+            binned_dict["{}_DATA".format(prefix)].add(binned_dict["{}_DUMMY".format(prefix)], -1)
+
+        # Only the subtracted data is fitted, pruned and plotted, so only these become TH1Ds
+        for j in range(len(t_bins)-1):
+            for k in range(len(phi_bins)-1):
+                for prefix in ["H_MM", "H_MM_fit1sub", "H_MM_pisub", "H_MM_nosub", "H_t"]:
+                    hist_bin_dict["{}_DATA_{}_{}".format(prefix, j, k)] = binned_dict["{}_DATA".format(prefix)].to_hist(j, k)
+        del binned_dict
+
 
     # Pion subtraction by scaling pion background to peak size
     if ParticleType == "kaon":
@@ -444,45 +506,48 @@ def process_hist_data(tree_data, tree_dummy, normfac_data, normfac_dummy, t_bins
     for j in range(len(t_bins)-1):
         for k in range(len(phi_bins)-1):
                             
-            hist_bin_dict["H_MM_RAND_{}_{}".format(j, k)].Scale(1/nWindows)
-            hist_bin_dict["H_MM_fit1sub_RAND_{}_{}".format(j, k)].Scale(1/nWindows)
-            hist_bin_dict["H_MM_pisub_RAND_{}_{}".format(j, k)].Scale(1/nWindows)
-            hist_bin_dict["H_MM_nosub_RAND_{}_{}".format(j, k)].Scale(1/nWindows)            
-            hist_bin_dict["H_t_RAND_{}_{}".format(j, k)].Scale(1/nWindows)
-
-            hist_bin_dict["H_MM_DATA_{}_{}".format(j, k)].Add(hist_bin_dict["H_MM_RAND_{}_{}".format(j, k)],-1)
-            hist_bin_dict["H_MM_fit1sub_DATA_{}_{}".format(j, k)].Add(hist_bin_dict["H_MM_fit1sub_RAND_{}_{}".format(j, k)],-1)
-            hist_bin_dict["H_MM_pisub_DATA_{}_{}".format(j, k)].Add(hist_bin_dict["H_MM_pisub_RAND_{}_{}".format(j, k)],-1)
-            hist_bin_dict["H_MM_nosub_DATA_{}_{}".format(j, k)].Add(hist_bin_dict["H_MM_nosub_RAND_{}_{}".format(j, k)],-1)            
-            hist_bin_dict["H_t_DATA_{}_{}".format(j, k)].Add(hist_bin_dict["H_t_RAND_{}_{}".format(j, k)],-1)
-
-            hist_bin_dict["H_MM_DUMMY_RAND_{}_{}".format(j, k)].Scale(1/nWindows)
-            hist_bin_dict["H_MM_fit1sub_DUMMY_RAND_{}_{}".format(j, k)].Scale(1/nWindows)
-            hist_bin_dict["H_MM_pisub_DUMMY_RAND_{}_{}".format(j, k)].Scale(1/nWindows)
-            hist_bin_dict["H_MM_nosub_DUMMY_RAND_{}_{}".format(j, k)].Scale(1/nWindows)            
-            hist_bin_dict["H_t_DUMMY_RAND_{}_{}".format(j, k)].Scale(1/nWindows)
-
-            hist_bin_dict["H_MM_DUMMY_{}_{}".format(j, k)].Add(hist_bin_dict["H_MM_DUMMY_RAND_{}_{}".format(j, k)],-1)
-            hist_bin_dict["H_MM_fit1sub_DUMMY_{}_{}".format(j, k)].Add(hist_bin_dict["H_MM_fit1sub_DUMMY_RAND_{}_{}".format(j, k)],-1)
-            hist_bin_dict["H_MM_pisub_DUMMY_{}_{}".format(j, k)].Add(hist_bin_dict["H_MM_pisub_DUMMY_RAND_{}_{}".format(j, k)],-1)
-            hist_bin_dict["H_MM_nosub_DUMMY_{}_{}".format(j, k)].Add(hist_bin_dict["H_MM_nosub_DUMMY_RAND_{}_{}".format(j, k)],-1)            
-            hist_bin_dict["H_t_DUMMY_{}_{}".format(j, k)].Add(hist_bin_dict["H_t_DUMMY_RAND_{}_{}".format(j, k)],-1)        
-
-            # Normalize for yields
-            hist_bin_dict["H_MM_DATA_{}_{}".format(j, k)].Scale(normfac_data)
-            hist_bin_dict["H_MM_fit1sub_DATA_{}_{}".format(j, k)].Scale(normfac_data)
-            hist_bin_dict["H_MM_pisub_DATA_{}_{}".format(j, k)].Scale(normfac_data)
-            hist_bin_dict["H_MM_nosub_DATA_{}_{}".format(j, k)].Scale(normfac_data)
-            hist_bin_dict["H_t_DATA_{}_{}".format(j, k)].Scale(normfac_data)
-            hist_bin_dict["H_MM_DUMMY_{}_{}".format(j, k)].Scale(normfac_dummy)
-            hist_bin_dict["H_t_DUMMY_{}_{}".format(j, k)].Scale(normfac_dummy)          
+            # The columnar path has already done this on the BinnedHist arrays
+            if inpDict.get("EVENT_LOOP", False):
+
+                hist_bin_dict["H_MM_RAND_{}_{}".format(j, k)].Scale(1/nWindows)
+                hist_bin_dict["H_MM_fit1sub_RAND_{}_{}".format(j, k)].Scale(1/nWindows)
+                hist_bin_dict["H_MM_pisub_RAND_{}_{}".format(j, k)].Scale(1/nWindows)
+                hist_bin_dict["H_MM_nosub_RAND_{}_{}".format(j, k)].Scale(1/nWindows)            
+                hist_bin_dict["H_t_RAND_{}_{}".format(j, k)].Scale(1/nWindows)
+
+                hist_bin_dict["H_MM_DATA_{}_{}".format(j, k)].Add(hist_bin_dict["H_MM_RAND_{}_{}".format(j, k)],-1)
+                hist_bin_dict["H_MM_fit1sub_DATA_{}_{}".format(j, k)].Add(hist_bin_dict["H_MM_fit1sub_RAND_{}_{}".format(j, k)],-1)
+                hist_bin_dict["H_MM_pisub_DATA_{}_{}".format(j, k)].Add(hist_bin_dict["H_MM_pisub_RAND_{}_{}".format(j, k)],-1)
+                hist_bin_dict["H_MM_nosub_DATA_{}_{}".format(j, k)].Add(hist_bin_dict["H_MM_nosub_RAND_{}_{}".format(j, k)],-1)            
+                hist_bin_dict["H_t_DATA_{}_{}".format(j, k)].Add(hist_bin_dict["H_t_RAND_{}_{}".format(j, k)],-1)
+
+                hist_bin_dict["H_MM_DUMMY_RAND_{}_{}".format(j, k)].Scale(1/nWindows)
+                hist_bin_dict["H_MM_fit1sub_DUMMY_RAND_{}_{}".format(j, k)].Scale(1/nWindows)
+                hist_bin_dict["H_MM_pisub_DUMMY_RAND_{}_{}".format(j, k)].Scale(1/nWindows)
+                hist_bin_dict["H_MM_nosub_DUMMY_RAND_{}_{}".format(j, k)].Scale(1/nWindows)            
+                hist_bin_dict["H_t_DUMMY_RAND_{}_{}".format(j, k)].Scale(1/nWindows)
+
+                hist_bin_dict["H_MM_DUMMY_{}_{}".format(j, k)].Add(hist_bin_dict["H_MM_DUMMY_RAND_{}_{}".format(j, k)],-1)
+                hist_bin_dict["H_MM_fit1sub_DUMMY_{}_{}".format(j, k)].Add(hist_bin_dict["H_MM_fit1sub_DUMMY_RAND_{}_{}".format(j, k)],-1)
+                hist_bin_dict["H_MM_pisub_DUMMY_{}_{}".format(j, k)].Add(hist_bin_dict["H_MM_pisub_DUMMY_RAND_{}_{}".format(j, k)],-1)
+                hist_bin_dict["H_MM_nosub_DUMMY_{}_{}".format(j, k)].Add(hist_bin_dict["H_MM_nosub_DUMMY_RAND_{}_{}".format(j, k)],-1)            
+                hist_bin_dict["H_t_DUMMY_{}_{}".format(j, k)].Add(hist_bin_dict["H_t_DUMMY_RAND_{}_{}".format(j, k)],-1)        
+
+                # Normalize for yields
+                hist_bin_dict["H_MM_DATA_{}_{}".format(j, k)].Scale(normfac_data)
+                hist_bin_dict["H_MM_fit1sub_DATA_{}_{}".format(j, k)].Scale(normfac_data)
+                hist_bin_dict["H_MM_pisub_DATA_{}_{}".format(j, k)].Scale(normfac_data)
+                hist_bin_dict["H_MM_nosub_DATA_{}_{}".format(j, k)].Scale(normfac_data)
+                hist_bin_dict["H_t_DATA_{}_{}".format(j, k)].Scale(normfac_data)
+                hist_bin_dict["H_MM_DUMMY_{}_{}".format(j, k)].Scale(normfac_dummy)
+                hist_bin_dict["H_t_DUMMY_{}_{}".format(j, k)].Scale(normfac_dummy)          
             
-            # Dummy subtraction            
-            hist_bin_dict["H_MM_fit1sub_DATA_{}_{}".format(j, k)].Add(hist_bin_dict["H_MM_fit1sub_DUMMY_{}_{}".format(j, k)], -1)
-            hist_bin_dict["H_MM_pisub_DATA_{}_{}".format(j, k)].Add(hist_bin_dict["H_MM_pisub_DUMMY_{}_{}".format(j, k)], -1)
-            hist_bin_dict["H_MM_nosub_DATA_{}_{}".format(j, k)].Add(hist_bin_dict["H_MM_nosub_DUMMY_{}_{}".format(j, k)], -1)
-            hist_bin_dict["H_MM_DATA_{}_{}".format(j, k)].Add(hist_bin_dict["H_MM_DUMMY_{}_{}".format(j, k)], -1)
-            hist_bin_dict["H_t_DATA_{}_{}".format(j, k)].Add(hist_bin_dict["H_t_DUMMY_{}_{}".format(j, k)], -1) 
+                # Dummy subtraction            
+                hist_bin_dict["H_MM_fit1sub_DATA_{}_{}".format(j, k)].Add(hist_bin_dict["H_MM_fit1sub_DUMMY_{}_{}".format(j, k)], -1)
+                hist_bin_dict["H_MM_pisub_DATA_{}_{}".format(j, k)].Add(hist_bin_dict["H_MM_pisub_DUMMY_{}_{}".format(j, k)], -1)
+                hist_bin_dict["H_MM_nosub_DATA_{}_{}".format(j, k)].Add(hist_bin_dict["H_MM_nosub_DUMMY_{}_{}".format(j, k)], -1)
+                hist_bin_dict["H_MM_DATA_{}_{}".format(j, k)].Add(hist_bin_dict["H_MM_DUMMY_{}_{}".format(j, k)], -1)
+                hist_bin_dict["H_t_DATA_{}_{}".format(j, k)].Add(hist_bin_dict["H_t_DUMMY_{}_{}".format(j, k)], -1) 
 
             # Remove histograms with less than event_threshold entries and negative integrals
             event_threshold = 10
@@ -630,13 +695,13 @@ def process_hist_data(tree_data, tree_dummy, normfac_data, normfac_dummy, t_bins
             # Clone dictionary
             cloned_dict = {}
 
-            # Iterate through processed_dict to clone all objects
-            for key, sub_dict in processed_dict.items():
-                cloned_dict[key] = {}
-                for sub_key, obj in sub_dict.items():
-                    if is_hist(obj):
-                        # Clone the object and assign it to the new dictionary
-                        cloned_dict[key][sub_key] = obj.Clone()
+            # Only the current bin is drawn, so only its objects are cloned
+            bin_key = "t_bin{}phi_bin{}".format(j+1, k+1)
+            cloned_dict[bin_key] = {}
+            for sub_key, obj in processed_dict[bin_key].items():
+                if is_hist(obj):
+                    # Clone the object and assign it to the new dictionary
+                    cloned_dict[bin_key][sub_key] = obj.Clone()
 
             # Optionally sort the keys in cloned_dict if needed
             for key in cloned_dict.keys():
@@ -1001,6 +1066,9 @@ def process_hist_simc(tree_simc, normfac_simc, t_bins, phi_bins, phi_setting, in
     from apply_cuts import apply_simc_cuts, set_val
     set_val(inpDict) # Set global variables for optimization
 
+    sys.path.append("cuts")
+    from event_scan import scan_simc, fill_binned, YIELD_BIN_SPEC_SIMC, YIELD_BIN_SPEC_SIMC_UNWEIGHTED
+
     ################################################################################################################################################
     # Define HGCer hole cut for KaonLT 2018-19
     if ParticleType == "kaon":
@@ -1010,7 +1078,8 @@ def process_hist_simc(tree_simc, normfac_simc, t_bins, phi_bins, phi_setting, in
         
     ################################################################################################################################################
         
-    TBRANCH_SIMC  = tree_simc.Get("h10")
+    # Full h10 tree, also for a weight sidecar (see iter_weight)
+    TBRANCH_SIMC  = get_simc_tree(tree_simc)
     
     hist_bin_dict = {}
     
@@ -1022,50 +1091,68 @@ def process_hist_simc(tree_simc, normfac_simc, t_bins, phi_bins, phi_setting, in
             hist_bin_dict["H_t_SIMC_{}_{}".format(j, k)]       = TH1D("H_t_SIMC_{}_{}".format(j, k),"-t", 200, inpDict["tmin"], inpDict["tmax"])
             hist_bin_dict["H_MM_SIMC_unweighted_{}_{}".format(j, k)] = TH1D("H_MM_SIMC_{}_{}".format(j, k),"MM", 200, inpDict["mm_min"], inpDict["mm_max"])
 
-    print("\nBinning simc...")
-    for i,evt in enumerate(TBRANCH_SIMC):
+    if inpDict.get("EVENT_LOOP", False):
 
-        # Progress bar
-        Misc.progressBar(i, TBRANCH_SIMC.GetEntries(),bar_length=25)
+        iter_good = simc_good_mask(tree_simc.GetName())
 
-        ##############
-        # HARD CODED #
-        ##############
+        print("\nBinning simc...")
+        for i,evt in enumerate(TBRANCH_SIMC):
 
-        # Check if variable shift branch exists
-        try:
-            adj_missmass = evt.missmass_shift
-        except AttributeError:
-            adj_missmass = evt.missmass
+            # Progress bar
+            Misc.progressBar(i, TBRANCH_SIMC.GetEntries(),bar_length=25)
 
-        ##############
-        ##############        
-        ##############        
+            # Events dropped by the reweighting (weight sidecars only)
+            if iter_good is not None and not iter_good[i]:
+                continue
+
+            ##############
+            # HARD CODED #
+            ##############
+
+            # Check if variable shift branch exists
+            try:
+                adj_missmass = evt.missmass_shift
+            except AttributeError:
+                adj_missmass = evt.missmass
+
+            ##############
+            ##############        
+            ##############        
         
-        if ParticleType == "kaon":          
-            ALLCUTS =  apply_simc_cuts(evt, mm_min, mm_max) and not hgcer_cutg.IsInside(evt.phgcer_x_det, evt.phgcer_y_det)          
-        else:
-            ALLCUTS = apply_simc_cuts(evt, mm_min, mm_max)
+            if ParticleType == "kaon":          
+                ALLCUTS =  apply_simc_cuts(evt, mm_min, mm_max) and not hgcer_cutg.IsInside(evt.phgcer_x_det, evt.phgcer_y_det)          
+            else:
+                ALLCUTS = apply_simc_cuts(evt, mm_min, mm_max)
 
-        #Fill SIMC events
-        if(ALLCUTS):
+            #Fill SIMC events
+            if(ALLCUTS):
             
-            # Phase shift to right setting
-            #phi_shift = (evt.phipq+math.pi)
-            phi_shift = (evt.phipq)            
+                # Phase shift to right setting
+                #phi_shift = (evt.phipq+math.pi)
+                phi_shift = (evt.phipq)            
             
-            # Loop through bins in t_simc and identify events in specified bins
-            for j in range(len(t_bins)-1):
-                for k in range(len(phi_bins)-1):            
-                    if t_bins[j] <= -evt.t <= t_bins[j+1]:
-                        if phi_bins[k] <= (phi_shift)*(180 / math.pi) <= phi_bins[k+1]:
-                            if iteration:                                
-                                hist_bin_dict["H_t_SIMC_{}_{}".format(j, k)].Fill(-evt.t, evt.iter_weight)
-                                hist_bin_dict["H_MM_SIMC_{}_{}".format(j, k)].Fill(adj_missmass, evt.iter_weight)
-                            else:
-                                hist_bin_dict["H_t_SIMC_{}_{}".format(j, k)].Fill(-evt.t, evt.Weight)
-                                hist_bin_dict["H_MM_SIMC_{}_{}".format(j, k)].Fill(adj_missmass, evt.Weight)
-                            hist_bin_dict["H_MM_SIMC_unweighted_{}_{}".format(j, k)].Fill(adj_missmass)
+                # Loop through bins in t_simc and identify events in specified bins
+                for j in range(len(t_bins)-1):
+                    for k in range(len(phi_bins)-1):            
+                        if t_bins[j] <= -evt.t <= t_bins[j+1]:
+                            if phi_bins[k] <= (phi_shift)*(180 / math.pi) <= phi_bins[k+1]:
+                                if iteration:                                
+                                    hist_bin_dict["H_t_SIMC_{}_{}".format(j, k)].Fill(-evt.t, evt.iter_weight)
+                                    hist_bin_dict["H_MM_SIMC_{}_{}".format(j, k)].Fill(adj_missmass, evt.iter_weight)
+                                else:
+                                    hist_bin_dict["H_t_SIMC_{}_{}".format(j, k)].Fill(-evt.t, evt.Weight)
+                                    hist_bin_dict["H_MM_SIMC_{}_{}".format(j, k)].Fill(adj_missmass, evt.Weight)
+                                hist_bin_dict["H_MM_SIMC_unweighted_{}_{}".format(j, k)].Fill(adj_missmass)
+    else:
+
+        scanned = scan_simc(tree_simc.GetName(), inpDict, iteration, hgcer_cutg if ParticleType == "kaon" else None)
+
+        if scanned is not None:
+            arrays, cut_masks = scanned
+            print("\nBinning simc...")
+            # SIMC goes from 0 to 2pi so no need for +pi
+            fill_binned(hist_bin_dict, "SIMC", arrays, cut_masks, YIELD_BIN_SPEC_SIMC, t_bins, phi_bins, phi_col="phipq")
+            fill_binned(hist_bin_dict, "SIMC_unweighted", arrays, cut_masks, YIELD_BIN_SPEC_SIMC_UNWEIGHTED, t_bins, phi_bins, phi_col="phipq")
 
     # Checks for first plots and calls +'(' to Print
     canvas_iter = 0
@@ -1092,13 +1179,13 @@ def process_hist_simc(tree_simc, normfac_simc, t_bins, phi_bins, phi_setting, in
             # Clone dictionary
             cloned_dict = {}
 
-            # Iterate through processed_dict to clone all objects
-            for key, sub_dict in processed_dict.items():
-                cloned_dict[key] = {}
-                for sub_key, obj in sub_dict.items():
-                    if is_hist(obj):
-                        # Clone the object and assign it to the new dictionary
-                        cloned_dict[key][sub_key] = obj.Clone()
+            # Only the current bin is drawn, so only its objects are cloned
+            bin_key = "t_bin{}phi_bin{}".format(j+1, k+1)
+            cloned_dict[bin_key] = {}
+            for sub_key, obj in processed_dict[bin_key].items():
+                if is_hist(obj):
+                    # Clone the object and assign it to the new dictionary
+                    cloned_dict[bin_key][sub_key] = obj.Clone()
 
             # Optionally sort the keys in cloned_dict if needed
             for key in cloned_dict.keys():
@@ -1317,11 +1404,57 @@ def find_yield_simc(histlist, inpDict, iteration=False):
         print("-"*25)
         yieldDict[hist["phi_setting"]] = {}
         yieldDict[hist["phi_setting"]]["yield"] = calculate_yield_simc("yield", hist, t_bins, phi_bins, inpDict, iteration)
+
+        if inpDict.get("SIMC_RESPONSE", False):
+            simc_response(hist, yieldDict[hist["phi_setting"]]["yield"], t_bins, phi_bins, inpDict, iteration)
             
     return {"binned_SIMC" : yieldDict}
 
 ##################################################################################################################################################
 
+def simc_response(hist, yields, t_bins, phi_bins, inpDict, iteration):
+    '''
+    Build and write the sparse SIMC response matrix of one setting (see response_matrix.SimcResponse)
+
+    The events come from the same (cached) scan as process_hist_simc. The matrix applied to
+    the current cross sections must give back the yields just found, any difference is printed.
+    '''
+
+    ParticleType = inpDict["ParticleType"]
+    phi_setting = hist["phi_setting"]
+
+    sys.path.append("cuts")
+    from event_scan import scan_simc
+
+    hgcer_cutg = None
+    if ParticleType == "kaon":
+        from hgcer_hole import apply_HGCer_hole_cut
+        hgcer_cutg = apply_HGCer_hole_cut(inpDict["Q2"], inpDict["W"], inpDict["EPSSET"])
+
+    scanned = scan_simc(hist["InFile_SIMC"].GetName(), inpDict, iteration, hgcer_cutg)
+    if scanned is None:
+        return None
+    arrays, cut_masks = scanned
+
+    # Same bin width as the H_MM_SIMC spectra the yields are summed from
+    bin_width = (inpDict["mm_max"]-inpDict["mm_min"])/200
+    response = build_simc_response(arrays, cut_masks, t_bins, phi_bins, hist["normfac_simc"], bin_width, iteration)
+
+    sig_prev = arrays["iter_sig"] if iteration else arrays["sigcm"]
+    sig_prev = sig_prev[cut_masks["ALLCUTS"] & (sig_prev != 0.0)]
+    check = response.yields(sig_prev)
+    max_diff = 0.0
+    for (j, k), val in yields.items():
+        max_diff = max(max_diff, abs(check[j, k]-val["yield"])/max(abs(val["yield"]), 1e-300) if val["yield"] > 0.0 else 0.0)
+    print("\nSIMC response matrix for {}: {} events, {} entries, max rel. diff to yields {:.3e}".format(phi_setting, response.matrix.shape[1], response.matrix.nnz, max_diff))
+
+    out_file = "{}/{}_{}_Q{}W{}_{}e{}_simc_response.npz".format(OUTPATH, phi_setting, ParticleType, inpDict["Q2"], inpDict["W"], inpDict["EPSSET"], prescale_tag(inpDict))
+    save_simc_response(response, out_file)
+
+    return response
+
+##################################################################################################################################################
+
 def grab_yield_data(histlist, phisetlist, inpDict):
 
     OutFilename = inpDict["OutFilename"]
@@ -31,6 +31,7 @@ b3 = ""
 a4 = ""
 b4 = ""
 c0_dict = {}
+c0_key = ""
 
 # Then, set global variables which is called with arguments
 def set_val(inpDict):
@@ -61,7 +62,7 @@ def set_val(inpDict):
     # HARD CODED #
     ##############
 
-    global c0_dict
+    global c0_dict, c0_key
     
     # Adjusted HMS delta to fix hsxfp correlation
     # See Dave Gaskell's slides for more info: https://redmine.jlab.org/attachments/2316
@@ -95,6 +96,9 @@ def set_val(inpDict):
     else:
         c0_dict["Q0p4W2p20_lowe"] = 0.0
         c0_dict["Q0p4W2p20_highe"] = 0.0
+
+    # Key only needs to be built once per setting
+    c0_key = "Q{}W{}_{}e".format(Q2,W,EPSSET)
             
     ##############
     ##############        
@@ -108,7 +112,7 @@ def apply_data_cuts(evt, mm_min=0.7, mm_max=1.5):
     # HARD CODED #
     ##############
 
-    adj_hsdelta = evt.hsdelta + c0_dict["Q{}W{}_{}e".format(Q2,W,EPSSET)]*evt.hsxpfp
+    adj_hsdelta = evt.hsdelta + c0_dict[c0_key]*evt.hsxpfp
 
     # Check if variable shift branch exists
     try:
@@ -146,7 +150,7 @@ def apply_data_sub_cuts(evt):
     # HARD CODED #
     ##############
 
-    adj_hsdelta = evt.hsdelta + c0_dict["Q{}W{}_{}e".format(Q2,W,EPSSET)]*evt.hsxpfp
+    adj_hsdelta = evt.hsdelta + c0_dict[c0_key]*evt.hsxpfp
     
     ##############
     ##############        
@@ -199,3 +203,147 @@ def apply_simc_cuts(evt, mm_min=0.7, mm_max=1.5):
     ALLCUTS = HMS_Acceptance and SHMS_Acceptance and Diamond and t_RANGE and MMCUT
     
     return ALLCUTS
+
+###############################################################################################################################################
+# Array versions of the cuts above
+# These take a dictionary of branch arrays (e.g. from uproot) and return boolean masks
+# for each cut component, so cut-flow counts come for free
+
+# Order of the cut components used for the cut flow
+DATA_CUT_ORDER = ["HMS_FixCut", "HMS_Acceptance", "SHMS_FixCut", "SHMS_Acceptance", "Diamond", "t_RANGE", "MMCUT"]
+SIMC_CUT_ORDER = ["HMS_Acceptance", "SHMS_Acceptance", "Diamond", "t_RANGE", "MMCUT"]
+
+def add_data_columns(arrays):
+    '''
+    Add adj_hsdelta, adj_MM and minus_t columns to a dictionary of data branch arrays (in place)
+    '''
+
+    ##############
+    # HARD CODED #
+    ##############
+
+    arrays["adj_hsdelta"] = arrays["hsdelta"] + c0_dict[c0_key]*arrays["hsxpfp"]
+
+    # Check if variable shift branch exists
+    if "MM_shift" in arrays:
+        arrays["adj_MM"] = arrays["MM_shift"]
+    else:
+        arrays["adj_MM"] = arrays["MM"]
+
+    ##############
+    ##############        
+    ##############
+
+    arrays["minus_t"] = -arrays["MandelT"]
+
+    return arrays
+
+def add_simc_columns(arrays):
+    '''
+    Add adj_missmass and minus_t columns to a dictionary of SIMC branch arrays (in place)
+    '''
+
+    ##############
+    # HARD CODED #
+    ##############
+
+    # Check if variable shift branch exists
+    if "missmass_shift" in arrays:
+        arrays["adj_missmass"] = arrays["missmass_shift"]
+    else:
+        arrays["adj_missmass"] = arrays["missmass"]
+
+    ##############
+    ##############        
+    ##############
+
+    arrays["minus_t"] = -arrays["t"]
+
+    return arrays
+
+def diamond_mask(arrays):
+    W_Q2 = arrays["W"]/arrays["Q2"]
+    return (W_Q2>a1+b1/arrays["Q2"]) & (W_Q2<a2+b2/arrays["Q2"]) & (W_Q2>a3+b3/arrays["Q2"]) & (W_Q2<a4+b4/arrays["Q2"])
+
+def data_cut_masks(arrays, mm_min=0.7, mm_max=1.5):
+    '''
+    Array version of apply_data_cuts and apply_data_sub_cuts
+
+    Returns a dictionary of boolean masks for each cut component along with
+    NOMMCUTS (same as apply_data_sub_cuts) and ALLCUTS (same as apply_data_cuts)
+    '''
+
+    if "adj_MM" not in arrays:
+        add_data_columns(arrays)
+
+    adj_hsdelta = arrays["adj_hsdelta"]
+    adj_MM = arrays["adj_MM"]
+
+    masks = {}
+
+    #CUTs Definations 
+    masks["SHMS_FixCut"] = (arrays["P_hod_goodstarttime"] == 1) & (arrays["P_dc_InsideDipoleExit"] == 1)
+    masks["SHMS_Acceptance"] = (arrays["ssdelta"]>=-10.0) & (arrays["ssdelta"]<=20.0) & (arrays["ssxptar"]>=-0.06) & (arrays["ssxptar"]<=0.06) & (arrays["ssyptar"]>=-0.04) & (arrays["ssyptar"]<=0.04)
+
+    masks["HMS_FixCut"] = (arrays["H_hod_goodstarttime"] == 1) & (arrays["H_dc_InsideDipoleExit"] == 1)
+    masks["HMS_Acceptance"] = (adj_hsdelta>=-8.0) & (adj_hsdelta<=8.0) & (arrays["hsxptar"]>=-0.08) & (arrays["hsxptar"]<=0.08) & (arrays["hsyptar"]>=-0.045) & (arrays["hsyptar"]<=0.045)
+
+    masks["Diamond"] = diamond_mask(arrays)
+
+    masks["t_RANGE"] = (tmin<arrays["minus_t"]) & (arrays["minus_t"]<tmax)
+
+    masks["MMCUT"] = (mm_min<adj_MM) & (adj_MM<mm_max)
+
+    masks["NOMMCUTS"] = masks["HMS_FixCut"] & masks["HMS_Acceptance"] & masks["SHMS_FixCut"] & masks["SHMS_Acceptance"] & masks["Diamond"] & masks["t_RANGE"]
+    masks["ALLCUTS"] = masks["NOMMCUTS"] & masks["MMCUT"]
+
+    return masks
+
+def simc_cut_masks(arrays, mm_min=0.7, mm_max=1.5):
+    '''
+    Array version of apply_simc_cuts
+
+    Returns a dictionary of boolean masks for each cut component along with
+    NOMMCUTS and ALLCUTS (same as apply_simc_cuts)
+    '''
+
+    if "adj_missmass" not in arrays:
+        add_simc_columns(arrays)
+
+    adj_missmass = arrays["adj_missmass"]
+
+    masks = {}
+
+    # Define the acceptance cuts  
+    masks["SHMS_Acceptance"] = (arrays["ssdelta"]>=-10.0) & (arrays["ssdelta"]<=20.0) & (arrays["ssxptar"]>=-0.06) & (arrays["ssxptar"]<=0.06) & (arrays["ssyptar"]>=-0.04) & (arrays["ssyptar"]<=0.04)
+    masks["HMS_Acceptance"] = (arrays["hsdelta"]>=-8.0) & (arrays["hsdelta"]<=8.0) & (arrays["hsxptar"]>=-0.08) & (arrays["hsxptar"]<=0.08) & (arrays["hsyptar"]>=-0.045) & (arrays["hsyptar"]<=0.045)
+
+    masks["Diamond"] = diamond_mask(arrays)
+
+    masks["t_RANGE"] = (tmin<arrays["minus_t"]) & (arrays["minus_t"]<tmax)
+
+    masks["MMCUT"] = (mm_min<adj_missmass) & (adj_missmass<mm_max)
+
+    masks["NOMMCUTS"] = masks["HMS_Acceptance"] & masks["SHMS_Acceptance"] & masks["Diamond"] & masks["t_RANGE"]
+    masks["ALLCUTS"] = masks["NOMMCUTS"] & masks["MMCUT"]
+
+    return masks
+
+def cut_flow(masks, order=None):
+    '''
+    Cumulative number of events passing each cut component, in the order given
+    (defaults to DATA_CUT_ORDER or SIMC_CUT_ORDER)
+
+    Returns a list of (cut name, events passing this and all previous cuts)
+    '''
+
+    if order is None:
+        order = DATA_CUT_ORDER if "SHMS_FixCut" in masks else SIMC_CUT_ORDER
+
+    flow = []
+    passing = None
+    for key in order:
+        passing = masks[key] if passing is None else (passing & masks[key])
+        flow.append((key, int(np.count_nonzero(passing))))
+
+    return flow
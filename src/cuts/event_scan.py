@@ -0,0 +1,653 @@
+#! /usr/bin/python
+
+#
+# Description: Single pass event scan of the data/dummy prompt/random trees shared by all analysis stages
+# ================================================================
+# Time-stamp: "2025-04-22 14:05:10 trottar"
+# ================================================================
+#
+# Author:  Richard L. Trotta III <trotta@cua.edu>
+#
+# Copyright (c) trottar
+#
+
+##################################################################################################################################################
+
+# Import relevant packages
+import numpy as np
+import sys, math, os, hashlib, json
+
+################################################################################################################################################
+'''
+ltsep package import and pathing definitions
+'''
+
+# Import package for cuts
+from ltsep import Root
+
+lt=Root(os.path.realpath(__file__),"Plot_LTSep")
+
+# Add this to all files for more dynamic pathing
+USER=lt.USER # Grab user info for file finding
+HOST=lt.HOST
+REPLAYPATH=lt.REPLAYPATH
+UTILPATH=lt.UTILPATH
+LTANAPATH=lt.LTANAPATH
+ANATYPE=lt.ANATYPE
+OUTPATH=lt.OUTPATH
+
+##################################################################################################################################################
+# Importing utility functions
+
+sys.path.append("utility")
+from columnar import iterate_tree_arrays, concat_chunks, fill_hist_arrays, group_by_bin, bin_pairs, get_prescale, prescale_mask, prescale_tag
+from columnar import simc_base_file, read_simc_weights, SIMC_WEIGHT_BRANCHES
+
+##################################################################################################################################################
+# Import function to define cut masks
+
+from apply_cuts import data_cut_masks, simc_cut_masks, cut_flow, DATA_CUT_ORDER, SIMC_CUT_ORDER
+from hgcer_hole import apply_HGCer_hole_mask
+
+##################################################################################################################################################
+
+# (category, input file key in inpDict, tree type)
+SCAN_CATEGORIES = [
+    ("DATA", "InDATAFilename", "prompt"),
+    ("DUMMY", "InDUMMYFilename", "prompt"),
+    ("RAND", "InDATAFilename", "rand"),
+    ("DUMMY_RAND", "InDUMMYFilename", "rand"),
+]
+
+# Every branch used by rand_sub, calculate_yield, ave_per_bin and particle_subtraction
+SCAN_BRANCHES = [
+    "hsdelta", "hsxptar", "hsyptar", "hsxfp", "hsyfp", "hsxpfp", "hsypfp",
+    "ssdelta", "ssxptar", "ssyptar", "ssxfp", "ssyfp", "ssxpfp", "ssypfp",
+    "P_hod_goodstarttime", "P_dc_InsideDipoleExit", "H_hod_goodstarttime", "H_dc_InsideDipoleExit",
+    "P_hgcer_xAtCer", "P_hgcer_yAtCer", "P_hgcer_npeSum", "P_aero_npeSum", "P_cal_etottracknorm", "P_gtr_beta",
+    "H_cer_npeSum", "H_cal_etottracknorm", "CTime_ROC1",
+    "MM", "MM_shift", "MandelT", "Q2", "W", "epsilon", "ph_q", "th_q", "ph_recoil", "th_recoil",
+    "pmiss", "emiss", "pmx", "pmy", "pmz",
+]
+
+# Scans already read this session, see get_event_scan
+SCAN_CACHE = {}
+
+# Bump when the masks or kept columns change so old sidecar caches are ignored
+SCAN_CACHE_VERSION = 1
+
+# Columnar fill specification shared by rand_sub and particle_subtraction_cuts
+# (histogram prefix, x column, y column, weight column, cut mask)
+# Histograms are filled as <prefix>_<DATA/DUMMY/RAND/DUMMY_RAND>, any that are not booked for a category are skipped
+# adj_MM, adj_hsdelta and minus_t are derived columns (see apply_cuts.add_data_columns)
+
+FILL_SPEC = [
+    # HGCer hole comparison (kaon only)
+    ("P_hgcer_nohole_xAtCer_vs_yAtCer", "P_hgcer_xAtCer", "P_hgcer_yAtCer", "P_hgcer_npeSum", "NOHOLECUTS"),
+    ("P_hgcer_nohole_xAtCer_vs_MM", "P_hgcer_xAtCer", "adj_MM", "P_hgcer_npeSum", "NOHOLECUTS"),
+    ("P_hgcer_nohole_yAtCer_vs_MM", "P_hgcer_yAtCer", "adj_MM", "P_hgcer_npeSum", "NOHOLECUTS"),
+    # No MM cut
+    ("H_MM_fit1sub", "adj_MM", None, None, "NOMMCUTS"),
+    ("H_MM_pisub", "adj_MM", None, None, "NOMMCUTS"),
+    ("H_MM_nosub", "adj_MM", None, None, "NOMMCUTS"),
+    # All cuts
+    ("P_hgcer_xAtCer_vs_yAtCer", "P_hgcer_xAtCer", "P_hgcer_yAtCer", "P_hgcer_npeSum", "ALLCUTS"),
+    ("P_hgcer_xAtCer_vs_MM", "P_hgcer_xAtCer", "adj_MM", "P_hgcer_npeSum", "ALLCUTS"),
+    ("P_hgcer_yAtCer_vs_MM", "P_hgcer_yAtCer", "adj_MM", "P_hgcer_npeSum", "ALLCUTS"),
+    ("MM_vs_CoinTime", "adj_MM", "CTime_ROC1", None, "ALLCUTS"),
+    ("CoinTime_vs_beta", "CTime_ROC1", "P_gtr_beta", None, "ALLCUTS"),
+    ("MM_vs_beta", "adj_MM", "P_gtr_beta", None, "ALLCUTS"),
+    ("MM_vs_H_cer", "adj_MM", "H_cer_npeSum", None, "ALLCUTS"),
+    ("MM_vs_H_cal", "adj_MM", "H_cal_etottracknorm", None, "ALLCUTS"),
+    ("MM_vs_P_cal", "adj_MM", "P_cal_etottracknorm", None, "ALLCUTS"),
+    ("MM_vs_P_hgcer", "adj_MM", "P_hgcer_npeSum", None, "ALLCUTS"),
+    ("MM_vs_P_aero", "adj_MM", "P_aero_npeSum", None, "ALLCUTS"),
+    # SIMC goes from 0 to 2pi so no need for +pi
+    ("phiq_vs_t", "ph_q", "minus_t", None, "ALLCUTS"),
+    ("Q2_vs_W", "Q2", "W", None, "ALLCUTS"),
+    ("Q2_vs_t", "Q2", "minus_t", None, "ALLCUTS"),
+    ("W_vs_t", "W", "minus_t", None, "ALLCUTS"),
+    ("EPS_vs_t", "epsilon", "minus_t", None, "ALLCUTS"),
+    ("MM_vs_t", "adj_MM", "minus_t", None, "ALLCUTS"),
+    ("H_ct", "CTime_ROC1", None, None, "ALLCUTS"),
+    ("H_ssxfp", "ssxfp", None, None, "ALLCUTS"),
+    ("H_ssyfp", "ssyfp", None, None, "ALLCUTS"),
+    ("H_ssxpfp", "ssxpfp", None, None, "ALLCUTS"),
+    ("H_ssypfp", "ssypfp", None, None, "ALLCUTS"),
+    ("H_ssdelta", "ssdelta", None, None, "ALLCUTS"),
+    ("H_ssxptar", "ssxptar", None, None, "ALLCUTS"),
+    ("H_ssyptar", "ssyptar", None, None, "ALLCUTS"),
+    ("H_hsxfp", "hsxfp", None, None, "ALLCUTS"),
+    ("H_hsyfp", "hsyfp", None, None, "ALLCUTS"),
+    ("H_hsxpfp", "hsxpfp", None, None, "ALLCUTS"),
+    ("H_hsypfp", "hsypfp", None, None, "ALLCUTS"),
+    ("H_hsdelta", "adj_hsdelta", None, None, "ALLCUTS"),
+    ("H_hsxptar", "hsxptar", None, None, "ALLCUTS"),
+    ("H_hsyptar", "hsyptar", None, None, "ALLCUTS"),
+    ("H_ph_q", "ph_q", None, None, "ALLCUTS"),
+    ("H_th_q", "th_q", None, None, "ALLCUTS"),
+    ("H_ph_recoil", "ph_recoil", None, None, "ALLCUTS"),
+    ("H_th_recoil", "th_recoil", None, None, "ALLCUTS"),
+    ("H_pmiss", "pmiss", None, None, "ALLCUTS"),
+    ("H_emiss", "emiss", None, None, "ALLCUTS"),
+    ("H_pmx", "pmx", None, None, "ALLCUTS"),
+    ("H_pmy", "pmy", None, None, "ALLCUTS"),
+    ("H_pmz", "pmz", None, None, "ALLCUTS"),
+    ("H_Q2", "Q2", None, None, "ALLCUTS"),
+    ("H_t", "minus_t", None, None, "ALLCUTS"),
+    ("H_W", "W", None, None, "ALLCUTS"),
+    ("H_epsilon", "epsilon", None, None, "ALLCUTS"),
+    ("H_MM", "adj_MM", None, None, "ALLCUTS"),
+    # Only booked for DATA in rand_sub
+    ("H_cal_etottracknorm", "H_cal_etottracknorm", None, None, "ALLCUTS"),
+    ("H_cer_npeSum", "H_cer_npeSum", None, None, "ALLCUTS"),
+    ("P_cal_etottracknorm", "P_cal_etottracknorm", None, None, "ALLCUTS"),
+    ("P_hgcer_npeSum", "P_hgcer_npeSum", None, None, "ALLCUTS"),
+    ("P_aero_npeSum", "P_aero_npeSum", None, None, "ALLCUTS"),
+]
+
+################################################################################################################################################
+
+def fill_from_spec(hist_objs, category, arrays, cut_masks):
+    '''
+    Fill every booked <prefix>_<category> histogram in FILL_SPEC from the arrays
+    '''
+    for prefix, xcol, ycol, wcol, cut in FILL_SPEC:
+        hist = hist_objs.get("{}_{}".format(prefix, category))
+        if hist is None:
+            continue
+        mask = cut_masks[cut]
+        x = arrays[xcol][mask]
+        y = arrays[ycol][mask] if ycol is not None else None
+        w = arrays[wcol][mask] if wcol is not None else None
+        fill_hist_arrays(hist, x, y, w)
+
+# Per t-bin (ave_per_bin) and per t/phi-bin (calculate_yield) histograms
+# (histogram prefix, column, weight column, cut mask), filled as <prefix>_<category>_<j> or <prefix>_<category>_<j>_<k>
+AVE_BIN_SPEC = [
+    ("H_MM_fit1sub", "adj_MM", None, "NOMMCUTS"),
+    ("H_MM_pisub", "adj_MM", None, "NOMMCUTS"),
+    ("H_MM_nosub", "adj_MM", None, "NOMMCUTS"),
+    ("H_t", "minus_t", None, "ALLCUTS"),
+    ("H_Q2", "Q2", None, "ALLCUTS"),
+    ("H_W", "W", None, "ALLCUTS"),
+    ("H_epsilon", "epsilon", None, "ALLCUTS"),
+    ("H_MM", "adj_MM", None, "ALLCUTS"),
+]
+
+YIELD_BIN_SPEC = [
+    ("H_MM_fit1sub", "adj_MM", None, "NOMMCUTS"),
+    ("H_MM_pisub", "adj_MM", None, "NOMMCUTS"),
+    ("H_MM_nosub", "adj_MM", None, "NOMMCUTS"),
+    ("H_t", "minus_t", None, "ALLCUTS"),
+    ("H_MM", "adj_MM", None, "ALLCUTS"),
+]
+
+# SIMC, sim_weight is Weight or iter_weight (see scan_simc)
+AVE_BIN_SPEC_SIMC = [
+    ("H_t", "minus_t", "sim_weight", "ALLCUTS"),
+    ("H_Q2", "Q2", "sim_weight", "ALLCUTS"),
+    ("H_W", "W", "sim_weight", "ALLCUTS"),
+    ("H_epsilon", "epsilon", "sim_weight", "ALLCUTS"),
+]
+
+YIELD_BIN_SPEC_SIMC = [
+    ("H_t", "minus_t", "sim_weight", "ALLCUTS"),
+    ("H_MM", "adj_missmass", "sim_weight", "ALLCUTS"),
+]
+
+# Filled with category SIMC_unweighted
+YIELD_BIN_SPEC_SIMC_UNWEIGHTED = [
+    ("H_MM", "adj_missmass", None, "ALLCUTS"),
+]
+
+def fill_binned(hist_dict, category, arrays, cut_masks, spec, t_bins, phi_bins=None, phi_col="ph_q"):
+    '''
+    Fill the per t-bin (phi_bins=None) or per t/phi-bin histograms in hist_dict from the arrays
+    Bin edges are inclusive on both sides, same as the event loops
+    Each event is assigned its bin once (see columnar.group_by_bin), so the cost no longer
+    scales with the number of bins
+    '''
+    if len(arrays["minus_t"]) == 0:
+        return
+    if phi_bins is None:
+        groups = group_by_bin(arrays["minus_t"], t_bins)
+    else:
+        groups = group_by_bin(arrays["minus_t"], t_bins, arrays[phi_col]*(180 / math.pi), phi_bins)
+        nphi = len(phi_bins)-1
+    for flat_bin, evt_idx in groups.items():
+        if phi_bins is None:
+            bin_key = "{}".format(flat_bin)
+        else:
+            bin_key = "{}_{}".format(*divmod(flat_bin, nphi))
+        for prefix, col, wcol, cut in spec:
+            hist = hist_dict.get("{}_{}_{}".format(prefix, category, bin_key))
+            if hist is None:
+                continue
+            sel = evt_idx[cut_masks[cut][evt_idx]]
+            w = arrays[wcol][sel] if wcol is not None else None
+            fill_hist_arrays(hist, arrays[col][sel], weights=w)
+
+def fill_binned_arrays(binned_dict, category, arrays, cut_masks, spec, t_bins, phi_bins=None, phi_col="ph_q"):
+    '''
+    Same as fill_binned but into the array backed BinnedHist of binned_dict (keyed prefix_category),
+    every (t,phi) bin is filled in one pass per spectrum without any per bin histogram
+    '''
+    if len(arrays["minus_t"]) == 0:
+        return
+    if phi_bins is None:
+        evt, flat = bin_pairs(arrays["minus_t"], t_bins)
+    else:
+        evt, flat = bin_pairs(arrays["minus_t"], t_bins, arrays[phi_col]*(180 / math.pi), phi_bins)
+    for prefix, col, wcol, cut in spec:
+        binned = binned_dict.get("{}_{}".format(prefix, category))
+        if binned is None:
+            continue
+        sel = cut_masks[cut][evt]
+        w = arrays[wcol][evt[sel]] if wcol is not None else None
+        binned.fill(flat[sel], arrays[col][evt[sel]], weights=w)
+
+def binned_mm_offset(arrays, cut_masks, t_bins, phi_bins=None):
+    '''
+    MM shift offset of the last event passing all cuts inside the binning range, same as the event loops
+    Returns None if no event passes
+    '''
+    in_range = cut_masks["ALLCUTS"] & (t_bins[0] <= arrays["minus_t"]) & (arrays["minus_t"] <= t_bins[-1])
+    if phi_bins is not None:
+        phi_deg = arrays["ph_q"]*(180 / math.pi)
+        in_range &= (phi_bins[0] <= phi_deg) & (phi_deg <= phi_bins[-1])
+    if not np.any(in_range):
+        return None
+    last_evt = np.flatnonzero(in_range)[-1]
+    return arrays["adj_MM"][last_evt] - arrays["MM"][last_evt]
+
+def add_cut_flow(flow, chunk_flow):
+    '''
+    Accumulate the cut flow of a chunk (same cut order) onto the running total, flow=None starts a new total
+    '''
+    if flow is None:
+        return list(chunk_flow)
+    return [(cut, npass+chunk_npass) for (cut, npass), (chunk_cut, chunk_npass) in zip(flow, chunk_flow)]
+
+def hgcer_hole_mask(hgcer_cutg, x, y, candidates):
+    '''
+    True for the events inside the HGCer hole TCutG, only the candidate events
+    (those that could pass the other cuts) are tested
+    '''
+    in_hole = np.zeros(len(x), dtype=bool)
+    in_hole[candidates] = apply_HGCer_hole_mask(hgcer_cutg, x[candidates], y[candidates])
+    return in_hole
+
+################################################################################################################################################
+
+def save_scan_cache(cache_file, cache_key, arrays, masks, flow):
+    '''
+    Write the kept events, their masks and the cut flow of one tree to a compressed .npz sidecar
+    '''
+    out = {"cache_key" : np.array(cache_key)}
+    for key, val in arrays.items():
+        out["arrays/{}".format(key)] = val
+    for key, val in masks.items():
+        out["masks/{}".format(key)] = val
+    out["flow_cuts"] = np.array([cut for cut, npass in flow])
+    out["flow_npass"] = np.array([npass for cut, npass in flow], dtype=np.int64)
+    try:
+        np.savez_compressed(cache_file, **out)
+    except OSError as e:
+        print("WARNING: Could not write scan cache {}, {}".format(cache_file, e))
+
+def load_scan_cache(cache_file, cache_key):
+    '''
+    Read a sidecar written by save_scan_cache
+    Returns (arrays, masks, cut flow), or None if there is no cache or it was made with different inputs
+    '''
+    if not os.path.isfile(cache_file):
+        return None
+    try:
+        with np.load(cache_file) as f:
+            if str(f["cache_key"]) != cache_key:
+                print("Scan cache {} is out of date, rescanning...".format(cache_file))
+                return None
+            arrays = {key.split("/", 1)[1] : f[key] for key in f.files if key.startswith("arrays/")}
+            masks = {key.split("/", 1)[1] : f[key] for key in f.files if key.startswith("masks/")}
+            flow = list(zip([str(cut) for cut in f["flow_cuts"]], [int(npass) for npass in f["flow_npass"]]))
+    except (OSError, KeyError, ValueError) as e:
+        print("WARNING: Could not read scan cache {}, {}".format(cache_file, e))
+        return None
+    return arrays, masks, flow
+
+################################################################################################################################################
+
+class EventScan:
+    '''
+    Reads the prompt/random data and dummy trees of one setting a single time,
+    evaluates the shared cut masks and keeps only the events that can pass any
+    of them. Stages register consumers, callables with signature
+
+        consumer(category, arrays, masks)
+
+    which are called once per tree (DATA, DUMMY, RAND, DUMMY_RAND). Consumers
+    registered after the scan has run are replayed from the kept events, so the
+    trees are only read once per setting no matter how many stages use them.
+
+    Masks given to consumers
+        ALLCUTS         : apply_data_cuts (and not in HGCer hole)
+        NOMMCUTS        : apply_data_sub_cuts (and not in HGCer hole)
+        NOHOLECUTS      : apply_data_cuts
+        NOHOLE_NOMMCUTS : apply_data_sub_cuts
+    plus the individual cut components from apply_cuts.data_cut_masks
+    '''
+
+    def __init__(self, phi_setting, particle, inpDict, hgcer_cutg=None):
+
+        self.phi_setting = phi_setting
+        self.particle = particle
+        self.inpDict = inpDict
+        self.hgcer_cutg = hgcer_cutg
+
+        self.events = {}
+        self.masks = {}
+        self.consumers = []
+        self.scanned = False
+
+    def root_file(self, file_key):
+        return "{}/{}_{}_{}.root".format(OUTPATH, self.phi_setting, self.particle, self.inpDict[file_key])
+
+    def tree_name(self, tree_type):
+        return "Cut_{}_Events_{}_noRF".format(self.particle.capitalize(), tree_type)
+
+    def cache_file(self, file_key, tree_type):
+        return "{}/{}_{}_{}_{}{}_scan.npz".format(OUTPATH, self.phi_setting, self.particle, self.inpDict[file_key], tree_type, prescale_tag(self.inpDict))
+
+    def cache_key(self, root_file, tree_type):
+        '''
+        Hash of everything the kept events and masks depend on, the input file (path, size
+        and modification time), the tree, the cut parameters and the HGCer hole setting
+        '''
+        stat = os.stat(root_file)
+        params = {
+            "version" : SCAN_CACHE_VERSION,
+            "root_file" : os.path.realpath(root_file),
+            "size" : stat.st_size,
+            "mtime" : stat.st_mtime_ns,
+            "tree" : self.tree_name(tree_type),
+            "branches" : SCAN_BRANCHES,
+            "hgcer_hole" : self.hgcer_cutg is not None,
+            "setting" : [self.inpDict["Q2"], self.inpDict["W"], self.inpDict["EPSSET"]],
+            "prescale" : get_prescale(self.inpDict),
+        }
+        for key in ["mm_min", "mm_max", "tmin", "tmax", "a1", "b1", "a2", "b2", "a3", "b3", "a4", "b4"]:
+            params[key] = float(self.inpDict[key])
+        return hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()
+
+    def register(self, consumer):
+        '''
+        Add a consumer, if the trees have already been scanned the consumer is called right away
+        '''
+        self.consumers.append(consumer)
+        if self.scanned:
+            for category in self.events.keys():
+                consumer(category, self.events[category], self.masks[category])
+        return consumer
+
+    def scan_chunk(self, arrays):
+        '''
+        Evaluate the cut masks for one chunk of a tree
+        Returns the kept events, their masks and the chunk cut flow
+        '''
+
+        masks = data_cut_masks(arrays, self.inpDict["mm_min"], self.inpDict["mm_max"])
+        masks["NOHOLECUTS"] = masks["ALLCUTS"]
+        masks["NOHOLE_NOMMCUTS"] = masks["NOMMCUTS"]
+        cut_order = list(DATA_CUT_ORDER)
+
+        if self.hgcer_cutg is not None:
+            in_hole = hgcer_hole_mask(self.hgcer_cutg, arrays["P_hgcer_xAtCer"], arrays["P_hgcer_yAtCer"], masks["NOHOLE_NOMMCUTS"])
+            masks["HGCer_hole"] = ~in_hole
+            masks["ALLCUTS"] = masks["NOHOLECUTS"] & ~in_hole
+            masks["NOMMCUTS"] = masks["NOHOLE_NOMMCUTS"] & ~in_hole
+            cut_order.append("HGCer_hole")
+
+        flow = [("Events", len(arrays["MandelT"]))] + cut_flow(masks, cut_order)
+
+        # Every mask is a subset of NOHOLE_NOMMCUTS, so only those events need to be kept
+        keep = masks["NOHOLE_NOMMCUTS"]
+        events = {key : val[keep] for key, val in arrays.items()}
+        masks = {key : val[keep] for key, val in masks.items()}
+
+        return events, masks, flow
+
+    def run(self):
+        '''
+        Read each tree once, evaluate the cut masks and call every registered consumer
+        '''
+
+        if self.scanned:
+            return self
+
+        for category, file_key, tree_type in SCAN_CATEGORIES:
+
+            root_file = self.root_file(file_key)
+            if not os.path.isfile(root_file):
+                print("\n\nERROR: No file found called {}\n\n".format(root_file))
+                continue
+
+            cache_file = self.cache_file(file_key, tree_type)
+            cache_key = self.cache_key(root_file, tree_type)
+
+            cached = load_scan_cache(cache_file, cache_key) if self.inpDict.get("SCAN_CACHE", True) else None
+            if cached is not None:
+                print("\nUsing cached scan {} for {} {} {}...".format(cache_file, self.phi_setting, self.particle, category))
+                self.events[category], self.masks[category], flow = cached
+                for cut, npass in flow:
+                    print("{:>20} : {}".format(cut, npass))
+                for consumer in self.consumers:
+                    consumer(category, self.events[category], self.masks[category])
+                continue
+
+            print("\nScanning {} {} {}...".format(self.phi_setting, self.particle, category))
+
+            # Read in chunks so memory is bounded by the chunk size, only the events that can pass are kept
+            kept_events, kept_masks, flow = [], [], None
+            prescale = get_prescale(self.inpDict)
+            start = 0
+            for arrays in iterate_tree_arrays(root_file, self.tree_name(tree_type), SCAN_BRANCHES, self.inpDict.get("CHUNK_SIZE")):
+                if prescale > 1:
+                    nevents = len(arrays["MandelT"])
+                    sel = prescale_mask(start, nevents, prescale)
+                    start += nevents
+                    arrays = {key : val[sel] for key, val in arrays.items()}
+                events, masks, chunk_flow = self.scan_chunk(arrays)
+                kept_events.append(events)
+                kept_masks.append(masks)
+                flow = add_cut_flow(flow, chunk_flow)
+            if flow is None:
+                continue
+
+            # Cut flow
+            for cut, npass in flow:
+                print("{:>20} : {}".format(cut, npass))
+
+            self.events[category] = concat_chunks(kept_events)
+            self.masks[category] = concat_chunks(kept_masks)
+
+            if self.inpDict.get("SCAN_CACHE", True):
+                save_scan_cache(cache_file, cache_key, self.events[category], self.masks[category], flow)
+
+            for consumer in self.consumers:
+                consumer(category, self.events[category], self.masks[category])
+
+        self.scanned = True
+
+        return self
+
+################################################################################################################################################
+
+def get_event_scan(phi_setting, particle, inpDict, hgcer_cutg=None):
+    '''
+    Return the (run) EventScan for this setting, reusing a previous scan if the
+    input files and cut parameters are unchanged
+    '''
+
+    key = (phi_setting, particle, inpDict["InDATAFilename"], inpDict["InDUMMYFilename"], hgcer_cutg is not None, get_prescale(inpDict),
+           inpDict["mm_min"], inpDict["mm_max"], inpDict["tmin"], inpDict["tmax"],
+           inpDict["a1"], inpDict["b1"], inpDict["a2"], inpDict["b2"],
+           inpDict["a3"], inpDict["b3"], inpDict["a4"], inpDict["b4"])
+
+    if key not in SCAN_CACHE:
+        SCAN_CACHE[key] = EventScan(phi_setting, particle, inpDict, hgcer_cutg).run()
+
+    return SCAN_CACHE[key]
+
+################################################################################################################################################
+
+# Every branch used by the SIMC binning in calculate_yield and ave_per_bin, by compare_simc_iter
+# and by the SIMC response matrix (vertex kinematics and cross sections, see response_matrix)
+SIMC_BRANCHES = [
+    "hsdelta", "hsxptar", "hsyptar", "ssdelta", "ssxptar", "ssyptar",
+    "hsxfp", "hsyfp", "hsxpfp", "hsypfp", "ssxfp", "ssyfp", "ssxpfp", "ssypfp",
+    "missmass", "missmass_shift", "t", "phipq", "thetapq", "Q2", "W", "epsilon", "Pm", "Em",
+    "Q2i", "Wi", "ti", "phipqi",
+    "Weight", "sigcm", "iter_weight", "iter_sig", "phgcer_x_det", "phgcer_y_det",
+]
+
+# Bump when the SIMC masks or kept columns change so old sidecar caches are ignored
+SIMC_SCAN_CACHE_VERSION = 2
+
+# SIMC base trees already scanned this session, see scan_simc_base
+SIMC_SCAN_CACHE = {}
+
+def simc_scan_key(base_file, inpDict, hgcer_cutg=None):
+    '''
+    Hash of everything the kept SIMC events and masks depend on
+
+    Only the base tree matters, the weights of each iteration are read from the sidecar.
+    The file is identified by name, size and modification time rather than path, so the
+    hard links main_iter makes in each iteration directory share one cache.
+    '''
+    stat = os.stat(base_file)
+    params = {
+        "version" : SIMC_SCAN_CACHE_VERSION,
+        "base_file" : os.path.basename(base_file),
+        "size" : stat.st_size,
+        "mtime" : stat.st_mtime_ns,
+        "branches" : SIMC_BRANCHES,
+        "hgcer_hole" : hgcer_cutg is not None,
+        "setting" : [inpDict["Q2"], inpDict["W"], inpDict["EPSSET"]],
+        "prescale" : get_prescale(inpDict),
+    }
+    for key in ["mm_min", "mm_max", "tmin", "tmax", "a1", "b1", "a2", "b2", "a3", "b3", "a4", "b4"]:
+        params[key] = float(inpDict[key])
+    return hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()
+
+def scan_simc_base(base_file, inpDict, hgcer_cutg=None):
+    '''
+    Read a SIMC h10 tree once and evaluate the SIMC cut masks (same as apply_simc_cuts)
+
+    Acceptance, diamond, t range, MM and the HGCer hole do not depend on the weights, so the
+    result is kept for the session and in an .npz sidecar in OUTPATH, and every iteration
+    after the first only reads its weight sidecar (see scan_simc).
+    Returns (arrays, masks, cut flow) for the events passing NOMMCUTS before the HGCer hole cut,
+    arrays["entry"] is their index in the tree. None if the tree is empty.
+    '''
+
+    cache_key = simc_scan_key(base_file, inpDict, hgcer_cutg)
+    if cache_key in SIMC_SCAN_CACHE:
+        return SIMC_SCAN_CACHE[cache_key]
+
+    cache_file = "{}/{}{}_simc_scan.npz".format(OUTPATH, os.path.splitext(os.path.basename(base_file))[0], prescale_tag(inpDict))
+    cached = load_scan_cache(cache_file, cache_key) if inpDict.get("SCAN_CACHE", True) else None
+    if cached is not None:
+        print("\nUsing cached scan {} for {}...".format(cache_file, base_file))
+        SIMC_SCAN_CACHE[cache_key] = cached
+        return cached
+
+    print("\nScanning {}...".format(base_file))
+
+    kept_events, kept_masks, flow = [], [], None
+    prescale = get_prescale(inpDict)
+    start = 0
+    for arrays in iterate_tree_arrays(base_file, "h10", SIMC_BRANCHES, inpDict.get("CHUNK_SIZE")):
+
+        nevents = len(arrays["t"])
+        arrays["entry"] = start + np.arange(nevents, dtype=np.int64)
+        start += nevents
+        if prescale > 1:
+            # Entries stay those of the full tree so the weight sidecars still line up
+            sel = prescale_mask(start-nevents, nevents, prescale)
+            arrays = {key : val[sel] for key, val in arrays.items()}
+            nevents = len(arrays["t"])
+        masks = simc_cut_masks(arrays, inpDict["mm_min"], inpDict["mm_max"])
+        masks["NOHOLECUTS"] = masks["ALLCUTS"]
+        masks["NOHOLE_NOMMCUTS"] = masks["NOMMCUTS"]
+        cut_order = list(SIMC_CUT_ORDER)
+
+        if hgcer_cutg is not None:
+            in_hole = hgcer_hole_mask(hgcer_cutg, arrays["phgcer_x_det"], arrays["phgcer_y_det"], masks["NOHOLE_NOMMCUTS"])
+            masks["HGCer_hole"] = ~in_hole
+            masks["ALLCUTS"] = masks["NOHOLECUTS"] & ~in_hole
+            masks["NOMMCUTS"] = masks["NOHOLE_NOMMCUTS"] & ~in_hole
+            cut_order.append("HGCer_hole")
+
+        chunk_flow = [("Events", nevents)] + cut_flow(masks, cut_order)
+        flow = add_cut_flow(flow, chunk_flow)
+
+        # Every mask is a subset of NOHOLE_NOMMCUTS, so only those events need to be kept
+        keep = masks["NOHOLE_NOMMCUTS"]
+        kept_events.append({key : val[keep] for key, val in arrays.items()})
+        kept_masks.append({key : val[keep] for key, val in masks.items()})
+
+    if flow is None:
+        return None
+
+    scanned = (concat_chunks(kept_events), concat_chunks(kept_masks), flow)
+
+    if inpDict.get("SCAN_CACHE", True):
+        save_scan_cache(cache_file, cache_key, *scanned)
+
+    SIMC_SCAN_CACHE[cache_key] = scanned
+
+    return scanned
+
+def scan_simc(root_file, inpDict, iteration, hgcer_cutg=None):
+    '''
+    SIMC arrays and cut masks of root_file (see scan_simc_base) with the weights of root_file
+    Adds the sim_weight column, iter_weight if iteration else Weight
+
+    For a weight sidecar the masks come from its base tree, the weight columns are taken
+    from the sidecar by entry and the events dropped by the reweighting are removed, so
+    an iteration only costs reading the sidecar.
+    Returns the arrays and masks for the events passing NOMMCUTS before the HGCer hole cut
+    (use the masks, ALLCUTS includes the hole), or None if the tree is empty
+    '''
+
+    base_file = simc_base_file(root_file)
+    scanned = scan_simc_base(base_file, inpDict, hgcer_cutg)
+    if scanned is None:
+        return None
+    base_arrays, base_masks, flow = scanned
+
+    # Cut flow
+    for cut, npass in flow:
+        print("{:>20} : {}".format(cut, npass))
+
+    # Copies of the dictionaries, the cached columns themselves are never modified
+    arrays = dict(base_arrays)
+    masks = dict(base_masks)
+
+    weights = read_simc_weights(root_file)
+    if weights is not None:
+        entry = arrays["entry"]
+        for key in SIMC_WEIGHT_BRANCHES[:-1]:
+            arrays[key] = weights[key][entry]
+        good = weights["iter_good"][entry]
+        arrays = {key : val[good] for key, val in arrays.items()}
+        masks = {key : val[good] for key, val in masks.items()}
+        print("{:>20} : {}".format("Reweighted", int(np.count_nonzero(masks["NOMMCUTS"]))))
+
+    if iteration:
+        arrays["sim_weight"] = arrays["iter_weight"]
+    else:
+        arrays["sim_weight"] = arrays["Weight"]
+
+    return arrays, masks
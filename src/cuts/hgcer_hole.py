@@ -3,15 +3,20 @@
 #
 # Description:
 # ================================================================
-# Time-stamp: "2024-09-26 17:13:00 trottar"
+# Time-stamp: "2025-04-23 11:02:47 trottar"
 # ================================================================
 #
 # Author:  Richard L. Trotta III <trotta@cua.edu>
 #
 # Copyright (c) trottar
 #
+import numpy as np
 import ROOT
 from ROOT import TCutG
+import sys
+
+sys.path.append("utility")
+from columnar import iterate_tree_arrays, simc_base_file
 
 def apply_HGCer_hole_cut(Q2, W, EPSSET):
 
@@ -98,3 +103,75 @@ def apply_HGCer_hole_cut(Q2, W, EPSSET):
     '''
     
     return cutg
+
+def cutg_vertices(cutg):
+    '''
+    Vertices of a TCutG as numpy arrays
+    '''
+    npts = cutg.GetN()
+    xpts = np.array([cutg.GetX()[i] for i in range(npts)], dtype=np.float64)
+    ypts = np.array([cutg.GetY()[i] for i in range(npts)], dtype=np.float64)
+    return xpts, ypts
+
+def inside_polygon(xp, yp, xpts, ypts):
+    '''
+    Array version of TMath::IsInside (what TCutG::IsInside calls), same crossing test
+    and same floating point operations so the result is identical event by event
+    '''
+    xp = np.asarray(xp, dtype=np.float64)
+    yp = np.asarray(yp, dtype=np.float64)
+    odd_nodes = np.zeros(xp.shape, dtype=bool)
+    j = len(xpts)-1
+    for i in range(len(xpts)):
+        crosses = ((ypts[i] < yp) & (ypts[j] >= yp)) | ((ypts[j] < yp) & (ypts[i] >= yp))
+        # y[j]-y[i] can only be zero where crosses is False
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x_cross = xpts[i]+(yp-ypts[i])/(ypts[j]-ypts[i])*(xpts[j]-xpts[i])
+        odd_nodes ^= crosses & (x_cross < xp)
+        j = i
+    return odd_nodes
+
+def apply_HGCer_hole_mask(cutg, x, y):
+    '''
+    Boolean mask of the events inside the HGCer hole, replaces calling cutg.IsInside(x, y) per event
+    '''
+    xpts, ypts = cutg_vertices(cutg)
+    return inside_polygon(x, y, xpts, ypts)
+
+def simc_HGCer_hole_mask(cutg, root_file, chunk_size=None):
+    '''
+    HGCer hole mask for every event of a SIMC h10 tree, in tree order
+    The tree is streamed in chunks (see columnar.iterate_tree_arrays)
+    For a weight sidecar the base tree is used, which has the same entries (see utility.get_simc_tree)
+    '''
+    in_hole = [apply_HGCer_hole_mask(cutg, arrays["phgcer_x_det"], arrays["phgcer_y_det"]) \
+               for arrays in iterate_tree_arrays(simc_base_file(root_file), "h10", ["phgcer_x_det", "phgcer_y_det"], chunk_size)]
+    if len(in_hole) == 0:
+        return np.zeros(0, dtype=bool)
+    return np.concatenate(in_hole)
+
+def check_HGCer_hole_parity(cutg, x, y):
+    '''
+    Compare apply_HGCer_hole_mask against TCutG::IsInside, returns the indices that disagree
+    '''
+    mask = apply_HGCer_hole_mask(cutg, x, y)
+    ref = np.array([bool(cutg.IsInside(xi, yi)) for xi, yi in zip(x, y)], dtype=bool)
+    return np.flatnonzero(mask != ref)
+
+if __name__ == "__main__":
+
+    # Parity check of the array test against TCutG on random points, the vertices and points along the edges
+    cutg = apply_HGCer_hole_cut("", "", "")
+    xpts, ypts = cutg_vertices(cutg)
+    rng = np.random.default_rng(0)
+    x = np.concatenate([rng.uniform(-30, 30, 200000), xpts, np.repeat(xpts, 50)])
+    y = np.concatenate([rng.uniform(-30, 30, 200000), ypts, np.tile(np.linspace(-30, 30, 50), len(ypts))])
+    # Grid on the vertex values themselves
+    xg, yg = np.meshgrid(np.unique(np.concatenate([xpts, ypts])), np.unique(np.concatenate([xpts, ypts])))
+    x = np.concatenate([x, xg.ravel(), yg.ravel()])
+    y = np.concatenate([y, yg.ravel(), xg.ravel()])
+    bad = check_HGCer_hole_parity(cutg, x, y)
+    print("HGCer hole parity: {} points, {} mismatches".format(len(x), len(bad)))
+    for i in bad[:20]:
+        print("    ({}, {})".format(x[i], y[i]))
+    sys.exit(1 if len(bad) > 0 else 0)
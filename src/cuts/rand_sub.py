@@ -53,6 +53,7 @@ OUTPATH=lt.OUTPATH
 
 sys.path.append("utility")
 from utility import open_root_file, remove_bad_bins, create_polar_plot, integrate_hist_range
+from columnar import reservoir_fill_graph, fill_hist_arrays
 
 ################################################################################################################################################
 # Suppressing the terminal splash of Print()
@@ -117,6 +118,7 @@ def rand_sub(phi_setting, inpDict):
     # Import function to define cut bools
     from apply_cuts import apply_data_cuts, apply_data_sub_cuts, set_val
     set_val(inpDict) # Set global variables for optimization
+    from event_scan import get_event_scan, fill_from_spec
     
     ################################################################################################################################################
     # Define HGCer hole cut for KaonLT 2018-19
@@ -309,261 +311,273 @@ def rand_sub(phi_setting, inpDict):
     ################################################################################################################################################
     # Plot definitions
 
-    H_hsdelta_DATA  = TH1D("H_hsdelta_DATA","HMS Delta", 100, -20.0, 20.0)
-    H_hsxptar_DATA  = TH1D("H_hsxptar_DATA","HMS xptar", 100, -0.1, 0.1)
-    H_hsyptar_DATA  = TH1D("H_hsyptar_DATA","HMS yptar", 100, -0.1, 0.1)
-    H_ssxfp_DATA    = TH1D("H_ssxfp_DATA","SHMS xfp", 100, -25.0, 25.0)
-    H_ssyfp_DATA    = TH1D("H_ssyfp_DATA","SHMS yfp", 100, -25.0, 25.0)
-    H_ssxpfp_DATA   = TH1D("H_ssxpfp_DATA","SHMS xpfp", 100, -0.09, 0.09)
-    H_ssypfp_DATA   = TH1D("H_ssypfp_DATA","SHMS ypfp", 100, -0.05, 0.04)
-    H_hsxfp_DATA    = TH1D("H_hsxfp_DATA","HMS xfp", 100, -40.0, 40.0)
-    H_hsyfp_DATA    = TH1D("H_hsyfp_DATA","HMS yfp", 100, -20.0, 20.0)
-    H_hsxpfp_DATA   = TH1D("H_hsxpfp_DATA","HMS xpfp", 100, -0.09, 0.05)
-    H_hsypfp_DATA   = TH1D("H_hsypfp_DATA","HMS ypfp", 100, -0.05, 0.04)
-    H_ssdelta_DATA  = TH1D("H_ssdelta_DATA","SHMS delta", 100, -20.0, 20.0)
-    H_ssxptar_DATA  = TH1D("H_ssxptar_DATA","SHMS xptar", 100, -0.1, 0.1)
-    H_ssyptar_DATA  = TH1D("H_ssyptar_DATA","SHMS yptar", 100, -0.04, 0.04)
-    H_q_DATA        = TH1D("H_q_DATA","q", 100, 0.0, 10.0)
-    H_Q2_DATA       = TH1D("H_Q2_DATA","Q2", 100, inpDict["Q2min"], inpDict["Q2max"])
-    H_W_DATA  = TH1D("H_W_DATA","W ", 100, inpDict["Wmin"], inpDict["Wmax"])
-    H_t_DATA       = TH1D("H_t_DATA","-t", 100, inpDict["tmin"], inpDict["tmax"])
-    H_epsilon_DATA  = TH1D("H_epsilon_DATA","epsilon", 100, inpDict["Epsmin"], inpDict["Epsmax"])
-    H_MM_DATA  = TH1D("H_MM_DATA",f"MM_{ParticleType[0].upper()}", 100, inpDict["mm_min"], inpDict["mm_max"])
-    H_MM_fit1sub_DATA  = TH1D("H_MM_fit1sub_DATA",f"MM_fit1sub_{ParticleType[0].upper()}", 100, 0.7, 1.5)
-    H_MM_pisub_DATA  = TH1D("H_MM_pisub_DATA",f"MM_pisub_{ParticleType[0].upper()}", 100, 0.7, 1.5)
-    H_MM_nosub_DATA  = TH1D("H_MM_nosub_DATA",f"MM_nosub_{ParticleType[0].upper()}", 100, 0.7, 1.5)
-    H_th_DATA  = TH1D("H_th_DATA","X' tar", 100, -0.1, 0.1)
-    H_ph_DATA  = TH1D("H_ph_DATA","Y' tar", 100, -0.1, 0.1)
-    H_ph_q_DATA  = TH1D("H_ph_q_DATA","Phi Detected (ph_xq)", 100, -math.pi, math.pi)
-    H_th_q_DATA  = TH1D("H_th_q_DATA","Theta Detected (th_xq)", 100, -0.2, 0.2)
-    H_ph_recoil_DATA  = TH1D("H_ph_recoil_DATA","Phi Recoil (ph_bq)", 100, -10.0, 10.0)
-    H_th_recoil_DATA  = TH1D("H_th_recoil_DATA","Theta Recoil (th_bq)", 100, -10.0, 10.0)
-    H_pmiss_DATA  = TH1D("H_pmiss_DATA","pmiss", 100, 0.0, 2.0)
-    H_emiss_DATA  = TH1D("H_emiss_DATA","emiss", 100, 0.0, 2.0)
-    H_pmx_DATA  = TH1D("H_pmx_DATA","pmx", 100, -10.0, 10.0)
-    H_pmy_DATA  = TH1D("H_pmy_DATA","pmy ", 100, -10.0, 10.0)
-    H_pmz_DATA  = TH1D("H_pmz_DATA","pmz", 100, -10.0, 10.0)
-    H_ct_DATA = TH1D("H_ct_DATA", f"Electron-{ParticleType.capitalize()} CTime", 100, -50, 50)
-    H_cal_etottracknorm_DATA = TH1D("H_cal_etottracknorm_DATA", "HMS Cal etottracknorm", 100, 0.2, 1.8)
-    H_cer_npeSum_DATA = TH1D("H_cer_npeSum_DATA", "HMS Cer Npe Sum", 100, 0, 30)
-    P_cal_etottracknorm_DATA = TH1D("P_cal_etottracknorm_DATA", "SHMS Cal etottracknorm", 100, 0, 1)
-    P_hgcer_npeSum_DATA = TH1D("P_hgcer_npeSum_DATA", "SHMS HGCer Npe Sum", 100, 0, 10)
-    P_aero_npeSum_DATA = TH1D("P_aero_npeSum_DATA", "SHMS Aero Npe Sum", 100, 0, 30)
-
-    H_hsdelta_DUMMY  = TH1D("H_hsdelta_DUMMY","HMS Delta", 100, -20.0, 20.0)
-    H_hsxptar_DUMMY  = TH1D("H_hsxptar_DUMMY","HMS xptar", 100, -0.1, 0.1)
-    H_hsyptar_DUMMY  = TH1D("H_hsyptar_DUMMY","HMS yptar", 100, -0.1, 0.1)
-    H_ssxfp_DUMMY    = TH1D("H_ssxfp_DUMMY","SHMS xfp", 100, -25.0, 25.0)
-    H_ssyfp_DUMMY    = TH1D("H_ssyfp_DUMMY","SHMS yfp", 100, -25.0, 25.0)
-    H_ssxpfp_DUMMY   = TH1D("H_ssxpfp_DUMMY","SHMS xpfp", 100, -0.09, 0.09)
-    H_ssypfp_DUMMY   = TH1D("H_ssypfp_DUMMY","SHMS ypfp", 100, -0.05, 0.04)
-    H_hsxfp_DUMMY    = TH1D("H_hsxfp_DUMMY","HMS xfp", 100, -40.0, 40.0)
-    H_hsyfp_DUMMY    = TH1D("H_hsyfp_DUMMY","HMS yfp", 100, -20.0, 20.0)
-    H_hsxpfp_DUMMY   = TH1D("H_hsxpfp_DUMMY","HMS xpfp", 100, -0.09, 0.05)
-    H_hsypfp_DUMMY   = TH1D("H_hsypfp_DUMMY","HMS ypfp", 100, -0.05, 0.04)
-    H_ssdelta_DUMMY  = TH1D("H_ssdelta_DUMMY","SHMS delta", 100, -20.0, 20.0)
-    H_ssxptar_DUMMY  = TH1D("H_ssxptar_DUMMY","SHMS xptar", 100, -0.1, 0.1)
-    H_ssyptar_DUMMY  = TH1D("H_ssyptar_DUMMY","SHMS yptar", 100, -0.04, 0.04)
-    H_q_DUMMY        = TH1D("H_q_DUMMY","q", 100, 0.0, 10.0)
-    H_Q2_DUMMY       = TH1D("H_Q2_DUMMY","Q2", 100, inpDict["Q2min"], inpDict["Q2max"])
-    H_W_DUMMY  = TH1D("H_W_DUMMY","W ", 100, inpDict["Wmin"], inpDict["Wmax"])
-    H_t_DUMMY       = TH1D("H_t_DUMMY","-t", 100, inpDict["tmin"], inpDict["tmax"])  
-    H_epsilon_DUMMY  = TH1D("H_epsilon_DUMMY","epsilon", 100, inpDict["Epsmin"], inpDict["Epsmax"])
-    H_MM_DUMMY  = TH1D("H_MM_DUMMY",f"MM_{ParticleType[0].upper()}", 100, inpDict["mm_min"], inpDict["mm_max"])
-    H_MM_fit1sub_DUMMY  = TH1D("H_MM_fit1sub_DUMMY",f"MM_fit1sub_{ParticleType[0].upper()}", 100, 0.7, 1.5)
-    H_MM_pisub_DUMMY  = TH1D("H_MM_pisub_DUMMY",f"MM_pisub_{ParticleType[0].upper()}", 100, 0.7, 1.5)
-    H_MM_nosub_DUMMY  = TH1D("H_MM_nosub_DUMMY",f"MM_nosub_{ParticleType[0].upper()}", 100, 0.7, 1.5)
-    H_th_DUMMY  = TH1D("H_th_DUMMY","X' tar", 100, -0.1, 0.1)
-    H_ph_DUMMY  = TH1D("H_ph_DUMMY","Y' tar", 100, -0.1, 0.1)
-    H_ph_q_DUMMY  = TH1D("H_ph_q_DUMMY","Phi Detected (ph_xq)", 100, -math.pi, math.pi)
-    H_th_q_DUMMY  = TH1D("H_th_q_DUMMY","Theta Detected (th_xq)", 100, -0.2, 0.2)
-    H_ph_recoil_DUMMY  = TH1D("H_ph_recoil_DUMMY","Phi Recoil (ph_bq)", 100, -10.0, 10.0)
-    H_th_recoil_DUMMY  = TH1D("H_th_recoil_DUMMY","Theta Recoil (th_bq)", 100, -10.0, 10.0)
-    H_pmiss_DUMMY  = TH1D("H_pmiss_DUMMY","pmiss", 100, 0.0, 2.0)
-    H_emiss_DUMMY  = TH1D("H_emiss_DUMMY","emiss", 100, 0.0, 2.0)
-    H_pmx_DUMMY  = TH1D("H_pmx_DUMMY","pmx", 100, -10.0, 10.0)
-    H_pmy_DUMMY  = TH1D("H_pmy_DUMMY","pmy ", 100, -10.0, 10.0)
-    H_pmz_DUMMY  = TH1D("H_pmz_DUMMY","pmz", 100, -10.0, 10.0)
-    H_ct_DUMMY = TH1D("H_ct_DUMMY", f"Electron-{ParticleType.capitalize()} CTime", 100, -50, 50)
-
-    H_hsdelta_RAND  = TH1D("H_hsdelta_RAND","HMS Delta", 100, -20.0, 20.0)
-    H_hsxptar_RAND  = TH1D("H_hsxptar_RAND","HMS xptar", 100, -0.1, 0.1)
-    H_hsyptar_RAND  = TH1D("H_hsyptar_RAND","HMS yptar", 100, -0.1, 0.1)
-    H_ssxfp_RAND    = TH1D("H_ssxfp_RAND","SHMS xfp", 100, -25.0, 25.0)
-    H_ssyfp_RAND    = TH1D("H_ssyfp_RAND","SHMS yfp", 100, -25.0, 25.0)
-    H_ssxpfp_RAND   = TH1D("H_ssxpfp_RAND","SHMS xpfp", 100, -0.09, 0.09)
-    H_ssypfp_RAND   = TH1D("H_ssypfp_RAND","SHMS ypfp", 100, -0.05, 0.04)
-    H_hsxfp_RAND    = TH1D("H_hsxfp_RAND","HMS xfp", 100, -40.0, 40.0)
-    H_hsyfp_RAND    = TH1D("H_hsyfp_RAND","HMS yfp", 100, -20.0, 20.0)
-    H_hsxpfp_RAND   = TH1D("H_hsxpfp_RAND","HMS xpfp", 100, -0.09, 0.05)
-    H_hsypfp_RAND   = TH1D("H_hsypfp_RAND","HMS ypfp", 100, -0.05, 0.04)
-    H_ssdelta_RAND  = TH1D("H_ssdelta_RAND","SHMS delta", 100, -20.0, 20.0)
-    H_ssxptar_RAND  = TH1D("H_ssxptar_RAND","SHMS xptar", 100, -0.1, 0.1)
-    H_ssyptar_RAND  = TH1D("H_ssyptar_RAND","SHMS yptar", 100, -0.04, 0.04)
-    H_q_RAND        = TH1D("H_q_RAND","q", 100, 0.0, 10.0)
-    H_Q2_RAND       = TH1D("H_Q2_RAND","Q2", 100, inpDict["Q2min"], inpDict["Q2max"])
-    H_W_RAND  = TH1D("H_W_RAND","W ", 100, inpDict["Wmin"], inpDict["Wmax"])
-    H_t_RAND       = TH1D("H_t_RAND","-t", 100, inpDict["tmin"], inpDict["tmax"])
-    H_epsilon_RAND  = TH1D("H_epsilon_RAND","epsilon", 100, inpDict["Epsmin"], inpDict["Epsmax"])
-    H_MM_RAND  = TH1D("H_MM_RAND",f"MM_{ParticleType[0].upper()}", 100, inpDict["mm_min"], inpDict["mm_max"])
-    H_MM_fit1sub_RAND  = TH1D("H_MM_fit1sub_RAND",f"MM_fit1sub_{ParticleType[0].upper()}", 100, 0.7, 1.5)
-    H_MM_pisub_RAND  = TH1D("H_MM_pisub_RAND",f"MM_pisub_{ParticleType[0].upper()}", 100, 0.7, 1.5)
-    H_MM_nosub_RAND  = TH1D("H_MM_nosub_RAND",f"MM_nosub_{ParticleType[0].upper()}", 100, 0.7, 1.5)
-    H_th_RAND  = TH1D("H_th_RAND","X' tar", 100, -0.1, 0.1)
-    H_ph_RAND  = TH1D("H_ph_RAND","Y' tar", 100, -0.1, 0.1)
-    H_ph_q_RAND  = TH1D("H_ph_q_RAND","Phi Detected (ph_xq)", 100, -math.pi, math.pi)
-    H_th_q_RAND  = TH1D("H_th_q_RAND","Theta Detected (th_xq)", 100, -0.2, 0.2)
-    H_ph_recoil_RAND  = TH1D("H_ph_recoil_RAND","Phi Recoil (ph_bq)", 100, -10.0, 10.0)
-    H_th_recoil_RAND  = TH1D("H_th_recoil_RAND","Theta Recoil (th_bq)", 100, -10.0, 10.0)
-    H_pmiss_RAND  = TH1D("H_pmiss_RAND","pmiss", 100, 0.0, 2.0)
-    H_emiss_RAND  = TH1D("H_emiss_RAND","emiss", 100, 0.0, 2.0)
-    H_pmx_RAND  = TH1D("H_pmx_RAND","pmx", 100, -10.0, 10.0)
-    H_pmy_RAND  = TH1D("H_pmy_RAND","pmy ", 100, -10.0, 10.0)
-    H_pmz_RAND  = TH1D("H_pmz_RAND","pmz", 100, -10.0, 10.0)
-    H_ct_RAND = TH1D("H_ct_RAND", f"Electron-{ParticleType.capitalize()} CTime", 100, -50, 50)
-
-    H_hsdelta_DUMMY_RAND  = TH1D("H_hsdelta_DUMMY_RAND","HMS Delta", 100, -20.0, 20.0)
-    H_hsxptar_DUMMY_RAND  = TH1D("H_hsxptar_DUMMY_RAND","HMS xptar", 100, -0.1, 0.1)
-    H_hsyptar_DUMMY_RAND  = TH1D("H_hsyptar_DUMMY_RAND","HMS yptar", 100, -0.1, 0.1)
-    H_ssxfp_DUMMY_RAND    = TH1D("H_ssxfp_DUMMY_RAND","SHMS xfp", 100, -25.0, 25.0)
-    H_ssyfp_DUMMY_RAND    = TH1D("H_ssyfp_DUMMY_RAND","SHMS yfp", 100, -25.0, 25.0)
-    H_ssxpfp_DUMMY_RAND   = TH1D("H_ssxpfp_DUMMY_RAND","SHMS xpfp", 100, -0.09, 0.09)
-    H_ssypfp_DUMMY_RAND   = TH1D("H_ssypfp_DUMMY_RAND","SHMS ypfp", 100, -0.05, 0.04)
-    H_hsxfp_DUMMY_RAND    = TH1D("H_hsxfp_DUMMY_RAND","HMS xfp", 100, -40.0, 40.0)
-    H_hsyfp_DUMMY_RAND    = TH1D("H_hsyfp_DUMMY_RAND","HMS yfp", 100, -20.0, 20.0)
-    H_hsxpfp_DUMMY_RAND   = TH1D("H_hsxpfp_DUMMY_RAND","HMS xpfp", 100, -0.09, 0.05)
-    H_hsypfp_DUMMY_RAND   = TH1D("H_hsypfp_DUMMY_RAND","HMS ypfp", 100, -0.05, 0.04)
-    H_ssdelta_DUMMY_RAND  = TH1D("H_ssdelta_DUMMY_RAND","SHMS delta", 100, -20.0, 20.0)
-    H_ssxptar_DUMMY_RAND  = TH1D("H_ssxptar_DUMMY_RAND","SHMS xptar", 100, -0.1, 0.1)
-    H_ssyptar_DUMMY_RAND  = TH1D("H_ssyptar_DUMMY_RAND","SHMS yptar", 100, -0.04, 0.04)
-    H_q_DUMMY_RAND        = TH1D("H_q_DUMMY_RAND","q", 100, 0.0, 10.0)
-    H_Q2_DUMMY_RAND       = TH1D("H_Q2_DUMMY_RAND","Q2", 100, inpDict["Q2min"], inpDict["Q2max"])
-    H_W_DUMMY_RAND  = TH1D("H_W_DUMMY_RAND","W ", 100, inpDict["Wmin"], inpDict["Wmax"])
-    H_t_DUMMY_RAND       = TH1D("H_t_DUMMY_RAND","-t", 100, inpDict["tmin"], inpDict["tmax"])
-    H_epsilon_DUMMY_RAND  = TH1D("H_epsilon_DUMMY_RAND","epsilon", 100, inpDict["Epsmin"], inpDict["Epsmax"])
-    H_MM_DUMMY_RAND  = TH1D("H_MM_DUMMY_RAND",f"MM_{ParticleType[0].upper()}", 100, inpDict["mm_min"], inpDict["mm_max"])
-    H_MM_fit1sub_DUMMY_RAND  = TH1D("H_MM_fit1sub_DUMMY_RAND",f"MM_fit1sub_{ParticleType[0].upper()}", 100, 0.7, 1.5)
-    H_MM_pisub_DUMMY_RAND  = TH1D("H_MM_pisub_DUMMY_RAND",f"MM_pisub_{ParticleType[0].upper()}", 100, 0.7, 1.5)
-    H_MM_nosub_DUMMY_RAND  = TH1D("H_MM_nosub_DUMMY_RAND",f"MM_nosub_{ParticleType[0].upper()}", 100, 0.7, 1.5)
-    H_th_DUMMY_RAND  = TH1D("H_th_DUMMY_RAND","X' tar", 100, -0.1, 0.1)
-    H_ph_DUMMY_RAND  = TH1D("H_ph_DUMMY_RAND","Y' tar", 100, -0.1, 0.1)
-    H_ph_q_DUMMY_RAND  = TH1D("H_ph_q_DUMMY_RAND","Phi Detected (ph_xq)", 100, -math.pi, math.pi)
-    H_th_q_DUMMY_RAND  = TH1D("H_th_q_DUMMY_RAND","Theta Detected (th_xq)", 100, -0.2, 0.2)
-    H_ph_recoil_DUMMY_RAND  = TH1D("H_ph_recoil_DUMMY_RAND","Phi Recoil (ph_bq)", 100, -10.0, 10.0)
-    H_th_recoil_DUMMY_RAND  = TH1D("H_th_recoil_DUMMY_RAND","Theta Recoil (th_bq)", 100, -10.0, 10.0)
-    H_pmiss_DUMMY_RAND  = TH1D("H_pmiss_DUMMY_RAND","pmiss", 100, 0.0, 2.0)
-    H_emiss_DUMMY_RAND  = TH1D("H_emiss_DUMMY_RAND","emiss", 100, 0.0, 2.0)
-    H_pmx_DUMMY_RAND  = TH1D("H_pmx_DUMMY_RAND","pmx", 100, -10.0, 10.0)
-    H_pmy_DUMMY_RAND  = TH1D("H_pmy_DUMMY_RAND","pmy ", 100, -10.0, 10.0)
-    H_pmz_DUMMY_RAND  = TH1D("H_pmz_DUMMY_RAND","pmz", 100, -10.0, 10.0)
-    H_ct_DUMMY_RAND = TH1D("H_ct_DUMMY_RAND", f"Electron-{ParticleType.capitalize()} CTime", 100, -50, 50)
+    # Histograms by name as they are booked, filled by the columnar engine from FILL_SPEC
+    hist_objs = {}
+    def book(hist):
+        hist_objs[hist.GetName()] = hist
+        return hist
+
+    H_hsdelta_DATA  = book(TH1D("H_hsdelta_DATA","HMS Delta", 100, -20.0, 20.0))
+    H_hsxptar_DATA  = book(TH1D("H_hsxptar_DATA","HMS xptar", 100, -0.1, 0.1))
+    H_hsyptar_DATA  = book(TH1D("H_hsyptar_DATA","HMS yptar", 100, -0.1, 0.1))
+    H_ssxfp_DATA    = book(TH1D("H_ssxfp_DATA","SHMS xfp", 100, -25.0, 25.0))
+    H_ssyfp_DATA    = book(TH1D("H_ssyfp_DATA","SHMS yfp", 100, -25.0, 25.0))
+    H_ssxpfp_DATA   = book(TH1D("H_ssxpfp_DATA","SHMS xpfp", 100, -0.09, 0.09))
+    H_ssypfp_DATA   = book(TH1D("H_ssypfp_DATA","SHMS ypfp", 100, -0.05, 0.04))
+    H_hsxfp_DATA    = book(TH1D("H_hsxfp_DATA","HMS xfp", 100, -40.0, 40.0))
+    H_hsyfp_DATA    = book(TH1D("H_hsyfp_DATA","HMS yfp", 100, -20.0, 20.0))
+    H_hsxpfp_DATA   = book(TH1D("H_hsxpfp_DATA","HMS xpfp", 100, -0.09, 0.05))
+    H_hsypfp_DATA   = book(TH1D("H_hsypfp_DATA","HMS ypfp", 100, -0.05, 0.04))
+    H_ssdelta_DATA  = book(TH1D("H_ssdelta_DATA","SHMS delta", 100, -20.0, 20.0))
+    H_ssxptar_DATA  = book(TH1D("H_ssxptar_DATA","SHMS xptar", 100, -0.1, 0.1))
+    H_ssyptar_DATA  = book(TH1D("H_ssyptar_DATA","SHMS yptar", 100, -0.04, 0.04))
+    H_q_DATA        = book(TH1D("H_q_DATA","q", 100, 0.0, 10.0))
+    H_Q2_DATA       = book(TH1D("H_Q2_DATA","Q2", 100, inpDict["Q2min"], inpDict["Q2max"]))
+    H_W_DATA  = book(TH1D("H_W_DATA","W ", 100, inpDict["Wmin"], inpDict["Wmax"]))
+    H_t_DATA       = book(TH1D("H_t_DATA","-t", 100, inpDict["tmin"], inpDict["tmax"]))
+    H_epsilon_DATA  = book(TH1D("H_epsilon_DATA","epsilon", 100, inpDict["Epsmin"], inpDict["Epsmax"]))
+    H_MM_DATA  = book(TH1D("H_MM_DATA",f"MM_{ParticleType[0].upper()}", 100, inpDict["mm_min"], inpDict["mm_max"]))
+    H_MM_fit1sub_DATA  = book(TH1D("H_MM_fit1sub_DATA",f"MM_fit1sub_{ParticleType[0].upper()}", 100, 0.7, 1.5))
+    H_MM_pisub_DATA  = book(TH1D("H_MM_pisub_DATA",f"MM_pisub_{ParticleType[0].upper()}", 100, 0.7, 1.5))
+    H_MM_nosub_DATA  = book(TH1D("H_MM_nosub_DATA",f"MM_nosub_{ParticleType[0].upper()}", 100, 0.7, 1.5))
+    H_th_DATA  = book(TH1D("H_th_DATA","X' tar", 100, -0.1, 0.1))
+    H_ph_DATA  = book(TH1D("H_ph_DATA","Y' tar", 100, -0.1, 0.1))
+    H_ph_q_DATA  = book(TH1D("H_ph_q_DATA","Phi Detected (ph_xq)", 100, -math.pi, math.pi))
+    H_th_q_DATA  = book(TH1D("H_th_q_DATA","Theta Detected (th_xq)", 100, -0.2, 0.2))
+    H_ph_recoil_DATA  = book(TH1D("H_ph_recoil_DATA","Phi Recoil (ph_bq)", 100, -10.0, 10.0))
+    H_th_recoil_DATA  = book(TH1D("H_th_recoil_DATA","Theta Recoil (th_bq)", 100, -10.0, 10.0))
+    H_pmiss_DATA  = book(TH1D("H_pmiss_DATA","pmiss", 100, 0.0, 2.0))
+    H_emiss_DATA  = book(TH1D("H_emiss_DATA","emiss", 100, 0.0, 2.0))
+    H_pmx_DATA  = book(TH1D("H_pmx_DATA","pmx", 100, -10.0, 10.0))
+    H_pmy_DATA  = book(TH1D("H_pmy_DATA","pmy ", 100, -10.0, 10.0))
+    H_pmz_DATA  = book(TH1D("H_pmz_DATA","pmz", 100, -10.0, 10.0))
+    H_ct_DATA = book(TH1D("H_ct_DATA", f"Electron-{ParticleType.capitalize()} CTime", 100, -50, 50))
+    H_cal_etottracknorm_DATA = book(TH1D("H_cal_etottracknorm_DATA", "HMS Cal etottracknorm", 100, 0.2, 1.8))
+    H_cer_npeSum_DATA = book(TH1D("H_cer_npeSum_DATA", "HMS Cer Npe Sum", 100, 0, 30))
+    P_cal_etottracknorm_DATA = book(TH1D("P_cal_etottracknorm_DATA", "SHMS Cal etottracknorm", 100, 0, 1))
+    P_hgcer_npeSum_DATA = book(TH1D("P_hgcer_npeSum_DATA", "SHMS HGCer Npe Sum", 100, 0, 10))
+    P_aero_npeSum_DATA = book(TH1D("P_aero_npeSum_DATA", "SHMS Aero Npe Sum", 100, 0, 30))
+
+    H_hsdelta_DUMMY  = book(TH1D("H_hsdelta_DUMMY","HMS Delta", 100, -20.0, 20.0))
+    H_hsxptar_DUMMY  = book(TH1D("H_hsxptar_DUMMY","HMS xptar", 100, -0.1, 0.1))
+    H_hsyptar_DUMMY  = book(TH1D("H_hsyptar_DUMMY","HMS yptar", 100, -0.1, 0.1))
+    H_ssxfp_DUMMY    = book(TH1D("H_ssxfp_DUMMY","SHMS xfp", 100, -25.0, 25.0))
+    H_ssyfp_DUMMY    = book(TH1D("H_ssyfp_DUMMY","SHMS yfp", 100, -25.0, 25.0))
+    H_ssxpfp_DUMMY   = book(TH1D("H_ssxpfp_DUMMY","SHMS xpfp", 100, -0.09, 0.09))
+    H_ssypfp_DUMMY   = book(TH1D("H_ssypfp_DUMMY","SHMS ypfp", 100, -0.05, 0.04))
+    H_hsxfp_DUMMY    = book(TH1D("H_hsxfp_DUMMY","HMS xfp", 100, -40.0, 40.0))
+    H_hsyfp_DUMMY    = book(TH1D("H_hsyfp_DUMMY","HMS yfp", 100, -20.0, 20.0))
+    H_hsxpfp_DUMMY   = book(TH1D("H_hsxpfp_DUMMY","HMS xpfp", 100, -0.09, 0.05))
+    H_hsypfp_DUMMY   = book(TH1D("H_hsypfp_DUMMY","HMS ypfp", 100, -0.05, 0.04))
+    H_ssdelta_DUMMY  = book(TH1D("H_ssdelta_DUMMY","SHMS delta", 100, -20.0, 20.0))
+    H_ssxptar_DUMMY  = book(TH1D("H_ssxptar_DUMMY","SHMS xptar", 100, -0.1, 0.1))
+    H_ssyptar_DUMMY  = book(TH1D("H_ssyptar_DUMMY","SHMS yptar", 100, -0.04, 0.04))
+    H_q_DUMMY        = book(TH1D("H_q_DUMMY","q", 100, 0.0, 10.0))
+    H_Q2_DUMMY       = book(TH1D("H_Q2_DUMMY","Q2", 100, inpDict["Q2min"], inpDict["Q2max"]))
+    H_W_DUMMY  = book(TH1D("H_W_DUMMY","W ", 100, inpDict["Wmin"], inpDict["Wmax"]))
+    H_t_DUMMY       = book(TH1D("H_t_DUMMY","-t", 100, inpDict["tmin"], inpDict["tmax"]))  
+    H_epsilon_DUMMY  = book(TH1D("H_epsilon_DUMMY","epsilon", 100, inpDict["Epsmin"], inpDict["Epsmax"]))
+    H_MM_DUMMY  = book(TH1D("H_MM_DUMMY",f"MM_{ParticleType[0].upper()}", 100, inpDict["mm_min"], inpDict["mm_max"]))
+    H_MM_fit1sub_DUMMY  = book(TH1D("H_MM_fit1sub_DUMMY",f"MM_fit1sub_{ParticleType[0].upper()}", 100, 0.7, 1.5))
+    H_MM_pisub_DUMMY  = book(TH1D("H_MM_pisub_DUMMY",f"MM_pisub_{ParticleType[0].upper()}", 100, 0.7, 1.5))
+    H_MM_nosub_DUMMY  = book(TH1D("H_MM_nosub_DUMMY",f"MM_nosub_{ParticleType[0].upper()}", 100, 0.7, 1.5))
+    H_th_DUMMY  = book(TH1D("H_th_DUMMY","X' tar", 100, -0.1, 0.1))
+    H_ph_DUMMY  = book(TH1D("H_ph_DUMMY","Y' tar", 100, -0.1, 0.1))
+    H_ph_q_DUMMY  = book(TH1D("H_ph_q_DUMMY","Phi Detected (ph_xq)", 100, -math.pi, math.pi))
+    H_th_q_DUMMY  = book(TH1D("H_th_q_DUMMY","Theta Detected (th_xq)", 100, -0.2, 0.2))
+    H_ph_recoil_DUMMY  = book(TH1D("H_ph_recoil_DUMMY","Phi Recoil (ph_bq)", 100, -10.0, 10.0))
+    H_th_recoil_DUMMY  = book(TH1D("H_th_recoil_DUMMY","Theta Recoil (th_bq)", 100, -10.0, 10.0))
+    H_pmiss_DUMMY  = book(TH1D("H_pmiss_DUMMY","pmiss", 100, 0.0, 2.0))
+    H_emiss_DUMMY  = book(TH1D("H_emiss_DUMMY","emiss", 100, 0.0, 2.0))
+    H_pmx_DUMMY  = book(TH1D("H_pmx_DUMMY","pmx", 100, -10.0, 10.0))
+    H_pmy_DUMMY  = book(TH1D("H_pmy_DUMMY","pmy ", 100, -10.0, 10.0))
+    H_pmz_DUMMY  = book(TH1D("H_pmz_DUMMY","pmz", 100, -10.0, 10.0))
+    H_ct_DUMMY = book(TH1D("H_ct_DUMMY", f"Electron-{ParticleType.capitalize()} CTime", 100, -50, 50))
+
+    H_hsdelta_RAND  = book(TH1D("H_hsdelta_RAND","HMS Delta", 100, -20.0, 20.0))
+    H_hsxptar_RAND  = book(TH1D("H_hsxptar_RAND","HMS xptar", 100, -0.1, 0.1))
+    H_hsyptar_RAND  = book(TH1D("H_hsyptar_RAND","HMS yptar", 100, -0.1, 0.1))
+    H_ssxfp_RAND    = book(TH1D("H_ssxfp_RAND","SHMS xfp", 100, -25.0, 25.0))
+    H_ssyfp_RAND    = book(TH1D("H_ssyfp_RAND","SHMS yfp", 100, -25.0, 25.0))
+    H_ssxpfp_RAND   = book(TH1D("H_ssxpfp_RAND","SHMS xpfp", 100, -0.09, 0.09))
+    H_ssypfp_RAND   = book(TH1D("H_ssypfp_RAND","SHMS ypfp", 100, -0.05, 0.04))
+    H_hsxfp_RAND    = book(TH1D("H_hsxfp_RAND","HMS xfp", 100, -40.0, 40.0))
+    H_hsyfp_RAND    = book(TH1D("H_hsyfp_RAND","HMS yfp", 100, -20.0, 20.0))
+    H_hsxpfp_RAND   = book(TH1D("H_hsxpfp_RAND","HMS xpfp", 100, -0.09, 0.05))
+    H_hsypfp_RAND   = book(TH1D("H_hsypfp_RAND","HMS ypfp", 100, -0.05, 0.04))
+    H_ssdelta_RAND  = book(TH1D("H_ssdelta_RAND","SHMS delta", 100, -20.0, 20.0))
+    H_ssxptar_RAND  = book(TH1D("H_ssxptar_RAND","SHMS xptar", 100, -0.1, 0.1))
+    H_ssyptar_RAND  = book(TH1D("H_ssyptar_RAND","SHMS yptar", 100, -0.04, 0.04))
+    H_q_RAND        = book(TH1D("H_q_RAND","q", 100, 0.0, 10.0))
+    H_Q2_RAND       = book(TH1D("H_Q2_RAND","Q2", 100, inpDict["Q2min"], inpDict["Q2max"]))
+    H_W_RAND  = book(TH1D("H_W_RAND","W ", 100, inpDict["Wmin"], inpDict["Wmax"]))
+    H_t_RAND       = book(TH1D("H_t_RAND","-t", 100, inpDict["tmin"], inpDict["tmax"]))
+    H_epsilon_RAND  = book(TH1D("H_epsilon_RAND","epsilon", 100, inpDict["Epsmin"], inpDict["Epsmax"]))
+    H_MM_RAND  = book(TH1D("H_MM_RAND",f"MM_{ParticleType[0].upper()}", 100, inpDict["mm_min"], inpDict["mm_max"]))
+    H_MM_fit1sub_RAND  = book(TH1D("H_MM_fit1sub_RAND",f"MM_fit1sub_{ParticleType[0].upper()}", 100, 0.7, 1.5))
+    H_MM_pisub_RAND  = book(TH1D("H_MM_pisub_RAND",f"MM_pisub_{ParticleType[0].upper()}", 100, 0.7, 1.5))
+    H_MM_nosub_RAND  = book(TH1D("H_MM_nosub_RAND",f"MM_nosub_{ParticleType[0].upper()}", 100, 0.7, 1.5))
+    H_th_RAND  = book(TH1D("H_th_RAND","X' tar", 100, -0.1, 0.1))
+    H_ph_RAND  = book(TH1D("H_ph_RAND","Y' tar", 100, -0.1, 0.1))
+    H_ph_q_RAND  = book(TH1D("H_ph_q_RAND","Phi Detected (ph_xq)", 100, -math.pi, math.pi))
+    H_th_q_RAND  = book(TH1D("H_th_q_RAND","Theta Detected (th_xq)", 100, -0.2, 0.2))
+    H_ph_recoil_RAND  = book(TH1D("H_ph_recoil_RAND","Phi Recoil (ph_bq)", 100, -10.0, 10.0))
+    H_th_recoil_RAND  = book(TH1D("H_th_recoil_RAND","Theta Recoil (th_bq)", 100, -10.0, 10.0))
+    H_pmiss_RAND  = book(TH1D("H_pmiss_RAND","pmiss", 100, 0.0, 2.0))
+    H_emiss_RAND  = book(TH1D("H_emiss_RAND","emiss", 100, 0.0, 2.0))
+    H_pmx_RAND  = book(TH1D("H_pmx_RAND","pmx", 100, -10.0, 10.0))
+    H_pmy_RAND  = book(TH1D("H_pmy_RAND","pmy ", 100, -10.0, 10.0))
+    H_pmz_RAND  = book(TH1D("H_pmz_RAND","pmz", 100, -10.0, 10.0))
+    H_ct_RAND = book(TH1D("H_ct_RAND", f"Electron-{ParticleType.capitalize()} CTime", 100, -50, 50))
+
+    H_hsdelta_DUMMY_RAND  = book(TH1D("H_hsdelta_DUMMY_RAND","HMS Delta", 100, -20.0, 20.0))
+    H_hsxptar_DUMMY_RAND  = book(TH1D("H_hsxptar_DUMMY_RAND","HMS xptar", 100, -0.1, 0.1))
+    H_hsyptar_DUMMY_RAND  = book(TH1D("H_hsyptar_DUMMY_RAND","HMS yptar", 100, -0.1, 0.1))
+    H_ssxfp_DUMMY_RAND    = book(TH1D("H_ssxfp_DUMMY_RAND","SHMS xfp", 100, -25.0, 25.0))
+    H_ssyfp_DUMMY_RAND    = book(TH1D("H_ssyfp_DUMMY_RAND","SHMS yfp", 100, -25.0, 25.0))
+    H_ssxpfp_DUMMY_RAND   = book(TH1D("H_ssxpfp_DUMMY_RAND","SHMS xpfp", 100, -0.09, 0.09))
+    H_ssypfp_DUMMY_RAND   = book(TH1D("H_ssypfp_DUMMY_RAND","SHMS ypfp", 100, -0.05, 0.04))
+    H_hsxfp_DUMMY_RAND    = book(TH1D("H_hsxfp_DUMMY_RAND","HMS xfp", 100, -40.0, 40.0))
+    H_hsyfp_DUMMY_RAND    = book(TH1D("H_hsyfp_DUMMY_RAND","HMS yfp", 100, -20.0, 20.0))
+    H_hsxpfp_DUMMY_RAND   = book(TH1D("H_hsxpfp_DUMMY_RAND","HMS xpfp", 100, -0.09, 0.05))
+    H_hsypfp_DUMMY_RAND   = book(TH1D("H_hsypfp_DUMMY_RAND","HMS ypfp", 100, -0.05, 0.04))
+    H_ssdelta_DUMMY_RAND  = book(TH1D("H_ssdelta_DUMMY_RAND","SHMS delta", 100, -20.0, 20.0))
+    H_ssxptar_DUMMY_RAND  = book(TH1D("H_ssxptar_DUMMY_RAND","SHMS xptar", 100, -0.1, 0.1))
+    H_ssyptar_DUMMY_RAND  = book(TH1D("H_ssyptar_DUMMY_RAND","SHMS yptar", 100, -0.04, 0.04))
+    H_q_DUMMY_RAND        = book(TH1D("H_q_DUMMY_RAND","q", 100, 0.0, 10.0))
+    H_Q2_DUMMY_RAND       = book(TH1D("H_Q2_DUMMY_RAND","Q2", 100, inpDict["Q2min"], inpDict["Q2max"]))
+    H_W_DUMMY_RAND  = book(TH1D("H_W_DUMMY_RAND","W ", 100, inpDict["Wmin"], inpDict["Wmax"]))
+    H_t_DUMMY_RAND       = book(TH1D("H_t_DUMMY_RAND","-t", 100, inpDict["tmin"], inpDict["tmax"]))
+    H_epsilon_DUMMY_RAND  = book(TH1D("H_epsilon_DUMMY_RAND","epsilon", 100, inpDict["Epsmin"], inpDict["Epsmax"]))
+    H_MM_DUMMY_RAND  = book(TH1D("H_MM_DUMMY_RAND",f"MM_{ParticleType[0].upper()}", 100, inpDict["mm_min"], inpDict["mm_max"]))
+    H_MM_fit1sub_DUMMY_RAND  = book(TH1D("H_MM_fit1sub_DUMMY_RAND",f"MM_fit1sub_{ParticleType[0].upper()}", 100, 0.7, 1.5))
+    H_MM_pisub_DUMMY_RAND  = book(TH1D("H_MM_pisub_DUMMY_RAND",f"MM_pisub_{ParticleType[0].upper()}", 100, 0.7, 1.5))
+    H_MM_nosub_DUMMY_RAND  = book(TH1D("H_MM_nosub_DUMMY_RAND",f"MM_nosub_{ParticleType[0].upper()}", 100, 0.7, 1.5))
+    H_th_DUMMY_RAND  = book(TH1D("H_th_DUMMY_RAND","X' tar", 100, -0.1, 0.1))
+    H_ph_DUMMY_RAND  = book(TH1D("H_ph_DUMMY_RAND","Y' tar", 100, -0.1, 0.1))
+    H_ph_q_DUMMY_RAND  = book(TH1D("H_ph_q_DUMMY_RAND","Phi Detected (ph_xq)", 100, -math.pi, math.pi))
+    H_th_q_DUMMY_RAND  = book(TH1D("H_th_q_DUMMY_RAND","Theta Detected (th_xq)", 100, -0.2, 0.2))
+    H_ph_recoil_DUMMY_RAND  = book(TH1D("H_ph_recoil_DUMMY_RAND","Phi Recoil (ph_bq)", 100, -10.0, 10.0))
+    H_th_recoil_DUMMY_RAND  = book(TH1D("H_th_recoil_DUMMY_RAND","Theta Recoil (th_bq)", 100, -10.0, 10.0))
+    H_pmiss_DUMMY_RAND  = book(TH1D("H_pmiss_DUMMY_RAND","pmiss", 100, 0.0, 2.0))
+    H_emiss_DUMMY_RAND  = book(TH1D("H_emiss_DUMMY_RAND","emiss", 100, 0.0, 2.0))
+    H_pmx_DUMMY_RAND  = book(TH1D("H_pmx_DUMMY_RAND","pmx", 100, -10.0, 10.0))
+    H_pmy_DUMMY_RAND  = book(TH1D("H_pmy_DUMMY_RAND","pmy ", 100, -10.0, 10.0))
+    H_pmz_DUMMY_RAND  = book(TH1D("H_pmz_DUMMY_RAND","pmz", 100, -10.0, 10.0))
+    H_ct_DUMMY_RAND = book(TH1D("H_ct_DUMMY_RAND", f"Electron-{ParticleType.capitalize()} CTime", 100, -50, 50))
 
     ################################################################################################################################################
     # 2D histograms
 
-    MM_vs_CoinTime_DATA = TH2D("MM_vs_CoinTime_DATA","Missing Mass vs CTime; MM; Coin_Time",100, inpDict["mm_min"], inpDict["mm_max"], 100, -50, 50)
-    CoinTime_vs_beta_DATA = TH2D("CoinTime_vs_beta_DATA", "CTime vs SHMS #beta; Coin_Time; SHMS_#beta", 100, -10, 10, 100, 0, 2)
-    MM_vs_beta_DATA = TH2D("MM_vs_beta_DATA", "Missing Mass vs SHMS #beta; MM; SHMS_#beta", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0, 2)
-    MM_vs_H_cer_DATA = TH2D("MM_vs_H_cer_DATA", "Missing Mass vs HMS Cerenkov; MM; HMS Cerenkov", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0, 30)
-    MM_vs_H_cal_DATA = TH2D("MM_vs_H_cal_DATA", "Missing Mass vs HMS Cal eTrackNorm; MM; HMS Cal eTrackNorm", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0.2, 1.8)
-    MM_vs_P_cal_DATA = TH2D("MM_vs_P_cal_DATA", "Missing Mass vs SHMS Cal eTrackNorm; MM; SHMS Cal eTrackNorm", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0, 1)
-    MM_vs_P_hgcer_DATA = TH2D("MM_vs_P_hgcer_DATA", "Missing Mass vs SHMS HGCer; MM; SHMS HGCer", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0, 10)
-    MM_vs_P_aero_DATA = TH2D("MM_vs_P_aero_DATA", "Missing Mass vs SHMS Aerogel; MM; SHMS Aerogel", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0, 30)
-    phiq_vs_t_DATA = TH2D("phiq_vs_t_DATA","; #phi ;t", 12, -3.14, 3.14, 24, inpDict["tmin"], inpDict["tmax"])
+    MM_vs_CoinTime_DATA = book(TH2D("MM_vs_CoinTime_DATA","Missing Mass vs CTime; MM; Coin_Time",100, inpDict["mm_min"], inpDict["mm_max"], 100, -50, 50))
+    CoinTime_vs_beta_DATA = book(TH2D("CoinTime_vs_beta_DATA", "CTime vs SHMS #beta; Coin_Time; SHMS_#beta", 100, -10, 10, 100, 0, 2))
+    MM_vs_beta_DATA = book(TH2D("MM_vs_beta_DATA", "Missing Mass vs SHMS #beta; MM; SHMS_#beta", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0, 2))
+    MM_vs_H_cer_DATA = book(TH2D("MM_vs_H_cer_DATA", "Missing Mass vs HMS Cerenkov; MM; HMS Cerenkov", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0, 30))
+    MM_vs_H_cal_DATA = book(TH2D("MM_vs_H_cal_DATA", "Missing Mass vs HMS Cal eTrackNorm; MM; HMS Cal eTrackNorm", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0.2, 1.8))
+    MM_vs_P_cal_DATA = book(TH2D("MM_vs_P_cal_DATA", "Missing Mass vs SHMS Cal eTrackNorm; MM; SHMS Cal eTrackNorm", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0, 1))
+    MM_vs_P_hgcer_DATA = book(TH2D("MM_vs_P_hgcer_DATA", "Missing Mass vs SHMS HGCer; MM; SHMS HGCer", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0, 10))
+    MM_vs_P_aero_DATA = book(TH2D("MM_vs_P_aero_DATA", "Missing Mass vs SHMS Aerogel; MM; SHMS Aerogel", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0, 30))
+    phiq_vs_t_DATA = book(TH2D("phiq_vs_t_DATA","; #phi ;t", 12, -3.14, 3.14, 24, inpDict["tmin"], inpDict["tmax"]))
     polar_phiq_vs_t_DATA = TGraphPolar()
     polar_phiq_vs_t_DATA.SetName("polar_phiq_vs_t_DATA")
-    Q2_vs_W_DATA = TH2D("Q2_vs_W_DATA", "Q^{2} vs W; Q^{2}; W", 50, inpDict["Q2min"], inpDict["Q2max"], 50, inpDict["Wmin"], inpDict["Wmax"])
-    Q2_vs_t_DATA = TH2D("Q2_vs_t_DATA", "Q^{2} vs t; Q^{2}; t", 50, inpDict["Q2min"], inpDict["Q2max"], 50, inpDict["tmin"], inpDict["tmax"])
-    W_vs_t_DATA = TH2D("W_vs_t_DATA", "W vs t; W; t", 50, inpDict["Wmin"], inpDict["Wmax"], 50, inpDict["tmin"], inpDict["tmax"])
-    EPS_vs_t_DATA = TH2D("EPS_vs_t_DATA", "Epsilon vs t; Epsilon; t", 50, inpDict["Epsmin"], inpDict["Epsmax"], 50, inpDict["tmin"], inpDict["tmax"])
-    MM_vs_t_DATA = TH2D("MM_vs_t_DATA", "Missing Mass vs t; MM; t", 100, inpDict["mm_min"], inpDict["mm_max"], 100, inpDict["tmin"], inpDict["tmax"])
+    book(polar_phiq_vs_t_DATA)
+    # Binned (phi [deg], -t) version of the polar plot, fixed memory regardless of statistics
+    polar_phiq_vs_t_binned_DATA = book(TH2D("polar_phiq_vs_t_binned_DATA","; #phi ;-t", 72, -180, 180, 50, 0.0, inpDict["tmax"]))
+    Q2_vs_W_DATA = book(TH2D("Q2_vs_W_DATA", "Q^{2} vs W; Q^{2}; W", 50, inpDict["Q2min"], inpDict["Q2max"], 50, inpDict["Wmin"], inpDict["Wmax"]))
+    Q2_vs_t_DATA = book(TH2D("Q2_vs_t_DATA", "Q^{2} vs t; Q^{2}; t", 50, inpDict["Q2min"], inpDict["Q2max"], 50, inpDict["tmin"], inpDict["tmax"]))
+    W_vs_t_DATA = book(TH2D("W_vs_t_DATA", "W vs t; W; t", 50, inpDict["Wmin"], inpDict["Wmax"], 50, inpDict["tmin"], inpDict["tmax"]))
+    EPS_vs_t_DATA = book(TH2D("EPS_vs_t_DATA", "Epsilon vs t; Epsilon; t", 50, inpDict["Epsmin"], inpDict["Epsmax"], 50, inpDict["tmin"], inpDict["tmax"]))
+    MM_vs_t_DATA = book(TH2D("MM_vs_t_DATA", "Missing Mass vs t; MM; t", 100, inpDict["mm_min"], inpDict["mm_max"], 100, inpDict["tmin"], inpDict["tmax"]))
     # HGCer hole comparison plots
-    P_hgcer_xAtCer_vs_yAtCer_DATA = TH2D("P_hgcer_xAtCer_vs_yAtCer_DATA", "X vs Y; X; Y", 50, -30, 30, 50, -30, 30)
+    P_hgcer_xAtCer_vs_yAtCer_DATA = book(TH2D("P_hgcer_xAtCer_vs_yAtCer_DATA", "X vs Y; X; Y", 50, -30, 30, 50, -30, 30))
     if ParticleType == "kaon":
-        P_hgcer_nohole_xAtCer_vs_yAtCer_DATA = TH2D("P_hgcer_nohole_xAtCer_vs_yAtCer_DATA", "X vs Y (no hole cut); X; Y", 50, -30, 30, 50, -30, 30)
-    P_hgcer_xAtCer_vs_MM_DATA = TH2D("P_hgcer_xAtCer_vs_MM_DATA", "X vs MM; X; MM", 50, -30, 30, 50, 0, 2)
+        P_hgcer_nohole_xAtCer_vs_yAtCer_DATA = book(TH2D("P_hgcer_nohole_xAtCer_vs_yAtCer_DATA", "X vs Y (no hole cut); X; Y", 50, -30, 30, 50, -30, 30))
+    P_hgcer_xAtCer_vs_MM_DATA = book(TH2D("P_hgcer_xAtCer_vs_MM_DATA", "X vs MM; X; MM", 50, -30, 30, 50, 0, 2))
     if ParticleType == "kaon":
-        P_hgcer_nohole_xAtCer_vs_MM_DATA = TH2D("P_hgcer_nohole_xAtCer_vs_MM_DATA", "X vs MM (no hole cut); X; MM", 50, -30, 30, 50, 0, 2)
-    P_hgcer_yAtCer_vs_MM_DATA = TH2D("P_hgcer_yAtCer_vs_MM_DATA", "Y vs MM; Y; MM", 50, -30, 30, 50, 0, 2)
+        P_hgcer_nohole_xAtCer_vs_MM_DATA = book(TH2D("P_hgcer_nohole_xAtCer_vs_MM_DATA", "X vs MM (no hole cut); X; MM", 50, -30, 30, 50, 0, 2))
+    P_hgcer_yAtCer_vs_MM_DATA = book(TH2D("P_hgcer_yAtCer_vs_MM_DATA", "Y vs MM; Y; MM", 50, -30, 30, 50, 0, 2))
     if ParticleType == "kaon":
-        P_hgcer_nohole_yAtCer_vs_MM_DATA = TH2D("P_hgcer_nohole_yAtCer_vs_MM_DATA", "Y vs MM (no hole cut); Y; MM", 50, -30, 30, 50, 0, 2)
+        P_hgcer_nohole_yAtCer_vs_MM_DATA = book(TH2D("P_hgcer_nohole_yAtCer_vs_MM_DATA", "Y vs MM (no hole cut); Y; MM", 50, -30, 30, 50, 0, 2))
     
-    MM_vs_CoinTime_DUMMY = TH2D("MM_vs_CoinTime_DUMMY","Missing Mass vs CTime; MM; Coin_Time",100, inpDict["mm_min"], inpDict["mm_max"], 100, -50, 50)
-    CoinTime_vs_beta_DUMMY = TH2D("CoinTime_vs_beta_DUMMY", "CTime vs SHMS #beta; Coin_Time; SHMS_#beta", 100, -10, 10, 100, 0, 2)
-    MM_vs_beta_DUMMY = TH2D("MM_vs_beta_DUMMY", "Missing Mass vs SHMS #beta; MM; SHMS_#beta", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0, 2)
-    MM_vs_H_cer_DUMMY = TH2D("MM_vs_H_cer_DUMMY", "Missing Mass vs HMS Cerenkov; MM; HMS Cerenkov", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0, 30)
-    MM_vs_P_cal_DUMMY = TH2D("MM_vs_P_cal_DUMMY", "Missing Mass vs SHMS Cal eTrackNorm; MM; SHMS Cal eTrackNorm", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0.2, 1.8)    
-    MM_vs_H_cal_DUMMY = TH2D("MM_vs_H_cal_DUMMY", "Missing Mass vs HMS Cal eTrackNorm; MM; HMS Cal eTrackNorm", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0, 1)
-    MM_vs_P_hgcer_DUMMY = TH2D("MM_vs_P_hgcer_DUMMY", "Missing Mass vs SHMS HGCer; MM; SHMS HGCer", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0, 10)
-    MM_vs_P_aero_DUMMY = TH2D("MM_vs_P_aero_DUMMY", "Missing Mass vs SHMS Aerogel; MM; SHMS Aerogel", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0, 30)    
-    phiq_vs_t_DUMMY = TH2D("phiq_vs_t_DUMMY","; #phi ;t", 12, -3.14, 3.14, 24, inpDict["tmin"], inpDict["tmax"])
+    MM_vs_CoinTime_DUMMY = book(TH2D("MM_vs_CoinTime_DUMMY","Missing Mass vs CTime; MM; Coin_Time",100, inpDict["mm_min"], inpDict["mm_max"], 100, -50, 50))
+    CoinTime_vs_beta_DUMMY = book(TH2D("CoinTime_vs_beta_DUMMY", "CTime vs SHMS #beta; Coin_Time; SHMS_#beta", 100, -10, 10, 100, 0, 2))
+    MM_vs_beta_DUMMY = book(TH2D("MM_vs_beta_DUMMY", "Missing Mass vs SHMS #beta; MM; SHMS_#beta", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0, 2))
+    MM_vs_H_cer_DUMMY = book(TH2D("MM_vs_H_cer_DUMMY", "Missing Mass vs HMS Cerenkov; MM; HMS Cerenkov", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0, 30))
+    MM_vs_P_cal_DUMMY = book(TH2D("MM_vs_P_cal_DUMMY", "Missing Mass vs SHMS Cal eTrackNorm; MM; SHMS Cal eTrackNorm", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0.2, 1.8))    
+    MM_vs_H_cal_DUMMY = book(TH2D("MM_vs_H_cal_DUMMY", "Missing Mass vs HMS Cal eTrackNorm; MM; HMS Cal eTrackNorm", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0, 1))
+    MM_vs_P_hgcer_DUMMY = book(TH2D("MM_vs_P_hgcer_DUMMY", "Missing Mass vs SHMS HGCer; MM; SHMS HGCer", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0, 10))
+    MM_vs_P_aero_DUMMY = book(TH2D("MM_vs_P_aero_DUMMY", "Missing Mass vs SHMS Aerogel; MM; SHMS Aerogel", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0, 30))    
+    phiq_vs_t_DUMMY = book(TH2D("phiq_vs_t_DUMMY","; #phi ;t", 12, -3.14, 3.14, 24, inpDict["tmin"], inpDict["tmax"]))
     polar_phiq_vs_t_DUMMY = TGraphPolar()
     polar_phiq_vs_t_DUMMY.SetName("polar_phiq_vs_t_DUMMY")
-    Q2_vs_W_DUMMY = TH2D("Q2_vs_W_DUMMY", "Q^{2} vs W; Q^{2}; W", 50, inpDict["Q2min"], inpDict["Q2max"], 50, inpDict["Wmin"], inpDict["Wmax"])
-    Q2_vs_t_DUMMY = TH2D("Q2_vs_t_DUMMY", "Q^{2} vs t; Q^{2}; t", 50, inpDict["Q2min"], inpDict["Q2max"], 50, inpDict["tmin"], inpDict["tmax"])
-    W_vs_t_DUMMY = TH2D("W_vs_t_DUMMY", "W vs t; W; t", 50, inpDict["Wmin"], inpDict["Wmax"], 50, inpDict["tmin"], inpDict["tmax"])
-    EPS_vs_t_DUMMY = TH2D("EPS_vs_t_DUMMY", "Epsilon vs t; Epsilon; t", 50, inpDict["Epsmin"], inpDict["Epsmax"], 50, inpDict["tmin"], inpDict["tmax"])
-    MM_vs_t_DUMMY = TH2D("MM_vs_t_DUMMY", "Missing Mass vs t; MM; t", 100, inpDict["mm_min"], inpDict["mm_max"], 100, inpDict["tmin"], inpDict["tmax"])
+    book(polar_phiq_vs_t_DUMMY)
+    # Binned (phi [deg], -t) version of the polar plot, fixed memory regardless of statistics
+    polar_phiq_vs_t_binned_DUMMY = book(TH2D("polar_phiq_vs_t_binned_DUMMY","; #phi ;-t", 72, -180, 180, 50, 0.0, inpDict["tmax"]))
+    Q2_vs_W_DUMMY = book(TH2D("Q2_vs_W_DUMMY", "Q^{2} vs W; Q^{2}; W", 50, inpDict["Q2min"], inpDict["Q2max"], 50, inpDict["Wmin"], inpDict["Wmax"]))
+    Q2_vs_t_DUMMY = book(TH2D("Q2_vs_t_DUMMY", "Q^{2} vs t; Q^{2}; t", 50, inpDict["Q2min"], inpDict["Q2max"], 50, inpDict["tmin"], inpDict["tmax"]))
+    W_vs_t_DUMMY = book(TH2D("W_vs_t_DUMMY", "W vs t; W; t", 50, inpDict["Wmin"], inpDict["Wmax"], 50, inpDict["tmin"], inpDict["tmax"]))
+    EPS_vs_t_DUMMY = book(TH2D("EPS_vs_t_DUMMY", "Epsilon vs t; Epsilon; t", 50, inpDict["Epsmin"], inpDict["Epsmax"], 50, inpDict["tmin"], inpDict["tmax"]))
+    MM_vs_t_DUMMY = book(TH2D("MM_vs_t_DUMMY", "Missing Mass vs t; MM; t", 100, inpDict["mm_min"], inpDict["mm_max"], 100, inpDict["tmin"], inpDict["tmax"]))
     # HGCer hole comparison plots
-    P_hgcer_xAtCer_vs_yAtCer_DUMMY = TH2D("P_hgcer_xAtCer_vs_yAtCer_DUMMY", "X vs Y; X; Y", 50, -30, 30, 50, -30, 30)
+    P_hgcer_xAtCer_vs_yAtCer_DUMMY = book(TH2D("P_hgcer_xAtCer_vs_yAtCer_DUMMY", "X vs Y; X; Y", 50, -30, 30, 50, -30, 30))
     if ParticleType == "kaon":
-        P_hgcer_nohole_xAtCer_vs_yAtCer_DUMMY = TH2D("P_hgcer_nohole_xAtCer_vs_yAtCer_DUMMY", "X vs Y (no hole cut); X; Y", 50, -30, 30, 50, -30, 30)
-    P_hgcer_xAtCer_vs_MM_DUMMY = TH2D("P_hgcer_xAtCer_vs_MM_DUMMY", "X vs MM; X; MM", 50, -30, 30, 50, 0, 2)
+        P_hgcer_nohole_xAtCer_vs_yAtCer_DUMMY = book(TH2D("P_hgcer_nohole_xAtCer_vs_yAtCer_DUMMY", "X vs Y (no hole cut); X; Y", 50, -30, 30, 50, -30, 30))
+    P_hgcer_xAtCer_vs_MM_DUMMY = book(TH2D("P_hgcer_xAtCer_vs_MM_DUMMY", "X vs MM; X; MM", 50, -30, 30, 50, 0, 2))
     if ParticleType == "kaon":
-        P_hgcer_nohole_xAtCer_vs_MM_DUMMY = TH2D("P_hgcer_nohole_xAtCer_vs_MM_DUMMY", "X vs MM (no hole cut); X; MM", 50, -30, 30, 50, 0, 2)
-    P_hgcer_yAtCer_vs_MM_DUMMY = TH2D("P_hgcer_yAtCer_vs_MM_DUMMY", "Y vs MM; Y; MM", 50, -30, 30, 50, 0, 2)
+        P_hgcer_nohole_xAtCer_vs_MM_DUMMY = book(TH2D("P_hgcer_nohole_xAtCer_vs_MM_DUMMY", "X vs MM (no hole cut); X; MM", 50, -30, 30, 50, 0, 2))
+    P_hgcer_yAtCer_vs_MM_DUMMY = book(TH2D("P_hgcer_yAtCer_vs_MM_DUMMY", "Y vs MM; Y; MM", 50, -30, 30, 50, 0, 2))
     if ParticleType == "kaon":
-        P_hgcer_nohole_yAtCer_vs_MM_DUMMY = TH2D("P_hgcer_nohole_yAtCer_vs_MM_DUMMY", "Y vs MM (no hole cut); Y; MM", 50, -30, 30, 50, 0, 2)
+        P_hgcer_nohole_yAtCer_vs_MM_DUMMY = book(TH2D("P_hgcer_nohole_yAtCer_vs_MM_DUMMY", "Y vs MM (no hole cut); Y; MM", 50, -30, 30, 50, 0, 2))
     
-    MM_vs_CoinTime_RAND = TH2D("MM_vs_CoinTime_RAND","Missing Mass vs CTime; MM; Coin_Time",100, inpDict["mm_min"], inpDict["mm_max"], 100, -50, 50)
-    CoinTime_vs_beta_RAND = TH2D("CoinTime_vs_beta_RAND", "CTime vs SHMS #beta; Coin_Time; SHMS_#beta", 100, -10, 10, 100, 0, 2)
-    MM_vs_beta_RAND = TH2D("MM_vs_beta_RAND", "Missing Mass vs SHMS #beta; MM; SHMS_#beta", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0, 2)
-    MM_vs_H_cer_RAND = TH2D("MM_vs_H_cer_RAND", "Missing Mass vs HMS Cerenkov; MM; HMS Cerenkov", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0, 30)
-    MM_vs_H_cal_RAND = TH2D("MM_vs_H_cal_RAND", "Missing Mass vs HMS Cal eTrackNorm; MM; HMS Cal eTrackNorm", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0.2, 1.8)
-    MM_vs_P_cal_RAND = TH2D("MM_vs_P_cal_RAND", "Missing Mass vs SHMS Cal eTrackNorm; MM; SHMS Cal eTrackNorm", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0, 1)    
-    MM_vs_P_hgcer_RAND = TH2D("MM_vs_P_hgcer_RAND", "Missing Mass vs SHMS HGCer; MM; SHMS HGCer", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0, 10)
-    MM_vs_P_aero_RAND = TH2D("MM_vs_P_aero_RAND", "Missing Mass vs SHMS Aerogel; MM; SHMS Aerogel", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0, 30)    
-    phiq_vs_t_RAND = TH2D("phiq_vs_t_RAND","; #phi ;t", 12, -3.14, 3.14, 24, inpDict["tmin"], inpDict["tmax"])
-    Q2_vs_W_RAND = TH2D("Q2_vs_W_RAND", "Q^{2} vs W; Q^{2}; W", 50, inpDict["Q2min"], inpDict["Q2max"], 50, inpDict["Wmin"], inpDict["Wmax"])
-    Q2_vs_t_RAND = TH2D("Q2_vs_t_RAND", "Q^{2} vs t; Q^{2}; t", 50, inpDict["Q2min"], inpDict["Q2max"], 50, inpDict["tmin"], inpDict["tmax"])
-    W_vs_t_RAND = TH2D("W_vs_t_RAND", "W vs t; W; t", 50, inpDict["Wmin"], inpDict["Wmax"], 50, inpDict["tmin"], inpDict["tmax"])
-    EPS_vs_t_RAND = TH2D("EPS_vs_t_RAND", "Epsilon vs t; Epsilon; t", 50, inpDict["Epsmin"], inpDict["Epsmax"], 50, inpDict["tmin"], inpDict["tmax"])
-    MM_vs_t_RAND = TH2D("MM_vs_t_RAND", "Missing Mass vs t; MM; t", 100, inpDict["mm_min"], inpDict["mm_max"], 100, inpDict["tmin"], inpDict["tmax"])
+    MM_vs_CoinTime_RAND = book(TH2D("MM_vs_CoinTime_RAND","Missing Mass vs CTime; MM; Coin_Time",100, inpDict["mm_min"], inpDict["mm_max"], 100, -50, 50))
+    CoinTime_vs_beta_RAND = book(TH2D("CoinTime_vs_beta_RAND", "CTime vs SHMS #beta; Coin_Time; SHMS_#beta", 100, -10, 10, 100, 0, 2))
+    MM_vs_beta_RAND = book(TH2D("MM_vs_beta_RAND", "Missing Mass vs SHMS #beta; MM; SHMS_#beta", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0, 2))
+    MM_vs_H_cer_RAND = book(TH2D("MM_vs_H_cer_RAND", "Missing Mass vs HMS Cerenkov; MM; HMS Cerenkov", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0, 30))
+    MM_vs_H_cal_RAND = book(TH2D("MM_vs_H_cal_RAND", "Missing Mass vs HMS Cal eTrackNorm; MM; HMS Cal eTrackNorm", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0.2, 1.8))
+    MM_vs_P_cal_RAND = book(TH2D("MM_vs_P_cal_RAND", "Missing Mass vs SHMS Cal eTrackNorm; MM; SHMS Cal eTrackNorm", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0, 1))    
+    MM_vs_P_hgcer_RAND = book(TH2D("MM_vs_P_hgcer_RAND", "Missing Mass vs SHMS HGCer; MM; SHMS HGCer", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0, 10))
+    MM_vs_P_aero_RAND = book(TH2D("MM_vs_P_aero_RAND", "Missing Mass vs SHMS Aerogel; MM; SHMS Aerogel", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0, 30))    
+    phiq_vs_t_RAND = book(TH2D("phiq_vs_t_RAND","; #phi ;t", 12, -3.14, 3.14, 24, inpDict["tmin"], inpDict["tmax"]))
+    Q2_vs_W_RAND = book(TH2D("Q2_vs_W_RAND", "Q^{2} vs W; Q^{2}; W", 50, inpDict["Q2min"], inpDict["Q2max"], 50, inpDict["Wmin"], inpDict["Wmax"]))
+    Q2_vs_t_RAND = book(TH2D("Q2_vs_t_RAND", "Q^{2} vs t; Q^{2}; t", 50, inpDict["Q2min"], inpDict["Q2max"], 50, inpDict["tmin"], inpDict["tmax"]))
+    W_vs_t_RAND = book(TH2D("W_vs_t_RAND", "W vs t; W; t", 50, inpDict["Wmin"], inpDict["Wmax"], 50, inpDict["tmin"], inpDict["tmax"]))
+    EPS_vs_t_RAND = book(TH2D("EPS_vs_t_RAND", "Epsilon vs t; Epsilon; t", 50, inpDict["Epsmin"], inpDict["Epsmax"], 50, inpDict["tmin"], inpDict["tmax"]))
+    MM_vs_t_RAND = book(TH2D("MM_vs_t_RAND", "Missing Mass vs t; MM; t", 100, inpDict["mm_min"], inpDict["mm_max"], 100, inpDict["tmin"], inpDict["tmax"]))
     # HGCer hole comparison plots
-    P_hgcer_xAtCer_vs_yAtCer_RAND = TH2D("P_hgcer_xAtCer_vs_yAtCer_RAND", "X vs Y; X; Y", 50, -30, 30, 50, -30, 30)
+    P_hgcer_xAtCer_vs_yAtCer_RAND = book(TH2D("P_hgcer_xAtCer_vs_yAtCer_RAND", "X vs Y; X; Y", 50, -30, 30, 50, -30, 30))
     if ParticleType == "kaon":
-        P_hgcer_nohole_xAtCer_vs_yAtCer_RAND = TH2D("P_hgcer_nohole_xAtCer_vs_yAtCer_RAND", "X vs Y (no hole cut); X; Y", 50, -30, 30, 50, -30, 30)
-    P_hgcer_xAtCer_vs_MM_RAND = TH2D("P_hgcer_xAtCer_vs_MM_RAND", "X vs MM; X; MM", 50, -30, 30, 50, 0, 2)
+        P_hgcer_nohole_xAtCer_vs_yAtCer_RAND = book(TH2D("P_hgcer_nohole_xAtCer_vs_yAtCer_RAND", "X vs Y (no hole cut); X; Y", 50, -30, 30, 50, -30, 30))
+    P_hgcer_xAtCer_vs_MM_RAND = book(TH2D("P_hgcer_xAtCer_vs_MM_RAND", "X vs MM; X; MM", 50, -30, 30, 50, 0, 2))
     if ParticleType == "kaon":
-        P_hgcer_nohole_xAtCer_vs_MM_RAND = TH2D("P_hgcer_nohole_xAtCer_vs_MM_RAND", "X vs MM (no hole cut); X; MM", 50, -30, 30, 50, 0, 2)
-    P_hgcer_yAtCer_vs_MM_RAND = TH2D("P_hgcer_yAtCer_vs_MM_RAND", "Y vs MM; Y; MM", 50, -30, 30, 50, 0, 2)
+        P_hgcer_nohole_xAtCer_vs_MM_RAND = book(TH2D("P_hgcer_nohole_xAtCer_vs_MM_RAND", "X vs MM (no hole cut); X; MM", 50, -30, 30, 50, 0, 2))
+    P_hgcer_yAtCer_vs_MM_RAND = book(TH2D("P_hgcer_yAtCer_vs_MM_RAND", "Y vs MM; Y; MM", 50, -30, 30, 50, 0, 2))
     if ParticleType == "kaon":
-        P_hgcer_nohole_yAtCer_vs_MM_RAND = TH2D("P_hgcer_nohole_yAtCer_vs_MM_RAND", "Y vs MM (no hole cut); Y; MM", 50, -30, 30, 50, 0, 2)
+        P_hgcer_nohole_yAtCer_vs_MM_RAND = book(TH2D("P_hgcer_nohole_yAtCer_vs_MM_RAND", "Y vs MM (no hole cut); Y; MM", 50, -30, 30, 50, 0, 2))
     
-    MM_vs_CoinTime_DUMMY_RAND = TH2D("MM_vs_CoinTime_DUMMY_RAND","Missing Mass vs CTime; MM; Coin_Time",100, inpDict["mm_min"], inpDict["mm_max"], 100, -50, 50)
-    CoinTime_vs_beta_DUMMY_RAND = TH2D("CoinTime_vs_beta_DUMMY_RAND", "CTime vs SHMS #beta; Coin_Time; SHMS_#beta", 100, -10, 10, 100, 0, 2)
-    MM_vs_beta_DUMMY_RAND = TH2D("MM_vs_beta_DUMMY_RAND", "Missing Mass vs SHMS #beta; MM; SHMS_#beta", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0, 2)
-    MM_vs_H_cer_DUMMY_RAND = TH2D("MM_vs_H_cer_DUMMY_RAND", "Missing Mass vs HMS Cerenkov; MM; HMS Cerenkov", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0, 30)
-    MM_vs_H_cal_DUMMY_RAND = TH2D("MM_vs_H_cal_DUMMY_RAND", "Missing Mass vs HMS Cal eTrackNorm; MM; HMS Cal eTrackNorm", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0.2, 1.8)
-    MM_vs_P_cal_DUMMY_RAND = TH2D("MM_vs_P_cal_DUMMY_RAND", "Missing Mass vs SHMS Cal eTrackNorm; MM; SHMS Cal eTrackNorm", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0, 1)    
-    MM_vs_P_hgcer_DUMMY_RAND = TH2D("MM_vs_P_hgcer_DUMMY_RAND", "Missing Mass vs SHMS HGCer; MM; SHMS HGCer", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0, 10)
-    MM_vs_P_aero_DUMMY_RAND = TH2D("MM_vs_P_aero_DUMMY_RAND", "Missing Mass vs SHMS Aerogel; MM; SHMS Aerogel", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0, 30)    
-    phiq_vs_t_DUMMY_RAND = TH2D("phiq_vs_t_DUMMY_RAND","; #phi ;t", 12, -3.14, 3.14, 24, inpDict["tmin"], inpDict["tmax"])
-    Q2_vs_W_DUMMY_RAND = TH2D("Q2_vs_W_DUMMY_RAND", "Q^{2} vs W; Q^{2}; W", 50, inpDict["Q2min"], inpDict["Q2max"], 50, inpDict["Wmin"], inpDict["Wmax"])
-    Q2_vs_t_DUMMY_RAND = TH2D("Q2_vs_t_DUMMY_RAND", "Q^{2} vs t; Q^{2}; t", 50, inpDict["Q2min"], inpDict["Q2max"], 50, inpDict["tmin"], inpDict["tmax"])
-    W_vs_t_DUMMY_RAND = TH2D("W_vs_t_DUMMY_RAND", "W vs t; W; t", 50, inpDict["Wmin"], inpDict["Wmax"], 50, inpDict["tmin"], inpDict["tmax"])
-    EPS_vs_t_DUMMY_RAND = TH2D("EPS_vs_t_DUMMY_RAND", "Epsilon vs t; Epsilon; t", 50, inpDict["Epsmin"], inpDict["Epsmax"], 50, inpDict["tmin"], inpDict["tmax"])
-    MM_vs_t_DUMMY_RAND = TH2D("MM_vs_t_DUMMY_RAND", "Missing Mass vs t; MM; t", 100, inpDict["mm_min"], inpDict["mm_max"], 100, inpDict["tmin"], inpDict["tmax"])
+    MM_vs_CoinTime_DUMMY_RAND = book(TH2D("MM_vs_CoinTime_DUMMY_RAND","Missing Mass vs CTime; MM; Coin_Time",100, inpDict["mm_min"], inpDict["mm_max"], 100, -50, 50))
+    CoinTime_vs_beta_DUMMY_RAND = book(TH2D("CoinTime_vs_beta_DUMMY_RAND", "CTime vs SHMS #beta; Coin_Time; SHMS_#beta", 100, -10, 10, 100, 0, 2))
+    MM_vs_beta_DUMMY_RAND = book(TH2D("MM_vs_beta_DUMMY_RAND", "Missing Mass vs SHMS #beta; MM; SHMS_#beta", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0, 2))
+    MM_vs_H_cer_DUMMY_RAND = book(TH2D("MM_vs_H_cer_DUMMY_RAND", "Missing Mass vs HMS Cerenkov; MM; HMS Cerenkov", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0, 30))
+    MM_vs_H_cal_DUMMY_RAND = book(TH2D("MM_vs_H_cal_DUMMY_RAND", "Missing Mass vs HMS Cal eTrackNorm; MM; HMS Cal eTrackNorm", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0.2, 1.8))
+    MM_vs_P_cal_DUMMY_RAND = book(TH2D("MM_vs_P_cal_DUMMY_RAND", "Missing Mass vs SHMS Cal eTrackNorm; MM; SHMS Cal eTrackNorm", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0, 1))    
+    MM_vs_P_hgcer_DUMMY_RAND = book(TH2D("MM_vs_P_hgcer_DUMMY_RAND", "Missing Mass vs SHMS HGCer; MM; SHMS HGCer", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0, 10))
+    MM_vs_P_aero_DUMMY_RAND = book(TH2D("MM_vs_P_aero_DUMMY_RAND", "Missing Mass vs SHMS Aerogel; MM; SHMS Aerogel", 100, inpDict["mm_min"], inpDict["mm_max"], 100, 0, 30))    
+    phiq_vs_t_DUMMY_RAND = book(TH2D("phiq_vs_t_DUMMY_RAND","; #phi ;t", 12, -3.14, 3.14, 24, inpDict["tmin"], inpDict["tmax"]))
+    Q2_vs_W_DUMMY_RAND = book(TH2D("Q2_vs_W_DUMMY_RAND", "Q^{2} vs W; Q^{2}; W", 50, inpDict["Q2min"], inpDict["Q2max"], 50, inpDict["Wmin"], inpDict["Wmax"]))
+    Q2_vs_t_DUMMY_RAND = book(TH2D("Q2_vs_t_DUMMY_RAND", "Q^{2} vs t; Q^{2}; t", 50, inpDict["Q2min"], inpDict["Q2max"], 50, inpDict["tmin"], inpDict["tmax"]))
+    W_vs_t_DUMMY_RAND = book(TH2D("W_vs_t_DUMMY_RAND", "W vs t; W; t", 50, inpDict["Wmin"], inpDict["Wmax"], 50, inpDict["tmin"], inpDict["tmax"]))
+    EPS_vs_t_DUMMY_RAND = book(TH2D("EPS_vs_t_DUMMY_RAND", "Epsilon vs t; Epsilon; t", 50, inpDict["Epsmin"], inpDict["Epsmax"], 50, inpDict["tmin"], inpDict["tmax"]))
+    MM_vs_t_DUMMY_RAND = book(TH2D("MM_vs_t_DUMMY_RAND", "Missing Mass vs t; MM; t", 100, inpDict["mm_min"], inpDict["mm_max"], 100, inpDict["tmin"], inpDict["tmax"]))
     # HGCer hole comparison plots
-    P_hgcer_xAtCer_vs_yAtCer_DUMMY_RAND = TH2D("P_hgcer_xAtCer_vs_yAtCer_DUMMY_RAND", "X vs Y; X; Y", 50, -30, 30, 50, -30, 30)
+    P_hgcer_xAtCer_vs_yAtCer_DUMMY_RAND = book(TH2D("P_hgcer_xAtCer_vs_yAtCer_DUMMY_RAND", "X vs Y; X; Y", 50, -30, 30, 50, -30, 30))
     if ParticleType == "kaon":
-        P_hgcer_nohole_xAtCer_vs_yAtCer_DUMMY_RAND = TH2D("P_hgcer_nohole_xAtCer_vs_yAtCer_DUMMY_RAND", "X vs Y (no hole cut); X; Y", 50, -30, 30, 50, -30, 30)
-    P_hgcer_xAtCer_vs_MM_DUMMY_RAND = TH2D("P_hgcer_xAtCer_vs_MM_DUMMY_RAND", "X vs MM; X; MM", 50, -30, 30, 50, 0, 2)
+        P_hgcer_nohole_xAtCer_vs_yAtCer_DUMMY_RAND = book(TH2D("P_hgcer_nohole_xAtCer_vs_yAtCer_DUMMY_RAND", "X vs Y (no hole cut); X; Y", 50, -30, 30, 50, -30, 30))
+    P_hgcer_xAtCer_vs_MM_DUMMY_RAND = book(TH2D("P_hgcer_xAtCer_vs_MM_DUMMY_RAND", "X vs MM; X; MM", 50, -30, 30, 50, 0, 2))
     if ParticleType == "kaon":
-        P_hgcer_nohole_xAtCer_vs_MM_DUMMY_RAND = TH2D("P_hgcer_nohole_xAtCer_vs_MM_DUMMY_RAND", "X vs MM (no hole cut); X; MM", 50, -30, 30, 50, 0, 2)
-    P_hgcer_yAtCer_vs_MM_DUMMY_RAND = TH2D("P_hgcer_yAtCer_vs_MM_DUMMY_RAND", "Y vs MM; Y; MM", 50, -30, 30, 50, 0, 2)
+        P_hgcer_nohole_xAtCer_vs_MM_DUMMY_RAND = book(TH2D("P_hgcer_nohole_xAtCer_vs_MM_DUMMY_RAND", "X vs MM (no hole cut); X; MM", 50, -30, 30, 50, 0, 2))
+    P_hgcer_yAtCer_vs_MM_DUMMY_RAND = book(TH2D("P_hgcer_yAtCer_vs_MM_DUMMY_RAND", "Y vs MM; Y; MM", 50, -30, 30, 50, 0, 2))
     if ParticleType == "kaon":
-        P_hgcer_nohole_yAtCer_vs_MM_DUMMY_RAND = TH2D("P_hgcer_nohole_yAtCer_vs_MM_DUMMY_RAND", "Y vs MM (no hole cut); Y; MM", 50, -30, 30, 50, 0, 2)        
+        P_hgcer_nohole_yAtCer_vs_MM_DUMMY_RAND = book(TH2D("P_hgcer_nohole_yAtCer_vs_MM_DUMMY_RAND", "Y vs MM (no hole cut); Y; MM", 50, -30, 30, 50, 0, 2))        
 
     # Pion subtraction by scaling simc to peak size
     if ParticleType == "kaon":        
@@ -818,446 +832,481 @@ def rand_sub(phi_setting, inpDict):
     ################################################################################################################################################
     # Fill histograms for various trees called above
 
-    print("\nGrabbing {} {} data...".format(phi_setting,ParticleType))
-    for i,evt in enumerate(TBRANCH_DATA):
+    if inpDict.get("EVENT_LOOP", False):
 
-        # Progress bar
-        Misc.progressBar(i, TBRANCH_DATA.GetEntries(),bar_length=25)        
+        print("\nGrabbing {} {} data...".format(phi_setting,ParticleType))
+        for i,evt in enumerate(TBRANCH_DATA):
 
-        ##############
-        # HARD CODED #
-        ##############
+            # Progress bar
+            Misc.progressBar(i, TBRANCH_DATA.GetEntries(),bar_length=25)        
 
-        adj_hsdelta = evt.hsdelta + c0_dict["Q{}W{}_{}e".format(Q2,W,EPSSET)]*evt.hsxpfp
+            ##############
+            # HARD CODED #
+            ##############
 
-        # Check if variable shift branch exists
-        try:
-            adj_MM = evt.MM_shift
-        except AttributeError:
-            adj_MM = evt.MM
+            adj_hsdelta = evt.hsdelta + c0_dict["Q{}W{}_{}e".format(Q2,W,EPSSET)]*evt.hsxpfp
+
+            # Check if variable shift branch exists
+            try:
+                adj_MM = evt.MM_shift
+            except AttributeError:
+                adj_MM = evt.MM
         
-        ##############
-        ##############        
-        ##############
+            ##############
+            ##############        
+            ##############
         
-        if ParticleType == "kaon":
-            ALLCUTS = apply_data_cuts(evt, mm_min, mm_max) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
-            NOHOLECUTS = apply_data_cuts(evt, mm_min, mm_max)
-            NOMMCUTS = apply_data_sub_cuts(evt) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
-            if(NOHOLECUTS):
-                # HGCer hole comparison            
-                P_hgcer_nohole_xAtCer_vs_yAtCer_DATA.Fill(evt.P_hgcer_xAtCer,evt.P_hgcer_yAtCer, evt.P_hgcer_npeSum)
-                P_hgcer_nohole_xAtCer_vs_MM_DATA.Fill(evt.P_hgcer_xAtCer,adj_MM, evt.P_hgcer_npeSum)
-                P_hgcer_nohole_yAtCer_vs_MM_DATA.Fill(evt.P_hgcer_yAtCer,adj_MM, evt.P_hgcer_npeSum)
-        else:
-            ALLCUTS = apply_data_cuts(evt, mm_min, mm_max)
-            NOMMCUTS = apply_data_sub_cuts(evt)
+            if ParticleType == "kaon":
+                ALLCUTS = apply_data_cuts(evt, mm_min, mm_max) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
+                NOHOLECUTS = apply_data_cuts(evt, mm_min, mm_max)
+                NOMMCUTS = apply_data_sub_cuts(evt) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
+                if(NOHOLECUTS):
+                    # HGCer hole comparison            
+                    P_hgcer_nohole_xAtCer_vs_yAtCer_DATA.Fill(evt.P_hgcer_xAtCer,evt.P_hgcer_yAtCer, evt.P_hgcer_npeSum)
+                    P_hgcer_nohole_xAtCer_vs_MM_DATA.Fill(evt.P_hgcer_xAtCer,adj_MM, evt.P_hgcer_npeSum)
+                    P_hgcer_nohole_yAtCer_vs_MM_DATA.Fill(evt.P_hgcer_yAtCer,adj_MM, evt.P_hgcer_npeSum)
+            else:
+                ALLCUTS = apply_data_cuts(evt, mm_min, mm_max)
+                NOMMCUTS = apply_data_sub_cuts(evt)
             
-        if(NOMMCUTS):
-            H_MM_fit1sub_DATA.Fill(adj_MM)
-            H_MM_pisub_DATA.Fill(adj_MM)
-            H_MM_nosub_DATA.Fill(adj_MM)
+            if(NOMMCUTS):
+                H_MM_fit1sub_DATA.Fill(adj_MM)
+                H_MM_pisub_DATA.Fill(adj_MM)
+                H_MM_nosub_DATA.Fill(adj_MM)
             
-        if(ALLCUTS):
+            if(ALLCUTS):
 
-          # HGCer hole comparison
-          P_hgcer_xAtCer_vs_yAtCer_DATA.Fill(evt.P_hgcer_xAtCer,evt.P_hgcer_yAtCer, evt.P_hgcer_npeSum)
-          P_hgcer_xAtCer_vs_MM_DATA.Fill(evt.P_hgcer_xAtCer,adj_MM, evt.P_hgcer_npeSum)
-          P_hgcer_yAtCer_vs_MM_DATA.Fill(evt.P_hgcer_yAtCer,adj_MM, evt.P_hgcer_npeSum)
+              # HGCer hole comparison
+              P_hgcer_xAtCer_vs_yAtCer_DATA.Fill(evt.P_hgcer_xAtCer,evt.P_hgcer_yAtCer, evt.P_hgcer_npeSum)
+              P_hgcer_xAtCer_vs_MM_DATA.Fill(evt.P_hgcer_xAtCer,adj_MM, evt.P_hgcer_npeSum)
+              P_hgcer_yAtCer_vs_MM_DATA.Fill(evt.P_hgcer_yAtCer,adj_MM, evt.P_hgcer_npeSum)
 
-          # Phase shift to fix polar plots
-          #phi_shift = (evt.ph_q+math.pi)
-          phi_shift = (evt.ph_q)          
+              # Phase shift to fix polar plots
+              #phi_shift = (evt.ph_q+math.pi)
+              phi_shift = (evt.ph_q)          
           
-          MM_vs_CoinTime_DATA.Fill(adj_MM, evt.CTime_ROC1)
-          CoinTime_vs_beta_DATA.Fill(evt.CTime_ROC1,evt.P_gtr_beta)
-          MM_vs_beta_DATA.Fill(adj_MM,evt.P_gtr_beta)
-          MM_vs_H_cer_DATA.Fill(adj_MM,evt.H_cer_npeSum)
-          MM_vs_H_cal_DATA.Fill(adj_MM,evt.H_cal_etottracknorm)
-          MM_vs_P_cal_DATA.Fill(adj_MM,evt.P_cal_etottracknorm)
-          MM_vs_P_hgcer_DATA.Fill(adj_MM,evt.P_hgcer_npeSum)
-          MM_vs_P_aero_DATA.Fill(adj_MM,evt.P_aero_npeSum)
-          # SIMC goes from 0 to 2pi so no need for +pi
-          phiq_vs_t_DATA.Fill(phi_shift, -evt.MandelT)
-          Q2_vs_W_DATA.Fill(evt.Q2, evt.W)
-          Q2_vs_t_DATA.Fill(evt.Q2, -evt.MandelT)
-          W_vs_t_DATA.Fill(evt.W, -evt.MandelT)
-          EPS_vs_t_DATA.Fill(evt.epsilon, -evt.MandelT)
-          MM_vs_t_DATA.Fill(adj_MM, -evt.MandelT)
-          polar_phiq_vs_t_DATA.SetPoint(polar_phiq_vs_t_DATA.GetN(), (phi_shift)*(180/math.pi), -evt.MandelT)
+              MM_vs_CoinTime_DATA.Fill(adj_MM, evt.CTime_ROC1)
+              CoinTime_vs_beta_DATA.Fill(evt.CTime_ROC1,evt.P_gtr_beta)
+              MM_vs_beta_DATA.Fill(adj_MM,evt.P_gtr_beta)
+              MM_vs_H_cer_DATA.Fill(adj_MM,evt.H_cer_npeSum)
+              MM_vs_H_cal_DATA.Fill(adj_MM,evt.H_cal_etottracknorm)
+              MM_vs_P_cal_DATA.Fill(adj_MM,evt.P_cal_etottracknorm)
+              MM_vs_P_hgcer_DATA.Fill(adj_MM,evt.P_hgcer_npeSum)
+              MM_vs_P_aero_DATA.Fill(adj_MM,evt.P_aero_npeSum)
+              # SIMC goes from 0 to 2pi so no need for +pi
+              phiq_vs_t_DATA.Fill(phi_shift, -evt.MandelT)
+              Q2_vs_W_DATA.Fill(evt.Q2, evt.W)
+              Q2_vs_t_DATA.Fill(evt.Q2, -evt.MandelT)
+              W_vs_t_DATA.Fill(evt.W, -evt.MandelT)
+              EPS_vs_t_DATA.Fill(evt.epsilon, -evt.MandelT)
+              MM_vs_t_DATA.Fill(adj_MM, -evt.MandelT)
+              polar_phiq_vs_t_DATA.SetPoint(polar_phiq_vs_t_DATA.GetN(), (phi_shift)*(180/math.pi), -evt.MandelT)
+              polar_phiq_vs_t_binned_DATA.Fill((phi_shift)*(180/math.pi), -evt.MandelT)
           
-          H_ct_DATA.Fill(evt.CTime_ROC1)
-
-          H_ssxfp_DATA.Fill(evt.ssxfp)
-          H_ssyfp_DATA.Fill(evt.ssyfp)
-          H_ssxpfp_DATA.Fill(evt.ssxpfp)
-          H_ssypfp_DATA.Fill(evt.ssypfp)
-          H_ssdelta_DATA.Fill(evt.ssdelta)
-          H_ssxptar_DATA.Fill(evt.ssxptar)
-          H_ssyptar_DATA.Fill(evt.ssyptar)
-
-          H_hsxfp_DATA.Fill(evt.hsxfp)
-          H_hsyfp_DATA.Fill(evt.hsyfp)
-          H_hsxpfp_DATA.Fill(evt.hsxpfp)
-          H_hsypfp_DATA.Fill(evt.hsypfp)
-          H_hsdelta_DATA.Fill(adj_hsdelta)
-          H_hsxptar_DATA.Fill(evt.hsxptar)	
-          H_hsyptar_DATA.Fill(evt.hsyptar)
-
-          # SIMC goes from 0 to 2pi so no need for +pi          
-          H_ph_q_DATA.Fill((phi_shift))
-          H_th_q_DATA.Fill(evt.th_q)
-          H_ph_recoil_DATA.Fill(evt.ph_recoil)
-          H_th_recoil_DATA.Fill(evt.th_recoil)
-
-          H_pmiss_DATA.Fill(evt.pmiss)	
-          H_emiss_DATA.Fill(evt.emiss)	
-          #H_emiss_DATA.Fill(evt.emiss_nuc)
-          H_pmx_DATA.Fill(evt.pmx)
-          H_pmy_DATA.Fill(evt.pmy)
-          H_pmz_DATA.Fill(evt.pmz)
-          H_Q2_DATA.Fill(evt.Q2)
-          H_t_DATA.Fill(-evt.MandelT)
-          H_W_DATA.Fill(evt.W)
-          H_epsilon_DATA.Fill(evt.epsilon)
-          H_MM_DATA.Fill(adj_MM)
-          #H_MM_DATA.Fill(pow(adj_MM, 2))
-          #H_MM_DATA.Fill(evt.Mrecoil)
+              H_ct_DATA.Fill(evt.CTime_ROC1)
+
+              H_ssxfp_DATA.Fill(evt.ssxfp)
+              H_ssyfp_DATA.Fill(evt.ssyfp)
+              H_ssxpfp_DATA.Fill(evt.ssxpfp)
+              H_ssypfp_DATA.Fill(evt.ssypfp)
+              H_ssdelta_DATA.Fill(evt.ssdelta)
+              H_ssxptar_DATA.Fill(evt.ssxptar)
+              H_ssyptar_DATA.Fill(evt.ssyptar)
+
+              H_hsxfp_DATA.Fill(evt.hsxfp)
+              H_hsyfp_DATA.Fill(evt.hsyfp)
+              H_hsxpfp_DATA.Fill(evt.hsxpfp)
+              H_hsypfp_DATA.Fill(evt.hsypfp)
+              H_hsdelta_DATA.Fill(adj_hsdelta)
+              H_hsxptar_DATA.Fill(evt.hsxptar)	
+              H_hsyptar_DATA.Fill(evt.hsyptar)
+
+              # SIMC goes from 0 to 2pi so no need for +pi          
+              H_ph_q_DATA.Fill((phi_shift))
+              H_th_q_DATA.Fill(evt.th_q)
+              H_ph_recoil_DATA.Fill(evt.ph_recoil)
+              H_th_recoil_DATA.Fill(evt.th_recoil)
+
+              H_pmiss_DATA.Fill(evt.pmiss)	
+              H_emiss_DATA.Fill(evt.emiss)	
+              #H_emiss_DATA.Fill(evt.emiss_nuc)
+              H_pmx_DATA.Fill(evt.pmx)
+              H_pmy_DATA.Fill(evt.pmy)
+              H_pmz_DATA.Fill(evt.pmz)
+              H_Q2_DATA.Fill(evt.Q2)
+              H_t_DATA.Fill(-evt.MandelT)
+              H_W_DATA.Fill(evt.W)
+              H_epsilon_DATA.Fill(evt.epsilon)
+              H_MM_DATA.Fill(adj_MM)
+              #H_MM_DATA.Fill(pow(adj_MM, 2))
+              #H_MM_DATA.Fill(evt.Mrecoil)
           
-          H_cal_etottracknorm_DATA.Fill(evt.H_cal_etottracknorm)
-          H_cer_npeSum_DATA.Fill(evt.H_cer_npeSum)
+              H_cal_etottracknorm_DATA.Fill(evt.H_cal_etottracknorm)
+              H_cer_npeSum_DATA.Fill(evt.H_cer_npeSum)
 
-          P_cal_etottracknorm_DATA.Fill(evt.P_cal_etottracknorm)
-          P_hgcer_npeSum_DATA.Fill(evt.P_hgcer_npeSum)
-          P_aero_npeSum_DATA.Fill(evt.P_aero_npeSum)
+              P_cal_etottracknorm_DATA.Fill(evt.P_cal_etottracknorm)
+              P_hgcer_npeSum_DATA.Fill(evt.P_hgcer_npeSum)
+              P_aero_npeSum_DATA.Fill(evt.P_aero_npeSum)
 
-          MM_offset_DATA = adj_MM-evt.MM
+              MM_offset_DATA = adj_MM-evt.MM
           
-    ################################################################################################################################################
-    # Fill dummy histograms for various trees called above
+        ################################################################################################################################################
+        # Fill dummy histograms for various trees called above
 
-    print("\nGrabbing {} {} dummy...".format(phi_setting,ParticleType))
-    for i,evt in enumerate(TBRANCH_DUMMY):
+        print("\nGrabbing {} {} dummy...".format(phi_setting,ParticleType))
+        for i,evt in enumerate(TBRANCH_DUMMY):
 
-        # Progress bar
-        Misc.progressBar(i, TBRANCH_DUMMY.GetEntries(),bar_length=25)
+            # Progress bar
+            Misc.progressBar(i, TBRANCH_DUMMY.GetEntries(),bar_length=25)
 
-        ##############
-        # HARD CODED #
-        ##############
+            ##############
+            # HARD CODED #
+            ##############
 
-        adj_hsdelta = evt.hsdelta + c0_dict["Q{}W{}_{}e".format(Q2,W,EPSSET)]*evt.hsxpfp
+            adj_hsdelta = evt.hsdelta + c0_dict["Q{}W{}_{}e".format(Q2,W,EPSSET)]*evt.hsxpfp
 
-        # Check if variable shift branch exists
-        try:
-            adj_MM = evt.MM_shift
-        except AttributeError:
-            adj_MM = evt.MM
+            # Check if variable shift branch exists
+            try:
+                adj_MM = evt.MM_shift
+            except AttributeError:
+                adj_MM = evt.MM
         
-        ##############
-        ##############        
-        ##############
+            ##############
+            ##############        
+            ##############
         
-        if ParticleType == "kaon":
-            ALLCUTS = apply_data_cuts(evt, mm_min, mm_max) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
-            NOHOLECUTS = apply_data_cuts(evt, mm_min, mm_max)
-            NOMMCUTS = apply_data_sub_cuts(evt) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
-            if(NOHOLECUTS):
-                # HGCer hole comparison            
-                P_hgcer_nohole_xAtCer_vs_yAtCer_DUMMY.Fill(evt.P_hgcer_xAtCer,evt.P_hgcer_yAtCer, evt.P_hgcer_npeSum)
-                P_hgcer_nohole_xAtCer_vs_MM_DUMMY.Fill(evt.P_hgcer_xAtCer,adj_MM, evt.P_hgcer_npeSum)
-                P_hgcer_nohole_yAtCer_vs_MM_DUMMY.Fill(evt.P_hgcer_yAtCer,adj_MM, evt.P_hgcer_npeSum)
+            if ParticleType == "kaon":
+                ALLCUTS = apply_data_cuts(evt, mm_min, mm_max) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
+                NOHOLECUTS = apply_data_cuts(evt, mm_min, mm_max)
+                NOMMCUTS = apply_data_sub_cuts(evt) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
+                if(NOHOLECUTS):
+                    # HGCer hole comparison            
+                    P_hgcer_nohole_xAtCer_vs_yAtCer_DUMMY.Fill(evt.P_hgcer_xAtCer,evt.P_hgcer_yAtCer, evt.P_hgcer_npeSum)
+                    P_hgcer_nohole_xAtCer_vs_MM_DUMMY.Fill(evt.P_hgcer_xAtCer,adj_MM, evt.P_hgcer_npeSum)
+                    P_hgcer_nohole_yAtCer_vs_MM_DUMMY.Fill(evt.P_hgcer_yAtCer,adj_MM, evt.P_hgcer_npeSum)
 
-        else:
-            ALLCUTS = apply_data_cuts(evt, mm_min, mm_max)
-            NOMMCUTS = apply_data_sub_cuts(evt)
+            else:
+                ALLCUTS = apply_data_cuts(evt, mm_min, mm_max)
+                NOMMCUTS = apply_data_sub_cuts(evt)
             
-        if(NOMMCUTS):
-            H_MM_fit1sub_DUMMY.Fill(adj_MM) 
-            H_MM_pisub_DUMMY.Fill(adj_MM) 
-            H_MM_nosub_DUMMY.Fill(adj_MM)            
+            if(NOMMCUTS):
+                H_MM_fit1sub_DUMMY.Fill(adj_MM) 
+                H_MM_pisub_DUMMY.Fill(adj_MM) 
+                H_MM_nosub_DUMMY.Fill(adj_MM)            
             
-        if(ALLCUTS):
+            if(ALLCUTS):
 
-          # HGCer hole comparison
-          P_hgcer_xAtCer_vs_yAtCer_DUMMY.Fill(evt.P_hgcer_xAtCer,evt.P_hgcer_yAtCer, evt.P_hgcer_npeSum)
-          P_hgcer_xAtCer_vs_MM_DUMMY.Fill(evt.P_hgcer_xAtCer,adj_MM, evt.P_hgcer_npeSum)
-          P_hgcer_yAtCer_vs_MM_DUMMY.Fill(evt.P_hgcer_yAtCer,adj_MM, evt.P_hgcer_npeSum)
+              # HGCer hole comparison
+              P_hgcer_xAtCer_vs_yAtCer_DUMMY.Fill(evt.P_hgcer_xAtCer,evt.P_hgcer_yAtCer, evt.P_hgcer_npeSum)
+              P_hgcer_xAtCer_vs_MM_DUMMY.Fill(evt.P_hgcer_xAtCer,adj_MM, evt.P_hgcer_npeSum)
+              P_hgcer_yAtCer_vs_MM_DUMMY.Fill(evt.P_hgcer_yAtCer,adj_MM, evt.P_hgcer_npeSum)
 
 
-          # Phase shift to fix polar plots
-          #phi_shift = (evt.ph_q+math.pi)
-          phi_shift = (evt.ph_q)          
+              # Phase shift to fix polar plots
+              #phi_shift = (evt.ph_q+math.pi)
+              phi_shift = (evt.ph_q)          
           
-          MM_vs_CoinTime_DUMMY.Fill(adj_MM, evt.CTime_ROC1)
-          CoinTime_vs_beta_DUMMY.Fill(evt.CTime_ROC1,evt.P_gtr_beta)
-          MM_vs_beta_DUMMY.Fill(adj_MM,evt.P_gtr_beta)
-          MM_vs_H_cer_DUMMY.Fill(adj_MM,evt.H_cer_npeSum)
-          MM_vs_H_cal_DUMMY.Fill(adj_MM,evt.H_cal_etottracknorm)
-          MM_vs_P_cal_DUMMY.Fill(adj_MM,evt.P_cal_etottracknorm)
-          MM_vs_P_hgcer_DUMMY.Fill(adj_MM,evt.P_hgcer_npeSum)
-          MM_vs_P_aero_DUMMY.Fill(adj_MM,evt.P_aero_npeSum)          
-          # SIMC goes from 0 to 2pi so no need for +pi
-          phiq_vs_t_DUMMY.Fill(phi_shift, -evt.MandelT)
-          Q2_vs_W_DUMMY.Fill(evt.Q2, evt.W)
-          Q2_vs_t_DUMMY.Fill(evt.Q2, -evt.MandelT)
-          W_vs_t_DUMMY.Fill(evt.W, -evt.MandelT)
-          EPS_vs_t_DUMMY.Fill(evt.epsilon, -evt.MandelT)
-          MM_vs_t_DUMMY.Fill(adj_MM, -evt.MandelT)
-          polar_phiq_vs_t_DUMMY.SetPoint(polar_phiq_vs_t_DUMMY.GetN(), (phi_shift)*(180/math.pi), -evt.MandelT)
-
-          H_ct_DUMMY.Fill(evt.CTime_ROC1)
-
-          H_ssxfp_DUMMY.Fill(evt.ssxfp)
-          H_ssyfp_DUMMY.Fill(evt.ssyfp)
-          H_ssxpfp_DUMMY.Fill(evt.ssxpfp)
-          H_ssypfp_DUMMY.Fill(evt.ssypfp)
-          H_ssdelta_DUMMY.Fill(evt.ssdelta)
-          H_ssxptar_DUMMY.Fill(evt.ssxptar)
-          H_ssyptar_DUMMY.Fill(evt.ssyptar)
-
-          H_hsxfp_DUMMY.Fill(evt.hsxfp)
-          H_hsyfp_DUMMY.Fill(evt.hsyfp)
-          H_hsxpfp_DUMMY.Fill(evt.hsxpfp)
-          H_hsypfp_DUMMY.Fill(evt.hsypfp)
-          H_hsdelta_DUMMY.Fill(adj_hsdelta)
-          H_hsxptar_DUMMY.Fill(evt.hsxptar)	
-          H_hsyptar_DUMMY.Fill(evt.hsyptar)
-
-          # SIMC goes from 0 to 2pi so no need for +pi          
-          H_ph_q_DUMMY.Fill((phi_shift))
-          H_th_q_DUMMY.Fill(evt.th_q)
-          H_ph_recoil_DUMMY.Fill(evt.ph_recoil)
-          H_th_recoil_DUMMY.Fill(evt.th_recoil)
-
-          H_pmiss_DUMMY.Fill(evt.pmiss)	
-          H_emiss_DUMMY.Fill(evt.emiss)	
-          #H_emiss_DUMMY.Fill(evt.emiss_nuc)
-          H_pmx_DUMMY.Fill(evt.pmx)
-          H_pmy_DUMMY.Fill(evt.pmy)
-          H_pmz_DUMMY.Fill(evt.pmz)
-          H_Q2_DUMMY.Fill(evt.Q2)
-          H_t_DUMMY.Fill(-evt.MandelT)
-          H_W_DUMMY.Fill(evt.W)
-          H_epsilon_DUMMY.Fill(evt.epsilon)
-          H_MM_DUMMY.Fill(adj_MM)
-          #H_MM_DUMMY.Fill(pow(adj_MM, 2))  
-          #H_MM_DUMMY.Fill(evt.Mrecoil)
+              MM_vs_CoinTime_DUMMY.Fill(adj_MM, evt.CTime_ROC1)
+              CoinTime_vs_beta_DUMMY.Fill(evt.CTime_ROC1,evt.P_gtr_beta)
+              MM_vs_beta_DUMMY.Fill(adj_MM,evt.P_gtr_beta)
+              MM_vs_H_cer_DUMMY.Fill(adj_MM,evt.H_cer_npeSum)
+              MM_vs_H_cal_DUMMY.Fill(adj_MM,evt.H_cal_etottracknorm)
+              MM_vs_P_cal_DUMMY.Fill(adj_MM,evt.P_cal_etottracknorm)
+              MM_vs_P_hgcer_DUMMY.Fill(adj_MM,evt.P_hgcer_npeSum)
+              MM_vs_P_aero_DUMMY.Fill(adj_MM,evt.P_aero_npeSum)          
+              # SIMC goes from 0 to 2pi so no need for +pi
+              phiq_vs_t_DUMMY.Fill(phi_shift, -evt.MandelT)
+              Q2_vs_W_DUMMY.Fill(evt.Q2, evt.W)
+              Q2_vs_t_DUMMY.Fill(evt.Q2, -evt.MandelT)
+              W_vs_t_DUMMY.Fill(evt.W, -evt.MandelT)
+              EPS_vs_t_DUMMY.Fill(evt.epsilon, -evt.MandelT)
+              MM_vs_t_DUMMY.Fill(adj_MM, -evt.MandelT)
+              polar_phiq_vs_t_DUMMY.SetPoint(polar_phiq_vs_t_DUMMY.GetN(), (phi_shift)*(180/math.pi), -evt.MandelT)
+              polar_phiq_vs_t_binned_DUMMY.Fill((phi_shift)*(180/math.pi), -evt.MandelT)
+
+              H_ct_DUMMY.Fill(evt.CTime_ROC1)
+
+              H_ssxfp_DUMMY.Fill(evt.ssxfp)
+              H_ssyfp_DUMMY.Fill(evt.ssyfp)
+              H_ssxpfp_DUMMY.Fill(evt.ssxpfp)
+              H_ssypfp_DUMMY.Fill(evt.ssypfp)
+              H_ssdelta_DUMMY.Fill(evt.ssdelta)
+              H_ssxptar_DUMMY.Fill(evt.ssxptar)
+              H_ssyptar_DUMMY.Fill(evt.ssyptar)
+
+              H_hsxfp_DUMMY.Fill(evt.hsxfp)
+              H_hsyfp_DUMMY.Fill(evt.hsyfp)
+              H_hsxpfp_DUMMY.Fill(evt.hsxpfp)
+              H_hsypfp_DUMMY.Fill(evt.hsypfp)
+              H_hsdelta_DUMMY.Fill(adj_hsdelta)
+              H_hsxptar_DUMMY.Fill(evt.hsxptar)	
+              H_hsyptar_DUMMY.Fill(evt.hsyptar)
+
+              # SIMC goes from 0 to 2pi so no need for +pi          
+              H_ph_q_DUMMY.Fill((phi_shift))
+              H_th_q_DUMMY.Fill(evt.th_q)
+              H_ph_recoil_DUMMY.Fill(evt.ph_recoil)
+              H_th_recoil_DUMMY.Fill(evt.th_recoil)
+
+              H_pmiss_DUMMY.Fill(evt.pmiss)	
+              H_emiss_DUMMY.Fill(evt.emiss)	
+              #H_emiss_DUMMY.Fill(evt.emiss_nuc)
+              H_pmx_DUMMY.Fill(evt.pmx)
+              H_pmy_DUMMY.Fill(evt.pmy)
+              H_pmz_DUMMY.Fill(evt.pmz)
+              H_Q2_DUMMY.Fill(evt.Q2)
+              H_t_DUMMY.Fill(-evt.MandelT)
+              H_W_DUMMY.Fill(evt.W)
+              H_epsilon_DUMMY.Fill(evt.epsilon)
+              H_MM_DUMMY.Fill(adj_MM)
+              #H_MM_DUMMY.Fill(pow(adj_MM, 2))  
+              #H_MM_DUMMY.Fill(evt.Mrecoil)
           
-    ###################################################################################################################################################    
-    # Fill random histograms for various trees called above
+        ###################################################################################################################################################    
+        # Fill random histograms for various trees called above
 
-    print("\nGrabbing {} {} random data...".format(phi_setting,ParticleType))
-    for i,evt in enumerate(TBRANCH_RAND):
+        print("\nGrabbing {} {} random data...".format(phi_setting,ParticleType))
+        for i,evt in enumerate(TBRANCH_RAND):
 
-        # Progress bar
-        Misc.progressBar(i, TBRANCH_RAND.GetEntries(),bar_length=25)
+            # Progress bar
+            Misc.progressBar(i, TBRANCH_RAND.GetEntries(),bar_length=25)
         
-        ##############
-        # HARD CODED #
-        ##############
+            ##############
+            # HARD CODED #
+            ##############
 
-        adj_hsdelta = evt.hsdelta + c0_dict["Q{}W{}_{}e".format(Q2,W,EPSSET)]*evt.hsxpfp
+            adj_hsdelta = evt.hsdelta + c0_dict["Q{}W{}_{}e".format(Q2,W,EPSSET)]*evt.hsxpfp
 
-        # Check if variable shift branch exists
-        try:
-            adj_MM = evt.MM_shift
-        except AttributeError:
-            adj_MM = evt.MM
+            # Check if variable shift branch exists
+            try:
+                adj_MM = evt.MM_shift
+            except AttributeError:
+                adj_MM = evt.MM
         
-        ##############
-        ##############        
-        ##############
+            ##############
+            ##############        
+            ##############
 
-        if ParticleType == "kaon":
-            ALLCUTS = apply_data_cuts(evt, mm_min, mm_max) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
-            NOHOLECUTS = apply_data_cuts(evt, mm_min, mm_max)
-            NOMMCUTS = apply_data_sub_cuts(evt) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
-            if(NOHOLECUTS):
-                # HGCer hole comparison            
-                P_hgcer_nohole_xAtCer_vs_yAtCer_RAND.Fill(evt.P_hgcer_xAtCer,evt.P_hgcer_yAtCer, evt.P_hgcer_npeSum)
-                P_hgcer_nohole_xAtCer_vs_MM_RAND.Fill(evt.P_hgcer_xAtCer,adj_MM, evt.P_hgcer_npeSum)
-                P_hgcer_nohole_yAtCer_vs_MM_RAND.Fill(evt.P_hgcer_yAtCer,adj_MM, evt.P_hgcer_npeSum)
+            if ParticleType == "kaon":
+                ALLCUTS = apply_data_cuts(evt, mm_min, mm_max) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
+                NOHOLECUTS = apply_data_cuts(evt, mm_min, mm_max)
+                NOMMCUTS = apply_data_sub_cuts(evt) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
+                if(NOHOLECUTS):
+                    # HGCer hole comparison            
+                    P_hgcer_nohole_xAtCer_vs_yAtCer_RAND.Fill(evt.P_hgcer_xAtCer,evt.P_hgcer_yAtCer, evt.P_hgcer_npeSum)
+                    P_hgcer_nohole_xAtCer_vs_MM_RAND.Fill(evt.P_hgcer_xAtCer,adj_MM, evt.P_hgcer_npeSum)
+                    P_hgcer_nohole_yAtCer_vs_MM_RAND.Fill(evt.P_hgcer_yAtCer,adj_MM, evt.P_hgcer_npeSum)
 
-        else:
-            ALLCUTS = apply_data_cuts(evt, mm_min, mm_max)
-            NOMMCUTS = apply_data_sub_cuts(evt)
+            else:
+                ALLCUTS = apply_data_cuts(evt, mm_min, mm_max)
+                NOMMCUTS = apply_data_sub_cuts(evt)
             
-        if(NOMMCUTS):
-            H_MM_fit1sub_RAND.Fill(adj_MM)
-            H_MM_pisub_RAND.Fill(adj_MM)
-            H_MM_nosub_RAND.Fill(adj_MM)
+            if(NOMMCUTS):
+                H_MM_fit1sub_RAND.Fill(adj_MM)
+                H_MM_pisub_RAND.Fill(adj_MM)
+                H_MM_nosub_RAND.Fill(adj_MM)
             
-        if(ALLCUTS):
+            if(ALLCUTS):
 
-          # HGCer hole comparison
-          P_hgcer_xAtCer_vs_yAtCer_RAND.Fill(evt.P_hgcer_xAtCer,evt.P_hgcer_yAtCer, evt.P_hgcer_npeSum)
-          P_hgcer_xAtCer_vs_MM_RAND.Fill(evt.P_hgcer_xAtCer,adj_MM, evt.P_hgcer_npeSum)
-          P_hgcer_yAtCer_vs_MM_RAND.Fill(evt.P_hgcer_yAtCer,adj_MM, evt.P_hgcer_npeSum)
+              # HGCer hole comparison
+              P_hgcer_xAtCer_vs_yAtCer_RAND.Fill(evt.P_hgcer_xAtCer,evt.P_hgcer_yAtCer, evt.P_hgcer_npeSum)
+              P_hgcer_xAtCer_vs_MM_RAND.Fill(evt.P_hgcer_xAtCer,adj_MM, evt.P_hgcer_npeSum)
+              P_hgcer_yAtCer_vs_MM_RAND.Fill(evt.P_hgcer_yAtCer,adj_MM, evt.P_hgcer_npeSum)
 
-          # Phase shift to fix polar plots
-          #phi_shift = (evt.ph_q+math.pi)
-          phi_shift = (evt.ph_q)          
+              # Phase shift to fix polar plots
+              #phi_shift = (evt.ph_q+math.pi)
+              phi_shift = (evt.ph_q)          
           
-          MM_vs_CoinTime_RAND.Fill(adj_MM, evt.CTime_ROC1)
-          CoinTime_vs_beta_RAND.Fill(evt.CTime_ROC1,evt.P_gtr_beta)
-          MM_vs_beta_RAND.Fill(adj_MM,evt.P_gtr_beta)
-          MM_vs_H_cer_RAND.Fill(adj_MM,evt.H_cer_npeSum)
-          MM_vs_H_cal_RAND.Fill(adj_MM,evt.H_cal_etottracknorm)
-          MM_vs_P_cal_RAND.Fill(adj_MM,evt.P_cal_etottracknorm)
-          MM_vs_P_hgcer_RAND.Fill(adj_MM,evt.P_hgcer_npeSum)
-          MM_vs_P_aero_RAND.Fill(adj_MM,evt.P_aero_npeSum)          
-          # SIMC goes from 0 to 2pi so no need for +pi
-          phiq_vs_t_RAND.Fill(phi_shift, -evt.MandelT)
-          Q2_vs_W_RAND.Fill(evt.Q2, evt.W)
-          Q2_vs_t_RAND.Fill(evt.Q2, -evt.MandelT)
-          W_vs_t_RAND.Fill(evt.W, -evt.MandelT)
-          EPS_vs_t_RAND.Fill(evt.epsilon, -evt.MandelT)
-          MM_vs_t_RAND.Fill(adj_MM, -evt.MandelT)
-
-          H_ct_RAND.Fill(evt.CTime_ROC1)          
+              MM_vs_CoinTime_RAND.Fill(adj_MM, evt.CTime_ROC1)
+              CoinTime_vs_beta_RAND.Fill(evt.CTime_ROC1,evt.P_gtr_beta)
+              MM_vs_beta_RAND.Fill(adj_MM,evt.P_gtr_beta)
+              MM_vs_H_cer_RAND.Fill(adj_MM,evt.H_cer_npeSum)
+              MM_vs_H_cal_RAND.Fill(adj_MM,evt.H_cal_etottracknorm)
+              MM_vs_P_cal_RAND.Fill(adj_MM,evt.P_cal_etottracknorm)
+              MM_vs_P_hgcer_RAND.Fill(adj_MM,evt.P_hgcer_npeSum)
+              MM_vs_P_aero_RAND.Fill(adj_MM,evt.P_aero_npeSum)          
+              # SIMC goes from 0 to 2pi so no need for +pi
+              phiq_vs_t_RAND.Fill(phi_shift, -evt.MandelT)
+              Q2_vs_W_RAND.Fill(evt.Q2, evt.W)
+              Q2_vs_t_RAND.Fill(evt.Q2, -evt.MandelT)
+              W_vs_t_RAND.Fill(evt.W, -evt.MandelT)
+              EPS_vs_t_RAND.Fill(evt.epsilon, -evt.MandelT)
+              MM_vs_t_RAND.Fill(adj_MM, -evt.MandelT)
+
+              H_ct_RAND.Fill(evt.CTime_ROC1)          
           
-          H_ssxfp_RAND.Fill(evt.ssxfp)
-          H_ssyfp_RAND.Fill(evt.ssyfp)
-          H_ssxpfp_RAND.Fill(evt.ssxpfp)
-          H_ssypfp_RAND.Fill(evt.ssypfp)
-          H_ssdelta_RAND.Fill(evt.ssdelta)
-          H_ssxptar_RAND.Fill(evt.ssxptar)
-          H_ssyptar_RAND.Fill(evt.ssyptar)
-
-          H_hsxfp_RAND.Fill(evt.hsxfp)
-          H_hsyfp_RAND.Fill(evt.hsyfp)
-          H_hsxpfp_RAND.Fill(evt.hsxpfp)
-          H_hsypfp_RAND.Fill(evt.hsypfp)
-          H_hsdelta_RAND.Fill(adj_hsdelta)
-          H_hsxptar_RAND.Fill(evt.hsxptar)	
-          H_hsyptar_RAND.Fill(evt.hsyptar)
-
-          # SIMC goes from 0 to 2pi so no need for +pi          
-          H_ph_q_RAND.Fill((phi_shift))
-          H_th_q_RAND.Fill(evt.th_q)
-          H_ph_recoil_RAND.Fill(evt.ph_recoil)
-          H_th_recoil_RAND.Fill(evt.th_recoil)
+              H_ssxfp_RAND.Fill(evt.ssxfp)
+              H_ssyfp_RAND.Fill(evt.ssyfp)
+              H_ssxpfp_RAND.Fill(evt.ssxpfp)
+              H_ssypfp_RAND.Fill(evt.ssypfp)
+              H_ssdelta_RAND.Fill(evt.ssdelta)
+              H_ssxptar_RAND.Fill(evt.ssxptar)
+              H_ssyptar_RAND.Fill(evt.ssyptar)
+
+              H_hsxfp_RAND.Fill(evt.hsxfp)
+              H_hsyfp_RAND.Fill(evt.hsyfp)
+              H_hsxpfp_RAND.Fill(evt.hsxpfp)
+              H_hsypfp_RAND.Fill(evt.hsypfp)
+              H_hsdelta_RAND.Fill(adj_hsdelta)
+              H_hsxptar_RAND.Fill(evt.hsxptar)	
+              H_hsyptar_RAND.Fill(evt.hsyptar)
+
+              # SIMC goes from 0 to 2pi so no need for +pi          
+              H_ph_q_RAND.Fill((phi_shift))
+              H_th_q_RAND.Fill(evt.th_q)
+              H_ph_recoil_RAND.Fill(evt.ph_recoil)
+              H_th_recoil_RAND.Fill(evt.th_recoil)
           
-          H_pmiss_RAND.Fill(evt.pmiss)	
-          H_emiss_RAND.Fill(evt.emiss)	
-          #H_emiss_RAND.Fill(evt.emiss_nuc)
-          H_pmx_RAND.Fill(evt.pmx)
-          H_pmy_RAND.Fill(evt.pmy)
-          H_pmz_RAND.Fill(evt.pmz)
-          H_Q2_RAND.Fill(evt.Q2)
-          H_t_RAND.Fill(-evt.MandelT)
-          H_W_RAND.Fill(evt.W)
-          H_epsilon_RAND.Fill(evt.epsilon)
-          H_MM_RAND.Fill(adj_MM)
+              H_pmiss_RAND.Fill(evt.pmiss)	
+              H_emiss_RAND.Fill(evt.emiss)	
+              #H_emiss_RAND.Fill(evt.emiss_nuc)
+              H_pmx_RAND.Fill(evt.pmx)
+              H_pmy_RAND.Fill(evt.pmy)
+              H_pmz_RAND.Fill(evt.pmz)
+              H_Q2_RAND.Fill(evt.Q2)
+              H_t_RAND.Fill(-evt.MandelT)
+              H_W_RAND.Fill(evt.W)
+              H_epsilon_RAND.Fill(evt.epsilon)
+              H_MM_RAND.Fill(adj_MM)
           
-    ###################################################################################################################################################    
-    # Fill dummy random histograms for various trees called above
+        ###################################################################################################################################################    
+        # Fill dummy random histograms for various trees called above
 
-    print("\nGrabbing {} {} dummy random data...".format(phi_setting,ParticleType))
-    for i,evt in enumerate(TBRANCH_DUMMY_RAND):
+        print("\nGrabbing {} {} dummy random data...".format(phi_setting,ParticleType))
+        for i,evt in enumerate(TBRANCH_DUMMY_RAND):
 
-        # Progress bar
-        Misc.progressBar(i, TBRANCH_DUMMY_RAND.GetEntries(),bar_length=25)
+            # Progress bar
+            Misc.progressBar(i, TBRANCH_DUMMY_RAND.GetEntries(),bar_length=25)
 
-        ##############
-        # HARD CODED #
-        ##############
+            ##############
+            # HARD CODED #
+            ##############
 
-        adj_hsdelta = evt.hsdelta + c0_dict["Q{}W{}_{}e".format(Q2,W,EPSSET)]*evt.hsxpfp
+            adj_hsdelta = evt.hsdelta + c0_dict["Q{}W{}_{}e".format(Q2,W,EPSSET)]*evt.hsxpfp
 
-        # Check if variable shift branch exists
-        try:
-            adj_MM = evt.MM_shift
-        except AttributeError:
-            adj_MM = evt.MM
+            # Check if variable shift branch exists
+            try:
+                adj_MM = evt.MM_shift
+            except AttributeError:
+                adj_MM = evt.MM
         
-        ##############
-        ##############        
-        ##############
+            ##############
+            ##############        
+            ##############
 
-        if ParticleType == "kaon":
-            ALLCUTS = apply_data_cuts(evt, mm_min, mm_max) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
-            NOHOLECUTS = apply_data_cuts(evt, mm_min, mm_max)
-            NOMMCUTS = apply_data_sub_cuts(evt) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
-            if(NOHOLECUTS):
-                # HGCer hole comparison            
-                P_hgcer_nohole_xAtCer_vs_yAtCer_DUMMY_RAND.Fill(evt.P_hgcer_xAtCer,evt.P_hgcer_yAtCer, evt.P_hgcer_npeSum)
-                P_hgcer_nohole_xAtCer_vs_MM_DUMMY_RAND.Fill(evt.P_hgcer_xAtCer,adj_MM, evt.P_hgcer_npeSum)
-                P_hgcer_nohole_yAtCer_vs_MM_DUMMY_RAND.Fill(evt.P_hgcer_yAtCer,adj_MM, evt.P_hgcer_npeSum)
+            if ParticleType == "kaon":
+                ALLCUTS = apply_data_cuts(evt, mm_min, mm_max) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
+                NOHOLECUTS = apply_data_cuts(evt, mm_min, mm_max)
+                NOMMCUTS = apply_data_sub_cuts(evt) and not hgcer_cutg.IsInside(evt.P_hgcer_xAtCer, evt.P_hgcer_yAtCer) #and evt.P_hgcer_npeSum == 0.0
+                if(NOHOLECUTS):
+                    # HGCer hole comparison            
+                    P_hgcer_nohole_xAtCer_vs_yAtCer_DUMMY_RAND.Fill(evt.P_hgcer_xAtCer,evt.P_hgcer_yAtCer, evt.P_hgcer_npeSum)
+                    P_hgcer_nohole_xAtCer_vs_MM_DUMMY_RAND.Fill(evt.P_hgcer_xAtCer,adj_MM, evt.P_hgcer_npeSum)
+                    P_hgcer_nohole_yAtCer_vs_MM_DUMMY_RAND.Fill(evt.P_hgcer_yAtCer,adj_MM, evt.P_hgcer_npeSum)
 
-        else:
-            ALLCUTS = apply_data_cuts(evt, mm_min, mm_max)
-            NOMMCUTS = apply_data_sub_cuts(evt)
+            else:
+                ALLCUTS = apply_data_cuts(evt, mm_min, mm_max)
+                NOMMCUTS = apply_data_sub_cuts(evt)
             
-        if(NOMMCUTS):
-            H_MM_fit1sub_DUMMY_RAND.Fill(adj_MM)
-            H_MM_pisub_DUMMY_RAND.Fill(adj_MM)
-            H_MM_nosub_DUMMY_RAND.Fill(adj_MM)
+            if(NOMMCUTS):
+                H_MM_fit1sub_DUMMY_RAND.Fill(adj_MM)
+                H_MM_pisub_DUMMY_RAND.Fill(adj_MM)
+                H_MM_nosub_DUMMY_RAND.Fill(adj_MM)
             
-        if(ALLCUTS):
+            if(ALLCUTS):
 
-          # HGCer hole comparison
-          P_hgcer_xAtCer_vs_yAtCer_DUMMY_RAND.Fill(evt.P_hgcer_xAtCer,evt.P_hgcer_yAtCer, evt.P_hgcer_npeSum)
-          P_hgcer_xAtCer_vs_MM_DUMMY_RAND.Fill(evt.P_hgcer_xAtCer,adj_MM, evt.P_hgcer_npeSum)
-          P_hgcer_yAtCer_vs_MM_DUMMY_RAND.Fill(evt.P_hgcer_yAtCer,adj_MM, evt.P_hgcer_npeSum)
+              # HGCer hole comparison
+              P_hgcer_xAtCer_vs_yAtCer_DUMMY_RAND.Fill(evt.P_hgcer_xAtCer,evt.P_hgcer_yAtCer, evt.P_hgcer_npeSum)
+              P_hgcer_xAtCer_vs_MM_DUMMY_RAND.Fill(evt.P_hgcer_xAtCer,adj_MM, evt.P_hgcer_npeSum)
+              P_hgcer_yAtCer_vs_MM_DUMMY_RAND.Fill(evt.P_hgcer_yAtCer,adj_MM, evt.P_hgcer_npeSum)
 
-          # Phase shift to fix polar plots
-          #phi_shift = (evt.ph_q+math.pi)
-          phi_shift = (evt.ph_q)          
+              # Phase shift to fix polar plots
+              #phi_shift = (evt.ph_q+math.pi)
+              phi_shift = (evt.ph_q)          
           
-          MM_vs_CoinTime_DUMMY_RAND.Fill(adj_MM, evt.CTime_ROC1)
-          CoinTime_vs_beta_DUMMY_RAND.Fill(evt.CTime_ROC1,evt.P_gtr_beta)
-          MM_vs_beta_DUMMY_RAND.Fill(adj_MM,evt.P_gtr_beta)
-          MM_vs_H_cer_DUMMY_RAND.Fill(adj_MM,evt.H_cer_npeSum)
-          MM_vs_H_cal_DUMMY_RAND.Fill(adj_MM,evt.H_cal_etottracknorm)
-          MM_vs_P_cal_DUMMY_RAND.Fill(adj_MM,evt.P_cal_etottracknorm)
-          MM_vs_P_hgcer_DUMMY_RAND.Fill(adj_MM,evt.P_hgcer_npeSum)
-          MM_vs_P_aero_DUMMY_RAND.Fill(adj_MM,evt.P_aero_npeSum)          
-          # SIMC goes from 0 to 2pi so no need for +pi
-          phiq_vs_t_DUMMY_RAND.Fill(phi_shift, -evt.MandelT)
-          Q2_vs_W_DUMMY_RAND.Fill(evt.Q2, evt.W)
-          Q2_vs_t_DUMMY_RAND.Fill(evt.Q2, -evt.MandelT)
-          W_vs_t_DUMMY_RAND.Fill(evt.W, -evt.MandelT)
-          EPS_vs_t_DUMMY_RAND.Fill(evt.epsilon, -evt.MandelT)
-          MM_vs_t_DUMMY_RAND.Fill(adj_MM, -evt.MandelT)
+              MM_vs_CoinTime_DUMMY_RAND.Fill(adj_MM, evt.CTime_ROC1)
+              CoinTime_vs_beta_DUMMY_RAND.Fill(evt.CTime_ROC1,evt.P_gtr_beta)
+              MM_vs_beta_DUMMY_RAND.Fill(adj_MM,evt.P_gtr_beta)
+              MM_vs_H_cer_DUMMY_RAND.Fill(adj_MM,evt.H_cer_npeSum)
+              MM_vs_H_cal_DUMMY_RAND.Fill(adj_MM,evt.H_cal_etottracknorm)
+              MM_vs_P_cal_DUMMY_RAND.Fill(adj_MM,evt.P_cal_etottracknorm)
+              MM_vs_P_hgcer_DUMMY_RAND.Fill(adj_MM,evt.P_hgcer_npeSum)
+              MM_vs_P_aero_DUMMY_RAND.Fill(adj_MM,evt.P_aero_npeSum)          
+              # SIMC goes from 0 to 2pi so no need for +pi
+              phiq_vs_t_DUMMY_RAND.Fill(phi_shift, -evt.MandelT)
+              Q2_vs_W_DUMMY_RAND.Fill(evt.Q2, evt.W)
+              Q2_vs_t_DUMMY_RAND.Fill(evt.Q2, -evt.MandelT)
+              W_vs_t_DUMMY_RAND.Fill(evt.W, -evt.MandelT)
+              EPS_vs_t_DUMMY_RAND.Fill(evt.epsilon, -evt.MandelT)
+              MM_vs_t_DUMMY_RAND.Fill(adj_MM, -evt.MandelT)
           
-          H_ct_DUMMY_RAND.Fill(evt.CTime_ROC1)
-
-          H_ssxfp_DUMMY_RAND.Fill(evt.ssxfp)
-          H_ssyfp_DUMMY_RAND.Fill(evt.ssyfp)
-          H_ssxpfp_DUMMY_RAND.Fill(evt.ssxpfp)
-          H_ssypfp_DUMMY_RAND.Fill(evt.ssypfp)
-          H_ssdelta_DUMMY_RAND.Fill(evt.ssdelta)
-          H_ssxptar_DUMMY_RAND.Fill(evt.ssxptar)
-          H_ssyptar_DUMMY_RAND.Fill(evt.ssyptar)
-
-          H_hsxfp_DUMMY_RAND.Fill(evt.hsxfp)
-          H_hsyfp_DUMMY_RAND.Fill(evt.hsyfp)
-          H_hsxpfp_DUMMY_RAND.Fill(evt.hsxpfp)
-          H_hsypfp_DUMMY_RAND.Fill(evt.hsypfp)
-          H_hsdelta_DUMMY_RAND.Fill(adj_hsdelta)
-          H_hsxptar_DUMMY_RAND.Fill(evt.hsxptar)	
-          H_hsyptar_DUMMY_RAND.Fill(evt.hsyptar)
-
-          # SIMC goes from 0 to 2pi so no need for +pi          
-          H_ph_q_DUMMY_RAND.Fill((phi_shift))
-          H_th_q_DUMMY_RAND.Fill(evt.th_q)
-          H_ph_recoil_DUMMY_RAND.Fill(evt.ph_recoil)
-          H_th_recoil_DUMMY_RAND.Fill(evt.th_recoil)
+              H_ct_DUMMY_RAND.Fill(evt.CTime_ROC1)
+
+              H_ssxfp_DUMMY_RAND.Fill(evt.ssxfp)
+              H_ssyfp_DUMMY_RAND.Fill(evt.ssyfp)
+              H_ssxpfp_DUMMY_RAND.Fill(evt.ssxpfp)
+              H_ssypfp_DUMMY_RAND.Fill(evt.ssypfp)
+              H_ssdelta_DUMMY_RAND.Fill(evt.ssdelta)
+              H_ssxptar_DUMMY_RAND.Fill(evt.ssxptar)
+              H_ssyptar_DUMMY_RAND.Fill(evt.ssyptar)
+
+              H_hsxfp_DUMMY_RAND.Fill(evt.hsxfp)
+              H_hsyfp_DUMMY_RAND.Fill(evt.hsyfp)
+              H_hsxpfp_DUMMY_RAND.Fill(evt.hsxpfp)
+              H_hsypfp_DUMMY_RAND.Fill(evt.hsypfp)
+              H_hsdelta_DUMMY_RAND.Fill(adj_hsdelta)
+              H_hsxptar_DUMMY_RAND.Fill(evt.hsxptar)	
+              H_hsyptar_DUMMY_RAND.Fill(evt.hsyptar)
+
+              # SIMC goes from 0 to 2pi so no need for +pi          
+              H_ph_q_DUMMY_RAND.Fill((phi_shift))
+              H_th_q_DUMMY_RAND.Fill(evt.th_q)
+              H_ph_recoil_DUMMY_RAND.Fill(evt.ph_recoil)
+              H_th_recoil_DUMMY_RAND.Fill(evt.th_recoil)
           
-          H_pmiss_DUMMY_RAND.Fill(evt.pmiss)	
-          H_emiss_DUMMY_RAND.Fill(evt.emiss)	
-          #H_emiss_DUMMY_RAND.Fill(evt.emiss_nuc)
-          H_pmx_DUMMY_RAND.Fill(evt.pmx)
-          H_pmy_DUMMY_RAND.Fill(evt.pmy)
-          H_pmz_DUMMY_RAND.Fill(evt.pmz)
-          H_Q2_DUMMY_RAND.Fill(evt.Q2)
-          H_t_DUMMY_RAND.Fill(-evt.MandelT)
-          H_W_DUMMY_RAND.Fill(evt.W)
-          H_epsilon_DUMMY_RAND.Fill(evt.epsilon)
-          H_MM_DUMMY_RAND.Fill(adj_MM)
+              H_pmiss_DUMMY_RAND.Fill(evt.pmiss)	
+              H_emiss_DUMMY_RAND.Fill(evt.emiss)	
+              #H_emiss_DUMMY_RAND.Fill(evt.emiss_nuc)
+              H_pmx_DUMMY_RAND.Fill(evt.pmx)
+              H_pmy_DUMMY_RAND.Fill(evt.pmy)
+              H_pmz_DUMMY_RAND.Fill(evt.pmz)
+              H_Q2_DUMMY_RAND.Fill(evt.Q2)
+              H_t_DUMMY_RAND.Fill(-evt.MandelT)
+              H_W_DUMMY_RAND.Fill(evt.W)
+              H_epsilon_DUMMY_RAND.Fill(evt.epsilon)
+              H_MM_DUMMY_RAND.Fill(adj_MM)
           
+    else:
+
+        offsetDict = {}
+
+        def rand_sub_consumer(category, arrays, cut_masks, hist_objs=hist_objs):
+
+            fill_from_spec(hist_objs, category, arrays, cut_masks)
+
+            # Polar plots are only kept for data and dummy
+            # Binned for the full statistics, the graph only keeps a capped random sample of points
+            if category in ("DATA", "DUMMY"):
+                allcuts = cut_masks["ALLCUTS"]
+                phi_deg = arrays["ph_q"][allcuts]*(180/math.pi)
+                fill_hist_arrays(hist_objs["polar_phiq_vs_t_binned_{}".format(category)], phi_deg, arrays["minus_t"][allcuts])
+                reservoir_fill_graph(hist_objs["polar_phiq_vs_t_{}".format(category)], phi_deg, arrays["minus_t"][allcuts], inpDict.get("POLAR_MAX_POINTS"))
+
+            if category == "DATA" and np.any(cut_masks["ALLCUTS"]):
+                # Offset of the last accepted event, same as the event loop
+                last_evt = np.flatnonzero(cut_masks["ALLCUTS"])[-1]
+                offsetDict["MM_offset_DATA"] = arrays["adj_MM"][last_evt] - arrays["MM"][last_evt]
+
+        # Trees are read once per setting and shared with the binning stages
+        if ParticleType == "kaon":
+            scan = get_event_scan(phi_setting, ParticleType, inpDict, hgcer_cutg)
+        else:
+            scan = get_event_scan(phi_setting, ParticleType, inpDict)
+        scan.register(rand_sub_consumer)
+
+        if "MM_offset_DATA" in offsetDict:
+            MM_offset_DATA = offsetDict["MM_offset_DATA"]
+
     ################################################################################################################################################
     # Normalize dummy by effective charge and target correction
     # Normalize data by effective charge    
@@ -2002,6 +2051,7 @@ def rand_sub(phi_setting, inpDict):
     histDict["MM_vs_beta_DUMMY"] = MM_vs_beta_DUMMY
     histDict["phiq_vs_t_DUMMY"] = phiq_vs_t_DUMMY
     histDict["polar_phiq_vs_t_DUMMY"] = polar_phiq_vs_t_DUMMY
+    histDict["polar_phiq_vs_t_binned_DUMMY"] = polar_phiq_vs_t_binned_DUMMY
     histDict["H_hsdelta_DATA"] =     H_hsdelta_DATA
     histDict["H_hsxptar_DATA"] =     H_hsxptar_DATA
     histDict["H_hsyptar_DATA"] =     H_hsyptar_DATA
@@ -2047,6 +2097,7 @@ def rand_sub(phi_setting, inpDict):
     histDict["MM_vs_beta_DATA"] = MM_vs_beta_DATA
     histDict["phiq_vs_t_DATA"] = phiq_vs_t_DATA
     histDict["polar_phiq_vs_t_DATA"] = polar_phiq_vs_t_DATA
+    histDict["polar_phiq_vs_t_binned_DATA"] = polar_phiq_vs_t_binned_DATA
     histDict["Q2_vs_W_DATA"] = Q2_vs_W_DATA
     histDict["Q2_vs_t_DATA"] = Q2_vs_t_DATA
     histDict["W_vs_t_DATA"] = W_vs_t_DATA
@@ -2153,6 +2204,11 @@ def rand_sub(phi_setting, inpDict):
     
     Cpht_data.Print(outputpdf.replace("{}_FullAnalysis_".format(ParticleType),"{}_{}_rand_sub_".format(phi_setting,ParticleType)))
 
+    # Binned polar plot, all events
+    Cpht_binned_data = ROOT.TCanvas()
+    histDict["polar_phiq_vs_t_binned_DATA"].Draw("POL COLZ")
+    Cpht_binned_data.Print(outputpdf.replace("{}_FullAnalysis_".format(ParticleType),"{}_{}_rand_sub_".format(phi_setting,ParticleType)))
+
     ###
     # t plots            
     Ct = TCanvas()
@@ -0,0 +1,299 @@
+#! /usr/bin/python
+
+#
+# Description: Headless, checkpointed iteration of the model parameters against the SIMC response of every setting
+#
+# Loads the data yields and SIMC responses of all settings once and iterates the 16 parameters in one process,
+# the final par file is the starting point of the full iteration (main_iter.py)
+# ================================================================
+# Time-stamp: "2025-04-29 10:21:07 trottar"
+# ================================================================
+#
+# Author:  Richard L. Trotta III <trotta@cua.edu>
+#
+# Copyright (c) trottar
+#
+import numpy as np
+from scipy.optimize import least_squares
+import sys, os, json, time, hashlib
+
+##################################################################################################################################################
+# Importing utility functions
+
+sys.path.append("utility")
+from utility import create_dir
+from model_registry import get_model
+from response_matrix import load_simc_response, read_yield_data
+
+###############################################################################################################################################
+# Input arguments
+
+# e.g. python3 iter_driver.py 3p0 3p14 kaon +1 <settings file> 10 1e-3 (tolerance optional)
+# The settings file has one "simc_response_file yield_data_file" pair per line ('#' lines are skipped),
+# one line for each phi setting of both epsilons. The response files are written by find_yield_simc
+# with inpDict["SIMC_RESPONSE"] = True ({phi}_{particle}_Q{Q2}W{W}_{EPSSET}e_simc_response.npz in OUTPATH)
+if len(sys.argv) not in (7, 8):
+    print("Usage: python3 iter_driver.py Q2 W ParticleType POL settings_file num_iter [tolerance]")
+    sys.exit(2)
+
+Q2 = sys.argv[1]
+W = sys.argv[2]
+ParticleType = sys.argv[3]
+POL = sys.argv[4]
+settings_file = sys.argv[5]
+num_iter = int(sys.argv[6])
+tolerance = float(sys.argv[7]) if len(sys.argv) == 8 else None
+
+###############################################################################################################################################
+# ltsep package import and pathing definitions
+
+# Import package for cuts
+from ltsep import Root
+# Import package for progress bar
+from ltsep import Misc
+
+lt=Root(os.path.realpath(__file__),"Plot_LTSep")
+
+# Add this to all files for more dynamic pathing
+USER=lt.USER # Grab user info for file finding
+HOST=lt.HOST
+REPLAYPATH=lt.REPLAYPATH
+UTILPATH=lt.UTILPATH
+LTANAPATH=lt.LTANAPATH
+ANATYPE=lt.ANATYPE
+OUTPATH=lt.OUTPATH
+
+##################################################################################################################################################
+# Hard coded
+
+# Model function evaluations allowed per iteration, so every checkpoint is reached in bounded time
+MAX_NFEV = 200
+
+# Stop once neither the parameters nor the data/SIMC ratios move by more than the tolerance
+# (relative change of each parameter, absolute change of each ratio), when none is given
+TOLERANCE = 1e-3
+if tolerance is None:
+    tolerance = TOLERANCE
+
+###############################################################################################################################################
+
+if int(POL) == 1:
+    pol_str = "pl"
+elif int(POL) == -1:
+    pol_str = "mn"
+else:
+    print("ERROR: Invalid polarity...must be +1 or -1")
+    sys.exit(2)
+
+par_name = "par.{}_Q{}W{}.dat".format(pol_str, Q2.replace("p",""), W.replace("p",""))
+start_param_file = '{}/src/{}/parameters/{}'.format(LTANAPATH, ParticleType, par_name)
+
+ckpt_dir = "{}/iter_driver_{}_Q{}W{}".format(OUTPATH, ParticleType, Q2, W)
+create_dir(ckpt_dir)
+
+def read_par_file(par_file):
+    '''
+    The 16 parameters of a par file (par, par_err, indx, chi2 per line)
+    '''
+    par_vec = []
+    with open(par_file, 'r') as f:
+        for line in f:
+            data = line.split()
+            if data:
+                par_vec.append(float(data[0]))
+    return np.array(par_vec[:16], dtype=np.float64)
+
+def write_par_file(par_file, par_vec, par_err_vec, red_chi2):
+    '''
+    Same format as xfit_in_t writes
+    '''
+    with open(par_file, 'w') as f:
+        for i in range(len(par_vec)):
+            f.write("{:13.5e} {:13.5e} {:3d} {:12.1f}\n".format(par_vec[i], par_err_vec[i], i+1, red_chi2))
+
+def file_digest(fn):
+    '''
+    sha256 of the contents of a file, None if it does not exist
+    '''
+    if not os.path.isfile(fn):
+        return None
+    digest = hashlib.sha256()
+    with open(fn, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def last_checkpoint(inputs):
+    '''
+    Checkpoint of the highest finished iteration, None if there is none
+
+    A rerun of the same command resumes from this checkpoint (iter_<n>.json in ckpt_dir).
+    inputs is {path : file_digest} of the settings, response, yield and starting par files of this
+    run. A checkpoint written from different inputs is not resumed, the run stops instead.
+    '''
+    ckpts = sorted(f for f in os.listdir(ckpt_dir) if f.startswith("iter_") and f.endswith(".json"))
+    if not ckpts:
+        return None
+    with open("{}/{}".format(ckpt_dir, ckpts[-1]), 'r') as f:
+        ckpt = json.load(f)
+    ckpt_inputs = ckpt.get("inputs", {})
+    changed = sorted(fn for fn in set(inputs) | set(ckpt_inputs) if inputs.get(fn) != ckpt_inputs.get(fn))
+    if changed:
+        print("\n\nERROR: The checkpoints in {} were made from different inputs:".format(ckpt_dir))
+        for fn in changed:
+            print("    {}".format(fn))
+        print("Restore these files or remove {} to start fresh\n\n".format(ckpt_dir))
+        sys.exit(2)
+    return ckpt
+
+##################################################################################################################################################
+# Load every setting once
+
+model = get_model(Q2, W)
+
+settings = []
+input_files = [settings_file, start_param_file]
+with open(settings_file, 'r') as f:
+    for line in f:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        response_file, f_yield = line.split()[:2]
+        input_files += [response_file, f_yield]
+        response = load_simc_response(response_file)
+        if response is None:
+            print("\n\nERROR: No SIMC response file found called {}\n\n".format(response_file))
+            sys.exit(2)
+        data_yield, data_err = read_yield_data(f_yield, response.shape)
+        settings.append({
+            "name" : os.path.basename(response_file).replace("_simc_response.npz", ""),
+            "response" : response,
+            "data_yield" : data_yield,
+            "data_err" : data_err,
+            "used" : data_err > 0.0,
+        })
+if not settings:
+    print("\n\nERROR: No settings listed in {}\n\n".format(settings_file))
+    sys.exit(2)
+
+print("\nLoaded {} settings, {} SIMC events".format(len(settings), sum(s["response"].matrix.shape[1] for s in settings)))
+
+def setting_yields(params):
+    return [s["response"].predict(model, params) for s in settings]
+
+def setting_ratios(yields):
+    ratios = []
+    for s, yld in zip(settings, yields):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratios.append(np.where(yld > 0.0, s["data_yield"]/yld, 0.0))
+    return ratios
+
+##################################################################################################################################################
+# Start or resume
+
+inputs = {os.path.realpath(fn) : file_digest(fn) for fn in input_files}
+ckpt = last_checkpoint(inputs)
+if ckpt is None:
+    start_iter = 0
+    par_vec = read_par_file(start_param_file)
+    free = par_vec != 0.0
+    prev_ratios = setting_ratios(setting_yields(par_vec))
+    print("\nStarting from {}".format(start_param_file))
+else:
+    start_iter = ckpt["iteration"]
+    par_vec = np.array(ckpt["params"], dtype=np.float64)
+    free = np.array(ckpt["free"], dtype=bool)
+    prev_ratios = [np.array(ckpt["ratio"][s["name"]], dtype=np.float64) for s in settings]
+    print("\nResuming after iteration {} from {}".format(start_iter, ckpt_dir))
+    if ckpt.get("converged", False):
+        print("Iteration already converged, nothing to do")
+        sys.exit(0)
+
+def residuals(free_par):
+    params = par_vec.copy()
+    params[free] = free_par
+    res = []
+    for s, yld in zip(settings, setting_yields(params)):
+        res.append(((s["data_yield"]-yld)/np.where(s["used"], s["data_err"], 1.0))[s["used"]])
+    return np.concatenate(res)
+
+def jacobian(free_par):
+    '''
+    Derivatives of residuals from the model derivatives, no finite difference steps
+    '''
+    params = par_vec.copy()
+    params[free] = free_par
+    jac = []
+    for s in settings:
+        yld_jac = s["response"].predict_jac(model, params)[..., free]
+        jac.append((-yld_jac/np.where(s["used"], s["data_err"], 1.0)[..., None])[s["used"]])
+    return np.concatenate(jac)
+
+##################################################################################################################################################
+# Iterate
+
+# An iteration is one bounded least squares step (MAX_NFEV model evaluations) of the free parameters
+# against the data yields of all settings together, from the parameters of the last iteration.
+# Parameters that are zero in the starting par file are not used by the model and stay fixed.
+# After every iteration the parameters, chi2 and data/SIMC ratios are written to iter_<n>.json
+# (the checkpoint last_checkpoint resumes from), with the parameters also in par.<pol>_Q<Q2>W<W>.dat
+
+for iteration in range(start_iter+1, num_iter+1):
+
+    start_time = time.time()
+
+    fit = least_squares(residuals, par_vec[free], jac=jacobian, max_nfev=MAX_NFEV)
+
+    new_par_vec = par_vec.copy()
+    new_par_vec[free] = fit.x
+    ndf = max(int(sum(s["used"].sum() for s in settings)) - int(free.sum()), 1)
+    chi2 = float(np.sum(fit.fun**2))
+
+    # Parameter errors from the Jacobian of the last step, zero if it is singular
+    par_err_vec = np.zeros_like(new_par_vec)
+    try:
+        cov = np.linalg.inv(fit.jac.T @ fit.jac) * chi2/ndf
+        par_err_vec[free] = np.sqrt(np.abs(np.diag(cov)))
+    except np.linalg.LinAlgError:
+        pass
+
+    ratios = setting_ratios(setting_yields(new_par_vec))
+
+    par_change = np.max(np.abs(new_par_vec-par_vec)/np.maximum(np.abs(par_vec), 1e-12))
+    ratio_change = max(np.max(np.abs(r-r_prev)) for r, r_prev in zip(ratios, prev_ratios))
+    converged = par_change < tolerance and ratio_change < tolerance
+
+    print("\nIteration {}: chi2/ndf = {:.4e}, max par change = {:.3e}, max ratio change = {:.3e} ({:.1f} s)".format(
+        iteration, chi2/ndf, par_change, ratio_change, time.time()-start_time))
+    for s, r in zip(settings, ratios):
+        mean_ratio = np.mean(r[r > 0.0]) if np.any(r > 0.0) else 0.0
+        print("    {:40s} mean ratio = {:.4f}".format(s["name"], mean_ratio))
+
+    # Parameters first, the json marks the iteration as finished
+    write_par_file("{}/{}".format(ckpt_dir, par_name), new_par_vec, par_err_vec, chi2/ndf)
+    out_ckpt = {
+        "iteration" : iteration,
+        "params" : new_par_vec.tolist(),
+        "par_err" : par_err_vec.tolist(),
+        "free" : free.tolist(),
+        "inputs" : inputs,
+        "chi2" : chi2,
+        "ndf" : ndf,
+        "par_change" : float(par_change),
+        "ratio_change" : float(ratio_change),
+        "converged" : bool(converged),
+        "ratio" : {s["name"] : r.tolist() for s, r in zip(settings, ratios)},
+    }
+    tmp_file = "{}/iter_{:03d}.json.tmp".format(ckpt_dir, iteration)
+    with open(tmp_file, 'w') as f_json:
+        json.dump(out_ckpt, f_json)
+    os.replace(tmp_file, "{}/iter_{:03d}.json".format(ckpt_dir, iteration))
+
+    par_vec = new_par_vec
+    prev_ratios = ratios
+
+    if converged:
+        print("\nConverged after iteration {} (tolerance {:.1e})".format(iteration, tolerance))
+        break
+
+print("\nFinal parameters written to {}/{}".format(ckpt_dir, par_name))
@@ -38,6 +38,33 @@ import shutil
 sys.path.append("utility")
 from utility import open_root_file, show_pdf_with_evince, create_dir, is_root_obj, is_hist, hist_to_root, custom_encoder, set_dynamic_axis_ranges, notify_email, request_yn_response, run_bash_script
 
+##################################################################################################################################################
+# Quick-look options, may follow the positional arguments
+#   --prescale N : keep every N-th entry of the data, dummy and SIMC trees
+#   --fraction f : same with N = round(1/f), f must give N > 1 (at most about 2/3)
+# Normalizations are scaled by N so yields and ratios stay comparable, outputs are tagged _prescale{N}
+# A quick-look run stops after the tagged OUTPATH products (no yield/average lists, parameter or model
+# copies and no cross sections), so the full statistics results are never overwritten
+PRESCALE = 1
+for opt in ["--prescale", "--fraction"]:
+    if opt in sys.argv:
+        i_opt = sys.argv.index(opt)
+        try:
+            # int() rejects --prescale 2.5 rather than silently truncating it
+            PRESCALE = int(sys.argv[i_opt+1]) if opt == "--prescale" else int(round(1/float(sys.argv[i_opt+1])))
+        except (IndexError, ValueError, ZeroDivisionError):
+            print("ERROR: {} needs {}".format(opt, "an integer" if opt == "--prescale" else "a number"))
+            sys.exit(1)
+        if opt == "--fraction":
+            if PRESCALE <= 1:
+                print("ERROR: Invalid fraction {}...gives prescale {}, must be small enough for a prescale above 1".format(sys.argv[i_opt+1], PRESCALE))
+                sys.exit(1)
+            print("Fraction {} uses prescale {}".format(sys.argv[i_opt+1], PRESCALE))
+        del sys.argv[i_opt:i_opt+2]
+if PRESCALE < 1:
+    print("ERROR: Invalid prescale {}...must be at least 1 (fraction at most 1)".format(PRESCALE))
+    sys.exit(1)
+
 ##################################################################################################################################################
 # Check the number of arguments provided to the script
 
@@ -113,6 +140,11 @@ if EPSSET == "low":
     EPSVAL = LOEPS
 else:
     EPSVAL = HIEPS
+
+# Quick-look outputs never overwrite full statistics results (files in OUTPATH and the iteration directory)
+if PRESCALE > 1:
+    OutFilename = "{}_prescale{}".format(OutFilename, PRESCALE)
+    formatted_date = "{}_prescale{}".format(formatted_date, PRESCALE)
     
 inpDict = {
     "kinematics" : kinematics,
@@ -162,6 +194,41 @@ inpDict = {
     "formatted_date" : formatted_date,
 }
 
+##############
+# HARD CODED #
+##############
+# Set True to fill histograms with the original per-event PyROOT loops
+# instead of the shared columnar (uproot/numpy) event scan, useful for validation
+# Applies to rand_sub, calculate_yield, ave_per_bin and particle_subtraction
+inpDict["EVENT_LOOP"] = False
+# Reuse the per-event cut masks stored next to the input ROOT files ({phi}_{particle}_{InDATAFilename}_{prompt/rand}_scan.npz)
+# The cache is rebuilt automatically when the input file or any cut parameter changes
+inpDict["SCAN_CACHE"] = True
+# Events per chunk when streaming the trees (int), a size string such as "500 MB",
+# or None to choose from the available memory of the node
+inpDict["CHUNK_SIZE"] = None
+# Maximum number of points kept in the polar (phi, -t) scatter graphs, a random sample of the accepted events
+# The binned polar_phiq_vs_t_binned_* histograms always hold every event, None keeps every point in the graphs
+inpDict["POLAR_MAX_POINTS"] = 20000
+# Number of worker processes for the independent per phi setting steps (rand_sub, compare_simc; iter_weight, compare_simc_iter in main_iter.py)
+# Set to 1 to run the settings one after another in this process
+inpDict["SETTING_PROCS"] = 1
+# Also write the sparse SIMC response matrix of each setting ({phi}_{particle}_Q{Q2}W{W}_{EPSSET}e_simc_response.npz in OUTPATH)
+# from find_yield_simc, SIMC yields of any model parameters are then one sparse product (see response_matrix)
+inpDict["SIMC_RESPONSE"] = False
+# Interpolate the model from a (Q2, W, t, theta_cm) grid of each parameter set when reweighting SIMC (iter_weight)
+# The grids are cached in OUTPATH (xsect_grid_Q{Q2}W{W}_<hash>.npz) and their max interpolation error is printed
+inpDict["XSECT_GRID"] = False
+# Quick-look prescale (see --prescale/--fraction above), 1 for full statistics
+# Only the columnar event scan applies it, so it cannot be combined with EVENT_LOOP
+inpDict["PRESCALE"] = PRESCALE
+if PRESCALE > 1 and inpDict["EVENT_LOOP"]:
+    print("ERROR: --prescale/--fraction needs EVENT_LOOP = False")
+    sys.exit(1)
+##############
+##############
+##############
+
 ###############################################################################################################################################
 # ltsep package import and pathing definitions
 
@@ -199,9 +266,10 @@ ROOT.gROOT.SetBatch(ROOT.kTRUE) # Set ROOT to batch mode explicitly, does not sp
 ###############################################################################################################################################
 
 # Removes this file to reset iteration count (see below for more details)
+# A quick-look run is never an iteration, so it leaves the iteration count alone
 f_path = "{}/{}_Q{}W{}_iter.dat".format(LTANAPATH,ParticleType,Q2,W)
 # Check if the file exists
-if os.path.exists(f_path):
+if os.path.exists(f_path) and PRESCALE == 1:
     os.remove(f_path)
 
 # Create a new directory for each iteration in cache
@@ -355,8 +423,13 @@ from rand_sub import rand_sub
 # Put these all into an array so that if we are missing a setting it is easier to remove
 # Plus it makes the code below less repetitive
 histlist = []
-for phiset in phisetlist:
-    histlist.append(rand_sub(phiset,inpDict))
+if inpDict["SETTING_PROCS"] > 1:
+    # Settings are independent until binning, rand_sub and compare_simc are run together per worker
+    from setting_pool import run_settings
+    histlist = run_settings(phisetlist, inpDict, inpDict["SETTING_PROCS"])
+else:
+    for phiset in phisetlist:
+        histlist.append(rand_sub(phiset,inpDict))
     
 print("\n\n")
 
@@ -386,8 +459,10 @@ sys.path.append("simc_ana")
 from compare_simc import compare_simc
 
 # Upate hist dictionary with effective charge and simc histograms
-for hist in histlist:
-    hist.update(compare_simc(hist, inpDict))    
+# Already done by the workers when SETTING_PROCS > 1
+if inpDict["SETTING_PROCS"] <= 1:
+    for hist in histlist:
+        hist.update(compare_simc(hist, inpDict))    
 
 if DEBUG:
     # Show plot pdf for each setting
@@ -638,21 +713,26 @@ with open(foutjson, 'w') as f_json:
     json.dump(combineDict, f_json, default=custom_encoder)
 output_file_lst.append(foutjson)
 
-from physics_lists import create_lists
-create_lists(aveDict, yieldDict, histlist, inpDict, phisetlist, output_file_lst)
+if PRESCALE == 1:
+    from physics_lists import create_lists
+    create_lists(aveDict, yieldDict, histlist, inpDict, phisetlist, output_file_lst)
 
-# Copy initial parameterization to specific particle type directory
-shutil.copy('{}/src/models/par_{}_Q{}W{}'.format(LTANAPATH, pol_str, Q2.replace("p",""), W.replace("p","")), '{}/src/{}/parameters/par.{}_Q{}W{}.dat'.format(LTANAPATH, ParticleType, pol_str, Q2.replace("p",""), W.replace("p","")))
+    # Copy initial parameterization to specific particle type directory
+    shutil.copy('{}/src/models/par_{}_Q{}W{}'.format(LTANAPATH, pol_str, Q2.replace("p",""), W.replace("p","")), '{}/src/{}/parameters/par.{}_Q{}W{}.dat'.format(LTANAPATH, ParticleType, pol_str, Q2.replace("p",""), W.replace("p","")))
 
-# Copy input model to specific particle type directory
-shutil.copy('{}/src/models/Q{}W{}.model'.format(LTANAPATH, Q2, W), '{}/src/{}/functions/Q{}W{}.model'.format(LTANAPATH, ParticleType, Q2, W))
+    # Copy input model to specific particle type directory
+    shutil.copy('{}/src/models/Q{}W{}.model'.format(LTANAPATH, Q2, W), '{}/src/{}/functions/Q{}W{}.model'.format(LTANAPATH, ParticleType, Q2, W))
 
-# Save input model
-output_file_lst.append('{}/functions/Q{}W{}.model'.format(ParticleType, Q2, W))
+    # Save input model
+    output_file_lst.append('{}/functions/Q{}W{}.model'.format(ParticleType, Q2, W))
 
-# ***Parameter file from last iteration!***
-# ***These old parameters are needed for this iteration. See README for more info on procedure!***
-old_param_file = '{}/src/{}/parameters/par.{}_Q{}W{}.dat'.format(LTANAPATH, ParticleType, pol_str, Q2.replace("p",""), W.replace("p",""))
+    # ***Parameter file from last iteration!***
+    # ***These old parameters are needed for this iteration. See README for more info on procedure!***
+    old_param_file = '{}/src/{}/parameters/par.{}_Q{}W{}.dat'.format(LTANAPATH, ParticleType, pol_str, Q2.replace("p",""), W.replace("p",""))
+else:
+    # Quick-look run, everything below writes untagged files in src/{ParticleType} and src/models
+    print("\nQuick-look run (prescale {}), skipping the yield/average lists, parameter/model copies and cross sections...".format(PRESCALE))
+    old_param_file = '{}/src/models/par_{}_Q{}W{}'.format(LTANAPATH, pol_str, Q2.replace("p",""), W.replace("p",""))
 cut_summary_lst += "\n\nUnsep Parameterization for {}...\n".format(formatted_date)
 with open(old_param_file, 'r') as file:
     for line in file:
@@ -673,7 +753,7 @@ inpDict["cut_summary_lst"] = cut_summary_lst
 * Calculate the unseparated cross section
 '''
 
-if EPSSET == "high":
+if EPSSET == "high" and PRESCALE == 1:
     
     # Save fortran scripts that contain iteration functional form of parameterization
     py_param = 'models/param_{}_{}.py'.format(ParticleType, pol_str)
@@ -749,7 +829,8 @@ if EPSSET == "high":
 new_dir = "{}/{}/Q{}W{}/{}".format(TEMP_CACHEPATH, ParticleType.lower(), Q2, W, formatted_date)
 create_dir(new_dir)
 
-if EPSSET == "high":
+# Quick-look runs are not added to the _iter.dat history, main_iter.py keeps iterating on the full statistics result
+if EPSSET == "high" and PRESCALE == 1:
     
     print("\n\n")
 
@@ -774,7 +855,7 @@ if EPSSET == "high":
         # If not, create it and fill it with the string
         with open(f_path, 'x') as file:
             file.write(formatted_date)
-                
+            
     f_path_new = f_path.replace(LTANAPATH,new_dir).replace("iter","iter_0") # Zeroth iteration
     print("\nCopying {} to {}".format(f_path,f_path_new))
     shutil.copy(f_path,f_path_new)
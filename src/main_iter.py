@@ -36,7 +36,7 @@ import shutil
 # Importing utility functions
 
 sys.path.append("utility")
-from utility import open_root_file, show_pdf_with_evince, create_dir, is_root_obj, is_hist, hist_to_root, last_iter, get_histogram, hist_in_dir, custom_encoder, notify_email, request_yn_response, run_bash_script
+from utility import open_root_file, show_pdf_with_evince, create_dir, is_root_obj, is_hist, hist_to_root, last_iter, get_histogram, hist_in_dir, custom_encoder, notify_email, request_yn_response, run_bash_script, link_or_copy
 
 ##################################################################################################################################################
 # Check the number of arguments provided to the script
@@ -390,10 +390,12 @@ print("\nCopying {} to {}".format(LTANAPATH+"/src/"+py_param, LTANAPATH+"/src/"+
 shutil.copy(LTANAPATH+"/src/"+py_param, LTANAPATH+"/src/"+py_param_active)
 
 sys.path.append("simc_ana")
-from iter_weight import iter_weight
+from iter_weight import iter_weight, iter_file_name
 from compare_simc_iter import compare_simc
 
 # Upate hist dictionary with effective charge and simc histograms
+# Settings are copied here and then reweighted and compared one after another, or in SETTING_PROCS workers
+iter_jobs = []
 for hist in histlist:
     if iter_num > 1:
         # SIMC file with weight from last iteration
@@ -405,28 +407,39 @@ for hist in histlist:
     new_simc_root = old_simc_root.replace(closest_date, formatted_date)
     old_simc_hist = '{}/root/Prod_Coin_{}.hist'.format(prev_iter_dir, kinematics[0]+hist["phi_setting"].lower()+"_"+kinematics[1])
     new_simc_hist = old_simc_hist.replace(closest_date, formatted_date)
+    # Original SIMC file, the iteration weights are small sidecars aligned to it (see iter_weight)
+    old_simc_base = '{}/root/Prod_Coin_{}.root'.format(prev_iter_dir, kinematics[0]+hist["phi_setting"].lower()+"_"+kinematics[1])
+    new_simc_base = old_simc_base.replace(closest_date, formatted_date)
     # ***Create root directory here since it is used for weight iteration***
     create_dir(new_dir+"/root")
     # Make sure old simc root file exists
     if os.path.exists(old_simc_root):
         # Copy to new iteration so and then edit the weight
         print("\nCopying {} to {}".format(old_simc_root, new_simc_root))
-        shutil.copy(old_simc_root,new_simc_root)
+        # Hard link the unchanged SIMC file instead of duplicating it every iteration
+        link_or_copy(old_simc_root,new_simc_root)
+        if iter_num > 1 and os.path.exists(old_simc_base):
+            link_or_copy(old_simc_base,new_simc_base)
         shutil.copy(old_simc_hist,new_simc_hist)
         # Make sure new simc root file exists
         if os.path.exists(new_simc_root):
-            # Function to calculation new weight and apply it to simc root file 
-            iter_weight(new_param_file, new_simc_root, inpDict, hist["phi_setting"])
-            if iter_num > 1:
-                # SIMC file with weight from last iteration
-                new_simc_root = new_simc_root.replace("iter_{}".format(iter_num-1),"iter_{}".format(iter_num))
-            else:
-                # SIMC file with weight from last iteration
-                new_simc_root = new_simc_root.replace(".root","_iter_{}.root".format(iter_num))            
-            hist.update(compare_simc(new_simc_root, hist, inpDict))
+            iter_jobs.append((hist, new_simc_root))
         else:
             print("ERROR: {} not properly copied to {}".format(old_simc_root, new_simc_root))
             sys.exit(2)
+
+if inpDict.get("SETTING_PROCS", 1) > 1:
+    # Each setting reweights its own SIMC file, the histograms come back through per setting shards
+    from setting_pool import run_iter_settings
+    for (hist, new_simc_root), simcDict in zip(iter_jobs, run_iter_settings(iter_jobs, new_param_file, inpDict, inpDict["SETTING_PROCS"])):
+        hist.update(simcDict)
+else:
+    for hist, new_simc_root in iter_jobs:
+        # Function to calculation new weight and apply it to simc root file 
+        iter_weight(new_param_file, new_simc_root, inpDict, hist["phi_setting"])
+        # SIMC file with weight from this iteration
+        new_simc_root = iter_file_name(new_simc_root, iter_num)
+        hist.update(compare_simc(new_simc_root, hist, inpDict))
             
 if DEBUG:
     # Show plot pdf for each setting
@@ -74,6 +74,15 @@ else:
     mtar = 0.9395654133 # GeV/c^2, mass of the target (neutron)
 w_set = float(W.replace("p",".")) # W value
 
+# L/T separation of each t-bin
+#   "wls" - Weighted least squares on numpy arrays (utility/lt_linear.py), one solve per t-bin, no limits on the ρ's
+#   "tf2" - Staged TF2 fit with the PARAM_LIMITS below, the WLS result is printed alongside as a cross-check
+LT_SOLVER = "wls"
+
+# Monte Carlo replicas of the unseparated cross sections per t-bin, separated in one batched solve
+# (percentiles and correlations of sigT, sigL, sigLT, sigTT as a check of the quoted errors), 0 turns them off
+NUM_REPLICAS = 5000
+
 ###############################################################################################################################################
 # ---------------------------  DYNAMIC LIMITS  ---------------------------------
 #  PARAM_LIMITS encodes the *physical* boundaries that each cross-section term
@@ -181,6 +190,9 @@ def check_sigma_positive(fcn, graph,
 # Import separated xsects models
 from lt_active import LT_sep_x_fun_wrapper, LT_sep_x_fun_unsep_wrapper
 
+sys.path.append("../utility")
+from lt_linear import read_unsep_file, lt_design, lt_wls, lt_rho, lt_rho_err, lt_replicas, lt_replica_summary, print_replica_summary
+
 ###############################################################################################################################################
 
 def single_setting(q2_set, w_set, fn_lo, fn_hi):
@@ -204,6 +216,10 @@ def single_setting(q2_set, w_set, fn_lo, fn_hi):
     nhi = TNtuple("nhi", "nhi", "x/F:dx:x_mod:eps:theta:phi:t:w:Q2")
     nhi.ReadFile(fn_hi)
 
+    # Same files as arrays for the weighted least squares separation
+    unsep_lo = read_unsep_file(fn_lo)
+    unsep_hi = read_unsep_file(fn_hi)
+
     q2_list = []
     w_list = []
     theta_list = []
@@ -383,173 +399,217 @@ def single_setting(q2_set, w_set, fn_lo, fn_hi):
         g_plot_err.SetLineWidth(2)
 
         # ------------------------------------------------------------------
-        # Re-parameterised version enforcing |ρ| ≤ 1 
+        # Weighted least squares separation, same points and errors as g_plot_err
+        # straight from the files. Linear in sigT, sigL, sigLT, sigTT at fixed eps and phi,
+        # so a single solve gives all four and their covariance (no limits on the ρ's).
         # ------------------------------------------------------------------
-        # Re-parameterised LT/TT enforcing |ρ|≤1:
-        fff2 = TF2(
-            "fff2",
-            (
-                f"("
-                f"[0]"                                             # σ_T
-                f"+ y*[1]"                                        # ε·σ_L
-                f"+ sqrt(2*y*(1.+y))*cos(x*({PI}/180))*[2]*sqrt([0]*[1])"  # ρ_LT·√(σₜσₗ)
-                f"+ y*cos(2*x*({PI}/180))*[3]*[0]"               # ρ_TT·σₜ
-                f")"
-            ),
-            0, 360,
-            LOEPS-0.1, HIEPS+0.1
-        )         
-
-        for k in range(4):
-            fff2.ReleaseParameter(k)
-
-        # ---------------------------------------------------------------
-        par_keys  = ["sigT", "sigL", "rhoLT", "rhoTT"]
-        current_i = 0
-
-        for idx, key in enumerate(par_keys):
-            fff2.SetParName(idx, key)
-            if key in PARAM_LIMITS:
-                lo, hi = PARAM_LIMITS[key][current_i]
-                fff2.SetParLimits(idx, lo, hi)
-            else:
-                raise KeyError(f"{key} not found in PARAM_LIMITS")
-
-            # --- give MINUIT a sensible first step ---------------------
-            if key.startswith("rho"):
-                fff2.SetParError(idx, 0.02)            # ±0.02 for ρ’s
-            else:
-                step = 0.05 * (hi - lo) if hi > lo else 0.1
-                fff2.SetParError(idx, step)            # 5 % of range for σT, σL
-        # ---------------------------------------------------------------
-
-        # — Dynamic seeds based on data averages —
-        # Equations 1.13 and 1.14 from Bill's thesis
-        SEED_SIGT = ((HIEPS * ave_sig_lo) - (LOEPS * ave_sig_hi)) / eps_diff
-        SEED_SIGL = (ave_sig_hi - ave_sig_lo) / eps_diff
-        print(f"SEED_SIGT = {SEED_SIGT}")
-        print(f"SEED_SIGL = {SEED_SIGL}")
-        fff2.SetParameters(
-            SEED_SIGT,      # σ_T
-            SEED_SIGL,      # σ_L
-            0.0,         # ρ_LT
-            0.0          # ρ_TT
-        )
+        wls_pts = []
+        for unsep, eps_val in ((unsep_lo, lo_eps), (unsep_hi, hi_eps)):
+            sel = (unsep["t32"] == np.float32(t_list[i])) & (unsep["x"] != 0.0)
+            wls_pts.append((np.full(np.count_nonzero(sel), eps_val), unsep["phi"][sel], unsep["x"][sel],
+                            np.sqrt(unsep["dx"][sel]**2 + (syst_frac * unsep["x"][sel])**2)))
+        wls_cols = [np.concatenate(col) for col in zip(*wls_pts)]
+        wls_par, wls_cov, wls_chi2, wls_ndf = lt_wls(*wls_cols)
+        wls_err = np.sqrt(np.abs(np.diag(wls_cov)))
+
+        # Replicas drawn from the same errors, seeded by the t-bin so reruns agree
+        if NUM_REPLICAS > 0:
+            replica_summary = lt_replica_summary(lt_replicas(*wls_cols, num_replicas=NUM_REPLICAS, seed=i))
+
+        if LT_SOLVER == "tf2":
+            # ------------------------------------------------------------------
+            # Re-parameterised version enforcing |ρ| ≤ 1 
+            # ------------------------------------------------------------------
+            # Re-parameterised LT/TT enforcing |ρ|≤1:
+            fff2 = TF2(
+                "fff2",
+                (
+                    f"("
+                    f"[0]"                                             # σ_T
+                    f"+ y*[1]"                                        # ε·σ_L
+                    f"+ sqrt(2*y*(1.+y))*cos(x*({PI}/180))*[2]*sqrt([0]*[1])"  # ρ_LT·√(σₜσₗ)
+                    f"+ y*cos(2*x*({PI}/180))*[3]*[0]"               # ρ_TT·σₜ
+                    f")"
+                ),
+                0, 360,
+                LOEPS-0.1, HIEPS+0.1
+            )         
+
+            for k in range(4):
+                fff2.ReleaseParameter(k)
+
+            # ---------------------------------------------------------------
+            par_keys  = ["sigT", "sigL", "rhoLT", "rhoTT"]
+            current_i = 0
+
+            for idx, key in enumerate(par_keys):
+                fff2.SetParName(idx, key)
+                if key in PARAM_LIMITS:
+                    lo, hi = PARAM_LIMITS[key][current_i]
+                    fff2.SetParLimits(idx, lo, hi)
+                else:
+                    raise KeyError(f"{key} not found in PARAM_LIMITS")
+
+                # --- give MINUIT a sensible first step ---------------------
+                if key.startswith("rho"):
+                    fff2.SetParError(idx, 0.02)            # ±0.02 for ρ’s
+                else:
+                    step = 0.05 * (hi - lo) if hi > lo else 0.1
+                    fff2.SetParError(idx, step)            # 5 % of range for σT, σL
+            # ---------------------------------------------------------------
+
+            # — Dynamic seeds based on data averages —
+            # Equations 1.13 and 1.14 from Bill's thesis
+            SEED_SIGT = ((HIEPS * ave_sig_lo) - (LOEPS * ave_sig_hi)) / eps_diff
+            SEED_SIGL = (ave_sig_hi - ave_sig_lo) / eps_diff
+            print(f"SEED_SIGT = {SEED_SIGT}")
+            print(f"SEED_SIGL = {SEED_SIGL}")
+            fff2.SetParameters(
+                SEED_SIGT,      # σ_T
+                SEED_SIGL,      # σ_L
+                0.0,         # ρ_LT
+                0.0          # ρ_TT
+            )
         
-        # — Give Minuit a finite “kick size” on each parameter —
-        fff2.SetParError(0, max(1.0, 0.1 * SEED_SIGT))     # σ_T step ≃10% of its seed (but at least 1)
-        fff2.SetParError(1, max(0.1, 0.1 * abs(SEED_SIGL)))# σ_L step
-        fff2.SetParError(2, 0.5)                        # ρ_LT step
-        fff2.SetParError(3, 0.5)                        # ρ_TT step        
-
-        sigL_change = TGraphErrors()
-        sigT_change = TGraphErrors()
-        sigLT_change = TGraphErrors()
-        sigTT_change = TGraphErrors()
-
-        # ---------------- FIT SEQUENCE ------------------
-        fit_step = 0  # counter for adapt_limits
-
-        # --- Fit 1: T ---
-        fff2.FixParameter(1, SEED_SIGL)   # σL
-        fff2.FixParameter(2, 0.0)   # ρLT
-        fff2.FixParameter(3, 0.0)   # ρTT
-        # — Apply limits for all parameters in stage 0 —
-        for idx, name in enumerate(["sigT","sigL","rhoLT","rhoTT"]):
-            reset_limits_from_table(fff2, idx, name, stage=0)
-        # — Give Minuit a finite “kick size” on each parameter —
-        fff2.SetParError(0, max(1.0, 0.1 * SEED_SIGT))     # σ_T step ≃10% of its seed (but at least 1)
-        fff2.SetParError(1, max(0.1, 0.1 * abs(SEED_SIGL)))# σ_L step
-        fff2.SetParError(2, 0.5)                        # ρ_LT step
-        fff2.SetParError(3, 0.5)                        # ρ_TT step  
-        g_plot_err.Fit(fff2, "SEWQ")       # quiet, no redraw
-        check_sigma_positive(fff2, g_plot_err)
-
-        sigL_change.SetTitle("t = {:.3f}".format(t_list[i]))
-        sigL_change.GetXaxis().SetTitle("Fit Step")
-        sigL_change.GetYaxis().SetTitle("#it{#sigma}_{L}")
-
-        sigL_change.SetPoint(sigL_change.GetN(), sigL_change.GetN()+1, fff2.GetParameter(1))
-        sigL_change.SetPointError(sigL_change.GetN()-1, 0, fff2.GetParError(1))
-
-        sigT_change.SetTitle("t = {:.3f}".format(t_list[i]))
-        sigT_change.GetXaxis().SetTitle("Fit Step")
-        sigT_change.GetYaxis().SetTitle("#it{#sigma}_{T}")
-
-        sigT_change.SetPoint(sigT_change.GetN(), sigT_change.GetN()+1, fff2.GetParameter(0))
-        sigT_change.SetPointError(sigT_change.GetN()-1, 0, fff2.GetParError(0))
-
-        fit_step += 1
-
-        # --- Fit 2: L (fix T) ---
-        fff2.FixParameter(0, fff2.GetParameter(0))  # σT now fixed
-        fff2.ReleaseParameter(1)    # σL now floats
-        # — Apply limits for all parameters in stage 1 —
-        for idx, name in enumerate(["sigT","sigL","rhoLT","rhoTT"]):
-            reset_limits_from_table(fff2, idx, name, stage=1)
-        # — Give Minuit a finite “kick size” on each parameter —
-        fff2.SetParError(0, max(1.0, 0.1 * SEED_SIGT))     # σ_T step ≃10% of its seed (but at least 1)
-        fff2.SetParError(1, max(0.1, 0.1 * abs(SEED_SIGL)))# σ_L step
-        fff2.SetParError(2, 0.5)                        # ρ_LT step
-        fff2.SetParError(3, 0.5)                        # ρ_TT step         
-        g_plot_err.Fit(fff2, "SEWQ")
-        check_sigma_positive(fff2, g_plot_err)
-
-        sigL_change.SetPoint(sigL_change.GetN(), sigL_change.GetN()+1, fff2.GetParameter(1))
-        sigL_change.SetPointError(sigL_change.GetN()-1, 0, fff2.GetParError(1))
-        sigT_change.SetPoint(sigT_change.GetN(), sigT_change.GetN()+1, fff2.GetParameter(0))
-        sigT_change.SetPointError(sigT_change.GetN()-1, 0, fff2.GetParError(0))
-
-        fit_step += 1    
-
-        # --- Fit 3: ρ_LT , ρ_TT --------------------------
-        fff2.FixParameter(0, fff2.GetParameter(0))  # σT now fixed
-        fff2.FixParameter(1, fff2.GetParameter(1))  # σL now fixed
-        fff2.ReleaseParameter(2)    # ρ_LT now floats
-        fff2.ReleaseParameter(3)    # ρ_TT now floats
-        # — Apply limits for all parameters in stage 2 —
-        for idx, name in enumerate(["sigT","sigL","rhoLT","rhoTT"]):
-            reset_limits_from_table(fff2, idx, name, stage=2)
-        # — Give Minuit a finite “kick size” on each parameter —
-        fff2.SetParError(0, max(1.0, 0.1 * SEED_SIGT))     # σ_T step ≃10% of its seed (but at least 1)
-        fff2.SetParError(1, max(0.1, 0.1 * abs(SEED_SIGL)))# σ_L step
-        fff2.SetParError(2, 0.5)                        # ρ_LT step
-        fff2.SetParError(3, 0.5)                        # ρ_TT step         
-        g_plot_err.Fit(fff2, "SEWQ")
-        check_sigma_positive(fff2, g_plot_err)
-
-        sigL_change.SetPoint(sigL_change.GetN(), sigL_change.GetN()+1, fff2.GetParameter(1))
-        sigL_change.SetPointError(sigL_change.GetN()-1, 0, fff2.GetParError(1))
-        sigT_change.SetPoint(sigT_change.GetN(), sigT_change.GetN()+1, fff2.GetParameter(0))
-        sigT_change.SetPointError(sigT_change.GetN()-1, 0, fff2.GetParError(0))
-
-        fit_step += 1         
-
-        # --- Fit 4: ALL --------------------------
-        fff2.ReleaseParameter(0)    # σL now floats
-        fff2.ReleaseParameter(1)    # σL now floats
-        # — Apply limits for all parameters in stage 2 —
-        for idx, name in enumerate(["sigT","sigL","rhoLT","rhoTT"]):
-            reset_limits_from_table(fff2, idx, name, stage=2)
-        # — Give Minuit a finite “kick size” on each parameter —
-        fff2.SetParError(0, max(1.0, 0.1 * SEED_SIGT))     # σ_T step ≃10% of its seed (but at least 1)
-        fff2.SetParError(1, max(0.1, 0.1 * abs(SEED_SIGL)))# σ_L step
-        fff2.SetParError(2, 0.5)                        # ρ_LT step
-        fff2.SetParError(3, 0.5)                        # ρ_TT step         
-        g_plot_err.Fit(fff2, "SEWQ")
-        check_sigma_positive(fff2, g_plot_err)     
-
-        sigL_change.SetPoint(sigL_change.GetN(), sigL_change.GetN()+1, fff2.GetParameter(1))
-        sigL_change.SetPointError(sigL_change.GetN()-1, 0, fff2.GetParError(1))
-        sigT_change.SetPoint(sigT_change.GetN(), sigT_change.GetN()+1, fff2.GetParameter(0))
-        sigT_change.SetPointError(sigT_change.GetN()-1, 0, fff2.GetParError(0))
-
-        fit_step += 1    
-
-        # --- Report reduced χ² ---
-        chi2     = fff2.GetChisquare()
-        ndf      = max(1, fff2.GetNDF())   # avoid divide-by-zero
-        red_chi2 = chi2 / ndf
+            # — Give Minuit a finite “kick size” on each parameter —
+            fff2.SetParError(0, max(1.0, 0.1 * SEED_SIGT))     # σ_T step ≃10% of its seed (but at least 1)
+            fff2.SetParError(1, max(0.1, 0.1 * abs(SEED_SIGL)))# σ_L step
+            fff2.SetParError(2, 0.5)                        # ρ_LT step
+            fff2.SetParError(3, 0.5)                        # ρ_TT step        
+
+            sigL_change = TGraphErrors()
+            sigT_change = TGraphErrors()
+            sigLT_change = TGraphErrors()
+            sigTT_change = TGraphErrors()
+
+            # ---------------- FIT SEQUENCE ------------------
+            fit_step = 0  # counter for adapt_limits
+
+            # --- Fit 1: T ---
+            fff2.FixParameter(1, SEED_SIGL)   # σL
+            fff2.FixParameter(2, 0.0)   # ρLT
+            fff2.FixParameter(3, 0.0)   # ρTT
+            # — Apply limits for all parameters in stage 0 —
+            for idx, name in enumerate(["sigT","sigL","rhoLT","rhoTT"]):
+                reset_limits_from_table(fff2, idx, name, stage=0)
+            # — Give Minuit a finite “kick size” on each parameter —
+            fff2.SetParError(0, max(1.0, 0.1 * SEED_SIGT))     # σ_T step ≃10% of its seed (but at least 1)
+            fff2.SetParError(1, max(0.1, 0.1 * abs(SEED_SIGL)))# σ_L step
+            fff2.SetParError(2, 0.5)                        # ρ_LT step
+            fff2.SetParError(3, 0.5)                        # ρ_TT step  
+            g_plot_err.Fit(fff2, "SEWQ")       # quiet, no redraw
+            check_sigma_positive(fff2, g_plot_err)
+
+            sigL_change.SetTitle("t = {:.3f}".format(t_list[i]))
+            sigL_change.GetXaxis().SetTitle("Fit Step")
+            sigL_change.GetYaxis().SetTitle("#it{#sigma}_{L}")
+
+            sigL_change.SetPoint(sigL_change.GetN(), sigL_change.GetN()+1, fff2.GetParameter(1))
+            sigL_change.SetPointError(sigL_change.GetN()-1, 0, fff2.GetParError(1))
+
+            sigT_change.SetTitle("t = {:.3f}".format(t_list[i]))
+            sigT_change.GetXaxis().SetTitle("Fit Step")
+            sigT_change.GetYaxis().SetTitle("#it{#sigma}_{T}")
+
+            sigT_change.SetPoint(sigT_change.GetN(), sigT_change.GetN()+1, fff2.GetParameter(0))
+            sigT_change.SetPointError(sigT_change.GetN()-1, 0, fff2.GetParError(0))
+
+            fit_step += 1
+
+            # --- Fit 2: L (fix T) ---
+            fff2.FixParameter(0, fff2.GetParameter(0))  # σT now fixed
+            fff2.ReleaseParameter(1)    # σL now floats
+            # — Apply limits for all parameters in stage 1 —
+            for idx, name in enumerate(["sigT","sigL","rhoLT","rhoTT"]):
+                reset_limits_from_table(fff2, idx, name, stage=1)
+            # — Give Minuit a finite “kick size” on each parameter —
+            fff2.SetParError(0, max(1.0, 0.1 * SEED_SIGT))     # σ_T step ≃10% of its seed (but at least 1)
+            fff2.SetParError(1, max(0.1, 0.1 * abs(SEED_SIGL)))# σ_L step
+            fff2.SetParError(2, 0.5)                        # ρ_LT step
+            fff2.SetParError(3, 0.5)                        # ρ_TT step         
+            g_plot_err.Fit(fff2, "SEWQ")
+            check_sigma_positive(fff2, g_plot_err)
+
+            sigL_change.SetPoint(sigL_change.GetN(), sigL_change.GetN()+1, fff2.GetParameter(1))
+            sigL_change.SetPointError(sigL_change.GetN()-1, 0, fff2.GetParError(1))
+            sigT_change.SetPoint(sigT_change.GetN(), sigT_change.GetN()+1, fff2.GetParameter(0))
+            sigT_change.SetPointError(sigT_change.GetN()-1, 0, fff2.GetParError(0))
+
+            fit_step += 1    
+
+            # --- Fit 3: ρ_LT , ρ_TT --------------------------
+            fff2.FixParameter(0, fff2.GetParameter(0))  # σT now fixed
+            fff2.FixParameter(1, fff2.GetParameter(1))  # σL now fixed
+            fff2.ReleaseParameter(2)    # ρ_LT now floats
+            fff2.ReleaseParameter(3)    # ρ_TT now floats
+            # — Apply limits for all parameters in stage 2 —
+            for idx, name in enumerate(["sigT","sigL","rhoLT","rhoTT"]):
+                reset_limits_from_table(fff2, idx, name, stage=2)
+            # — Give Minuit a finite “kick size” on each parameter —
+            fff2.SetParError(0, max(1.0, 0.1 * SEED_SIGT))     # σ_T step ≃10% of its seed (but at least 1)
+            fff2.SetParError(1, max(0.1, 0.1 * abs(SEED_SIGL)))# σ_L step
+            fff2.SetParError(2, 0.5)                        # ρ_LT step
+            fff2.SetParError(3, 0.5)                        # ρ_TT step         
+            g_plot_err.Fit(fff2, "SEWQ")
+            check_sigma_positive(fff2, g_plot_err)
+
+            sigL_change.SetPoint(sigL_change.GetN(), sigL_change.GetN()+1, fff2.GetParameter(1))
+            sigL_change.SetPointError(sigL_change.GetN()-1, 0, fff2.GetParError(1))
+            sigT_change.SetPoint(sigT_change.GetN(), sigT_change.GetN()+1, fff2.GetParameter(0))
+            sigT_change.SetPointError(sigT_change.GetN()-1, 0, fff2.GetParError(0))
+
+            fit_step += 1         
+
+            # --- Fit 4: ALL --------------------------
+            fff2.ReleaseParameter(0)    # σL now floats
+            fff2.ReleaseParameter(1)    # σL now floats
+            # — Apply limits for all parameters in stage 2 —
+            for idx, name in enumerate(["sigT","sigL","rhoLT","rhoTT"]):
+                reset_limits_from_table(fff2, idx, name, stage=2)
+            # — Give Minuit a finite “kick size” on each parameter —
+            fff2.SetParError(0, max(1.0, 0.1 * SEED_SIGT))     # σ_T step ≃10% of its seed (but at least 1)
+            fff2.SetParError(1, max(0.1, 0.1 * abs(SEED_SIGL)))# σ_L step
+            fff2.SetParError(2, 0.5)                        # ρ_LT step
+            fff2.SetParError(3, 0.5)                        # ρ_TT step         
+            g_plot_err.Fit(fff2, "SEWQ")
+            check_sigma_positive(fff2, g_plot_err)     
+
+            sigL_change.SetPoint(sigL_change.GetN(), sigL_change.GetN()+1, fff2.GetParameter(1))
+            sigL_change.SetPointError(sigL_change.GetN()-1, 0, fff2.GetParError(1))
+            sigT_change.SetPoint(sigT_change.GetN(), sigT_change.GetN()+1, fff2.GetParameter(0))
+            sigT_change.SetPointError(sigT_change.GetN()-1, 0, fff2.GetParError(0))
+
+            fit_step += 1    
+
+            # --- Report reduced χ² ---
+            chi2     = fff2.GetChisquare()
+            ndf      = max(1, fff2.GetNDF())   # avoid divide-by-zero
+            red_chi2 = chi2 / ndf
+            lt_par = [fff2.GetParameter(k) for k in range(4)]
+
+        else:
+            rho_lt, rho_tt = lt_rho(wls_par)
+            lt_par = [float(wls_par[0]), float(wls_par[1]), rho_lt, rho_tt]
+
+            sigL_change = TGraphErrors()
+            sigT_change = TGraphErrors()
+            for g_change, k, name in ((sigL_change, 1, "#it{#sigma}_{L}"), (sigT_change, 0, "#it{#sigma}_{T}")):
+                g_change.SetTitle("t = {:.3f}".format(t_list[i]))
+                g_change.GetXaxis().SetTitle("Fit Step")
+                g_change.GetYaxis().SetTitle(name)
+                g_change.SetPoint(0, 1, wls_par[k])
+                g_change.SetPointError(0, 0, wls_err[k])
+
+            # Same check as check_sigma_positive, without the refit
+            sig_min = np.min(lt_design([[LOEPS], [HIEPS]], [0, 90, 180, 270]) @ wls_par)
+            if sig_min < 0 or abs(rho_lt) > 1 or abs(rho_tt) > 1:
+                print("WARNING: Separation outside the physical region (σ < 0 or |ρ| > 1); "
+                      "consider excluding this t-bin.")
+
+            # --- Report reduced χ² ---
+            chi2     = wls_chi2
+            ndf      = max(1, wls_ndf)   # avoid divide-by-zero
+            red_chi2 = chi2 / ndf
         
         # -----------------------  remainder of original code  -----------------------
         # (all canvases, output files, plots, integration, etc. unchanged)
@@ -606,25 +666,25 @@ def single_setting(q2_set, w_set, fn_lo, fn_hi):
         
         c2.Update()
 
-        flo.FixParameter(0, fff2.GetParameter(0))
-        flo.FixParameter(1, fff2.GetParameter(1))
-        flo.FixParameter(2, fff2.GetParameter(2))
-        flo.FixParameter(3, fff2.GetParameter(3))
+        flo.FixParameter(0, lt_par[0])
+        flo.FixParameter(1, lt_par[1])
+        flo.FixParameter(2, lt_par[2])
+        flo.FixParameter(3, lt_par[3])
 
-        flo_unsep.FixParameter(0, fff2.GetParameter(0))
-        flo_unsep.FixParameter(1, fff2.GetParameter(1))
-        flo_unsep.FixParameter(2, fff2.GetParameter(2))
-        flo_unsep.FixParameter(3, fff2.GetParameter(3))
+        flo_unsep.FixParameter(0, lt_par[0])
+        flo_unsep.FixParameter(1, lt_par[1])
+        flo_unsep.FixParameter(2, lt_par[2])
+        flo_unsep.FixParameter(3, lt_par[3])
 
-        fhi.FixParameter(0, fff2.GetParameter(0))
-        fhi.FixParameter(1, fff2.GetParameter(1))
-        fhi.FixParameter(2, fff2.GetParameter(2))
-        fhi.FixParameter(3, fff2.GetParameter(3))
+        fhi.FixParameter(0, lt_par[0])
+        fhi.FixParameter(1, lt_par[1])
+        fhi.FixParameter(2, lt_par[2])
+        fhi.FixParameter(3, lt_par[3])
 
-        fhi_unsep.FixParameter(0, fff2.GetParameter(0))
-        fhi_unsep.FixParameter(1, fff2.GetParameter(1))
-        fhi_unsep.FixParameter(2, fff2.GetParameter(2))
-        fhi_unsep.FixParameter(3, fff2.GetParameter(3))
+        fhi_unsep.FixParameter(0, lt_par[0])
+        fhi_unsep.FixParameter(1, lt_par[1])
+        fhi_unsep.FixParameter(2, lt_par[2])
+        fhi_unsep.FixParameter(3, lt_par[3])
 
         glo.Fit(flo, "SEWQ")
         ghi.Fit(fhi, "SEWQ")
@@ -677,37 +737,44 @@ def single_setting(q2_set, w_set, fn_lo, fn_hi):
             sig_diff_g.SetPointError(sig_diff_g.GetN()-1, 0, sig_diff_err)      
 
         # ---------------------------------------------------------------
-        # Central values -------------------------------------------------
-        sig_t   = fff2.GetParameter(0)
-        sig_l   = fff2.GetParameter(1)
-        rho_lt  = fff2.GetParameter(2)
-        rho_tt  = fff2.GetParameter(3)
-
-        sig_lt  = rho_lt * math.sqrt(sig_t * sig_l)
-        sig_tt  = rho_tt * sig_t
-
-        # One-sigma errors ----------------------------------------------
-        sig_t_err   = fff2.GetParError(0)
-        sig_l_err   = fff2.GetParError(1)
-        rho_lt_err  = fff2.GetParError(2)
-        rho_tt_err  = fff2.GetParError(3)
-
-        # ---------------------------------------------------------------
-        # Error propagation (fully guarded) -----------------------------
-        _eps = 1e-6                           # numerical floor
-
-        safe_sig_t  = max(abs(sig_t),  _eps)
-        safe_sig_l  = max(abs(sig_l),  _eps)
-        safe_rho_lt = max(abs(rho_lt), _eps)
-
-        sig_lt_err = abs(sig_lt) * math.sqrt(
-            (rho_lt_err / safe_rho_lt)**2
-            + (sig_t_err / (2.0 * safe_sig_t))**2
-            + (sig_l_err / (2.0 * safe_sig_l))**2
-        )
-
-        sig_tt_err = math.hypot( safe_sig_t * rho_tt_err,
-                                rho_tt      * sig_t_err )
+        if LT_SOLVER == "tf2":
+            # Central values -------------------------------------------------
+            sig_t   = fff2.GetParameter(0)
+            sig_l   = fff2.GetParameter(1)
+            rho_lt  = fff2.GetParameter(2)
+            rho_tt  = fff2.GetParameter(3)
+
+            sig_lt  = rho_lt * math.sqrt(sig_t * sig_l)
+            sig_tt  = rho_tt * sig_t
+
+            # One-sigma errors ----------------------------------------------
+            sig_t_err   = fff2.GetParError(0)
+            sig_l_err   = fff2.GetParError(1)
+            rho_lt_err  = fff2.GetParError(2)
+            rho_tt_err  = fff2.GetParError(3)
+
+            # ---------------------------------------------------------------
+            # Error propagation (fully guarded) -----------------------------
+            _eps = 1e-6                           # numerical floor
+
+            safe_sig_t  = max(abs(sig_t),  _eps)
+            safe_sig_l  = max(abs(sig_l),  _eps)
+            safe_rho_lt = max(abs(rho_lt), _eps)
+
+            sig_lt_err = abs(sig_lt) * math.sqrt(
+                (rho_lt_err / safe_rho_lt)**2
+                + (sig_t_err / (2.0 * safe_sig_t))**2
+                + (sig_l_err / (2.0 * safe_sig_l))**2
+            )
+
+            sig_tt_err = math.hypot( safe_sig_t * rho_tt_err,
+                                    rho_tt      * sig_t_err )
+        else:
+            # Central values and one-sigma errors straight from the solve
+            sig_t, sig_l, sig_lt, sig_tt = [float(p) for p in wls_par]
+            sig_t_err, sig_l_err, sig_lt_err, sig_tt_err = [float(e) for e in wls_err]
+            rho_lt, rho_tt = lt_par[2], lt_par[3]
+            rho_lt_err, rho_tt_err = lt_rho_err(wls_par, wls_cov)
         # ---------------------------------------------------------------
 
         print(f"\n=== Bin {i+1} Summary ===")
@@ -720,6 +787,14 @@ def single_setting(q2_set, w_set, fn_lo, fn_hi):
         print(f"  σ_L  = {sig_l:.3f} ± {sig_l_err:.3f}")
         print(f"  σ_LT = {sig_lt:.3f} ± {sig_lt_err:.3f}")
         print(f"  σ_TT = {sig_tt:.3f} ± {sig_tt_err:.3f}")
+        if LT_SOLVER == "tf2":
+            # Cross-check against the weighted least squares separation
+            wls_red_chi2 = wls_chi2 / max(1, wls_ndf)
+            print(f"  WLS: σ_T = {wls_par[0]:.3f} ± {wls_err[0]:.3f}   σ_L = {wls_par[1]:.3f} ± {wls_err[1]:.3f}   "
+                  f"σ_LT = {wls_par[2]:.3f} ± {wls_err[2]:.3f}   σ_TT = {wls_par[3]:.3f} ± {wls_err[3]:.3f}   "
+                  f"χ²/NDF = {wls_red_chi2:.2f}")
+        if NUM_REPLICAS > 0:
+            print_replica_summary(replica_summary)
         print("=== End of Bin Summary ===\n")
 
         fn_sep = "{}/src/{}/xsects/x_sep.{}_Q{}W{}.dat".format(
@@ -732,6 +807,19 @@ def single_setting(q2_set, w_set, fn_lo, fn_hi):
                     red_chi2, t_list[i], w_list[i], q2_list[i], theta_list[i]))
         except IOError:
             print("Error writing to file {}.".format(fn_sep))
+
+        # One line per t-bin: t, the replica percentiles of sigT, sigL, sigLT, sigTT (each LT_PERCENTILES),
+        # then the correlations T-L, T-LT, T-TT, L-LT, L-TT, LT-TT
+        if NUM_REPLICAS > 0:
+            fn_sep_rep = "{}/src/{}/xsects/x_sep_replicas.{}_Q{}W{}.dat".format(
+                LTANAPATH, ParticleType, polID, Q2.replace("p",""), W.replace("p",""))
+            try:
+                mode = 'w' if i == 0 else 'a'
+                with open(fn_sep_rep, mode) as f:
+                    vals = [t_list[i]] + list(replica_summary["percentiles"].T.ravel()) + list(replica_summary["corr"][np.triu_indices(4, 1)])
+                    f.write(" ".join("{:.5g}".format(v) for v in vals) + "\n")
+            except IOError:
+                print("Error writing to file {}.".format(fn_sep_rep))
             
         del g_plot_err
         
@@ -10,8 +10,13 @@
 #
 # Copyright (c) trottar
 #
-import math
-import ROOT
+import math, sys
+
+###############################################################################################################################################
+# Importing utility functions
+
+sys.path.append("utility")
+from model_registry import lt_sep_xsect
 
 ###############################################################################################################################################
 
@@ -26,17 +31,8 @@ def LT_sep_x_fun_wrapper(inp_eps):
         eps = inp_eps
         xx = x[0]
         #  ρ_LT term = ρₗₜ · √(σ_T·σ_L)  ;  ρ_TT term = ρₜₜ · σ_T
-        xs = ( par[0]
-              + eps * par[1]
-              + ROOT.TMath.Sqrt(2*eps*(1+eps))
-                * par[2]
-                * ROOT.TMath.Sqrt(par[0] * par[1])
-                * ROOT.TMath.Cos(xx*PI/180)
-              + eps
-                * par[3]
-                * par[0]
-                * ROOT.TMath.Cos(2*xx*PI/180) )
-        return xs
+        xs = lt_sep_xsect(eps, xx, par[0], par[1], par[2], par[3])
+        return float(xs)
     return LT_sep_x_fun
 
 ###############################################################################################################################################
@@ -47,17 +43,8 @@ def LT_sep_x_fun_unsep_wrapper(inp_eps):
         eps = inp_eps
         xx = x[0]
         #  ρ_LT term = ρₗₜ · √(σ_T·σ_L)  ;  ρ_TT term = ρₜₜ · σ_T
-        xs = ( par[0]
-              + eps * par[1]
-              + ROOT.TMath.Sqrt(2*eps*(1+eps))
-                * par[2]
-                * ROOT.TMath.Sqrt(par[0] * par[1])
-                * ROOT.TMath.Cos(xx)
-              + eps
-                * par[3]
-                * par[0]
-                * ROOT.TMath.Cos(2*xx) )
-        return xs
+        xs = lt_sep_xsect(eps, xx, par[0], par[1], par[2], par[3], degrees=False)
+        return float(xs)
     return LT_sep_x_fun_unsep
 
 ###############################################################################################################################################
@@ -12,6 +12,7 @@
 #
 import math, sys
 import logging
+import numpy as np
 
 logging.basicConfig(level=logging.DEBUG)
 
@@ -19,7 +20,7 @@ logging.basicConfig(level=logging.DEBUG)
 # Importing utility functions
 
 sys.path.append("utility")
-from utility import load_equations, prepare_equations
+from model_registry import get_model
 
 ###############################################################################################################################################
 # Need to grab polarity Q2 and W string values from xfit script
@@ -32,15 +33,17 @@ pol_str = ""
 Q2 = ""
 W = ""
 equations = ""
+model = None
 
 # Then, set global variables which is called with arguments defined in xfit script
 def set_val(inp_pol_str, inp_Q2, inp_W):
-    global pol_str, Q2, W, equations
+    global pol_str, Q2, W, equations, model
     pol_str = inp_pol_str
     Q2 = inp_Q2
     W = inp_W
-    # Load equations from model input file of given setting
-    equations = load_equations(f"Q{Q2}W{W}.model")
+    # Load and compile equations from model input file of given setting
+    model = get_model(Q2, W)
+    equations = model.equations
     if DEBUG:    
         logging.debug(f"Loaded equations: {equations}")
         
@@ -55,12 +58,12 @@ def iterWeight(arg_str):
     q2_set, w_set, qq, ww, tt, eps, theta_cm, phi_cm, sig_prev_iter, weight_prev_iter, *params = args
     par1, par2, par3, par4, par5, par6, par7, par8, par9, par10, par11, par12, par13, par14, par15, par16 = params
     
-    # Grab functional forms from model input file
-    fun_Sig_L_optimized = prepare_equations(equations, 'sig_L')
-    fun_Sig_T_optimized = prepare_equations(equations, 'sig_T')
-    fun_Sig_LT_optimized = prepare_equations(equations, 'sig_LT')
-    fun_Sig_TT_optimized = prepare_equations(equations, 'sig_TT')
-    fun_wfactor_optimized = prepare_equations(equations, 'wfactor')
+    # Grab functional forms from model input file (compiled once in set_val)
+    fun_Sig_L_optimized = model.scalar['sig_L']
+    fun_Sig_T_optimized = model.scalar['sig_T']
+    fun_Sig_LT_optimized = model.scalar['sig_LT']
+    fun_Sig_TT_optimized = model.scalar['sig_TT']
+    fun_wfactor_optimized = model.scalar['wfactor']
 
     # Calculate SigL, SigT, SigLT, SigTT
     sig_L = fun_Sig_L_optimized(q2_set, w_set, qq, ww, tt, theta_cm, par1, par2, par3, par4)
@@ -96,3 +99,37 @@ def iterWeight(arg_str):
         return [0.0, 0.0]
     else:
         return [float(wtn),float(sig)]
+
+###############################################################################################################################################
+
+def iterWeightArray(q2_set, w_set, qq, ww, tt, eps, theta_cm, phi_cm, sig_prev_iter, weight_prev_iter, params, grid=None):
+    '''
+    Same as iterWeight for arrays of events (one call for the whole SIMC sample)
+
+    q2_set, w_set and the 16 params are scalars, everything else is an array.
+    With grid (xsect_grid.XsectGrid of the same params) the model is interpolated instead of evaluated.
+    Returns the new weights, the new cross sections and the mask of bad events,
+    where the weight and cross section are set to zero (same as [0.0, 0.0] from iterWeight).
+    '''
+
+    params = [float(p) for p in params]
+
+    # Overflows, complex powers and divisions by zero become inf/nan and are flagged as bad below
+    with np.errstate(all="ignore"):
+
+        # Model kernels compiled once in set_val (see model_registry.XsectModel)
+        if grid is None:
+            sig = model.sig_unsep(qq, ww, tt, eps, theta_cm, phi_cm, params)
+        else:
+            sig = grid.sig_unsep(qq, ww, tt, eps, theta_cm, phi_cm)
+
+        wtn = weight_prev_iter * (sig / sig_prev_iter)
+
+    wtn = np.broadcast_to(wtn, np.shape(qq)).astype(np.float64)
+    sig = np.broadcast_to(sig, np.shape(qq)).astype(np.float64)
+    
+    bad = ~np.isfinite(wtn) | ~(wtn > 0.0) | (sig_prev_iter == 0.0)
+    wtn[bad] = 0.0
+    sig[bad] = 0.0
+
+    return wtn, sig, bad
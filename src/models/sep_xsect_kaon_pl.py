@@ -16,7 +16,7 @@ import math, sys
 # Importing utility functions
 
 sys.path.append("../utility")
-from utility import load_equations, prepare_equations
+from model_registry import get_model
 
 ##################################################################################################################################################
 
@@ -35,15 +35,15 @@ def import_model(inp_model, arg_str):
     # Convert degrees to radians
     theta_cm = theta_cm * math.pi/180
     
-    # Load equations from model input file of given setting
-    equations = load_equations(f"Q{str(q2_set).replace('.','p')}W{str(w_set).replace('.','p')}.model")
+    # Load equations from model input file of given setting (compiled once per setting)
+    model = get_model(q2_set, w_set)
 
     # Grab functional forms from model input file
-    fun_Sig_L_optimized = prepare_equations(equations, 'sig_L')
-    fun_Sig_T_optimized = prepare_equations(equations, 'sig_T')
-    fun_Sig_LT_optimized = prepare_equations(equations, 'sig_LT')
-    fun_Sig_TT_optimized = prepare_equations(equations, 'sig_TT')
-    fun_wfactor_optimized = prepare_equations(equations, 'wfactor')
+    fun_Sig_L_optimized = model.scalar['sig_L']
+    fun_Sig_T_optimized = model.scalar['sig_T']
+    fun_Sig_LT_optimized = model.scalar['sig_LT']
+    fun_Sig_TT_optimized = model.scalar['sig_TT']
+    fun_wfactor_optimized = model.scalar['wfactor']
 
     # Calculate SigL, SigT, SigLT, SigTT
     sig_L = fun_Sig_L_optimized(q2_set, w_set, qq, ww, tt, theta_cm, par1, par2, par3, par4)
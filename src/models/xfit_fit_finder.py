@@ -11,6 +11,7 @@
 # Copyright (c) trottar
 #
 import numpy as np
+from scipy.optimize import least_squares
 from ROOT import TGraph, TGraphErrors, TF1, TCanvas, TText, TLatex, TLegend, kRed, kBlue, kGreen, kMagenta, kBlack
 import sys, math, time, random
 
@@ -24,6 +25,7 @@ from utility import (
     local_search, select_valid_parameter, get_central_value, 
     calculate_information_criteria, sanitize_params
 )
+from model_registry import get_model
 
 ##################################################################################################################################################
 
@@ -40,6 +42,354 @@ from xfit_active import fun_Sig_L_wrapper, fun_Sig_T_wrapper, fun_Sig_LT_wrapper
 
 ##################################################################################################################################################
 
+class SigCost:
+    '''
+    Array version of the per step fit and cost of the annealing search for one separated cross section
+
+    The data (t, sig, sig_e) are read from nsep once and the model form is the same one the
+    TF1 of xfit_active evaluates, at the fixed Q2, W, theta_cm of the chosen bin, over all
+    t points at once. fit() replaces the TGraphErrors/TF1 Fit of each step and cost() is
+    calculate_cost on the arrays, so no ROOT objects are made inside the search.
+
+    As in the ROOT fit, points with zero error do not enter chi2 and the parameter limits are
+    bounds of the minimization. The limits follow TF1::SetParLimits: a parameter is fixed only
+    when lo*hi != 0 and lo >= hi, limits that are both zero leave it free and unbounded.
+    '''
+
+    def __init__(self, sig_name, nsep, q2_set, w_set, qq, ww, theta_cm):
+        nsep.Draw(f"sig{sig_name.lower()}:t:sig{sig_name.lower()}_e", "", "goff")
+        nrows = nsep.GetSelectedRows()
+        self.y = np.array([nsep.GetV1()[i] for i in range(nrows)], dtype=np.float64)
+        self.t = np.array([nsep.GetV2()[i] for i in range(nrows)], dtype=np.float64)
+        self.y_err = np.array([nsep.GetV3()[i] for i in range(nrows)], dtype=np.float64)
+        self.used = self.y_err != 0.0
+
+        self.model = get_model(q2_set, w_set)
+        self.sig_type = "sig_{}".format(sig_name)
+        self.qq = qq
+        self.ww = ww
+        # Same conversion as fun_Sig_* of xfit_active
+        self.theta_cm = theta_cm * math.pi/180
+
+    def eval(self, params, t=None):
+        '''
+        Model at the points t (default the data points) for up to 4 parameters (missing ones are 0.0)
+        '''
+        t = self.t if t is None else np.asarray(t, dtype=np.float64)
+        par = [params[i] if i < len(params) else 0.0 for i in range(4)]
+        return np.broadcast_to(self.model.sig_sep(self.sig_type, self.qq, self.ww, np.abs(t), self.theta_cm, par), t.shape)
+
+    def residuals(self, params):
+        '''
+        (data-model)/error of every data point, error 1 where it is zero (as calculate_cost)
+        '''
+        return (self.y - self.eval(params)) / np.where(self.used, self.y_err, 1.0)
+
+    def jacobian(self, params):
+        '''
+        Derivatives of residuals() with respect to the 4 parameters, exact from the model (XsectModel.sig_sep_jac)
+        '''
+        par = [params[i] if i < len(params) else 0.0 for i in range(4)]
+        jac = self.model.sig_sep_jac(self.sig_type, self.qq, self.ww, np.abs(self.t), self.theta_cm, par)
+        jac = np.broadcast_to(jac, self.t.shape + (4,))
+        return -jac / np.where(self.used, self.y_err, 1.0)[:, None]
+
+    def fit(self, params, lower, upper):
+        '''
+        Least squares fit from params within [lower, upper], with the exact Jacobian of the model
+
+        Returns the fitted parameters, their errors, chi2 and the degrees of freedom,
+        raises ValueError if the model is not finite at the start
+        '''
+        params = np.asarray(params, dtype=np.float64)
+        lower = np.asarray(lower, dtype=np.float64)
+        upper = np.asarray(upper, dtype=np.float64)
+        # TF1::SetParLimits semantics
+        fixed = (lower*upper != 0.0) & (lower >= upper)
+        bounded = lower < upper
+        free = ~fixed
+        start = np.where(bounded, np.clip(params, lower, upper), params)
+        lower = np.where(bounded, lower, -np.inf)
+        upper = np.where(bounded, upper, np.inf)
+
+        def fit_residuals(free_par):
+            par = start.copy()
+            par[free] = free_par
+            return self.residuals(par)[self.used]
+
+        def fit_jac(free_par):
+            par = start.copy()
+            par[free] = free_par
+            return self.jacobian(par)[self.used][:, :len(par)][:, free]
+
+        new_params = start.copy()
+        errors = np.zeros_like(start)
+        if np.any(free):
+            result = least_squares(fit_residuals, start[free], jac=fit_jac, bounds=(lower[free], upper[free]))
+            new_params[free] = result.x
+            # Parabolic errors of a chi2 fit, as the fit reports
+            try:
+                errors[free] = np.sqrt(np.abs(np.diag(np.linalg.pinv(result.jac.T @ result.jac))))
+            except np.linalg.LinAlgError:
+                pass
+
+        chi2 = float(np.sum(fit_residuals(new_params[free])**2))
+        ndf = int(np.count_nonzero(self.used)) - int(np.count_nonzero(free))
+        return list(new_params), list(errors), chi2, ndf
+
+    def cost(self, params, fit_params, chi2, ndf, num_events, num_params, lambda_reg=0.01):
+        '''
+        Same as utility.calculate_cost, with the fitted parameters, chi2 and ndf of fit() in
+        place of the TF1's (params are the ones the step started from, used for the l2 term)
+        '''
+        params = sanitize_params(params, clip_min=-1e4, clip_max=1e4)
+        l2_reg = np.sum(np.square(params))
+
+        residuals = self.residuals(fit_params)[:num_events]
+        if not np.all(np.isfinite(residuals)):
+            print("Non-finite residual detected. Parameters:", params)
+            return 1e12, lambda_reg
+
+        if num_events <= num_params:
+            mse = np.mean(np.square(residuals))
+            complexity_penalty = 0.1 * num_params / num_events
+            lambda_values = np.logspace(np.log10(1e-6), np.log10(100.0), 20)
+            costs = (mse + lambda_values * l2_reg) / (num_events + complexity_penalty)
+            best_index = np.argmin(costs)
+            return costs[best_index], lambda_values[best_index]
+
+        # Safeguard against division by very small nu:
+        nu = max(ndf, 1e-6)
+        if lambda_reg == 0:
+            return chi2 / nu, lambda_reg
+        return (chi2 + lambda_reg * l2_reg) / nu, lambda_reg
+
+##################################################################################################################################################
+
+def anneal_step(sig_cost, current_params, max_param_bounds, set_optimization, param_offsets, num_events, num_params, lambda_reg):
+    '''
+    Fit and cost of one annealing step on arrays (SigCost), same as the ROOT step of parameterize
+
+    current_params is updated in place as the ROOT step does (out of bound and tiny values set to zero).
+    Returns the fitted parameters, their errors, the cost, lambda_reg and the residual of the last data point.
+    '''
+    # Same limits as the TF1 of the ROOT step
+    for i_par in range(num_params):
+        if abs(current_params[i_par]) > abs(max_param_bounds):
+            current_params[i_par] = 0.0
+        if abs(current_params[i_par]) < 1e-15:
+            current_params[i_par] = 0.0
+    if set_optimization:
+        lower = [-max_param_bounds]*num_params
+        upper = [max_param_bounds]*num_params
+    else:
+        lower = [p - off*abs(p) for p, off in zip(current_params, param_offsets)]
+        upper = [p + off*abs(p) for p, off in zip(current_params, param_offsets)]
+
+    fit_params, fit_errors, fit_chi2, fit_ndf = sig_cost.fit(current_params, lower, upper)
+
+    # Evaluate cost
+    current_cost, lambda_reg = sig_cost.cost(
+        current_params, fit_params, fit_chi2, fit_ndf,
+        num_events, num_params, lambda_reg
+    )
+
+    # Simple residual from last data point
+    residual = float(sig_cost.residuals(fit_params)[num_events-1]) if num_events > 0 else 0.0
+
+    return fit_params, fit_errors, current_cost, lambda_reg, residual
+
+# SigCost of each separated cross section for the annealing workers, inherited through the fork
+_ANNEAL_COSTS = {}
+
+def anneal_run(job):
+    '''
+    One restart of the annealing search of parameterize on arrays, run by a worker
+
+    The restart only depends on its seed (random and numpy.random are seeded here), so the
+    result does not depend on which worker runs it or in which order. Unlike the sequential
+    restarts, lambda_reg and the stall reference start fresh for every restart.
+
+    Returns the best parameters, errors and cost of the restart, the temperature, acceptance
+    probability and residual when it was found, and the per iteration history for the plots.
+    '''
+    sig_name, run_idx, seed, num_params, num_events, max_iterations, initial_param_bounds, set_optimization = job
+
+    random.seed(seed)
+    np.random.seed(seed % 2**32)
+    sig_cost = _ANNEAL_COSTS[sig_name]
+
+    param_offsets = [0.1 for _ in range(num_params)]
+    lambda_reg = 0.01
+    cost_history = []
+
+    iteration = 0
+    stagnation_count = 0
+    initial_temperature = 1.0
+    temperature         = initial_temperature
+    max_param_bounds = initial_param_bounds
+
+    current_params = [
+        random.uniform(-max_param_bounds, max_param_bounds)
+        for _ in range(num_params)
+    ]
+    current_errors = [0.0]*num_params
+    best_params = list(current_params)
+    best_errors = list(current_errors)
+    best_cost   = float('inf')
+    accept_prob = 0.0
+    residual    = float('inf')
+
+    run = {
+        "best_params" : None,
+        "best_errors" : None,
+        "best_cost" : float('inf'),
+        "best_temp" : float('inf'),
+        "best_prob" : 1.0,
+        "best_residual" : float('inf'),
+        "history" : [],
+    }
+
+    while iteration <= max_iterations:
+
+        current_params = [simulated_annealing(p, temperature)
+                          for p in current_params]
+
+        try:
+            fit_params, fit_errors, current_cost, lambda_reg, residual = anneal_step(
+                sig_cost, current_params, max_param_bounds, set_optimization,
+                param_offsets, num_events, num_params, lambda_reg
+            )
+
+            cost_history.append(current_cost)
+            if len(cost_history) >= 2:
+                lambda_reg = adaptive_regularization(cost_history, lambda_reg)
+
+            accept_prob = acceptance_probability(best_cost, current_cost, temperature)
+
+            current_params = fit_params
+            current_errors = fit_errors
+
+            if accept_prob > random.random():
+                best_params = list(current_params)
+                best_cost   = current_cost
+                best_errors = list(current_errors)
+                if current_cost > run["best_cost"]:
+                    stagnation_count += 1
+            else:
+                stagnation_count += 1
+
+            if stagnation_count > 5:
+                current_params = [
+                    random.uniform(-max_param_bounds, max_param_bounds)
+                    for _ in range(num_params)
+                ]
+                stagnation_count = 0
+
+            current_params = list(best_params)
+            temperature = adaptive_cooling(initial_temperature, iteration, max_iterations)
+            max_param_bounds = random.uniform(100.0, initial_param_bounds)
+            iteration += 1
+
+        except (TypeError, ZeroDivisionError, OverflowError, ValueError, np.linalg.LinAlgError):
+            max_param_bounds = random.uniform(100.0, initial_param_bounds)
+            current_params = [
+                random.uniform(-max_param_bounds, max_param_bounds)
+                for _ in range(num_params)
+            ]
+            iteration += 1
+            continue
+
+        if best_cost < run["best_cost"]:
+            run["best_cost"] = best_cost
+            run["best_params"] = best_params[:]
+            run["best_errors"] = best_errors[:]
+            run["best_temp"] = temperature
+            run["best_prob"] = accept_prob
+            run["best_residual"] = residual
+
+        run["history"].append((best_params[:], best_cost, temperature, accept_prob, residual))
+
+    return run
+
+def run_anneal_pool(jobs, num_procs):
+    '''
+    anneal_run of every job in num_procs worker processes, {(sig_name, run_idx) : run}
+    '''
+    import multiprocessing
+
+    num_procs = max(1, min(num_procs, len(jobs)))
+    print("\nRunning {} annealing restarts with {} worker processes...".format(len(jobs), num_procs))
+
+    # Workers are forked so they inherit _ANNEAL_COSTS (compiled model forms are not picklable)
+    ctx = multiprocessing.get_context("fork")
+    with ctx.Pool(processes=num_procs) as pool:
+        runs = pool.map(anneal_run, jobs, chunksize=1)
+
+    return {(job[0], job[1]) : run for job, run in zip(jobs, runs)}
+
+def check_sig_cost_parity(sig_name, nsep, q2_set, w_set, qq, ww, theta_cm, num_params, num_starts=20, max_param_bounds=1e4, seed=0, rtol=1e-3):
+    '''
+    Fits of one separated cross section from the same seeded random starts with the ROOT step
+    of parameterize (TGraphErrors/TF1 Fit "SQ" within +-max_param_bounds) and with SigCost.fit
+
+    A start mismatches if only one of the two fits fails, if the chi2 differ by more than rtol
+    (relative), or if a parameter differs by more than rtol of its value or 10% of its ROOT error.
+    Returns the mismatches as (start, (root params, root chi2), (array params, array chi2)).
+    '''
+    sig_cost = SigCost(sig_name, nsep, q2_set, w_set, qq, ww, theta_cm)
+
+    g_sig = TGraphErrors()
+    for i_pt in range(len(sig_cost.t)):
+        g_sig.SetPoint(i_pt, sig_cost.t[i_pt], sig_cost.y[i_pt])
+        g_sig.SetPointError(i_pt, 0, sig_cost.y_err[i_pt])
+    if sig_name == "L":
+        fun_Sig = fun_Sig_L_wrapper(1.0, qq, ww, theta_cm)
+    elif sig_name == "T":
+        fun_Sig = fun_Sig_T_wrapper(1.0, qq, ww, theta_cm)
+    elif sig_name == "LT":
+        fun_Sig = fun_Sig_LT_wrapper(1.0, qq, ww, theta_cm)
+    elif sig_name == "TT":
+        fun_Sig = fun_Sig_TT_wrapper(1.0, qq, ww, theta_cm)
+    else:
+        raise ValueError("Unknown signal name")
+    f_sig = TF1(f"parity_sig_{sig_name}", fun_Sig, float(np.min(sig_cost.t)), float(np.max(sig_cost.t)), num_params)
+
+    lower = [-max_param_bounds]*num_params
+    upper = [max_param_bounds]*num_params
+    rng = np.random.default_rng(seed)
+    bad = []
+    for start in rng.uniform(-1.0, 1.0, size=(num_starts, num_params)):
+        start = list(start)
+
+        for i_par in range(num_params):
+            f_sig.SetParameter(i_par, start[i_par])
+            f_sig.SetParLimits(i_par, lower[i_par], upper[i_par])
+        r_sig_fit = g_sig.Fit(f_sig, "SQ")
+        root_ok = int(r_sig_fit) == 0
+        root_params = np.array([f_sig.GetParameter(i_par) for i_par in range(num_params)])
+        root_errors = np.array([f_sig.GetParError(i_par) for i_par in range(num_params)])
+        root_chi2 = f_sig.GetChisquare()
+
+        try:
+            arr_params, arr_errors, arr_chi2, arr_ndf = sig_cost.fit(start, lower, upper)
+            arr_ok = np.isfinite(arr_chi2)
+        except ValueError:
+            arr_params, arr_chi2, arr_ok = [float('nan')]*num_params, float('nan'), False
+        arr_params = np.array(arr_params)
+
+        if not root_ok and not arr_ok:
+            continue
+        par_tol = np.maximum(rtol*np.abs(root_params), 0.1*root_errors)
+        if root_ok != arr_ok \
+           or abs(arr_chi2 - root_chi2) > rtol*max(abs(root_chi2), 1.0) \
+           or np.any(np.abs(arr_params - root_params) > par_tol):
+            bad.append((start, (list(root_params), root_chi2), (list(arr_params), arr_chi2)))
+
+    return bad
+
+##################################################################################################################################################
+
 def parameterize(inpDict, par_vec, par_err_vec, par_chi2_vec, prv_par_vec, prv_err_vec, prv_chi2_vec, fixed_params, outputpdf, full_optimization=True, debug=False):
     """
     'parameterize' function including:
@@ -97,6 +447,10 @@ def parameterize(inpDict, par_vec, par_err_vec, par_chi2_vec, prv_par_vec, prv_e
     iter_num    = inpDict["iter_num"]
     fit_params  = inpDict["fit_params"]
     chi2_threshold = inpDict["chi2_threshold"]
+    # True rebuilds and fits the ROOT TGraphErrors/TF1 at every annealing step (validation of the SigCost search)
+    root_annealing = inpDict.get("root_annealing", False)
+    # True refines the best annealing result with one gradient based fit (exact model Jacobian) within the initial bounds
+    gradient_polish = inpDict.get("gradient_polish", True)
 
     q2_center_val = get_central_value(q2_vec)
     w_center_val  = get_central_value(w_vec)
@@ -106,6 +460,30 @@ def parameterize(inpDict, par_vec, par_err_vec, par_chi2_vec, prv_par_vec, prv_e
     num_events = nsep.GetEntries()
     colors = [kRed, kBlue, kGreen, kMagenta]
 
+    # Restarts of all separated cross sections in a process pool, each with its own seed
+    # (the restarts run here are seeded the same way)
+    num_procs = inpDict.get("num_procs", 1)
+    anneal_seed = inpDict.get("anneal_seed", 0)
+    anneal_results = None
+    if num_procs > 1 and root_annealing:
+        print("\nWARNING: root_annealing runs the restarts one after another, ignoring num_procs...")
+    elif num_procs > 1:
+        b = 0 # Same bin as below
+        jobs = []
+        _ANNEAL_COSTS.clear()
+        for it, (sig_name, val) in enumerate(fit_params.items()):
+            if sig_name in fixed_params:
+                continue
+            num_params = inpDict["initial_params"](sig_name, val)[0]
+            _ANNEAL_COSTS[sig_name] = SigCost(sig_name, nsep, q2_set, w_set, q2_vec[b], w_vec[b], th_vec[b])
+            for run_idx in range(num_optimizations):
+                seed = anneal_seed + 1000*it + run_idx
+                jobs.append((sig_name, run_idx, seed, num_params, num_events, max_iterations, initial_param_bounds, full_optimization))
+        if jobs:
+            anneal_start = time.time()
+            anneal_results = run_anneal_pool(jobs, num_procs)
+            print("The annealing pool took {:.2f} seconds.".format(time.time() - anneal_start))
+
     # -----------------------------------------------------------------------------
     # 3. Main loop over each fit in fit_params
     # -----------------------------------------------------------------------------
@@ -180,6 +558,13 @@ def parameterize(inpDict, par_vec, par_err_vec, par_chi2_vec, prv_par_vec, prv_e
                 graphs_sig_ic_aic.append(graph_sig_aic)
                 graphs_sig_ic_bic.append(graph_sig_bic)
 
+                # Data and model as arrays for the search, ROOT is only used for the final fit
+                sig_cost = SigCost(sig_name, nsep, q2_set, w_set, q2_vec[b], w_vec[b], th_vec[b])
+                if not root_annealing:
+                    for i_pt in range(len(w_vec)):
+                        graphs_sig_fit[it].SetPoint(i_pt, sig_cost.t[i_pt], sig_cost.y[i_pt])
+                        graphs_sig_fit[it].SetPointError(i_pt, 0, sig_cost.y_err[i_pt])
+
                 # Draw data
                 nsep.Draw(f"sig{sig_name.lower()}:t:sig{sig_name.lower()}_e", "", "goff")
                 start_time = time.time()
@@ -193,6 +578,35 @@ def parameterize(inpDict, par_vec, par_err_vec, par_chi2_vec, prv_par_vec, prv_e
 
                     print(f"Determining best fit for bin: t={t_vec[b]:.3f}, Q2={q2_vec[b]:.3f}, "
                           f"W={w_vec[b]:.3f}, theta={th_vec[b]:.3f}")
+
+                    if anneal_results is not None:
+                        # Restart already run by a worker, only its best and its history are merged
+                        run = anneal_results[(sig_name, run_idx)]
+                        for best_params, best_cost, temperature, accept_prob, residual in run["history"]:
+                            for i_par in range(num_params):
+                                graph_sig_params[i_par].SetPoint(total_iteration, total_iteration, best_params[i_par])
+                            graph_sig_chi2.SetPoint(total_iteration, total_iteration, round(best_cost, 4))
+                            graph_sig_temp.SetPoint(total_iteration, total_iteration, round(temperature, 4))
+                            graph_sig_accept.SetPoint(total_iteration, total_iteration, round(accept_prob, 4))
+                            graph_sig_residuals.SetPoint(total_iteration, total_iteration, round(residual, 4))
+                            graph_sig_aic.SetPoint(total_iteration, total_iteration, 0)
+                            graph_sig_bic.SetPoint(total_iteration, total_iteration, 0)
+                            total_iteration += 1
+                        if run["best_cost"] < best_overall_cost:
+                            best_overall_cost    = run["best_cost"]
+                            best_overall_bin     = b
+                            best_overall_params  = run["best_params"][:]
+                            best_overall_errors  = run["best_errors"][:]
+                            best_overall_temp    = run["best_temp"]
+                            best_overall_prob    = run["best_prob"]
+                            best_overall_residual= run["best_residual"]
+                        print(f"Best Cost: {best_overall_cost:.3f}")
+                        continue
+
+                    # Same seed per restart as the pool workers (anneal_run), so reruns give the same search
+                    random.seed(anneal_seed + 1000*it + run_idx)
+                    np.random.seed((anneal_seed + 1000*it + run_idx) % 2**32)
+
                     iteration = 0
                     stagnation_count = 0
                     initial_temperature = 1.0
@@ -230,58 +644,67 @@ def parameterize(inpDict, par_vec, par_err_vec, par_chi2_vec, prv_par_vec, prv_e
                         sys.stdout.flush()
 
                         try:
-                            # Data lines from nsep => build g_sig => fill graphs_sig_fit[it]
-                            g_sig = TGraphErrors()
-                            for i_data in range(nsep.GetSelectedRows()):
-                                x_val = nsep.GetV2()[i_data]
-                                y_val = nsep.GetV1()[i_data]
-                                y_err = nsep.GetV3()[i_data]
-                                g_sig.SetPoint(i_data, x_val, y_val)
-                                g_sig.SetPointError(i_data, 0, y_err)
-
-                            for i_pt in range(len(w_vec)):
-                                sig_X_fit = g_sig.GetY()[i_pt]# / (g_vec[i_pt]) / 1e3
-                                sig_X_fit_err = g_sig.GetEY()[i_pt]# / (g_vec[i_pt]) / 1e3
-                                graphs_sig_fit[it].SetPoint(i_pt, g_sig.GetX()[i_pt], sig_X_fit)
-                                graphs_sig_fit[it].SetPointError(i_pt, 0, sig_X_fit_err)
-
-                            fits_sig[it].SetParNames(*[f"p{4*it + i}" for i in range(num_params)])
-                            for i_par in range(num_params):
-                                if abs(current_params[i_par]) > abs(max_param_bounds):
-                                    current_params[i_par] = 0.0                                        
-                                if abs(current_params[i_par]) < 1e-15:
-                                    current_params[i_par] = 0.0
-                                fits_sig[it].SetParameter(i_par, current_params[i_par])
-                                if set_optimization:
-                                    fits_sig[it].SetParLimits(i_par, -max_param_bounds, max_param_bounds)
-                                else:
-                                    off = param_offsets[i_par]
-                                    fits_sig[it].SetParLimits(
-                                        i_par,
-                                        current_params[i_par] - off*abs(current_params[i_par]),
-                                        current_params[i_par] + off*abs(current_params[i_par])
-                                    )
-
-                            # Fit
-                            r_sig_fit = graphs_sig_fit[it].Fit(fits_sig[it], "SQ")
-
-                            # Evaluate cost
-                            current_cost, lambda_reg = calculate_cost(
-                                fits_sig[it], g_sig, current_params,
-                                num_events, num_params, lambda_reg
-                            )
-
-                            # Simple residual from last data point
-                            residual = 0.0
-                            for i_pt2 in range(num_events):
-                                x_pt = g_sig.GetX()[i_pt2]
-                                y_data = g_sig.GetY()[i_pt2]
-                                y_err  = g_sig.GetEY()[i_pt2]
-                                y_fit  = fits_sig[it].Eval(x_pt)
-                                if y_err != 0:
-                                    residual = (y_data - y_fit)/y_err
-                                else:
-                                    residual = (y_data - y_fit)
+                            if not root_annealing:
+                                fit_params, fit_errors, current_cost, lambda_reg, residual = anneal_step(
+                                    sig_cost, current_params, max_param_bounds, set_optimization,
+                                    param_offsets, num_events, num_params, lambda_reg
+                                )
+
+                            else:
+                                # Data lines from nsep => build g_sig => fill graphs_sig_fit[it]
+                                g_sig = TGraphErrors()
+                                for i_data in range(nsep.GetSelectedRows()):
+                                    x_val = nsep.GetV2()[i_data]
+                                    y_val = nsep.GetV1()[i_data]
+                                    y_err = nsep.GetV3()[i_data]
+                                    g_sig.SetPoint(i_data, x_val, y_val)
+                                    g_sig.SetPointError(i_data, 0, y_err)
+
+                                for i_pt in range(len(w_vec)):
+                                    sig_X_fit = g_sig.GetY()[i_pt]# / (g_vec[i_pt]) / 1e3
+                                    sig_X_fit_err = g_sig.GetEY()[i_pt]# / (g_vec[i_pt]) / 1e3
+                                    graphs_sig_fit[it].SetPoint(i_pt, g_sig.GetX()[i_pt], sig_X_fit)
+                                    graphs_sig_fit[it].SetPointError(i_pt, 0, sig_X_fit_err)
+
+                                fits_sig[it].SetParNames(*[f"p{4*it + i}" for i in range(num_params)])
+                                for i_par in range(num_params):
+                                    if abs(current_params[i_par]) > abs(max_param_bounds):
+                                        current_params[i_par] = 0.0                                        
+                                    if abs(current_params[i_par]) < 1e-15:
+                                        current_params[i_par] = 0.0
+                                    fits_sig[it].SetParameter(i_par, current_params[i_par])
+                                    if set_optimization:
+                                        fits_sig[it].SetParLimits(i_par, -max_param_bounds, max_param_bounds)
+                                    else:
+                                        off = param_offsets[i_par]
+                                        fits_sig[it].SetParLimits(
+                                            i_par,
+                                            current_params[i_par] - off*abs(current_params[i_par]),
+                                            current_params[i_par] + off*abs(current_params[i_par])
+                                        )
+
+                                # Fit
+                                r_sig_fit = graphs_sig_fit[it].Fit(fits_sig[it], "SQ")
+
+                                # Evaluate cost
+                                current_cost, lambda_reg = calculate_cost(
+                                    fits_sig[it], g_sig, current_params,
+                                    num_events, num_params, lambda_reg
+                                )
+
+                                # Simple residual from last data point
+                                residual = 0.0
+                                for i_pt2 in range(num_events):
+                                    x_pt = g_sig.GetX()[i_pt2]
+                                    y_data = g_sig.GetY()[i_pt2]
+                                    y_err  = g_sig.GetEY()[i_pt2]
+                                    y_fit  = fits_sig[it].Eval(x_pt)
+                                    if y_err != 0:
+                                        residual = (y_data - y_fit)/y_err
+                                    else:
+                                        residual = (y_data - y_fit)
+                                fit_params = [fits_sig[it].GetParameter(i_par) for i_par in range(num_params)]
+                                fit_errors = [fits_sig[it].GetParError(i_par) for i_par in range(num_params)]
 
                             cost_history.append(current_cost)
                             if len(cost_history) >= 2:
@@ -290,8 +713,8 @@ def parameterize(inpDict, par_vec, par_err_vec, par_chi2_vec, prv_par_vec, prv_e
                             accept_prob = acceptance_probability(best_cost, current_cost, temperature)
 
                             # Update current params from the fit
-                            current_params = [fits_sig[it].GetParameter(i_par) for i_par in range(num_params)]
-                            current_errors = [fits_sig[it].GetParError(i_par) for i_par in range(num_params)]
+                            current_params = fit_params
+                            current_errors = fit_errors
 
                             # Accept or not
                             if accept_prob > random.random():
@@ -306,7 +729,8 @@ def parameterize(inpDict, par_vec, par_err_vec, par_chi2_vec, prv_par_vec, prv_e
                                 stagnation_count += 1
 
                             # Local search every 15 iterations
-                            if iteration % 15 == 0:
+                            # (its result is replaced by the best parameters below, so the array search skips it)
+                            if root_annealing and iteration % 15 == 0:
                                 current_params = local_search(current_params, fits_sig[it], num_params)
 
                             # If stalling
@@ -327,7 +751,7 @@ def parameterize(inpDict, par_vec, par_err_vec, par_chi2_vec, prv_par_vec, prv_e
                             max_param_bounds = random.uniform(100.0, initial_param_bounds)
                             iteration += 1
 
-                        except (TypeError, ZeroDivisionError, OverflowError) as e:
+                        except (TypeError, ZeroDivisionError, OverflowError, ValueError, np.linalg.LinAlgError) as e:
                             # On error => re-random
                             if debug:
                                 print(f"[DEBUG] Exception => {str(e)}, re-randomizing.")
@@ -380,6 +804,27 @@ def parameterize(inpDict, par_vec, par_err_vec, par_chi2_vec, prv_par_vec, prv_e
                     print(f"ERROR: Fit failed! Check {equation_str} in input model file...")
                     sys.exit(2)
 
+                # Local refinement of the best solution, cost as an annealing step started from it
+                if gradient_polish:
+                    try:
+                        start_params = list(best_overall_params[:num_params])
+                        polish_params, polish_errors, polish_chi2, polish_ndf = sig_cost.fit(
+                            start_params, [-initial_param_bounds]*num_params, [initial_param_bounds]*num_params)
+                        polish_cost, _ = sig_cost.cost(
+                            start_params, polish_params, polish_chi2, polish_ndf,
+                            num_events, num_params, lambda_reg
+                        )
+                        if polish_cost < best_overall_cost:
+                            print(f"Gradient polish: cost {best_overall_cost:.5f} -> {polish_cost:.5f}")
+                            print(f"Polished solution: {polish_params}")
+                            best_overall_cost   = polish_cost
+                            best_overall_params = polish_params[:]
+                            best_overall_errors = polish_errors[:]
+                        else:
+                            print(f"Gradient polish: no improvement (cost {polish_cost:.5f})")
+                    except (ValueError, np.linalg.LinAlgError) as e:
+                        print(f"WARNING: Gradient polish failed ({e}), keeping the annealing result")
+
                 end_time = time.time()
                 print("The loop took {:.2f} seconds.".format(end_time - start_time))
 
@@ -637,3 +1082,44 @@ def parameterize(inpDict, par_vec, par_err_vec, par_chi2_vec, prv_par_vec, prv_e
         c8.Print(outputpdf+')')
     print(f"\nFits saved to {outputpdf}...")
 
+##################################################################################################################################################
+
+if __name__ == "__main__":
+
+    # Parity of the array fit of the annealing search (SigCost) with the ROOT fit, run from src, e.g.
+    #   python3 models/xfit_fit_finder.py 3p0 3p14 pl <path to x_sep.pl_Q30W314.dat> [num_starts]
+    from ROOT import TNtuple
+    from xfit_active import set_val
+    from utility import find_params
+
+    if len(sys.argv) < 5:
+        print("Usage: python3 models/xfit_fit_finder.py Q2 W pol_str x_sep_file [num_starts]")
+        sys.exit(2)
+    q2_set, w_set, pol_str, fn_sep = sys.argv[1:5]
+    num_starts = int(sys.argv[5]) if len(sys.argv) > 5 else 20
+
+    set_val(pol_str, q2_set, w_set)
+    nsep = TNtuple("nsep", "nsep", "sigl:sigl_e:sigt:sigt_e:siglt:siglt_e:sigtt:sigtt_e:chi:t:w:q2:thetacm")
+    nsep.ReadFile(fn_sep)
+    if nsep.GetEntries() == 0:
+        print("ERROR: No entries in {}".format(fn_sep))
+        sys.exit(2)
+    # Same bin as parameterize (b=0)
+    nsep.GetEntry(0)
+    qq, ww, theta_cm = nsep.q2, nsep.w, nsep.thetacm
+
+    equations = get_model(q2_set, w_set).equations
+    num_bad = 0
+    for sig_name in ["L", "T", "LT", "TT"]:
+        num_params = find_params(equations, sig_name, [1.0]*16)[0]
+        if num_params == 0:
+            continue
+        bad = check_sig_cost_parity(sig_name, nsep, q2_set, w_set, qq, ww, theta_cm, num_params, num_starts=num_starts)
+        print("Sig {} parity: {} starts, {} mismatches".format(sig_name, num_starts, len(bad)))
+        for start, (root_params, root_chi2), (arr_params, arr_chi2) in bad[:5]:
+            print("  start {}".format(["{:.4g}".format(p) for p in start]))
+            print("    ROOT:     chi2 {:.6g} params {}".format(root_chi2, ["{:.6g}".format(p) for p in root_params]))
+            print("    SigCost:  chi2 {:.6g} params {}".format(arr_chi2, ["{:.6g}".format(p) for p in arr_params]))
+        num_bad += len(bad)
+
+    sys.exit(1 if num_bad > 0 else 0)
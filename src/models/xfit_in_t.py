@@ -46,6 +46,7 @@ TEMP_CACHEPATH=f"{OUTPATH}/cache_transfer"
 
 sys.path.append("utility")
 from utility import load_equations, prepare_equations, find_params_wrapper, check_chi_squared_values, request_yn_response
+from model_registry import get_model
 
 ##################################################################################################################################################
 # Import fit finder function
@@ -117,6 +118,19 @@ def x_fit_in_t(ParticleType, pol_str, dir_iter, q2_set, w_set, inpDict, output_f
     #chi2_threshold = 1.0
     chi2_threshold = 3.0
     #chi2_threshold = 5.0
+
+    # True - Refit ROOT TGraphErrors/TF1 objects at every annealing step (original, slow, for validation)
+    # False - Fit and cost of each step on numpy arrays (xfit_fit_finder.SigCost), ROOT only for the final fit
+    root_annealing = False
+
+    # True - Refine the best annealing result with one bounded least squares fit using the exact model derivatives
+    gradient_polish = True
+
+    # Worker processes for the annealing restarts of all separated cross sections (1 runs them one after another)
+    # Each restart is seeded with anneal_seed + 1000*(L,T,LT,TT index) + restart, so reruns give the same fit
+    # (and the same result for any num_procs > 1)
+    num_procs = 1
+    anneal_seed = 0
     #chi2_threshold = 10.0
     #chi2_threshold = 30.0
     #chi2_threshold = 600.0
@@ -194,8 +208,8 @@ def x_fit_in_t(ParticleType, pol_str, dir_iter, q2_set, w_set, inpDict, output_f
         for line in f:
             ww, ww_e, qq, qq_e, tt, tt_e, theta_cm, it = map(float, line.strip().split())
 
-            # Grab functional form from model input file
-            fun_wfactor_optimized = prepare_equations(equations, 'wfactor')
+            # Grab functional form from model input file (compiled once per setting)
+            fun_wfactor_optimized = get_model(q2_set, w_set).scalar['wfactor']
 
             # Calculate wfactor
             g = fun_wfactor_optimized(q2_set, w_set, qq, ww, tt)
@@ -233,6 +247,10 @@ def x_fit_in_t(ParticleType, pol_str, dir_iter, q2_set, w_set, inpDict, output_f
         "iter_num" : iter_num,
         "fit_params" : fit_params,
         "chi2_threshold" : chi2_threshold,
+        "root_annealing" : root_annealing,
+        "gradient_polish" : gradient_polish,
+        "num_procs" : num_procs,
+        "anneal_seed" : anneal_seed,
         "xfit_log" : "{}/{}_xfit_in_t_Q{}W{}.log".format(OUTPATH, ParticleType, q2_set, w_set)
     }
 
@@ -17,7 +17,7 @@ import sys
 ################################################################################################################################################
 # Importing utility functions
 sys.path.append("utility")
-from utility import load_equations, prepare_equations
+from model_registry import get_model
 
 ################################################################################################################################################
 
@@ -37,14 +37,15 @@ def set_val(inp_pol_str, inp_Q2, inp_W):
     Q2 = inp_Q2
     W = inp_W
 
-    # Load equations from model input file of given setting
-    equations = load_equations(f"Q{Q2}W{W}.model")
+    # Load equations from model input file of given setting (compiled once per setting)
+    model = get_model(Q2, W)
+    equations = model.equations
 
     # Grab functional forms from model input file
-    fun_Sig_L_optimized = prepare_equations(equations, 'sig_L')
-    fun_Sig_T_optimized = prepare_equations(equations, 'sig_T')
-    fun_Sig_LT_optimized = prepare_equations(equations, 'sig_LT')
-    fun_Sig_TT_optimized = prepare_equations(equations, 'sig_TT')
+    fun_Sig_L_optimized = model.scalar['sig_L']
+    fun_Sig_T_optimized = model.scalar['sig_T']
+    fun_Sig_LT_optimized = model.scalar['sig_LT']
+    fun_Sig_TT_optimized = model.scalar['sig_TT']
 
 ################################################################################################################################################
 
@@ -48,6 +48,12 @@ LTANAPATH=lt.LTANAPATH
 ANATYPE=lt.ANATYPE
 OUTPATH=lt.OUTPATH
 
+################################################################################################################################################
+# Importing utility functions
+
+sys.path.append("utility")
+from columnar import get_prescale
+
 ################################################################################################################################################
 
 def get_eff_charge(hist, inpDict, all_data=True):    
@@ -212,7 +218,14 @@ def get_eff_charge(hist, inpDict, all_data=True):
         normfac_data = 1/(data_charge_center)
         if all_data:
             normfac_simc = (simc_normfactor)/(simc_nevents)
-        
+
+    # Quick-look mode keeps one event in PRESCALE of data, dummy and SIMC (see columnar.prescale_mask)
+    prescale = get_prescale(inpDict)
+    normfac_data *= prescale
+    normfac_dummy *= prescale
+    if all_data:
+        normfac_simc *= prescale
+
     print("\n\n{} data normalization: {:.3e}".format(phi_setting, normfac_data))
     print("{} dummy normalization: {:.3e}".format(phi_setting, normfac_dummy))
     if all_data:
@@ -397,7 +410,13 @@ def find_events(hist, inpDict):
         normfac_dummy = 1/(dummy_charge_center*dummy_target_corr)
         normfac_data = 1/(data_charge_center)
         normfac_simc = (simc_normfactor)/(simc_nevents)
-        
+
+    # Quick-look mode keeps one event in PRESCALE of data, dummy and SIMC (see columnar.prescale_mask)
+    prescale = get_prescale(inpDict)
+    normfac_data *= prescale
+    normfac_dummy *= prescale
+    normfac_simc *= prescale
+
     print("\n\n{} data total number of events: {:.3e}".format(phi_setting, NumEvts_MM_DATA))
     print("{} dummy total number of events: {:.3e}".format(phi_setting, NumEvts_MM_DUMMY))  
     print("{} simc weighted total number of events: {:.3e}".format(phi_setting, NumEvts_MM_SIMC))
@@ -46,6 +46,13 @@ LTANAPATH=lt.LTANAPATH
 ANATYPE=lt.ANATYPE
 OUTPATH=lt.OUTPATH
 
+################################################################################################################################################
+# Importing utility functions
+
+sys.path.append("utility")
+from utility import get_simc_tree
+from columnar import simc_good_mask
+
 ################################################################################################################################################
 # Suppressing the terminal splash of Print()
 ROOT.gROOT.ProcessLine("gErrorIgnoreLevel = kError;")
@@ -95,7 +102,7 @@ def plot_iteration(histlist, phisetlist, inpDict):
     # Define HGCer hole cut for KaonLT 2018-19
     if ParticleType == "kaon":
         sys.path.append("cuts")
-        from hgcer_hole import apply_HGCer_hole_cut
+        from hgcer_hole import apply_HGCer_hole_cut, simc_HGCer_hole_mask
         hgcer_cutg = apply_HGCer_hole_cut(Q2, W, EPSSET)
     
     ################################################################################################################################################    
@@ -113,7 +120,13 @@ def plot_iteration(histlist, phisetlist, inpDict):
     
     for hist in histlist_copy:
 
-        TBRANCH_SIMC  = hist["InFile_SIMC"].Get("h10")
+        # Full h10 tree, also for a weight sidecar (see iter_weight)
+        TBRANCH_SIMC  = get_simc_tree(hist["InFile_SIMC"])
+        iter_good = simc_good_mask(hist["InFile_SIMC"].GetName())
+
+        if ParticleType == "kaon":
+            # HGCer hole test for the whole tree at once
+            in_hole = simc_HGCer_hole_mask(hgcer_cutg, hist["InFile_SIMC"].GetName(), inpDict.get("CHUNK_SIZE"))
 
         hist["H_Weight_SIMC"] = TH1D("H_Weight_SIMC", "Simc Weight", 100, 0, 1e-5)
         hist["H_hsdelta_SIMC"] = TH1D("H_hsdelta_SIMC","HMS Delta", 100, -20.0, 20.0)
@@ -187,6 +200,10 @@ def plot_iteration(histlist, phisetlist, inpDict):
             # Progress bar
             Misc.progressBar(i, TBRANCH_SIMC.GetEntries(),bar_length=25)
 
+            # Events dropped by the reweighting (weight sidecars only)
+            if iter_good is not None and not iter_good[i]:
+                continue
+
             ##############
             # HARD CODED #
             ##############
@@ -202,7 +219,7 @@ def plot_iteration(histlist, phisetlist, inpDict):
             ##############        
 
             if ParticleType == "kaon":                
-                ALLCUTS =  apply_simc_cuts(evt, mm_min, mm_max) and not hgcer_cutg.IsInside(evt.phgcer_x_det, evt.phgcer_y_det)
+                ALLCUTS =  apply_simc_cuts(evt, mm_min, mm_max) and not in_hole[i]
             else:
                 ALLCUTS = apply_simc_cuts(evt, mm_min, mm_max)
 
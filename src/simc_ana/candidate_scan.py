@@ -0,0 +1,65 @@
+#! /usr/bin/python
+
+#
+# Description: Compare many candidate model parameter sets against the data yields of one setting in a single job
+# ================================================================
+# Time-stamp: "2025-04-28 17:02:44 trottar"
+# ================================================================
+#
+# Author:  Richard L. Trotta III <trotta@cua.edu>
+#
+# Copyright (c) trottar
+#
+import numpy as np
+import sys, os
+
+##################################################################################################################################################
+# Importing utility functions
+
+sys.path.append("utility")
+from model_registry import get_model
+from response_matrix import load_simc_response, evaluate_candidates, print_candidate_summary, read_yield_data
+
+###############################################################################################################################################
+# Input arguments
+
+# e.g. python3 simc_ana/candidate_scan.py 3p0 3p14 <simc_response.npz> <yield_data .dat> <candidates>
+# The SIMC response file is written by find_yield_simc with inpDict["SIMC_RESPONSE"] = True,
+# the candidate file has one set of 16 parameters (par1 ... par16) per line, '#' lines are skipped
+if len(sys.argv) not in (6, 7):
+    print("Usage: python3 simc_ana/candidate_scan.py Q2 W simc_response_file yield_data_file candidate_file [num_shown]")
+    sys.exit(2)
+
+Q2 = sys.argv[1]
+W = sys.argv[2]
+response_file = sys.argv[3]
+f_yield = sys.argv[4]
+candidate_file = sys.argv[5]
+num_shown = int(sys.argv[6]) if len(sys.argv) == 7 else 10
+
+###############################################################################################################################################
+
+response = load_simc_response(response_file)
+if response is None:
+    print("\n\nERROR: No SIMC response file found called {}\n\n".format(response_file))
+    sys.exit(2)
+
+param_sets = []
+with open(candidate_file, 'r') as f:
+    for line in f:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            param_sets.append([float(x) for x in line.split()[:16]])
+if not param_sets or any(len(params) != 16 for params in param_sets):
+    print("\n\nERROR: Candidate file {} needs 16 parameters per line\n\n".format(candidate_file))
+    sys.exit(2)
+
+data_yield, data_err = read_yield_data(f_yield, response.shape)
+
+print("\nEvaluating {} candidates over {} SIMC events...".format(len(param_sets), response.matrix.shape[1]))
+result = evaluate_candidates(response, get_model(Q2, W), param_sets, data_yield, data_err)
+print_candidate_summary(result, num_shown)
+
+out_file = os.path.splitext(candidate_file)[0] + "_scan.npz"
+np.savez_compressed(out_file, params=np.array(param_sets), **result)
+print("\nPer candidate yields, ratios and chi2 written to {}".format(out_file))
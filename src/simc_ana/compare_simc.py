@@ -52,7 +52,8 @@ OUTPATH=lt.OUTPATH
 # Importing utility functions
 
 sys.path.append("utility")
-from utility import open_root_file, create_polar_plot, remove_bad_bins
+from utility import open_root_file, create_polar_plot, remove_bad_bins, reservoir_set_point
+from columnar import get_prescale
 
 ################################################################################################################################################
 # Suppressing the terminal splash of Print()
@@ -117,7 +118,7 @@ def compare_simc(hist, inpDict):
     # Define HGCer hole cut for KaonLT 2018-19
     if ParticleType == "kaon":
         sys.path.append("cuts")
-        from hgcer_hole import apply_HGCer_hole_cut
+        from hgcer_hole import apply_HGCer_hole_cut, simc_HGCer_hole_mask
         hgcer_cutg = apply_HGCer_hole_cut(Q2, W, EPSSET)
     
     ################################################################################################################################################
@@ -134,6 +135,10 @@ def compare_simc(hist, inpDict):
 
     TBRANCH_SIMC  = InFile_SIMC.Get("h10")
 
+    if ParticleType == "kaon":
+        # HGCer hole test for the whole tree at once
+        in_hole = simc_HGCer_hole_mask(hgcer_cutg, rootFileSimc, inpDict.get("CHUNK_SIZE"))
+
     ###############################################################################################################################################
 
     # Grabs simc number of events and normalizaton factor
@@ -191,6 +196,11 @@ def compare_simc(hist, inpDict):
 
     polar_phiq_vs_t_SIMC = TGraphPolar()
     polar_phiq_vs_t_SIMC.SetName("polar_phiq_vs_t_SIMC")
+    # Binned (phi [deg], -t) version of the polar plot, fixed memory regardless of statistics
+    # SIMC goes from 0 to 2pi
+    polar_phiq_vs_t_binned_SIMC = TH2D("polar_phiq_vs_t_binned_SIMC","; #phi ;-t", 72, 0, 360, 50, 0.0, inpDict["tmax"])
+    # Number of events offered to polar_phiq_vs_t_SIMC, which only keeps a capped random sample
+    polar_n_seen = 0
     
     # HGCer hole comparison plots
     P_hgcer_xAtCer_vs_yAtCer_SIMC = TH2D("P_hgcer_xAtCer_vs_yAtCer_SIMC", "X vs Y (z-axis events); X; Y", 50, -30, 30, 50, -30, 30)
@@ -200,12 +210,18 @@ def compare_simc(hist, inpDict):
     ################################################################################################################################################
     # Fill data histograms for various trees called above
 
+    # Quick-look mode, same events as columnar.prescale_mask (normfac_simc is scaled up in get_eff_charge)
+    prescale = get_prescale(inpDict)
+
     print("\nGrabbing %s simc..." % phi_setting)
     for i,evt in enumerate(TBRANCH_SIMC):
 
       # Progress bar
       Misc.progressBar(i, TBRANCH_SIMC.GetEntries(),bar_length=25)
 
+      if i % prescale:
+          continue
+
       ##############
       # HARD CODED #
       ##############
@@ -222,8 +238,8 @@ def compare_simc(hist, inpDict):
       
       if ParticleType == "kaon":
           
-          ALLCUTS =  apply_simc_cuts(evt, mm_min, mm_max) and not hgcer_cutg.IsInside(evt.phgcer_x_det, evt.phgcer_y_det)
           NOHOLECUTS =  apply_simc_cuts(evt, mm_min, mm_max)
+          ALLCUTS =  NOHOLECUTS and not in_hole[i]
           
           if(NOHOLECUTS):
               # HGCer hole comparison            
@@ -245,7 +261,8 @@ def compare_simc(hist, inpDict):
           phi_shift = (evt.phipq)          
           
           # SIMC goes from 0 to 2pi so no need for +pi/2
-          polar_phiq_vs_t_SIMC.SetPoint(polar_phiq_vs_t_SIMC.GetN(), (phi_shift)*(180/math.pi), -evt.t)
+          polar_n_seen = reservoir_set_point(polar_phiq_vs_t_SIMC, polar_n_seen, (phi_shift)*(180/math.pi), -evt.t, inpDict.get("POLAR_MAX_POINTS"))
+          polar_phiq_vs_t_binned_SIMC.Fill((phi_shift)*(180/math.pi), -evt.t)
           
           H_Weight_SIMC.Fill(evt.Weight)
 
@@ -319,6 +336,7 @@ def compare_simc(hist, inpDict):
     histDict["H_pmz_SIMC"] =     H_pmz_SIMC
     histDict["H_W_SIMC"] =     H_W_SIMC
     histDict["polar_phiq_vs_t_SIMC"] = polar_phiq_vs_t_SIMC
+    histDict["polar_phiq_vs_t_binned_SIMC"] = polar_phiq_vs_t_binned_SIMC
     histDict["NumEvts_MM_SIMC"] = H_MM_SIMC.Integral()
     histDict["NumEvts_MM_unweighted_SIMC"] = H_MM_unweighted_SIMC.Integral()
 
@@ -366,6 +384,11 @@ def compare_simc(hist, inpDict):
 
     Cpht_data.Print(outputpdf.replace("{}_FullAnalysis_".format(ParticleType),"{}_{}_simc_".format(phi_setting,ParticleType)))
 
+    # Binned polar plot, all events
+    Cpht_binned_data = ROOT.TCanvas()
+    histDict["polar_phiq_vs_t_binned_SIMC"].Draw("POL COLZ")
+    Cpht_binned_data.Print(outputpdf.replace("{}_FullAnalysis_".format(ParticleType),"{}_{}_simc_".format(phi_setting,ParticleType)))
+
     ###
     # t plots            
     Ct = TCanvas()
@@ -52,7 +52,8 @@ OUTPATH=lt.OUTPATH
 # Importing utility functions
 
 sys.path.append("utility")
-from utility import open_root_file, create_polar_plot, remove_bad_bins
+from utility import open_root_file, create_polar_plot, remove_bad_bins, reservoir_set_point, get_simc_tree
+from columnar import simc_good_mask, fill_hist_arrays, reservoir_fill_graph
 
 ################################################################################################################################################
 # Suppressing the terminal splash of Print()
@@ -113,12 +114,13 @@ def compare_simc(rootFileSimc, hist, inpDict):
     sys.path.append("cuts")
     from apply_cuts import apply_simc_cuts, set_val
     set_val(inpDict) # Set global variables for optimization
+    from event_scan import scan_simc
     
     ################################################################################################################################################
     # Define HGCer hole cut for KaonLT 2018-19
     if ParticleType == "kaon":
         sys.path.append("cuts")
-        from hgcer_hole import apply_HGCer_hole_cut
+        from hgcer_hole import apply_HGCer_hole_cut, simc_HGCer_hole_mask
         hgcer_cutg = apply_HGCer_hole_cut(Q2, W, EPSSET)
     
     ################################################################################################################################################
@@ -132,7 +134,8 @@ def compare_simc(rootFileSimc, hist, inpDict):
     # Opening new simc root file with new iteration of weight
     InFile_SIMC = open_root_file(rootFileSimc)
 
-    TBRANCH_SIMC  = InFile_SIMC.Get("h10")
+    # Full h10 tree, also for a weight sidecar (see iter_weight)
+    TBRANCH_SIMC  = get_simc_tree(InFile_SIMC)
 
     ###############################################################################################################################################
 
@@ -196,6 +199,11 @@ def compare_simc(rootFileSimc, hist, inpDict):
 
     polar_phiq_vs_t_SIMC = TGraphPolar()
     polar_phiq_vs_t_SIMC.SetName("polar_phiq_vs_t_SIMC")
+    # Binned (phi [deg], -t) version of the polar plot, fixed memory regardless of statistics
+    # SIMC goes from 0 to 2pi
+    polar_phiq_vs_t_binned_SIMC = TH2D("polar_phiq_vs_t_binned_SIMC","; #phi ;-t", 72, 0, 360, 50, 0.0, inpDict["tmax"])
+    # Number of events offered to polar_phiq_vs_t_SIMC, which only keeps a capped random sample
+    polar_n_seen = 0
     
     # HGCer hole comparison plots
     P_hgcer_xAtCer_vs_yAtCer_SIMC = TH2D("P_hgcer_xAtCer_vs_yAtCer_SIMC", "X vs Y; X; Y", 50, -30, 30, 50, -30, 30)
@@ -206,84 +214,136 @@ def compare_simc(rootFileSimc, hist, inpDict):
     # Fill data histograms for various trees called above
 
     print("\nGrabbing %s simc..." % phi_setting)
-    for i,evt in enumerate(TBRANCH_SIMC):
+    if inpDict.get("EVENT_LOOP", False):
 
-      # Progress bar
-      Misc.progressBar(i, TBRANCH_SIMC.GetEntries(),bar_length=25)
+      iter_good = simc_good_mask(rootFileSimc)
 
-      ##############
-      # HARD CODED #
-      ##############
+      if ParticleType == "kaon":
+          # HGCer hole test for the whole tree at once
+          in_hole = simc_HGCer_hole_mask(hgcer_cutg, rootFileSimc, inpDict.get("CHUNK_SIZE"))
 
-      # Check if variable shift branch exists
-      try:
-          adj_missmass = evt.missmass_shift
-      except AttributeError:
-          adj_missmass = evt.missmass
+      for i,evt in enumerate(TBRANCH_SIMC):
 
-      ##############
-      ##############        
-      ##############        
+          # Progress bar
+          Misc.progressBar(i, TBRANCH_SIMC.GetEntries(),bar_length=25)
 
-      if ParticleType == "kaon":
+          # Events dropped by the reweighting (weight sidecars only)
+          if iter_good is not None and not iter_good[i]:
+              continue
+
+          ##############
+          # HARD CODED #
+          ##############
+
+          # Check if variable shift branch exists
+          try:
+              adj_missmass = evt.missmass_shift
+          except AttributeError:
+              adj_missmass = evt.missmass
+
+          ##############
+          ##############        
+          ##############        
+
+          if ParticleType == "kaon":
+          
+              NOHOLECUTS =  apply_simc_cuts(evt, mm_min, mm_max)
+              ALLCUTS =  NOHOLECUTS and not in_hole[i]
           
-          ALLCUTS =  apply_simc_cuts(evt, mm_min, mm_max) and not hgcer_cutg.IsInside(evt.phgcer_x_det, evt.phgcer_y_det)
-          NOHOLECUTS =  apply_simc_cuts(evt, mm_min, mm_max)
+              if(NOHOLECUTS):
+                  # HGCer hole comparison            
+                  P_hgcer_nohole_xAtCer_vs_yAtCer_SIMC.Fill(evt.phgcer_x_det,evt.phgcer_y_det)
           
-          if(NOHOLECUTS):
-              # HGCer hole comparison            
-              P_hgcer_nohole_xAtCer_vs_yAtCer_SIMC.Fill(evt.phgcer_x_det,evt.phgcer_y_det)
+          else:
+
+              ALLCUTS = apply_simc_cuts(evt, mm_min, mm_max)
           
-      else:
+          #Fill SIMC events
+          if(ALLCUTS):
 
-          ALLCUTS = apply_simc_cuts(evt, mm_min, mm_max)
+              if ParticleType == "kaon":
+                  # HGCer hole comparison
+                  P_hgcer_xAtCer_vs_yAtCer_SIMC.Fill(evt.phgcer_x_det,evt.phgcer_y_det)
+
+              # Phase shift to fix polar plots
+              #phi_shift = (evt.phipq+math.pi)
+              phi_shift = (evt.phipq)
+          
+              polar_n_seen = reservoir_set_point(polar_phiq_vs_t_SIMC, polar_n_seen, (phi_shift)*(180/math.pi), -evt.t, inpDict.get("POLAR_MAX_POINTS"))
+              polar_phiq_vs_t_binned_SIMC.Fill((phi_shift)*(180/math.pi), -evt.t)
           
-      #Fill SIMC events
-      if(ALLCUTS):
+              H_Weight_SIMC.Fill(evt.Weight)
+              H_iWeight_SIMC.Fill(evt.iter_weight)
+
+              H_ssxfp_SIMC.Fill(evt.ssxfp, evt.iter_weight)
+              H_ssyfp_SIMC.Fill(evt.ssyfp, evt.iter_weight)
+              H_ssxpfp_SIMC.Fill(evt.ssxpfp, evt.iter_weight)
+              H_ssypfp_SIMC.Fill(evt.ssypfp, evt.iter_weight)
+              H_hsxfp_SIMC.Fill(evt.hsxfp, evt.iter_weight)
+              H_hsyfp_SIMC.Fill(evt.hsyfp, evt.iter_weight)
+              H_hsxpfp_SIMC.Fill(evt.hsxpfp, evt.iter_weight)
+              H_hsypfp_SIMC.Fill(evt.hsypfp, evt.iter_weight)
+              H_ssdelta_SIMC.Fill(evt.ssdelta, evt.iter_weight) 
+              H_hsdelta_SIMC.Fill(evt.hsdelta, evt.iter_weight)	
+              H_ssxptar_SIMC.Fill(evt.ssxptar, evt.iter_weight)
+              H_ssyptar_SIMC.Fill(evt.ssyptar, evt.iter_weight)
+              H_hsxptar_SIMC.Fill(evt.hsxptar, evt.iter_weight)	
+              H_hsyptar_SIMC.Fill(evt.hsyptar, evt.iter_weight)
+
+              H_ph_q_SIMC.Fill((phi_shift), evt.iter_weight)
+              H_th_q_SIMC.Fill(evt.thetapq, evt.iter_weight)
+
+              H_pmiss_SIMC.Fill(evt.Pm, evt.iter_weight)	
+              H_emiss_SIMC.Fill(evt.Em, evt.iter_weight)	
+              #H_pmx_SIMC.Fill(evt.Pmx, evt.iter_weight)
+              #H_pmy_SIMC.Fill(evt.Pmy, evt.iter_weight)
+              #H_pmz_SIMC.Fill(evt.Pmz, evt.iter_weight)
+              H_Q2_SIMC.Fill(evt.Q2, evt.iter_weight)
+              H_W_SIMC.Fill(evt.W, evt.iter_weight)
+              H_t_SIMC.Fill(-evt.t, evt.iter_weight)
+              H_epsilon_SIMC.Fill(evt.epsilon, evt.iter_weight)
+              H_MM_SIMC.Fill(adj_missmass, evt.iter_weight)
+              #H_MM_SIMC.Fill(math.sqrt(evt.Em**2-evt.Pm**2), evt.iter_weight)
+              H_MM_unweighted_SIMC.Fill(adj_missmass)
+
+    else:
+
+      # Masks of the base tree are cached across iterations, only the weights are read (see event_scan.scan_simc)
+      scanned = scan_simc(rootFileSimc, inpDict, True, hgcer_cutg if ParticleType == "kaon" else None)
+
+      if scanned is not None:
+          arrays, cut_masks = scanned
 
           if ParticleType == "kaon":
               # HGCer hole comparison
-              P_hgcer_xAtCer_vs_yAtCer_SIMC.Fill(evt.phgcer_x_det,evt.phgcer_y_det)
+              sel = cut_masks["NOHOLECUTS"]
+              fill_hist_arrays(P_hgcer_nohole_xAtCer_vs_yAtCer_SIMC, arrays["phgcer_x_det"][sel], arrays["phgcer_y_det"][sel])
+
+          sel = cut_masks["ALLCUTS"]
+          evts = {key : val[sel] for key, val in arrays.items()}
+          w = evts["iter_weight"]
+
+          if ParticleType == "kaon":
+              # HGCer hole comparison
+              fill_hist_arrays(P_hgcer_xAtCer_vs_yAtCer_SIMC, evts["phgcer_x_det"], evts["phgcer_y_det"])
 
           # Phase shift to fix polar plots
-          #phi_shift = (evt.phipq+math.pi)
-          phi_shift = (evt.phipq)
-          
-          polar_phiq_vs_t_SIMC.SetPoint(polar_phiq_vs_t_SIMC.GetN(), (phi_shift)*(180/math.pi), -evt.t)
-          
-          H_Weight_SIMC.Fill(evt.Weight)
-          H_iWeight_SIMC.Fill(evt.iter_weight)
-
-          H_ssxfp_SIMC.Fill(evt.ssxfp, evt.iter_weight)
-          H_ssyfp_SIMC.Fill(evt.ssyfp, evt.iter_weight)
-          H_ssxpfp_SIMC.Fill(evt.ssxpfp, evt.iter_weight)
-          H_ssypfp_SIMC.Fill(evt.ssypfp, evt.iter_weight)
-          H_hsxfp_SIMC.Fill(evt.hsxfp, evt.iter_weight)
-          H_hsyfp_SIMC.Fill(evt.hsyfp, evt.iter_weight)
-          H_hsxpfp_SIMC.Fill(evt.hsxpfp, evt.iter_weight)
-          H_hsypfp_SIMC.Fill(evt.hsypfp, evt.iter_weight)
-          H_ssdelta_SIMC.Fill(evt.ssdelta, evt.iter_weight) 
-          H_hsdelta_SIMC.Fill(evt.hsdelta, evt.iter_weight)	
-          H_ssxptar_SIMC.Fill(evt.ssxptar, evt.iter_weight)
-          H_ssyptar_SIMC.Fill(evt.ssyptar, evt.iter_weight)
-          H_hsxptar_SIMC.Fill(evt.hsxptar, evt.iter_weight)	
-          H_hsyptar_SIMC.Fill(evt.hsyptar, evt.iter_weight)
-
-          H_ph_q_SIMC.Fill((phi_shift), evt.iter_weight)
-          H_th_q_SIMC.Fill(evt.thetapq, evt.iter_weight)
-
-          H_pmiss_SIMC.Fill(evt.Pm, evt.iter_weight)	
-          H_emiss_SIMC.Fill(evt.Em, evt.iter_weight)	
-          #H_pmx_SIMC.Fill(evt.Pmx, evt.iter_weight)
-          #H_pmy_SIMC.Fill(evt.Pmy, evt.iter_weight)
-          #H_pmz_SIMC.Fill(evt.Pmz, evt.iter_weight)
-          H_Q2_SIMC.Fill(evt.Q2, evt.iter_weight)
-          H_W_SIMC.Fill(evt.W, evt.iter_weight)
-          H_t_SIMC.Fill(-evt.t, evt.iter_weight)
-          H_epsilon_SIMC.Fill(evt.epsilon, evt.iter_weight)
-          H_MM_SIMC.Fill(adj_missmass, evt.iter_weight)
-          #H_MM_SIMC.Fill(math.sqrt(evt.Em**2-evt.Pm**2), evt.iter_weight)
-          H_MM_unweighted_SIMC.Fill(adj_missmass)
+          phi_shift = evts["phipq"]
+
+          polar_n_seen = reservoir_fill_graph(polar_phiq_vs_t_SIMC, (phi_shift)*(180/math.pi), evts["minus_t"], inpDict.get("POLAR_MAX_POINTS"), polar_n_seen)
+          fill_hist_arrays(polar_phiq_vs_t_binned_SIMC, (phi_shift)*(180/math.pi), evts["minus_t"])
+
+          fill_hist_arrays(H_Weight_SIMC, evts["Weight"])
+          fill_hist_arrays(H_iWeight_SIMC, evts["iter_weight"])
+
+          for h_simc, col in [(H_ssxfp_SIMC, "ssxfp"), (H_ssyfp_SIMC, "ssyfp"), (H_ssxpfp_SIMC, "ssxpfp"), (H_ssypfp_SIMC, "ssypfp"),
+                            (H_hsxfp_SIMC, "hsxfp"), (H_hsyfp_SIMC, "hsyfp"), (H_hsxpfp_SIMC, "hsxpfp"), (H_hsypfp_SIMC, "hsypfp"),
+                            (H_ssdelta_SIMC, "ssdelta"), (H_hsdelta_SIMC, "hsdelta"), (H_ssxptar_SIMC, "ssxptar"), (H_ssyptar_SIMC, "ssyptar"),
+                            (H_hsxptar_SIMC, "hsxptar"), (H_hsyptar_SIMC, "hsyptar"), (H_ph_q_SIMC, "phipq"), (H_th_q_SIMC, "thetapq"),
+                            (H_pmiss_SIMC, "Pm"), (H_emiss_SIMC, "Em"), (H_Q2_SIMC, "Q2"), (H_W_SIMC, "W"),
+                            (H_t_SIMC, "minus_t"), (H_epsilon_SIMC, "epsilon"), (H_MM_SIMC, "adj_missmass")]:
+              fill_hist_arrays(h_simc, evts[col], weights=w)
+          fill_hist_arrays(H_MM_unweighted_SIMC, evts["adj_missmass"])
               
     ################################################################################################################################################    
 
@@ -324,6 +384,7 @@ def compare_simc(rootFileSimc, hist, inpDict):
     histDict["H_pmz_SIMC"] =     H_pmz_SIMC
     histDict["H_W_SIMC"] =     H_W_SIMC
     histDict["polar_phiq_vs_t_SIMC"] = polar_phiq_vs_t_SIMC
+    histDict["polar_phiq_vs_t_binned_SIMC"] = polar_phiq_vs_t_binned_SIMC
     histDict["NumEvts_MM_SIMC"] = H_MM_SIMC.Integral()
     histDict["NumEvts_MM_unweighted_SIMC"] = H_MM_unweighted_SIMC.Integral()
 
@@ -371,6 +432,11 @@ def compare_simc(rootFileSimc, hist, inpDict):
 
     Cpht_data.Print(outputpdf.replace("{}_FullAnalysis_".format(ParticleType),"{}_{}_simc_".format(phi_setting,ParticleType)))
 
+    # Binned polar plot, all events
+    Cpht_binned_data = ROOT.TCanvas()
+    histDict["polar_phiq_vs_t_binned_SIMC"].Draw("POL COLZ")
+    Cpht_binned_data.Print(outputpdf.replace("{}_FullAnalysis_".format(ParticleType),"{}_{}_simc_".format(phi_setting,ParticleType)))
+
     ###
     # t plots            
     Ct = TCanvas()
@@ -24,13 +24,15 @@ import importlib.util
 # Importing utility functions
 
 sys.path.append("utility")
-from utility import open_root_file, run_fortran
+from utility import open_root_file, run_fortran, get_simc_tree
+from columnar import iterate_tree_arrays, read_simc_weights, simc_base_file, simc_good_mask, SIMC_WEIGHT_BRANCHES
+from xsect_grid import get_xsect_grid, grid_ranges
 
 ##################################################################################################################################################
 # Importing param model for weight iteration
 
 sys.path.append("models")
-from param_active import set_val, iterWeight
+from param_active import set_val, iterWeight, iterWeightArray
 
 ################################################################################################################################################
 '''
@@ -55,6 +57,109 @@ OUTPATH=lt.OUTPATH
 
 ################################################################################################################################################
 
+def iter_file_name(simc_root, iter_num):
+    '''
+    SIMC file written by iteration iter_num from the file of the previous iteration
+    '''
+    if iter_num > 1:
+        return simc_root.replace("iter_{}.root".format(iter_num-1),"iter_{}.root".format(iter_num))
+    else:
+        return simc_root.replace(".root","_iter_{}.root".format(iter_num))
+
+def iter_weight_batch(param_arr, simc_root, Q2, W, iter_num, phi_setting, inpDict):
+    '''
+    Same as the event loop of iter_weight, but the model is evaluated over whole
+    chunks of SIMC events at once (param_active.iterWeightArray) instead of
+    formatting and parsing a string for every event
+
+    Rather than rewriting every h10 branch, the new weights are written as a small
+    weight sidecar (the iter_{n}.root file): an h10 tree of SIMC_WEIGHT_BRANCHES
+    aligned entry by entry to the base SIMC tree, plus the simc_base name of that file.
+    Weight and sigcm hold the previous iteration's values, as in the full tree, and
+    events with a bad weight are kept with iter_good false instead of being dropped,
+    so the alignment is never lost. Readers attach it with utility.get_simc_tree or
+    columnar.iterate_simc_arrays.
+    '''
+
+    params = [float(p) for p in param_arr]
+
+    # Previous iteration, a sidecar carries its own weights and the events already dropped
+    prev_weights = read_simc_weights(simc_root)
+    base_root = simc_base_file(simc_root)
+    if prev_weights is None:
+        if iter_num > 1:
+            # Full iteration tree from before the sidecars
+            weight_col, sig_col = "iter_weight", "iter_sig"
+        else:
+            weight_col, sig_col = "Weight", "sigcm"
+    
+    # Interpolate the model from a grid of this parameter set covering every event (XSECT_GRID)
+    grid = None
+    if inpDict.get("XSECT_GRID", False):
+        kin = {key : [] for key in ["Q2i", "Wi", "ti", "thetapq"]}
+        for arrays in iterate_tree_arrays(base_root, "h10", list(kin.keys()), inpDict.get("CHUNK_SIZE")):
+            for key in kin:
+                kin[key].append(np.array([np.nanmin(arrays[key]), np.nanmax(arrays[key])]))
+        if kin["Q2i"]:
+            ranges = grid_ranges(*[np.concatenate(kin[key]) for key in kin])
+            grid = get_xsect_grid(Q2, W, params, ranges, OUTPATH)
+
+    # Keep track of bad events
+    num_bad = 0
+    total_events = 0
+    new_weights = {key : [] for key in SIMC_WEIGHT_BRANCHES}
+    
+    print("\nRecalculating weight for %s simc..." % phi_setting)
+    start = 0
+    for arrays in iterate_tree_arrays(base_root, "h10", ["Q2i", "Wi", "ti", "epsilon", "thetapq", "phipqi", "Weight", "sigcm", "iter_weight", "iter_sig"], inpDict.get("CHUNK_SIZE")):
+
+        stop = start + len(arrays["Q2i"])
+        if prev_weights is None:
+            prev_weight = arrays[weight_col]
+            prev_sig = arrays[sig_col]
+            prev_good = np.ones(stop-start, dtype=bool)
+        else:
+            prev_weight = prev_weights["iter_weight"][start:stop]
+            prev_sig = prev_weights["iter_sig"][start:stop]
+            prev_good = prev_weights["iter_good"][start:stop]
+        start = stop
+
+        # Note: ti is used instead of t, ti = main%t which matches its calculation in simc
+        #       This goes for Q2i, Wi, and phiqpi as well (see iter_weight)
+        wtn, sig, bad = iterWeightArray(float(Q2), float(W), arrays["Q2i"], arrays["Wi"], arrays["ti"], arrays["epsilon"], \
+                                        arrays["thetapq"], arrays["phipqi"], prev_sig, prev_weight, params, grid)
+
+        good = prev_good & ~bad
+        total_events += int(np.count_nonzero(prev_good))
+        num_bad += int(np.count_nonzero(prev_good & bad))
+
+        new_weights["Weight"].append(prev_weight)
+        new_weights["sigcm"].append(prev_sig)
+        new_weights["iter_weight"].append(wtn)
+        new_weights["iter_sig"].append(sig)
+        new_weights["iter_good"].append(good)
+
+    if start == 0:
+        print("\n\nERROR: No h10 tree found in {}\n\n".format(base_root))
+        sys.exit(2)
+
+    new_arr = np.empty(start, dtype=[(key, np.bool_ if key == "iter_good" else np.float32) for key in SIMC_WEIGHT_BRANCHES])
+    for key in SIMC_WEIGHT_BRANCHES:
+        new_arr[key] = np.concatenate(new_weights[key])
+    
+    new_InFile_SIMC = open_root_file(iter_file_name(simc_root, iter_num), "RECREATE")
+    new_InFile_SIMC.cd()
+    new_TBRANCH_SIMC = rnp.array2tree(new_arr, name="h10")
+    new_TBRANCH_SIMC.SetTitle("Iteration {}".format(iter_num))
+    new_TBRANCH_SIMC.Write("h10",ROOT.TObject.kOverwrite)
+    # Base file is looked up in the directory of the sidecar
+    ROOT.TNamed("simc_base", os.path.basename(base_root)).Write("simc_base",ROOT.TObject.kOverwrite)
+    new_InFile_SIMC.Close()
+
+    print(f"\n\nThere were {num_bad}/{total_events} bad events skipped...")
+
+################################################################################################################################################
+
 def iter_weight(param_file, simc_root, inpDict, phi_setting):
     
     formatted_date  = inpDict["formatted_date"]
@@ -83,17 +188,22 @@ def iter_weight(param_file, simc_root, inpDict, phi_setting):
     if not os.path.isfile(simc_root):
         print("\n\nERROR: No simc file found called {}\n\n".format(simc_root))        
         
+    # Set pol_str, q2_set, w_set for param model script
+    set_val(pol_str, q2_set, w_set)
+
+    # Event loop kept below for validation (EVENT_LOOP), otherwise reweight whole arrays
+    if not inpDict.get("EVENT_LOOP", False):
+        iter_weight_batch(param_arr, simc_root, Q2, W, iter_num, phi_setting, inpDict)
+        return
+    
     InFile_SIMC = open_root_file(simc_root, "READ")
-    TBRANCH_SIMC  = InFile_SIMC.Get("h10")
+    # Full h10 tree, also for a weight sidecar
+    TBRANCH_SIMC  = get_simc_tree(InFile_SIMC)
+    iter_good = simc_good_mask(simc_root)
 
-    if iter_num > 1:
-        # Create a new ROOT file for writing
-        new_InFile_SIMC = open_root_file(simc_root.replace("iter_{}.root".format(iter_num-1),"iter_{}.root".format(iter_num)), "UPDATE")
-        new_TBRANCH_SIMC = ROOT.TTree("h10", "Iteration {}".format(iter_num))
-    else:
-        # Create a new ROOT file for writing
-        new_InFile_SIMC = open_root_file(simc_root.replace(".root","_iter_{}.root".format(iter_num)), "UPDATE")
-        new_TBRANCH_SIMC = ROOT.TTree("h10", "Iteration {}".format(iter_num))        
+    # Create a new ROOT file for writing
+    new_InFile_SIMC = open_root_file(iter_file_name(simc_root, iter_num), "UPDATE")
+    new_TBRANCH_SIMC = ROOT.TTree("h10", "Iteration {}".format(iter_num))
 
     # Grab branches from previous iteration
     hsdelta_array = array( 'f', [0])
@@ -310,8 +420,6 @@ def iter_weight(param_file, simc_root, inpDict, phi_setting):
     new_TBRANCH_SIMC.Branch("pend_x_det", pend_x_det_array, "pend_x_det/F")
     new_TBRANCH_SIMC.Branch("pend_y_det", pend_y_det_array, "pend_y_det/F")
 
-    # Set pol_str, q2_set, w_set for param model script
-    set_val(pol_str, q2_set, w_set)
     
     ################################################################################################################################################
     # Run over simc root branch to determine new weight
@@ -326,6 +434,10 @@ def iter_weight(param_file, simc_root, inpDict, phi_setting):
       # Progress bar
       Misc.progressBar(i, total_events,bar_length=25)
 
+      # Events dropped by the reweighting (weight sidecars only)
+      if iter_good is not None and not iter_good[i]:
+          continue
+
       TBRANCH_SIMC.GetEntry(i)
 
       if iter_num > 1:
@@ -0,0 +1,113 @@
+#! /usr/bin/python
+#
+# Description: Dense per (t,phi) bin histograms held in numpy arrays, converted to ROOT histograms at output time
+# ================================================================
+# Time-stamp: "2025-04-25 11:02:47 trottar"
+# ================================================================
+#
+# Author:  Richard L. Trotta III <trotta@cua.edu>
+#
+# Copyright (c) trottar
+#
+import numpy as np
+from ROOT import TH1D
+
+################################################################################################################################################
+
+class BinnedHist:
+    '''
+    One TH1D-like spectrum for every (t,phi) bin, stored as a single array of shape
+    (n_t, n_phi, nbins+2) with the sum of weights squared alongside
+
+    Slot 0 and nbins+1 are the under/overflow, so the arrays hold exactly what the
+    per bin TH1Ds held. Scaling and adding act on all bins at once, the TH1Ds are
+    only made (to_hist) for the histograms that are fitted, pruned or plotted.
+
+    Args:
+        name: Histogram name, to_hist appends _j_k (e.g. H_MM_DATA -> H_MM_DATA_0_3)
+        title: Histogram title
+        shape: (n_t, n_phi), use n_phi=1 for t binning only
+        nbins, xmin, xmax: Fixed binning, same as the TH1D constructor
+    '''
+
+    def __init__(self, name, title, shape, nbins, xmin, xmax):
+        self.name = name
+        self.title = title
+        self.shape = tuple(shape)
+        self.nbins = nbins
+        self.xmin = float(xmin)
+        self.xmax = float(xmax)
+        self.sumw = np.zeros(self.shape + (nbins+2,), dtype=np.float64)
+        self.sumw2 = np.zeros(self.shape + (nbins+2,), dtype=np.float64)
+
+    def find_bin(self, x):
+        '''
+        Same as TAxis::FindFixBin, x < xmin is the underflow and x >= xmax (or NaN) the overflow
+        '''
+        x = np.asarray(x, dtype=np.float64)
+        inside = (x >= self.xmin) & (x < self.xmax)
+        hbin = np.full(len(x), self.nbins+1, dtype=np.int64)
+        hbin[x < self.xmin] = 0
+        hbin[inside] = 1 + (self.nbins*(x[inside]-self.xmin)/(self.xmax-self.xmin)).astype(np.int64)
+        return hbin
+
+    def fill(self, flat_bin, x, weights=None):
+        '''
+        Fill x into the (t,phi) bins given by flat_bin (j*n_phi+k, see columnar.bin_pairs)
+        '''
+        if len(x) == 0:
+            return
+        idx = np.asarray(flat_bin, dtype=np.int64)*(self.nbins+2) + self.find_bin(x)
+        size = self.sumw.size
+        if weights is None:
+            counts = np.bincount(idx, minlength=size).astype(np.float64)
+            self.sumw += counts.reshape(self.sumw.shape)
+            self.sumw2 += counts.reshape(self.sumw2.shape)
+        else:
+            weights = np.asarray(weights, dtype=np.float64)
+            self.sumw += np.bincount(idx, weights=weights, minlength=size).reshape(self.sumw.shape)
+            self.sumw2 += np.bincount(idx, weights=weights*weights, minlength=size).reshape(self.sumw2.shape)
+
+    def scale(self, c):
+        '''
+        Same as TH1::Scale(c) on every bin
+        '''
+        self.sumw *= c
+        self.sumw2 *= c*c
+        return self
+
+    def add(self, other, c=1.0):
+        '''
+        Same as TH1::Add(other, c) on every bin
+        '''
+        self.sumw += c*other.sumw
+        self.sumw2 += c*c*other.sumw2
+        return self
+
+    def view(self, j, k=0):
+        '''
+        (sumw, sumw2) of one (t,phi) bin, including under/overflow, without copying
+        '''
+        return self.sumw[j, k], self.sumw2[j, k]
+
+    def to_hist(self, j, k=None):
+        '''
+        TH1D of one (t,phi) bin, named as the per bin histograms were (name_j_k, or name_j for t only)
+
+        The statistics are recomputed from the bin contents (TH1::ResetStats), which is
+        what ROOT itself does after subtracting a histogram (TH1::Add with c < 0)
+        '''
+        if k is None:
+            hist_name = "{}_{}".format(self.name, j)
+            sumw, sumw2 = self.view(j)
+        else:
+            hist_name = "{}_{}_{}".format(self.name, j, k)
+            sumw, sumw2 = self.view(j, k)
+        hist = TH1D(hist_name, self.title, self.nbins, self.xmin, self.xmax)
+        hist.Sumw2()
+        errors = hist.GetSumw2()
+        for b in range(self.nbins+2):
+            hist.SetBinContent(b, float(sumw[b]))
+            errors.SetAt(float(sumw2[b]), b)
+        hist.ResetStats()
+        return hist
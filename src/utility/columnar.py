@@ -0,0 +1,360 @@
+#! /usr/bin/python
+#
+# Description: Columnar (uproot/numpy) helpers for reading trees and filling ROOT histograms in bulk
+# ================================================================
+# Time-stamp: "2025-04-22 10:12:31 trottar"
+# ================================================================
+#
+# Author:  Richard L. Trotta III <trotta@cua.edu>
+#
+# Copyright (c) trottar
+#
+import uproot as up
+import numpy as np
+import root_numpy as rnp
+import sys, os
+
+################################################################################################################################################
+
+def read_tree_arrays(root_file, tree_name, branches=None):
+    """
+    Read branches of a tree into a dictionary of numpy arrays.
+
+    Branches that are not found in the tree are skipped (e.g. MM_shift), so callers
+    should check for optional branches with 'in'. Numeric branches are promoted to
+    float64 so comparisons and arithmetic match the per-event PyROOT values exactly.
+
+    Args:
+        root_file: Path to the ROOT file
+        tree_name: Name of the tree (e.g. Cut_Kaon_Events_prompt_noRF)
+        branches: List of branch names to read (None reads all branches)
+
+    Returns:
+        dict: {branch name : numpy array}, empty if the tree is missing
+    """
+    with up.open(root_file) as f:
+        if tree_name not in f:
+            print("WARNING: Tree {} not found in {}".format(tree_name, root_file))
+            return {}
+        tree = f[tree_name]
+        available = set(tree.keys())
+        if branches is None:
+            branches = list(available)
+        else:
+            branches = [b for b in dict.fromkeys(branches) if b in available]
+        arrays = tree.arrays(branches, library="np")
+
+    return {key : np.asarray(val, dtype=np.float64) for key, val in arrays.items()}
+
+################################################################################################################################################
+
+def available_memory():
+    '''
+    Memory available to this process in bytes (MemAvailable from /proc/meminfo, free pages otherwise)
+    '''
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1])*1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return os.sysconf("SC_PAGE_SIZE")*os.sysconf("SC_AVPHYS_PAGES")
+
+def auto_chunk_size(nbranches, mem_fraction=0.1, min_events=50000, max_events=20000000):
+    '''
+    Number of events per chunk so that one chunk uses about mem_fraction of the available memory
+
+    Each event costs 8 bytes per branch as float64, times ~4 for the uproot read buffers,
+    the cut masks and the derived columns made from each chunk.
+    '''
+    bytes_per_event = 8*max(nbranches, 1)*4
+    nevents = int(available_memory()*mem_fraction/bytes_per_event)
+    return max(min_events, min(nevents, max_events))
+
+def iterate_tree_arrays(root_file, tree_name, branches=None, chunk_size=None):
+    '''
+    Iterate over a tree in chunks, yielding the same dictionaries as read_tree_arrays
+    so memory is bounded by the chunk size rather than the size of the tree
+
+    Args:
+        root_file: Path to the ROOT file
+        tree_name: Name of the tree
+        branches: List of branch names to read (None reads all branches), missing branches are skipped
+        chunk_size: Events per chunk (int), a size string uproot understands (e.g. "500 MB")
+                    or None to choose from the available memory (see auto_chunk_size)
+
+    Yields:
+        dict: {branch name : numpy array} for each chunk, nothing if the tree is missing
+    '''
+    with up.open(root_file) as f:
+        if tree_name not in f:
+            print("WARNING: Tree {} not found in {}".format(tree_name, root_file))
+            return
+        tree = f[tree_name]
+        available = set(tree.keys())
+        if branches is None:
+            branches = list(available)
+        else:
+            branches = [b for b in dict.fromkeys(branches) if b in available]
+        if chunk_size is None:
+            chunk_size = auto_chunk_size(len(branches))
+        for arrays in tree.iterate(branches, step_size=chunk_size, library="np"):
+            yield {key : np.asarray(val, dtype=np.float64) for key, val in arrays.items()}
+
+def get_prescale(inpDict):
+    '''
+    Quick-look prescale of the run (main.py --prescale N / --fraction f), 1 for full statistics
+    '''
+    return max(1, int(inpDict.get("PRESCALE", 1)))
+
+def prescale_tag(inpDict):
+    '''
+    Tag added to the names of quick-look outputs so they never overwrite full statistics results
+    '''
+    prescale = get_prescale(inpDict)
+    return "" if prescale == 1 else "_prescale{}".format(prescale)
+
+def prescale_mask(start, nevents, prescale):
+    '''
+    Events of a chunk starting at tree entry start that are kept by the prescale (entry % prescale == 0)
+
+    Deterministic in the entry number, so every stage and every rerun keeps the same events
+    '''
+    return (start + np.arange(nevents, dtype=np.int64)) % prescale == 0
+
+def concat_chunks(chunks):
+    '''
+    Join a list of {name : array} dictionaries (e.g. the events kept from each chunk)
+    '''
+    if len(chunks) == 0:
+        return {}
+    return {key : np.concatenate([chunk[key] for chunk in chunks]) for key in chunks[0].keys()}
+
+################################################################################################################################################
+
+# Branches of a SIMC weight sidecar written by iter_weight, aligned entry by entry to its base h10 tree
+SIMC_WEIGHT_BRANCHES = ["Weight", "sigcm", "iter_weight", "iter_sig", "iter_good"]
+
+def simc_base_file(root_file):
+    '''
+    File holding the full SIMC h10 tree for root_file
+
+    A weight sidecar names its base file (in the same directory) in its simc_base TNamed,
+    any other SIMC file (original or a full iteration tree) is its own base
+    '''
+    with up.open(root_file) as f:
+        if "simc_base" not in f:
+            return root_file
+        base_name = f["simc_base"].member("fTitle")
+    return os.path.join(os.path.dirname(root_file), base_name)
+
+def read_simc_weights(root_file):
+    '''
+    Weight columns of a SIMC weight sidecar, None if root_file is not a sidecar
+    iter_good is False for the events dropped by the reweighting (zero weight)
+    '''
+    if simc_base_file(root_file) == root_file:
+        return None
+    weights = read_tree_arrays(root_file, "h10", SIMC_WEIGHT_BRANCHES)
+    weights["iter_good"] = weights["iter_good"] > 0
+    return weights
+
+def simc_good_mask(root_file):
+    '''
+    Per entry mask of the events kept by the reweighting, for event loops over a sidecar
+    (see utility.get_simc_tree), None if root_file is not a sidecar
+    '''
+    weights = read_simc_weights(root_file)
+    if weights is None:
+        return None
+    return weights["iter_good"]
+
+def iterate_simc_arrays(root_file, branches=None, chunk_size=None):
+    '''
+    Same as iterate_tree_arrays over the SIMC h10 tree of root_file
+
+    For a weight sidecar the base tree is read instead, its weight columns are replaced
+    by the sidecar's and the events dropped by the reweighting are removed, so a sidecar
+    reads the same as a full iteration tree
+    '''
+    weights = read_simc_weights(root_file)
+    if weights is None:
+        yield from iterate_tree_arrays(root_file, "h10", branches, chunk_size)
+        return
+
+    start = 0
+    for arrays in iterate_tree_arrays(simc_base_file(root_file), "h10", branches, chunk_size):
+        stop = start + len(next(iter(arrays.values())))
+        good = weights["iter_good"][start:stop]
+        for key in SIMC_WEIGHT_BRANCHES[:-1]:
+            if branches is None or key in branches:
+                arrays[key] = weights[key][start:stop]
+        start = stop
+        yield {key : val[good] for key, val in arrays.items()}
+
+################################################################################################################################################
+
+def fill_hist_arrays(hist, x, y=None, weights=None):
+    """
+    Fill a TH1/TH2 in place from numpy arrays. Uses TH1::Fill under the hood so
+    the binning (including under/overflow) is identical to filling event by event.
+
+    Args:
+        hist: TH1D or TH2D to fill
+        x: Array of x values
+        y: Array of y values (TH2 only)
+        weights: Optional array of weights
+
+    Returns:
+        hist
+    """
+    if len(x) == 0:
+        return hist
+    if y is None:
+        rnp.fill_hist(hist, x, weights=weights)
+    else:
+        rnp.fill_hist(hist, np.column_stack((x, y)), weights=weights)
+    return hist
+
+################################################################################################################################################
+
+def fill_graph_arrays(graph, x, y):
+    """
+    Append points to a TGraph (or TGraphPolar) from numpy arrays.
+
+    Args:
+        graph: TGraph to append to
+        x: Array of x values
+        y: Array of y values
+
+    Returns:
+        graph
+    """
+    n = graph.GetN()
+    for i, (xi, yi) in enumerate(zip(x, y)):
+        graph.SetPoint(n+i, float(xi), float(yi))
+    return graph
+
+def reservoir_fill_graph(graph, x, y, max_points=None, n_seen=0, rng=None):
+    '''
+    Reservoir sample (algorithm R) of points into a TGraph (or TGraphPolar), so the
+    graph never holds more than max_points points however many events are offered.
+    Every event offered so far has the same chance of being in the graph.
+
+    Args:
+        graph: TGraph to fill
+        x: Array of x values
+        y: Array of y values
+        max_points: Cap on the number of points (None keeps every point, same as fill_graph_arrays)
+        n_seen: Number of events already offered to this graph (for filling over several calls)
+        rng: numpy random Generator (a fixed seed is used if None so plots are reproducible)
+
+    Returns:
+        int: Number of events offered so far, pass back as n_seen on the next call
+    '''
+    if max_points is None:
+        fill_graph_arrays(graph, x, y)
+        return n_seen + len(x)
+    if rng is None:
+        rng = np.random.default_rng(0)
+
+    # Fill the free slots first
+    nfree = max(0, min(max_points - graph.GetN(), len(x)))
+    fill_graph_arrays(graph, x[:nfree], y[:nfree])
+
+    # Event i (counting from 0 over all calls) replaces a random slot with probability max_points/(i+1)
+    evt_num = n_seen + np.arange(nfree, len(x))
+    slots = (rng.random(len(evt_num))*(evt_num+1)).astype(np.int64)
+    for i in np.flatnonzero(slots < max_points):
+        graph.SetPoint(int(slots[i]), float(x[nfree+i]), float(y[nfree+i]))
+
+    return n_seen + len(x)
+
+################################################################################################################################################
+
+def edge_bin_index(x, edges):
+    '''
+    Bin index of each value for sorted bin edges using a binary search, O(log n) per value
+
+    Bin edges are inclusive on both sides (edges[j] <= x <= edges[j+1]), same as the
+    event loops, so a value sitting exactly on an interior edge belongs to two bins.
+    Both candidates are returned, lo and hi are equal unless the value is on an edge.
+
+    Args:
+        x: Array of values
+        edges: Sorted array of bin edges
+
+    Returns:
+        lo, hi: Arrays of bin indices, -1 where the value is outside the binning
+    '''
+    edges = np.asarray(edges, dtype=np.float64)
+    nbins = len(edges)-1
+    lo = np.searchsorted(edges, x, side="left")-1
+    hi = np.searchsorted(edges, x, side="right")-1
+    # x == edges[0] only belongs to the first bin, x == edges[-1] only to the last
+    lo = np.where((lo >= 0) & (lo < nbins), lo, -1)
+    hi = np.where((hi >= 0) & (hi < nbins), hi, -1)
+    lo = np.where(lo < 0, hi, lo)
+    hi = np.where(hi < 0, lo, hi)
+    return lo, hi
+
+def bin_pairs(t, t_bins, phi=None, phi_bins=None):
+    '''
+    (event index, flat bin index) of every event in the t or t/phi binning
+
+    Each event is assigned its bin once with edge_bin_index instead of testing every
+    bin, the flat bin index is j for t only and j*(len(phi_bins)-1)+k for t/phi.
+    An event on an interior edge appears once for each bin it belongs to.
+
+    Args:
+        t: Array of -t values
+        t_bins: t bin edges
+        phi: Array of phi values (same units as phi_bins)
+        phi_bins: phi bin edges (None for t binning only)
+
+    Returns:
+        evt, flat: Arrays of event indices and their flat bin indices
+    '''
+    t_lo, t_hi = edge_bin_index(t, t_bins)
+    t_pairs = [(t_lo, t_lo >= 0), (t_hi, t_hi != t_lo)]
+    if phi_bins is None:
+        nphi = 1
+        phi_pairs = [(np.zeros(len(t), dtype=np.int64), np.ones(len(t), dtype=bool))]
+    else:
+        nphi = len(phi_bins)-1
+        phi_lo, phi_hi = edge_bin_index(phi, phi_bins)
+        phi_pairs = [(phi_lo, phi_lo >= 0), (phi_hi, phi_hi != phi_lo)]
+
+    evt_list = []
+    flat_list = []
+    for t_idx, t_sel in t_pairs:
+        for phi_idx, phi_sel in phi_pairs:
+            sel = np.flatnonzero(t_sel & phi_sel)
+            evt_list.append(sel)
+            flat_list.append(t_idx[sel]*nphi + phi_idx[sel])
+
+    return np.concatenate(evt_list), np.concatenate(flat_list)
+
+def group_by_bin(t, t_bins, phi=None, phi_bins=None):
+    '''
+    Group event indices by their (flattened) t or t/phi bin (see bin_pairs)
+    Events are kept in their original order within each bin.
+
+    Args:
+        t: Array of -t values
+        t_bins: t bin edges
+        phi: Array of phi values (same units as phi_bins)
+        phi_bins: phi bin edges (None for t binning only)
+
+    Returns:
+        dict: {flat bin index : array of event indices}
+    '''
+    evt, flat = bin_pairs(t, t_bins, phi, phi_bins)
+
+    # Stable sort so events stay in tree order inside each bin
+    order = np.lexsort((evt, flat))
+    evt, flat = evt[order], flat[order]
+    bins, starts = np.unique(flat, return_index=True)
+
+    return {int(b) : idx for b, idx in zip(bins, np.split(evt, starts[1:]))}
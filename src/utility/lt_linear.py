@@ -0,0 +1,175 @@
+#! /usr/bin/python
+
+#
+# Description: Closed form weighted least squares L/T separation of the unseparated cross sections
+# ================================================================
+# Time-stamp: "2025-04-30 09:41:18 trottar"
+# ================================================================
+#
+# Author:  Richard L. Trotta III <trotta@cua.edu>
+#
+# Copyright (c) trottar
+#
+import numpy as np
+import math
+
+##################################################################################################################################################
+
+# Columns of the x_unsep.{pol}_Q{Q2}W{W}_{eps}.dat files (same names as the TNtuple of lt_2D_fit)
+UNSEP_COLUMNS = ["x", "dx", "x_mod", "eps", "theta", "phi", "t", "w", "Q2"]
+
+# Order of the separated cross sections in the results
+LT_SEP_TYPES = ["sigT", "sigL", "sigLT", "sigTT"]
+
+# Monte Carlo replicas of the unseparated cross sections per t-bin and the percentiles reported
+LT_REPLICAS = 5000
+LT_PERCENTILES = (2.5, 16.0, 50.0, 84.0, 97.5)
+
+def read_unsep_file(fn):
+    '''
+    {column : array} of an x_unsep file, t is also kept as float32 (t32) to match the t-bins
+    the way the TNtuple (x/F) reads them
+    '''
+    data = np.loadtxt(fn, dtype=np.float64, ndmin=2)
+    unsep = {col : data[:, i] for i, col in enumerate(UNSEP_COLUMNS)}
+    unsep["t32"] = unsep["t"].astype(np.float32)
+    return unsep
+
+def lt_design(eps, phi, degrees=True):
+    '''
+    Coefficients of (sigT, sigL, sigLT, sigTT) in the unseparated cross section, shape (..., 4)
+
+        sig = sigT + eps*sigL + sqrt(2*eps*(1+eps))*cos(phi)*sigLT + eps*cos(2*phi)*sigTT
+
+    At fixed eps and phi the separation is linear in the four, phi in degrees unless degrees=False
+    '''
+    eps = np.asarray(eps, dtype=np.float64)
+    phi = np.asarray(phi, dtype=np.float64)
+    if degrees:
+        phi = phi * math.pi/180
+    eps, phi = np.broadcast_arrays(eps, phi)
+    return np.stack([np.ones_like(eps), eps, np.sqrt(2*eps*(1+eps)) * np.cos(phi), eps * np.cos(2*phi)], axis=-1)
+
+##################################################################################################################################################
+
+def lt_wls_batch(eps, phi, sig, sig_err, degrees=True):
+    '''
+    Weighted least squares separation of many t-bins at once
+
+    Args:
+        eps, phi, sig, sig_err: (n_bins, n_pts), points with sig_err <= 0 are padding and do not enter
+        degrees: phi in degrees
+
+    Returns:
+        dict: "par" (n_bins, 4) sigT, sigL, sigLT, sigTT
+              "cov" (n_bins, 4, 4) their covariance, inverse of the weighted normal matrix
+              "chi2", "ndf" (n_bins,)
+
+    The normal equations of all bins are inverted in one call. pinv keeps a bin without enough
+    phi/eps coverage finite (its unconstrained combinations get zero instead of failing the batch).
+    '''
+    sig = np.asarray(sig, dtype=np.float64)
+    sig_err = np.asarray(sig_err, dtype=np.float64)
+    used = sig_err > 0.0
+    wgt = np.where(used, 1.0/np.where(used, sig_err, 1.0)**2, 0.0)
+    sig = np.where(used, sig, 0.0)
+
+    design = lt_design(eps, phi, degrees)
+    normal = np.einsum('bpi,bp,bpj->bij', design, wgt, design)
+    cov = np.linalg.pinv(normal, hermitian=True)
+    par = np.einsum('bij,bpj,bp,bp->bi', cov, design, wgt, sig)
+
+    resid = sig - np.einsum('bpi,bi->bp', design, par)
+    chi2 = np.sum(wgt * resid**2, axis=1)
+    ndf = used.sum(axis=1) - 4
+
+    return {
+        "par" : par,
+        "cov" : cov,
+        "chi2" : chi2,
+        "ndf" : ndf,
+    }
+
+def lt_wls(eps, phi, sig, sig_err, degrees=True):
+    '''
+    lt_wls_batch of one t-bin, returns (par (4,), cov (4, 4), chi2, ndf)
+    '''
+    result = lt_wls_batch(*[np.atleast_2d(np.asarray(x, dtype=np.float64)) for x in np.broadcast_arrays(eps, phi, sig, sig_err)], degrees)
+    return result["par"][0], result["cov"][0], float(result["chi2"][0]), int(result["ndf"][0])
+
+def lt_rho(par):
+    '''
+    (rho_LT, rho_TT) of separated cross sections (sigT, sigL, sigLT, sigTT), the parameters of the TF2 of lt_2D_fit
+    '''
+    sig_t, sig_l, sig_lt, sig_tt = [float(p) for p in par[:4]]
+    root = math.sqrt(sig_t * sig_l) if sig_t * sig_l > 0.0 else 0.0
+    rho_lt = sig_lt / root if root > 0.0 else 0.0
+    rho_tt = sig_tt / sig_t if sig_t != 0.0 else 0.0
+    return rho_lt, rho_tt
+
+def lt_rho_err(par, cov):
+    '''
+    Errors of (rho_LT, rho_TT) of lt_rho from the covariance of (sigT, sigL, sigLT, sigTT)
+    '''
+    sig_t, sig_l = float(par[0]), float(par[1])
+    rho_lt, rho_tt = lt_rho(par)
+    if sig_t * sig_l <= 0.0:
+        return 0.0, 0.0
+    cov = np.asarray(cov, dtype=np.float64)
+    grad_lt = np.array([-0.5*rho_lt/sig_t, -0.5*rho_lt/sig_l, 1.0/math.sqrt(sig_t * sig_l), 0.0])
+    grad_tt = np.array([-rho_tt/sig_t, 0.0, 0.0, 1.0/sig_t])
+    return math.sqrt(abs(grad_lt @ cov @ grad_lt)), math.sqrt(abs(grad_tt @ cov @ grad_tt))
+
+##################################################################################################################################################
+
+def lt_replicas(eps, phi, sig, sig_err, num_replicas=LT_REPLICAS, seed=0, degrees=True):
+    '''
+    Separations of Monte Carlo replicas of the unseparated cross sections, for all t-bins in one call
+
+    Each replica draws every point from a gaussian of its error around its value. The weighted
+    least squares solution is linear in the cross sections, par = (A^T W A)^-1 A^T W sig, so the
+    operator is built once per bin and applied to all replicas in a single product.
+
+    Args:
+        eps, phi, sig, sig_err: (n_bins, n_pts) as lt_wls_batch, or (n_pts,) for one t-bin
+        num_replicas: Replicas per t-bin
+        seed: Seed of the numpy generator, the same seed gives the same replicas
+
+    Returns:
+        (n_bins, num_replicas, 4) sigT, sigL, sigLT, sigTT of every replica, (num_replicas, 4) for one t-bin
+    '''
+    single = np.ndim(sig) == 1
+    eps, phi, sig, sig_err = [np.atleast_2d(np.asarray(x, dtype=np.float64)) for x in np.broadcast_arrays(eps, phi, sig, sig_err)]
+    used = sig_err > 0.0
+    wgt = np.where(used, 1.0/np.where(used, sig_err, 1.0)**2, 0.0)
+    err = np.where(used, sig_err, 0.0)
+
+    design = lt_design(eps, phi, degrees)
+    cov = np.linalg.pinv(np.einsum('bpi,bp,bpj->bij', design, wgt, design), hermitian=True)
+    operator = np.einsum('bij,bpj,bp->bip', cov, design, wgt)
+
+    rng = np.random.default_rng(seed)
+    replicas = np.where(used, sig, 0.0)[:, None, :] + err[:, None, :] * rng.standard_normal((sig.shape[0], num_replicas, sig.shape[1]))
+    par = np.einsum('bip,brp->bri', operator, replicas)
+    return par[0] if single else par
+
+def lt_replica_summary(par, percentiles=LT_PERCENTILES):
+    '''
+    Mean, standard deviation, percentiles and correlation matrix of the replicas of one t-bin (num_replicas, 4)
+    '''
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = np.corrcoef(par, rowvar=False)
+    return {
+        "mean" : par.mean(axis=0),
+        "std" : par.std(axis=0, ddof=1),
+        "percentiles" : np.percentile(par, percentiles, axis=0),
+        "corr" : np.nan_to_num(corr),
+    }
+
+def print_replica_summary(summary, percentiles=LT_PERCENTILES):
+    print("  Replicas:" + "".join(" {:>10}".format("p{:g}".format(q)) for q in percentiles))
+    for k, sep_type in enumerate(LT_SEP_TYPES):
+        print("    {:7s}".format(sep_type) + "".join(" {:10.3f}".format(v) for v in summary["percentiles"][:, k]))
+    print("  Correlations:" + "".join(" {:>7}".format(sep_type) for sep_type in LT_SEP_TYPES))
+    for k, sep_type in enumerate(LT_SEP_TYPES):
+        print("    {:11s}".format(sep_type) + "".join(" {:7.3f}".format(v) for v in summary["corr"][k]))
@@ -0,0 +1,307 @@
+#! /usr/bin/python
+
+#
+# Description: Compiled sig_L/sig_T/sig_LT/sig_TT/wfactor kernels of the Q{Q2}W{W}.model files
+# ================================================================
+# Time-stamp: "2025-04-27 09:14:52 trottar"
+# ================================================================
+#
+# Author:  Richard L. Trotta III <trotta@cua.edu>
+#
+# Copyright (c) trottar
+#
+import numpy as np
+import math, sys
+
+##################################################################################################################################################
+# Importing utility functions
+
+from utility import load_equations, prepare_equations
+
+##################################################################################################################################################
+
+SIG_TYPES = ['sig_L', 'sig_T', 'sig_LT', 'sig_TT']
+
+# One compiled model per setting, shared by param, xfit and sep_xsect
+_MODEL_CACHE = {}
+
+# Imaginary step of the complex step parameter derivatives, exact to rounding for any step this small
+COMPLEX_STEP = 1e-30
+
+# Tolerances of check_model_parity and check_model_jac (central differences are only good to about 1e-8)
+PARITY_RTOL = 1e-9
+JAC_RTOL = 1e-5
+
+def setting_str(val):
+    '''
+    Q2/W as used in the model file names (3.0 or "3.0" -> "3p0")
+    '''
+    return str(val).replace('.', 'p')
+
+def get_model(q2_set, w_set):
+    '''
+    XsectModel of the given setting, the model file is only read and compiled once per process
+    '''
+    key = (setting_str(q2_set), setting_str(w_set))
+    if key not in _MODEL_CACHE:
+        _MODEL_CACHE[key] = XsectModel(*key)
+    return _MODEL_CACHE[key]
+
+##################################################################################################################################################
+
+class XsectModel:
+    '''
+    The functional forms of one Q{Q2}W{W}.model file, compiled once by prepare_equations
+
+    The model file is the only place the forms are written (set_sig_fortran.py generates
+    the Fortran xmodel from the same file). Two builds of each form are kept:
+        scalar: math based, one event at a time (ROOT TF1 callbacks, the .model checks)
+        vector: numpy based, qq/ww/tt/theta_cm may be arrays of events
+    The parameters are always scalars. A third build (complex) takes complex parameters and
+    gives the derivatives with respect to the parameters by complex step (sig_sep_jac).
+
+    Args:
+        q2_set, w_set: Setting strings, e.g. "3p0", "3p14"
+        equations: Already loaded equations, otherwise read from the model file
+    '''
+
+    def __init__(self, q2_set, w_set, equations=None):
+        self.q2_str = setting_str(q2_set)
+        self.w_str = setting_str(w_set)
+        self.q2_set = float(self.q2_str.replace('p', '.'))
+        self.w_set = float(self.w_str.replace('p', '.'))
+        if equations is None:
+            equations = load_equations(f"Q{self.q2_str}W{self.w_str}.model")
+        self.equations = equations
+        self.scalar = {sig_type : prepare_equations(equations, sig_type) for sig_type in SIG_TYPES + ['wfactor']}
+        self.vector = {sig_type : prepare_equations(equations, sig_type, vectorized=True) for sig_type in SIG_TYPES + ['wfactor']}
+        self.complex = {sig_type : prepare_equations(equations, sig_type, complex_step=True) for sig_type in SIG_TYPES}
+
+    def sig_sep(self, sig_type, qq, ww, tt, theta_cm, par):
+        '''
+        sig_L/sig_T/sig_LT/sig_TT over arrays of events, par are the four parameters of that form
+        '''
+        par1, par2, par3, par4 = [float(p) for p in par[:4]]
+        with np.errstate(all="ignore"):
+            return self.vector[sig_type](self.q2_set, self.w_set, qq, ww, tt, theta_cm, par1, par2, par3, par4)
+
+    def sig_sep_jac(self, sig_type, qq, ww, tt, theta_cm, par):
+        '''
+        Derivatives of sig_L/sig_T/sig_LT/sig_TT with respect to its four parameters, shape (n_events, 4)
+
+        f(p + ih e_k) = f(p) + ih df/dp_k + O(h**2), so Im(f)/h is the derivative without the
+        cancellation of a finite difference. Forms using a function without a complex version
+        (atan2, no complex build, see prepare_equations) or an operation that fails on complex
+        values use central differences.
+        '''
+        par = [float(p) for p in par[:4]]
+        shape = np.broadcast(qq, ww, tt, theta_cm).shape
+        jac = np.empty(shape + (4,), dtype=np.float64)
+        complex_form = self.complex[sig_type]
+        with np.errstate(all="ignore"):
+            for k in range(4):
+                try:
+                    if complex_form is None:
+                        raise TypeError
+                    cpar = [complex(p) for p in par]
+                    cpar[k] += 1j*COMPLEX_STEP
+                    val = complex_form(self.q2_set, self.w_set, qq, ww, tt, theta_cm, *cpar)
+                    jac[..., k] = np.imag(val) / COMPLEX_STEP
+                except TypeError:
+                    step = 1e-6 * max(abs(par[k]), 1.0)
+                    hi, lo = list(par), list(par)
+                    hi[k] += step
+                    lo[k] -= step
+                    jac[..., k] = (self.sig_sep(sig_type, qq, ww, tt, theta_cm, hi)
+                                   - self.sig_sep(sig_type, qq, ww, tt, theta_cm, lo)) / (2*step)
+        return jac
+
+    def wfactor(self, qq, ww, tt):
+        '''
+        W-factor over arrays of events
+        '''
+        with np.errstate(all="ignore"):
+            return self.vector['wfactor'](self.q2_set, self.w_set, qq, ww, tt)
+
+    def sig_all(self, qq, ww, tt, theta_cm, params):
+        '''
+        (sig_L, sig_T, sig_LT, sig_TT, wfactor) over arrays of events for the 16 parameters
+        '''
+        sigs = [self.sig_sep(sig_type, qq, ww, tt, theta_cm, params[4*i:4*i+4]) for i, sig_type in enumerate(SIG_TYPES)]
+        return (*sigs, self.wfactor(qq, ww, tt))
+
+    def sig_unsep(self, qq, ww, tt, eps, theta_cm, phi_cm, params):
+        '''
+        Unseparated dsig/dtdphicm in microbarns/MeV**2/rad over arrays of events, phi_cm in degrees
+
+        Same combination as param_*.iterWeight, theta_cm is passed to the forms as given
+        '''
+        sig_L, sig_T, sig_LT, sig_TT, wfactor = self.sig_all(qq, ww, tt, theta_cm, params)
+        with np.errstate(all="ignore"):
+            phi_cm = phi_cm * math.pi/180
+            sig = (sig_T + eps * sig_L + eps * np.cos(2. * phi_cm) * sig_TT +
+                     np.sqrt(2.0 * eps * (1. + eps)) * np.cos(phi_cm) * sig_LT)
+            sig = sig * wfactor
+            return sig / 2.0 / math.pi / 1e6
+
+    def sig_unsep_jac(self, qq, ww, tt, eps, theta_cm, phi_cm, params):
+        '''
+        Derivatives of sig_unsep with respect to the 16 parameters, shape (n_events, 16)
+        '''
+        shape = np.broadcast(qq, ww, tt, eps, theta_cm, phi_cm).shape
+        jac = np.empty(shape + (16,), dtype=np.float64)
+        with np.errstate(all="ignore"):
+            phi_cm = phi_cm * math.pi/180
+            # d sig / d sig_L, sig_T, sig_LT, sig_TT
+            coeffs = (eps, 1.0, np.sqrt(2.0 * eps * (1. + eps)) * np.cos(phi_cm), eps * np.cos(2. * phi_cm))
+            norm = self.wfactor(qq, ww, tt) / 2.0 / math.pi / 1e6
+            for i, (sig_type, coeff) in enumerate(zip(SIG_TYPES, coeffs)):
+                dsig = self.sig_sep_jac(sig_type, qq, ww, tt, theta_cm, params[4*i:4*i+4])
+                jac[..., 4*i:4*i+4] = dsig * np.expand_dims(np.broadcast_to(coeff * norm, shape), -1)
+        return jac
+
+##################################################################################################################################################
+
+def lt_sep_xsect(eps, phi, sig_T, sig_L, rho_LT, rho_TT, degrees=True):
+    '''
+    Unseparated cross section of the L/T separation from sigT, sigL and the LT/TT ratios
+
+    Same form as LT_sep_x_fun in lt_*_pl.py, eps and phi may be arrays (phi in degrees unless degrees=False)
+    '''
+    phi = np.asarray(phi, dtype=np.float64)
+    if degrees:
+        phi = phi * math.pi/180
+    with np.errstate(all="ignore"):
+        #  ρ_LT term = ρₗₜ · √(σ_T·σ_L)  ;  ρ_TT term = ρₜₜ · σ_T
+        return (sig_T
+                + eps * sig_L
+                + np.sqrt(2*eps*(1+eps)) * rho_LT * np.sqrt(sig_T * sig_L) * np.cos(phi)
+                + eps * rho_TT * sig_T * np.cos(2*phi))
+
+def lt_sep_xsect_jac(eps, phi, sig_T, sig_L, rho_LT, rho_TT, degrees=True):
+    '''
+    Analytic derivatives of lt_sep_xsect with respect to (sig_T, sig_L, rho_LT, rho_TT), shape (..., 4)
+    '''
+    phi = np.asarray(phi, dtype=np.float64)
+    if degrees:
+        phi = phi * math.pi/180
+    with np.errstate(all="ignore"):
+        lt_fac = np.sqrt(2*eps*(1+eps)) * np.cos(phi)
+        tt_fac = eps * np.cos(2*phi)
+        root = np.sqrt(sig_T * sig_L)
+        jac = (1.0 + 0.5 * lt_fac * rho_LT * root / sig_T + tt_fac * rho_TT,
+               eps + 0.5 * lt_fac * rho_LT * root / sig_L,
+               lt_fac * root,
+               tt_fac * sig_T)
+        return np.stack(np.broadcast_arrays(*jac), axis=-1)
+
+##################################################################################################################################################
+
+def check_model_parity(q2_set, w_set, params, npts=1000, rtol=PARITY_RTOL, seed=0):
+    '''
+    Compare the vector kernels against the scalar forms (one call per event) at random kinematics around the setting
+
+    Returns {sig_type : max relative difference} and prints a failure for any form above rtol.
+    Points where the scalar form raises or is not finite must be non-finite in the vector kernel too,
+    and the other way around (either mismatch counts as an infinite difference).
+    '''
+    model = get_model(q2_set, w_set)
+    rng = np.random.default_rng(seed)
+    qq = model.q2_set * rng.uniform(0.8, 1.2, npts)
+    ww = model.w_set * rng.uniform(0.95, 1.05, npts)
+    tt = rng.uniform(0.01, 1.5, npts)
+    theta_cm = rng.uniform(0.0, math.pi, npts)
+
+    results = {}
+    for i, sig_type in enumerate(SIG_TYPES + ['wfactor']):
+        if sig_type == 'wfactor':
+            vec = np.broadcast_to(model.wfactor(qq, ww, tt), (npts,))
+            fun_args = lambda n: (model.q2_set, model.w_set, qq[n], ww[n], tt[n])
+        else:
+            par = [float(p) for p in params[4*i:4*i+4]]
+            vec = np.broadcast_to(model.sig_sep(sig_type, qq, ww, tt, theta_cm, par), (npts,))
+            fun_args = lambda n: (model.q2_set, model.w_set, qq[n], ww[n], tt[n], theta_cm[n], *par)
+
+        max_diff = 0.0
+        for n in range(npts):
+            try:
+                ref = model.scalar[sig_type](*fun_args(n))
+            except (ValueError, OverflowError, ZeroDivisionError):
+                ref = math.nan
+            if isinstance(ref, complex) or not math.isfinite(ref):
+                if np.isfinite(vec[n]):
+                    max_diff = math.inf
+                continue
+            if not np.isfinite(vec[n]):
+                max_diff = math.inf
+                continue
+            diff = abs(vec[n] - ref) / max(abs(ref), 1e-300)
+            max_diff = max(max_diff, diff)
+        results[sig_type] = max_diff
+        if max_diff > rtol:
+            print(f"ERROR: {sig_type} kernel of Q{model.q2_str}W{model.w_str}.model differs from scalar form (max rel. diff {max_diff:.3e})")
+    return results
+
+def check_model_jac(q2_set, w_set, params, npts=1000, rtol=JAC_RTOL, seed=0):
+    '''
+    Compare the complex step parameter derivatives (sig_sep_jac) against central differences of the vector kernels
+
+    Returns {sig_type : max difference relative to the largest derivative of that form} and prints
+    a failure for any form above rtol. A derivative that is finite in only one of the two counts
+    as an infinite difference.
+    '''
+    model = get_model(q2_set, w_set)
+    rng = np.random.default_rng(seed)
+    qq = model.q2_set * rng.uniform(0.8, 1.2, npts)
+    ww = model.w_set * rng.uniform(0.95, 1.05, npts)
+    tt = rng.uniform(0.01, 1.5, npts)
+    theta_cm = rng.uniform(0.0, math.pi, npts)
+
+    results = {}
+    for i, sig_type in enumerate(SIG_TYPES):
+        par = [float(p) for p in params[4*i:4*i+4]]
+        jac = model.sig_sep_jac(sig_type, qq, ww, tt, theta_cm, par)
+        ref = np.empty_like(jac)
+        for k in range(4):
+            step = 1e-6 * max(abs(par[k]), 1.0)
+            hi, lo = list(par), list(par)
+            hi[k] += step
+            lo[k] -= step
+            ref[..., k] = (model.sig_sep(sig_type, qq, ww, tt, theta_cm, hi) - model.sig_sep(sig_type, qq, ww, tt, theta_cm, lo)) / (2*step)
+        good = np.isfinite(jac) & np.isfinite(ref)
+        scale = np.max(np.abs(ref[good])) if np.any(good) else 0.0
+        max_diff = float(np.max(np.abs(jac[good]-ref[good]))/scale) if scale > 0.0 else 0.0
+        if np.any(np.isfinite(jac) != np.isfinite(ref)):
+            max_diff = math.inf
+        results[sig_type] = max_diff
+        if max_diff > rtol:
+            print(f"ERROR: {sig_type} parameter derivatives of Q{model.q2_str}W{model.w_str}.model differ from central differences (max diff {max_diff:.3e})")
+    return results
+
+##################################################################################################################################################
+
+if __name__ == "__main__":
+    # e.g. python3 utility/model_registry.py 3p0 3p14 <par file of setting>
+    if len(sys.argv) != 4:
+        print("Usage: python3 utility/model_registry.py Q2 W par_file")
+        sys.exit(2)
+    par_vec = []
+    with open(sys.argv[3], 'r') as f:
+        for line in f:
+            data = line.split()
+            if data:
+                par_vec.append(float(data[0]))
+    if len(par_vec) < 16:
+        print("ERROR: {} has {} parameters, expected 16".format(sys.argv[3], len(par_vec)))
+        sys.exit(2)
+    failed = []
+    for sig_type, max_diff in check_model_parity(sys.argv[1], sys.argv[2], par_vec[:16]).items():
+        print(f"{sig_type:8s} max rel. diff = {max_diff:.3e}")
+        if not max_diff <= PARITY_RTOL:
+            failed.append(f"{sig_type} kernel")
+    for sig_type, max_diff in check_model_jac(sys.argv[1], sys.argv[2], par_vec[:16]).items():
+        print(f"{sig_type:8s} max jac. diff = {max_diff:.3e}")
+        if not max_diff <= JAC_RTOL:
+            failed.append(f"{sig_type} derivatives")
+    print("Model parity: {} checks, {} failures{}".format(2*len(SIG_TYPES)+1, len(failed), (" (" + ", ".join(failed) + ")") if failed else ""))
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,231 @@
+#! /usr/bin/python
+
+#
+# Description: Sparse response matrix from SIMC events to (t,phi) bin yields for fast re-evaluation of the model
+# ================================================================
+# Time-stamp: "2025-04-28 15:36:20 trottar"
+# ================================================================
+#
+# Author:  Richard L. Trotta III <trotta@cua.edu>
+#
+# Copyright (c) trottar
+#
+import numpy as np
+import scipy.sparse as sp
+import math, os
+
+##################################################################################################################################################
+# Importing utility functions
+
+from columnar import bin_pairs, available_memory
+
+##################################################################################################################################################
+
+# Vertex kinematics the model is evaluated at, same columns as iter_weight_batch
+RESPONSE_KIN_COLUMNS = ["Q2i", "Wi", "ti", "epsilon", "thetapq", "phipqi"]
+
+class SimcResponse:
+    '''
+    SIMC yield of every (t,phi) bin as a linear function of the per event model cross section
+
+    The reweighted SIMC weight of an event is w*sig(p)/sig, with w and sig the weight and
+    cross section it was generated (or last reweighted) with, and a bin yield is
+    normfac/bin_width times the sum of the weights of the events in it (calculate_yield_simc).
+    So for any parameter set p
+
+        yield(p) = matrix @ sig(p),   matrix[b,e] = normfac/bin_width * w_e/sig_e
+
+    and a candidate costs one model evaluation over the accepted events and one sparse mat-vec
+    instead of a full iteration.
+
+    Args:
+        matrix: scipy.sparse csr_matrix of shape (n_t*n_phi, n_events)
+        kin: {column : array} of RESPONSE_KIN_COLUMNS for the n_events accepted events
+        t_bins, phi_bins: Bin edges the matrix was built for
+    '''
+
+    def __init__(self, matrix, kin, t_bins, phi_bins):
+        self.matrix = matrix.tocsr()
+        self.kin = kin
+        self.t_bins = np.asarray(t_bins, dtype=np.float64)
+        self.phi_bins = np.asarray(phi_bins, dtype=np.float64)
+        self.shape = (len(self.t_bins)-1, len(self.phi_bins)-1)
+
+    def yields(self, sig):
+        '''
+        Bin yields (n_t, n_phi) for per event cross sections sig (n_events,),
+        or (n_t, n_phi, n_cand) for a matrix of candidates (n_events, n_cand)
+        '''
+        yld = self.matrix @ sig
+        return yld.reshape(self.shape + np.shape(sig)[1:])
+
+    def sig_model(self, model, params):
+        '''
+        Per event cross section of the model (model_registry.XsectModel) for the 16 params
+
+        Events the reweighting would reject (iterWeightArray, non-finite or non-positive
+        cross section) get zero, as their weight does.
+        '''
+        kin = self.kin
+        sig = model.sig_unsep(kin["Q2i"], kin["Wi"], kin["ti"], kin["epsilon"], kin["thetapq"], kin["phipqi"], params)
+        sig = np.broadcast_to(sig, np.shape(kin["Q2i"])).astype(np.float64)
+        sig[~np.isfinite(sig) | ~(sig > 0.0)] = 0.0
+        return sig
+
+    def predict(self, model, params):
+        '''
+        SIMC yields (n_t, n_phi) for one parameter set
+        '''
+        return self.yields(self.sig_model(model, params))
+
+    def predict_jac(self, model, params):
+        '''
+        Derivatives of the SIMC yields with respect to the 16 params (n_t, n_phi, 16)
+
+        The yields are linear in the per event cross section, so this is the response
+        matrix times the model derivatives (XsectModel.sig_unsep_jac) of the events that
+        have a cross section in sig_model.
+        '''
+        kin = self.kin
+        nevents = np.shape(kin["Q2i"])[0]
+        sig = self.sig_model(model, params)
+        jac = model.sig_unsep_jac(kin["Q2i"], kin["Wi"], kin["ti"], kin["epsilon"], kin["thetapq"], kin["phipqi"], params)
+        jac = np.broadcast_to(jac, (nevents, 16)).copy()
+        jac[(sig == 0.0) | ~np.all(np.isfinite(jac), axis=1)] = 0.0
+        return self.yields(jac)
+
+    def predict_many(self, model, param_sets):
+        '''
+        SIMC yields (n_t, n_phi, n_cand) for a list of parameter sets, one sparse product for all of them
+        '''
+        sig = np.column_stack([self.sig_model(model, params) for params in param_sets])
+        return self.yields(sig)
+
+################################################################################################################################################
+
+def build_simc_response(arrays, cut_masks, t_bins, phi_bins, normfac, bin_width, iteration, phi_col="phipq"):
+    '''
+    SimcResponse of a SIMC scan (event_scan.scan_simc), same event selection and binning as find_yield_simc
+
+    Events on an interior bin edge count in both bins, as in fill_binned. Events whose
+    current cross section is zero (rejected by a previous reweighting) have no response.
+    '''
+    weight = arrays["iter_weight"] if iteration else arrays["Weight"]
+    sig_prev = arrays["iter_sig"] if iteration else arrays["sigcm"]
+
+    sel = np.flatnonzero(cut_masks["ALLCUTS"] & (sig_prev != 0.0))
+    kin = {key : arrays[key][sel] for key in RESPONSE_KIN_COLUMNS}
+
+    evt, flat = bin_pairs(arrays["minus_t"][sel], t_bins, arrays[phi_col][sel]*(180 / math.pi), phi_bins)
+    coeff = normfac/bin_width * weight[sel][evt]/sig_prev[sel][evt]
+
+    # Duplicate (bin, event) entries are summed by the csr conversion
+    nbins = (len(t_bins)-1)*(len(phi_bins)-1)
+    matrix = sp.coo_matrix((coeff, (flat, evt)), shape=(nbins, len(sel))).tocsr()
+
+    return SimcResponse(matrix, kin, t_bins, phi_bins)
+
+def save_simc_response(response, out_file):
+    '''
+    Write a SimcResponse to a single .npz (the csr arrays, the event kinematics and the bin edges)
+    '''
+    out = {
+        "data" : response.matrix.data,
+        "indices" : response.matrix.indices,
+        "indptr" : response.matrix.indptr,
+        "shape" : np.array(response.matrix.shape),
+        "t_bins" : response.t_bins,
+        "phi_bins" : response.phi_bins,
+    }
+    for key, val in response.kin.items():
+        out["kin/{}".format(key)] = val
+    np.savez_compressed(out_file, **out)
+
+def load_simc_response(in_file):
+    '''
+    Read a SimcResponse written by save_simc_response, None if the file does not exist
+    '''
+    if not os.path.isfile(in_file):
+        return None
+    with np.load(in_file) as f:
+        matrix = sp.csr_matrix((f["data"], f["indices"], f["indptr"]), shape=tuple(f["shape"]))
+        kin = {key.split("/", 1)[1] : f[key] for key in f.files if key.startswith("kin/")}
+        return SimcResponse(matrix, kin, f["t_bins"], f["phi_bins"])
+
+################################################################################################################################################
+
+def candidate_chunk_size(nevents, mem_fraction=0.1):
+    '''
+    Number of candidates evaluated together so the (events x candidates) cross section matrix
+    uses about mem_fraction of the available memory
+    '''
+    return max(1, int(available_memory()*mem_fraction/(8*2*max(nevents, 1))))
+
+def evaluate_candidates(response, model, param_sets, data_yield, data_err, chunk_size=None):
+    '''
+    SIMC yields, data/SIMC ratios and chi2 of K candidate parameter sets in one pass
+
+    Args:
+        response: SimcResponse of the setting
+        model: model_registry.XsectModel the candidates are parameters of
+        param_sets: (K, 16) candidate parameters
+        data_yield, data_err: Data yields and errors (n_t, n_phi), see read_yield_data
+        chunk_size: Candidates per sparse product, None to choose from the available memory
+
+    Returns:
+        dict: "yield" and "ratio" (K, n_t, n_phi), "chi2" and "ndf" (K,)
+              chi2 sums ((data-simc)/data_err)**2 over the bins with a data error and a SIMC yield
+    '''
+    param_sets = np.atleast_2d(np.asarray(param_sets, dtype=np.float64))
+    ncand = len(param_sets)
+    if chunk_size is None:
+        chunk_size = candidate_chunk_size(response.matrix.shape[1])
+
+    yields = np.empty((ncand,) + response.shape, dtype=np.float64)
+    for start in range(0, ncand, chunk_size):
+        stop = min(start+chunk_size, ncand)
+        yields[start:stop] = np.moveaxis(response.predict_many(model, param_sets[start:stop]), -1, 0)
+
+    data_yield = np.asarray(data_yield, dtype=np.float64)
+    data_err = np.asarray(data_err, dtype=np.float64)
+    used = (data_err > 0.0) & (yields > 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(yields > 0.0, data_yield/yields, 0.0)
+        chi2 = np.where(used, ((data_yield-yields)/data_err)**2, 0.0).sum(axis=(1, 2))
+
+    return {
+        "yield" : yields,
+        "ratio" : ratio,
+        "chi2" : chi2,
+        "ndf" : used.sum(axis=(1, 2)),
+    }
+
+def print_candidate_summary(result, top=10):
+    '''
+    Print the candidates ordered by chi2/ndf, best first
+    '''
+    with np.errstate(divide="ignore", invalid="ignore"):
+        red_chi2 = np.where(result["ndf"] > 0, result["chi2"]/result["ndf"], np.inf)
+    print("\n{:>10} {:>14} {:>6} {:>12} {:>12}".format("Candidate", "chi2", "ndf", "chi2/ndf", "mean ratio"))
+    for i in np.argsort(red_chi2, kind="stable")[:top]:
+        ratio = result["ratio"][i]
+        mean_ratio = np.mean(ratio[ratio > 0.0]) if np.any(ratio > 0.0) else 0.0
+        print("{:>10} {:>14.4e} {:>6} {:>12.4e} {:>12.4e}".format(i, result["chi2"][i], result["ndf"][i], red_chi2[i], mean_ratio))
+    return red_chi2
+
+def read_yield_data(f_yield, shape):
+    '''
+    Data yields and errors (n_t, n_phi) from a yield_data.*.dat file (yield, yield_err, phibin, tbin per line)
+    '''
+    data_yield = np.zeros(shape, dtype=np.float64)
+    data_err = np.zeros(shape, dtype=np.float64)
+    with open(f_yield, 'r') as f:
+        for line in f:
+            line_lst = line.split()
+            if len(line_lst) < 4:
+                continue
+            tbin_index = int(line_lst[3])-1
+            phibin_index = int(line_lst[2])-1
+            data_yield[tbin_index, phibin_index] = float(line_lst[0])
+            data_err[tbin_index, phibin_index] = float(line_lst[1])
+    return data_yield, data_err
@@ -0,0 +1,188 @@
+#! /usr/bin/python
+#
+# Description: Run the independent per phi setting steps (rand_sub, compare_simc, iter_weight) in worker processes
+# ================================================================
+# Time-stamp: "2025-04-24 09:48:15 trottar"
+# ================================================================
+#
+# Author:  Richard L. Trotta III <trotta@cua.edu>
+#
+# Copyright (c) trottar
+#
+import ROOT
+from ROOT import TFile
+import multiprocessing
+import sys, os
+
+################################################################################################################################################
+'''
+ltsep package import and pathing definitions
+'''
+
+# Import package for cuts
+from ltsep import Root
+
+lt=Root(os.path.realpath(__file__),"Plot_LTSep")
+
+# Add this to all files for more dynamic pathing
+USER=lt.USER # Grab user info for file finding
+HOST=lt.HOST
+REPLAYPATH=lt.REPLAYPATH
+UTILPATH=lt.UTILPATH
+LTANAPATH=lt.LTANAPATH
+ANATYPE=lt.ANATYPE
+OUTPATH=lt.OUTPATH
+
+################################################################################################################################################
+# Importing utility functions
+
+sys.path.append("utility")
+from utility import open_root_file
+
+################################################################################################################################################
+
+def shard_file_name(phi_setting, inpDict):
+    '''
+    Per setting ROOT shard written by a worker, so workers never share an output file
+    '''
+    return "{}/{}_{}_{}_shard.root".format(OUTPATH, phi_setting, inpDict["ParticleType"], inpDict["OutFilename"])
+
+def dict_to_shard(histDict, shard_file):
+    '''
+    Write every ROOT object of a setting dictionary to shard_file (keyed by its dictionary key)
+
+    Returns a picklable description of the dictionary
+        (TFile, path) for open input files, reopened by the parent
+        (TObject, key) for objects written to the shard
+        (value, val) for everything else
+    '''
+    meta = {}
+    shard = TFile.Open(shard_file, "RECREATE")
+    for key, val in histDict.items():
+        if isinstance(val, ROOT.TFile):
+            meta[key] = ("TFile", val.GetName())
+        elif isinstance(val, ROOT.TObject):
+            shard.WriteTObject(val, key, "Overwrite")
+            meta[key] = ("TObject", key)
+        else:
+            meta[key] = ("value", val)
+    shard.Close()
+    return meta
+
+def shard_to_dict(meta, shard_file):
+    '''
+    Rebuild a setting dictionary in the parent from a worker's shard, the shard is removed afterwards
+    '''
+    histDict = {}
+    shard = TFile.Open(shard_file, "READ")
+    for key, (kind, val) in meta.items():
+        if kind == "TFile":
+            histDict[key] = open_root_file(val)
+        elif kind == "TObject":
+            obj = shard.Get(val)
+            # Detach histograms from the shard so they survive closing it
+            if hasattr(obj, "SetDirectory"):
+                obj.SetDirectory(0)
+            histDict[key] = obj
+        else:
+            histDict[key] = val
+    shard.Close()
+    os.remove(shard_file)
+    return histDict
+
+################################################################################################################################################
+
+def process_setting(phi_setting, inpDict):
+    '''
+    Random subtraction and simc comparison of one phi setting, same as the sequential steps in main.py
+    '''
+    sys.path.append("cuts")
+    from rand_sub import rand_sub
+    sys.path.append("simc_ana")
+    from compare_simc import compare_simc
+
+    hist = rand_sub(phi_setting, inpDict)
+    # If hist is empty (length of one for phi setting check) the setting is dropped by main.py
+    if len(hist.keys()) > 1:
+        hist.update(compare_simc(hist, inpDict))
+    return hist
+
+def setting_worker(args):
+
+    phi_setting, inpDict = args
+
+    ROOT.gROOT.SetBatch(ROOT.kTRUE) # Set ROOT to batch mode explicitly, does not splash anything to screen
+
+    shard_file = shard_file_name(phi_setting, inpDict)
+    return dict_to_shard(process_setting(phi_setting, inpDict), shard_file)
+
+def run_settings(phisetlist, inpDict, num_procs):
+    '''
+    Run process_setting for every phi setting in num_procs worker processes
+
+    Each worker writes its ROOT objects to its own shard file and the parent merges
+    them back, returning the setting dictionaries in the order of phisetlist
+    '''
+
+    num_procs = max(1, min(num_procs, len(phisetlist)))
+
+    print("\nProcessing {} settings with {} worker processes...".format(", ".join(phisetlist), num_procs))
+
+    # Workers are forked so they inherit the ROOT/ltsep setup of main.py (which is a script, not importable)
+    ctx = multiprocessing.get_context("fork")
+    with ctx.Pool(processes=num_procs) as pool:
+        metas = pool.map(setting_worker, [(phiset, inpDict) for phiset in phisetlist])
+
+    return [shard_to_dict(meta, shard_file_name(phiset, inpDict)) for phiset, meta in zip(phisetlist, metas)]
+
+################################################################################################################################################
+
+# (hist, simc_root) of every setting for the iteration workers, inherited through the fork
+# so the data histograms of the settings are never pickled
+_ITER_JOBS = []
+
+def iter_shard_file_name(phi_setting, inpDict):
+    return "{}/{}_{}_{}_iter_shard.root".format(OUTPATH, phi_setting, inpDict["ParticleType"], inpDict["OutFilename"])
+
+def process_iter_setting(hist, simc_root, param_file, inpDict):
+    '''
+    SIMC reweighting and comparison of one phi setting, same as the sequential steps in main_iter.py
+    '''
+    sys.path.append("simc_ana")
+    from iter_weight import iter_weight, iter_file_name
+    from compare_simc_iter import compare_simc
+
+    iter_weight(param_file, simc_root, inpDict, hist["phi_setting"])
+    return compare_simc(iter_file_name(simc_root, inpDict["iter_num"]), hist, inpDict)
+
+def iter_setting_worker(args):
+
+    job, param_file, inpDict = args
+
+    ROOT.gROOT.SetBatch(ROOT.kTRUE) # Set ROOT to batch mode explicitly, does not splash anything to screen
+
+    hist, simc_root = _ITER_JOBS[job]
+    shard_file = iter_shard_file_name(hist["phi_setting"], inpDict)
+    return dict_to_shard(process_iter_setting(hist, simc_root, param_file, inpDict), shard_file)
+
+def run_iter_settings(iter_jobs, param_file, inpDict, num_procs):
+    '''
+    Run process_iter_setting for every (hist, simc_root) of iter_jobs in num_procs worker processes
+
+    Each worker only writes the weight sidecar of its own SIMC file and its shard, the parent
+    returns the compare_simc dictionaries in the order of iter_jobs
+    '''
+    global _ITER_JOBS
+
+    num_procs = max(1, min(num_procs, len(iter_jobs)))
+    phisetlist = [hist["phi_setting"] for hist, _ in iter_jobs]
+
+    print("\nReweighting SIMC of {} settings with {} worker processes...".format(", ".join(phisetlist), num_procs))
+
+    _ITER_JOBS = list(iter_jobs)
+    ctx = multiprocessing.get_context("fork")
+    with ctx.Pool(processes=num_procs) as pool:
+        metas = pool.map(iter_setting_worker, [(job, param_file, inpDict) for job in range(len(iter_jobs))])
+    _ITER_JOBS = []
+
+    return [shard_to_dict(meta, iter_shard_file_name(phiset, inpDict)) for phiset, meta in zip(phisetlist, metas)]
@@ -25,6 +25,7 @@ import signal
 import random
 import math
 import re
+import types
 import sys, os, subprocess
 
 ################################################################################################################################################
@@ -474,6 +475,46 @@ def create_polar_plot(hist, title="", r_title='|-t|', phi_title='#Phi', marker_c
     
     return polar_plot
 
+# Per event version of columnar.reservoir_fill_graph, n_seen is the number of events already offered to the graph
+# Keeps at most max_points points in the graph (None keeps every point)
+def reservoir_set_point(graph, n_seen, x, y, max_points=None):
+    if max_points is None or graph.GetN() < max_points:
+        graph.SetPoint(graph.GetN(), x, y)
+    else:
+        slot = random.randint(0, n_seen)
+        if slot < max_points:
+            graph.SetPoint(slot, x, y)
+    return n_seen + 1
+
+################################################################################################################################################
+
+def get_simc_tree(InFile_SIMC):
+    '''
+    h10 tree of an open SIMC file
+
+    For a weight sidecar written by iter_weight the base h10 tree (all the SIMC branches)
+    is attached as a friend, so evt.<branch> reads as it did from a full iteration tree.
+    Events dropped by the reweighting are still in the tree, skip them with columnar.simc_good_mask
+    '''
+    tree = InFile_SIMC.Get("h10")
+    base_name = InFile_SIMC.Get("simc_base")
+    if base_name:
+        base_file = os.path.join(os.path.dirname(InFile_SIMC.GetName()), base_name.GetTitle())
+        tree.AddFriend("base=h10", base_file)
+    return tree
+
+def link_or_copy(src, dst):
+    '''
+    Hard link src to dst (no extra disk space), copying instead if linking is not possible (e.g. across file systems)
+    The copy keeps the modification time, so the SIMC scan cache still matches (see event_scan.simc_scan_key)
+    '''
+    if os.path.exists(dst):
+        os.remove(dst)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
 ################################################################################################################################################
 
 def match_to_bin(data):
@@ -1160,7 +1201,37 @@ def extract_values(filename):
 
 ################################################################################################################################################
 
-def prepare_equations(equations, sig_type):
+# Stand-in for the math module when the model equations are evaluated over numpy arrays
+NUMPY_MATH = types.SimpleNamespace(
+    pi=math.pi, e=math.e, inf=math.inf,
+    exp=np.exp, log=np.log, log10=np.log10, sqrt=np.sqrt, pow=np.power, fabs=np.fabs,
+    sin=np.sin, cos=np.cos, tan=np.tan, asin=np.arcsin, acos=np.arccos, atan=np.arctan, atan2=np.arctan2,
+    sinh=np.sinh, cosh=np.cosh, tanh=np.tanh,
+)
+
+# Same with complex parameters (complex step derivatives), fabs keeps the sign of the real part
+# so d|x| = sign(x) dx. atan2 has no complex form and is left out.
+COMPLEX_MATH = types.SimpleNamespace(
+    pi=math.pi, e=math.e, inf=math.inf,
+    exp=np.exp, log=np.log, log10=np.log10, sqrt=np.sqrt, pow=np.power,
+    fabs=lambda x: np.where(np.real(x) < 0.0, -x, x),
+    sin=np.sin, cos=np.cos, tan=np.tan, asin=np.arcsin, acos=np.arccos, atan=np.arctan,
+    sinh=np.sinh, cosh=np.cosh, tanh=np.tanh,
+)
+
+def prepare_equations(equations, sig_type, vectorized=False, complex_step=False):
+    '''
+    Build the sig_L/sig_T/sig_LT/sig_TT/wfactor function from the model equations
+
+    With vectorized=True qq, ww, tt and theta_cm may be numpy arrays (one value per event),
+    math.* is evaluated with numpy and the zero guards are applied element-wise.
+    The parameters stay scalars in both cases.
+
+    complex_step=True is the vectorized build for complex parameters (model_registry
+    parameter derivatives), the parameter zero guards compare the real part. Returns None
+    if the form uses a math function without a complex version (see COMPLEX_MATH).
+    '''
+    vectorized = vectorized or complex_step
     tiny_offset = 1e-15  # Define a tiny offset to avoid division by zero
 
     if sig_type == "sig_L":
@@ -1205,17 +1276,33 @@ def prepare_equations(equations, sig_type):
         print(f"ERROR: Issue with function {sig_type}! Check input model file...")
         sys.exit(2)
 
+    if complex_step:
+        if any(not hasattr(COMPLEX_MATH, name) for name in re.findall(r"math\.(\w+)", "\n".join(eq_lst))):
+            return None
+        func_str = re.sub(r"if (par\d+) > ", r"if \1.real > ", func_str)
+
     # Add checks to avoid zero values
-    func_str += "        qq = qq if qq > 1e-15 else qq + tiny_offset\n"
-    func_str += "        ww = ww if ww > 1e-15 else ww + tiny_offset\n"
-    func_str += "        tt = tt if tt > 1e-15 else tt + tiny_offset\n"
-    func_str += "        theta_cm = theta_cm if theta_cm > 1e-15 else theta_cm + tiny_offset\n"
+    if vectorized:
+        func_str += "        qq = where(qq > 1e-15, qq, qq + tiny_offset)\n"
+        func_str += "        ww = where(ww > 1e-15, ww, ww + tiny_offset)\n"
+        func_str += "        tt = where(tt > 1e-15, tt, tt + tiny_offset)\n"
+        func_str += "        theta_cm = where(theta_cm > 1e-15, theta_cm, theta_cm + tiny_offset)\n"
+    else:
+        func_str += "        qq = qq if qq > 1e-15 else qq + tiny_offset\n"
+        func_str += "        ww = ww if ww > 1e-15 else ww + tiny_offset\n"
+        func_str += "        tt = tt if tt > 1e-15 else tt + tiny_offset\n"
+        func_str += "        theta_cm = theta_cm if theta_cm > 1e-15 else theta_cm + tiny_offset\n"
 
     # Build function body with equations
     func_str += "        " + "\n        ".join(eq_lst) + "\n"
     func_str += f"        return {sig_type}\n"
 
-    exec_globals = {'__builtins__': None, 'math': math, 'tiny_offset': tiny_offset}
+    if complex_step:
+        exec_globals = {'__builtins__': None, 'math': COMPLEX_MATH, 'where': np.where, 'tiny_offset': tiny_offset}
+    elif vectorized:
+        exec_globals = {'__builtins__': None, 'math': NUMPY_MATH, 'where': np.where, 'tiny_offset': tiny_offset}
+    else:
+        exec_globals = {'__builtins__': None, 'math': math, 'tiny_offset': tiny_offset}
     exec(func_str, exec_globals)
     return exec_globals[f'{sig_type}_optimized']
 
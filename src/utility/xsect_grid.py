@@ -0,0 +1,236 @@
+#! /usr/bin/python
+
+#
+# Description: sig_L/sig_T/sig_LT/sig_TT/wfactor tabulated on a (Q2, W, t, theta_cm) grid for fast per event weights
+# ================================================================
+# Time-stamp: "2025-04-29 14:37:52 trottar"
+# ================================================================
+#
+# Author:  Richard L. Trotta III <trotta@cua.edu>
+#
+# Copyright (c) trottar
+#
+import numpy as np
+import hashlib, json, math, os
+
+##################################################################################################################################################
+# Importing utility functions
+
+from model_registry import get_model, SIG_TYPES
+
+##################################################################################################################################################
+
+GRID_FORMS = SIG_TYPES + ['wfactor']
+
+# Points per axis (Q2, W, t, theta_cm)
+GRID_SHAPE = (24, 24, 64, 32)
+
+# Random points the interpolation is checked against direct evaluation at
+GRID_CHECK_POINTS = 5000
+
+# One grid per (model, parameters, ranges) and process
+_GRID_CACHE = {}
+
+def grid_key(model, params, ranges, shape=GRID_SHAPE):
+    '''
+    Model name plus a hash of the model equations, the 16 parameters, the ranges and the grid shape
+    '''
+    spec = {
+        "equations" : model.equations,
+        "params" : [float(p) for p in params],
+        "ranges" : [[float(lo), float(hi)] for lo, hi in ranges],
+        "shape" : list(shape),
+    }
+    digest = hashlib.sha1(json.dumps(spec, sort_keys=True).encode()).hexdigest()[:16]
+    return "Q{}W{}_{}".format(model.q2_str, model.w_str, digest)
+
+def grid_ranges(qq, ww, tt, theta_cm, pad=0.02):
+    '''
+    (lo, hi) of each axis covering the given events, padded by a fraction of the width
+    '''
+    ranges = []
+    for x in (qq, ww, tt, theta_cm):
+        x = np.asarray(x, dtype=np.float64)
+        x = x[np.isfinite(x)]
+        lo, hi = (float(x.min()), float(x.max())) if len(x) else (0.0, 1.0)
+        width = max(hi-lo, 1e-6)
+        ranges.append((lo-pad*width, hi+pad*width))
+    return ranges
+
+##################################################################################################################################################
+
+class XsectGrid:
+    '''
+    The separated forms and the W-factor of one parameter set on a regular 4D grid
+
+    The per event values come from multilinear interpolation of the 16 surrounding grid
+    points. Events outside the grid, or next to grid points where a form is not finite,
+    are evaluated directly with the model so the weights never depend on the grid range.
+    The interpolation error is measured against direct evaluation when the grid is built
+    (max_error, see check).
+
+    Args:
+        model: model_registry.XsectModel
+        params: The 16 parameters
+        ranges: (lo, hi) of Q2, W, t and theta_cm, see grid_ranges
+        shape: Points per axis
+        values: Already tabulated {form : array of shape}, otherwise evaluated here
+    '''
+
+    def __init__(self, model, params, ranges, shape=GRID_SHAPE, values=None):
+        self.model = model
+        self.params = [float(p) for p in params]
+        self.ranges = [(float(lo), float(hi)) for lo, hi in ranges]
+        self.shape = tuple(shape)
+        self.axes = [np.linspace(lo, hi, n) for (lo, hi), n in zip(self.ranges, self.shape)]
+        if values is None:
+            values = self.tabulate()
+        self.values = values
+        self.max_error = {}
+
+    def tabulate(self):
+        '''
+        Direct evaluation of every form at every grid point, the axes are broadcast against each other
+        '''
+        qq, ww, tt, theta_cm = np.meshgrid(*self.axes, indexing="ij", sparse=True)
+        forms = self.model.sig_all(qq, ww, tt, theta_cm, self.params)
+        return {form : np.broadcast_to(val, self.shape).astype(np.float64) for form, val in zip(GRID_FORMS, forms)}
+
+    def interpolate(self, qq, ww, tt, theta_cm):
+        '''
+        {form : array} at the events and the mask of events inside the grid
+        '''
+        points = [np.asarray(x, dtype=np.float64) for x in np.broadcast_arrays(qq, ww, tt, theta_cm)]
+        inside = np.ones(points[0].shape, dtype=bool)
+        index, frac = [], []
+        for x, (lo, hi), n in zip(points, self.ranges, self.shape):
+            inside &= (x >= lo) & (x <= hi)
+            pos = np.clip((x-lo)/(hi-lo)*(n-1), 0.0, n-1)
+            i = np.minimum(pos.astype(np.intp), n-2)
+            index.append(i)
+            frac.append(pos-i)
+
+        out = {form : np.zeros(points[0].shape, dtype=np.float64) for form in GRID_FORMS}
+        # Sum over the 16 corners of the cell, each weighted by the product of its 1D weights
+        for corner in range(16):
+            offs = [(corner >> d) & 1 for d in range(4)]
+            wgt = np.ones(points[0].shape, dtype=np.float64)
+            for d in range(4):
+                wgt *= frac[d] if offs[d] else 1.0-frac[d]
+            idx = tuple(index[d]+offs[d] for d in range(4))
+            for form in GRID_FORMS:
+                out[form] += wgt*self.values[form][idx]
+        return out, inside
+
+    def sig_all(self, qq, ww, tt, theta_cm):
+        '''
+        (sig_L, sig_T, sig_LT, sig_TT, wfactor) over arrays of events, same as XsectModel.sig_all
+        '''
+        with np.errstate(all="ignore"):
+            out, inside = self.interpolate(qq, ww, tt, theta_cm)
+        direct = ~inside
+        for form in GRID_FORMS:
+            direct |= ~np.isfinite(out[form])
+        if np.any(direct):
+            qq, ww, tt, theta_cm = [np.asarray(x, dtype=np.float64) for x in np.broadcast_arrays(qq, ww, tt, theta_cm)]
+            forms = self.model.sig_all(qq[direct], ww[direct], tt[direct], theta_cm[direct], self.params)
+            for form, val in zip(GRID_FORMS, forms):
+                out[form][direct] = val
+        return tuple(out[form] for form in GRID_FORMS)
+
+    def sig_unsep(self, qq, ww, tt, eps, theta_cm, phi_cm):
+        '''
+        Unseparated dsig/dtdphicm in microbarns/MeV**2/rad, same as XsectModel.sig_unsep, phi_cm in degrees
+        '''
+        sig_L, sig_T, sig_LT, sig_TT, wfactor = self.sig_all(qq, ww, tt, theta_cm)
+        with np.errstate(all="ignore"):
+            phi_cm = phi_cm * math.pi/180
+            sig = (sig_T + eps * sig_L + eps * np.cos(2. * phi_cm) * sig_TT +
+                     np.sqrt(2.0 * eps * (1. + eps)) * np.cos(phi_cm) * sig_LT)
+            sig = sig * wfactor
+            return sig / 2.0 / math.pi / 1e6
+
+    def check(self, npts=GRID_CHECK_POINTS, seed=0):
+        '''
+        Max interpolation error against direct evaluation at random points inside the grid
+
+        The separated forms are compared relative to the largest value of that form over the
+        points (sig_LT and sig_TT cross zero), the unseparated cross section (at random eps
+        and phi_cm) relative to each point, which is what the weights see.
+        '''
+        rng = np.random.default_rng(seed)
+        pts = [rng.uniform(lo, hi, npts) for lo, hi in self.ranges]
+        eps = rng.uniform(0.1, 0.9, npts)
+        phi_cm = rng.uniform(0.0, 360.0, npts)
+
+        with np.errstate(all="ignore"):
+            interp, _ = self.interpolate(*pts)
+            direct = self.model.sig_all(*pts, self.params)
+            self.max_error = {}
+            for form, ref in zip(GRID_FORMS, direct):
+                ref = np.broadcast_to(ref, (npts,))
+                good = np.isfinite(ref) & np.isfinite(interp[form])
+                scale = np.max(np.abs(ref[good])) if np.any(good) else 0.0
+                self.max_error[form] = float(np.max(np.abs(interp[form][good]-ref[good]))/scale) if scale > 0.0 else 0.0
+
+            sig_grid = self.sig_unsep(*pts[:3], eps, pts[3], phi_cm)
+            sig_ref = np.broadcast_to(self.model.sig_unsep(*pts[:3], eps, pts[3], phi_cm, self.params), (npts,))
+            good = np.isfinite(sig_ref) & (sig_ref != 0.0)
+            self.max_error["sig"] = float(np.max(np.abs(sig_grid[good]/sig_ref[good]-1.0))) if np.any(good) else 0.0
+
+        return self.max_error
+
+    def print_error(self):
+        print("\nCross section grid Q{}W{} {}: max interpolation error".format(self.model.q2_str, self.model.w_str, "x".join(str(n) for n in self.shape)))
+        for form, err in self.max_error.items():
+            print("    {:8s} {:.3e}".format(form, err))
+
+##################################################################################################################################################
+
+def save_xsect_grid(grid, out_file):
+    out = {
+        "params" : np.array(grid.params),
+        "ranges" : np.array(grid.ranges),
+        "shape" : np.array(grid.shape),
+        "max_error" : json.dumps(grid.max_error),
+    }
+    for form, val in grid.values.items():
+        out["values/{}".format(form)] = val
+    np.savez_compressed(out_file, **out)
+
+def load_xsect_grid(model, in_file):
+    '''
+    XsectGrid written by save_xsect_grid, None if the file does not exist
+    '''
+    if not os.path.isfile(in_file):
+        return None
+    with np.load(in_file) as f:
+        values = {key.split("/", 1)[1] : f[key] for key in f.files if key.startswith("values/")}
+        grid = XsectGrid(model, f["params"], f["ranges"], tuple(f["shape"]), values)
+        grid.max_error = json.loads(str(f["max_error"]))
+    return grid
+
+def get_xsect_grid(q2_set, w_set, params, ranges, cache_dir=None, shape=GRID_SHAPE):
+    '''
+    XsectGrid of the setting's model for the parameters and ranges, built once
+
+    Kept in memory and, with cache_dir, on disk as xsect_grid_<key>.npz (see grid_key),
+    so the other phi settings and reruns with the same parameters reuse it. The maximum
+    interpolation error is printed whenever a grid is built or read.
+    '''
+    model = get_model(q2_set, w_set)
+    key = grid_key(model, params, ranges, shape)
+    if key in _GRID_CACHE:
+        return _GRID_CACHE[key]
+
+    grid_file = None if cache_dir is None else "{}/xsect_grid_{}.npz".format(cache_dir, key)
+    grid = None if grid_file is None else load_xsect_grid(model, grid_file)
+    if grid is None:
+        grid = XsectGrid(model, params, ranges, shape)
+        grid.check()
+        if grid_file is not None:
+            save_xsect_grid(grid, grid_file)
+    grid.print_error()
+
+    _GRID_CACHE[key] = grid
+    return grid